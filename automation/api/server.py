@@ -5,27 +5,31 @@ Sourcing Copilot API服务
 
 import os
 import json
-import asyncio
 import uvicorn
 import time
 import uuid
 import glob
 import logging
 from datetime import datetime
-from fastapi import FastAPI, BackgroundTasks, WebSocket, HTTPException, Depends
+
+# 模块导入计时起点（冷启动预算见 automation/benchmarks/import_profile.py）
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, WebSocket, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, FileResponse
 from pydantic import BaseModel
 from typing import List, Optional, Any, Dict
 from sqlalchemy.orm import Session
 
-from automation.browser_control.browser_manager import BrowserManager
+from automation.worker.worker_client import AutomationWorkerClient, WorkerUnavailableError, WorkerCommandError
+from automation.api.warmup import StartupWarmup
 from automation.rules_engine.simple_rules_engine import SimpleRulesEngine
-from automation.utils.start_chrome import start_chrome_with_debugging, is_browser_running_with_debugging
 from automation.utils.screenshot_manager import ScreenshotManager
+from automation.utils.config_store import get_config_store
 
 # 导入数据库相关模块
-from automation.database.db import get_db_session, init_db, check_db_connection
+from automation.database.db import get_db_session
 from automation.database.models import Candidate, CandidateStatus, OperationLog as DBOperationLog, CandidateSkill
 from candidate_repository import CandidateRepository
 from sqlalchemy.orm import joinedload
@@ -33,6 +37,17 @@ from sqlalchemy.orm import joinedload
 # 创建FastAPI应用
 app = FastAPI(title="Sourcing Copilot API")
 
+# 工作进程不可用或命令执行失败时，按原有接口的格式返回错误而不是裸500
+@app.exception_handler(WorkerUnavailableError)
+async def worker_unavailable_handler(request, exc):
+    print(f"自动化工作进程不可用: {exc}")
+    return JSONResponse(status_code=503, content={"success": False, "message": str(exc)})
+
+@app.exception_handler(WorkerCommandError)
+async def worker_command_error_handler(request, exc):
+    print(f"自动化工作进程命令执行失败: {exc}")
+    return JSONResponse(status_code=500, content={"success": False, "message": str(exc)})
+
 # 配置CORS
 app.add_middleware(
     CORSMiddleware,
@@ -43,28 +58,23 @@ app.add_middleware(
 )
 
 # 全局实例
-browser_manager = BrowserManager()
+# 浏览器和自动化流程运行在独立的工作进程中，API进程通过客户端发送命令
+automation = AutomationWorkerClient()
 rules_engine = SimpleRulesEngine()
 
+# 数据库初始化和工作进程启动在端口绑定后于后台进行，导入本模块时不做耗时操作
+warmup = StartupWarmup(automation)
+
 # 配置文件路径
 CONFIG_DIR = os.path.expanduser("~/Library/Application Support/SourcingCopilot")
 CONFIG_PATH = os.path.join(CONFIG_DIR, "config.json")
-LOGS_PATH = os.path.join(CONFIG_DIR, "logs.json")
+
+# 配置存储（工作进程按文件修改时间读取同一个配置文件）
+config_store = get_config_store(rules_engine.create_default_config)
 
 # 确保配置目录存在
 os.makedirs(CONFIG_DIR, exist_ok=True)
 
-# 初始化数据库
-print("正在初始化数据库...")
-if init_db():
-    print("数据库初始化成功")
-    if check_db_connection():
-        print("数据库连接测试成功")
-    else:
-        print("警告：数据库连接测试失败")
-else:
-    print("错误：数据库初始化失败")
-
 # 数据模型
 class Rule(BaseModel):
     id: str
@@ -96,6 +106,14 @@ class LaunchBrowserRequest(BaseModel):
     use_default_profile: Optional[bool] = True
     wait_for_pages: Optional[bool] = True
 
+class JobRequest(BaseModel):
+    name: str
+    quota: Optional[int] = 0                  # 打招呼配额，0表示不限制
+    config: Optional[Dict[str, Any]] = None   # 覆盖的配置字段（规则、岗位描述等）
+    pacing: Optional[Dict[str, Any]] = None   # 任务自己的节奏预算
+    url: Optional[str] = None                 # 推荐列表URL
+    start: Optional[bool] = True              # 是否立即启动
+
 class LogEntry(BaseModel):
     id: str
     timestamp: str
@@ -105,63 +123,25 @@ class LogEntry(BaseModel):
     dataId: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
 
-# 日志存储
-logs_data = []
-
-# 辅助函数
-def load_logs():
-    """从文件加载日志"""
-    global logs_data
-    if os.path.exists(LOGS_PATH):
-        try:
-            with open(LOGS_PATH, "r", encoding="utf-8") as f:
-                logs_data = json.load(f)
-        except Exception as e:
-            print(f"读取日志文件失败: {e}")
-            logs_data = []
-    else:
-        logs_data = []
-
-def save_logs():
-    """保存日志到文件"""
-    try:
-        with open(LOGS_PATH, "w", encoding="utf-8") as f:
-            json.dump(logs_data, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        print(f"保存日志文件失败: {e}")
-
-# 加载日志数据
-load_logs()
+async def require_database():
+    """需要数据库的接口依赖：等待后台的数据库初始化完成"""
+    await warmup.wait_database()
 
 # API路由
 @app.get("/api/config")
 async def get_config():
-    """获取规则配置"""
-    if os.path.exists(CONFIG_PATH):
-        try:
-            with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"读取配置文件失败: {e}")
-    
-    # 返回默认配置
-    return rules_engine.create_default_config()
+    """获取规则配置（文件不存在时返回默认配置）"""
+    return config_store.get()
 
 @app.post("/api/config")
 async def save_config(config: Dict[str, Any]):
     """保存规则配置 - 改进版，支持合并不同类型的配置"""
     try:
-        # 读取现有配置
-        existing_config = {}
-        if os.path.exists(CONFIG_PATH):
-            try:
-                with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-                    existing_config = json.load(f)
-            except Exception as e:
-                print(f"读取现有配置失败: {e}")
-        
-        # 智能合并配置
-        merged_config = existing_config.copy()
+        # 读取现有配置（配置文件不存在时从空配置开始合并）
+        existing_config = config_store.get() if os.path.exists(CONFIG_PATH) else {}
+        
+        # 智能合并配置，不修改共享的缓存对象
+        merged_config = dict(existing_config)
         
         # 更新基本字段
         basic_fields = ['autoMode', 'passScore']
@@ -183,45 +163,105 @@ async def save_config(config: Dict[str, Any]):
             if field in config:
                 merged_config[field] = config[field]
         
-        # 保存合并后的配置
-        with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-            json.dump(merged_config, f, ensure_ascii=False, indent=2)
+        # 保存合并后的配置，正在运行的自动化会在下一轮使用新配置
+        version = config_store.save(merged_config)
         
-        print(f"✅ 配置保存成功，合并了 {len(config.keys())} 个字段")
-        return {"success": True, "message": "配置已保存", "merged_fields": list(config.keys())}
+        print(f"✅ 配置保存成功，合并了 {len(config.keys())} 个字段 (版本 {version})")
+        return {"success": True, "message": "配置已保存", "merged_fields": list(config.keys()), "version": version}
     except Exception as e:
         print(f"保存配置文件失败: {e}")
         return {"success": False, "error": str(e)}
 
+@app.get("/api/ready")
+async def get_readiness():
+    """就绪检查：数据库和自动化工作进程都初始化完成后返回200，否则返回503"""
+    status = warmup.get_status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
 @app.post("/api/automation/start")
-async def start_automation(background_tasks: BackgroundTasks):
-    """启动自动化任务"""
-    if browser_manager.is_running:
-        return {"success": False, "message": "自动化任务已在运行"}
-    
-    # 在后台启动自动化任务
-    background_tasks.add_task(browser_manager.start_automation)
-    return {"success": True, "message": "自动化任务已启动"}
+async def start_automation():
+    """启动自动化任务（在工作进程中运行）"""
+    return await automation.call("start_automation")
 
 @app.post("/api/automation/stop")
 async def stop_automation():
     """停止自动化任务"""
-    browser_manager.stop_automation()
-    return {"success": True, "message": "自动化任务已停止"}
+    return await automation.call("stop_automation")
 
 @app.get("/api/status")
 async def get_status():
-    """获取当前状态"""
-    status = browser_manager.get_status()
-    
+    """获取当前状态（返回工作进程最近推送的状态快照，不等待工作进程）"""
+    status = automation.status
     return {
-        "running": browser_manager.is_running,
-        "pageType": browser_manager.current_page_type,
-        "processedCount": browser_manager.processed_count,
-        "candidates": browser_manager.get_greeted_candidates(10)[::-1]  # 返回最近10条记录，倒序
+        "running": status.get("running", False),
+        "pageType": status.get("pageType", "unknown"),
+        "processedCount": status.get("processedCount", 0),
+        "candidates": status.get("candidates", [])
     }
 
-@app.get("/api/candidates")
+@app.get("/api/worker")
+async def get_worker_info():
+    """获取自动化工作进程信息"""
+    return {"success": True, "data": automation.get_info()}
+
+@app.post("/api/worker/restart")
+async def restart_worker():
+    """重启自动化工作进程（API服务不受影响）"""
+    return {"success": True, "data": await automation.restart()}
+
+@app.get("/api/connection")
+async def get_connection_status():
+    """获取浏览器连接的心跳和恢复统计"""
+    return {"success": True, "data": await automation.call("get_connection_stats")}
+
+@app.get("/api/request-policy")
+async def get_request_policy_stats():
+    """获取请求拦截统计（拦截数、估算节省字节数、启用/未启用时的加载耗时）"""
+    return {"success": True, "data": await automation.call("get_request_policy_stats")}
+
+@app.get("/api/jobs")
+async def list_jobs():
+    """获取所有筛选任务的状态和计数器"""
+    return {"success": True, "data": await automation.call("list_jobs")}
+
+@app.post("/api/jobs")
+async def create_job(request: JobRequest):
+    """创建筛选任务，每个任务使用自己的配置、配额和节奏预算，在独立标签页中并发运行"""
+    return await automation.call(
+        "create_job",
+        timeout=60,
+        name=request.name,
+        config=request.config,
+        quota=request.quota,
+        pacing=request.pacing,
+        url=request.url,
+        start=request.start
+    )
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """获取单个筛选任务的状态"""
+    status = await automation.call("get_job", job_id=job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="任务不存在")
+    return {"success": True, "data": status}
+
+@app.post("/api/jobs/{job_id}/start")
+async def start_job(job_id: str):
+    """启动或重新启动筛选任务"""
+    return await automation.call("start_job", timeout=60, job_id=job_id)
+
+@app.post("/api/jobs/{job_id}/stop")
+async def stop_job(job_id: str):
+    """停止筛选任务"""
+    return await automation.call("stop_job", job_id=job_id)
+
+@app.delete("/api/jobs/{job_id}")
+async def remove_job(job_id: str):
+    """停止并移除筛选任务"""
+    return await automation.call("remove_job", timeout=60, job_id=job_id)
+
+@app.get("/api/candidates", dependencies=[Depends(require_database)])
 async def get_candidates(limit: int = 100, offset: int = 0):
     """获取候选人列表"""
     try:
@@ -239,7 +279,7 @@ async def get_candidates(limit: int = 100, offset: int = 0):
         traceback.print_exc()
         return {"success": False, "error": str(e), "data": []}
 
-@app.post("/api/candidates")
+@app.post("/api/candidates", dependencies=[Depends(require_database)])
 async def create_candidate(candidate_data: Dict[str, Any]):
     """创建新候选人"""
     try:
@@ -285,7 +325,7 @@ async def create_candidate(candidate_data: Dict[str, Any]):
         traceback.print_exc()
         return {"success": False, "error": str(e)}
 
-@app.get("/api/candidates/{candidate_id}")
+@app.get("/api/candidates/{candidate_id}", dependencies=[Depends(require_database)])
 async def get_candidate_by_id(candidate_id: str):
     """获取单个候选人详情"""
     try:
@@ -363,7 +403,7 @@ async def get_candidate_by_id(candidate_id: str):
         traceback.print_exc()
         return {"success": False, "error": str(e), "data": None}
 
-@app.put("/api/candidates/{candidate_id}/status")
+@app.put("/api/candidates/{candidate_id}/status", dependencies=[Depends(require_database)])
 async def update_candidate_status(candidate_id: str, status_data: Dict[str, Any]):
     """更新候选人状态"""
     try:
@@ -411,7 +451,7 @@ async def update_candidate_status(candidate_id: str, status_data: Dict[str, Any]
         return {"success": False, "error": str(e), "data": None}
 
 # 日志API端点
-@app.get("/api/logs")
+@app.get("/api/logs", dependencies=[Depends(require_database)])
 async def get_logs(limit: int = 100, offset: int = 0):
     """获取操作日志列表 - 按候选人分组"""
     try:
@@ -564,7 +604,7 @@ async def get_logs(limit: int = 100, offset: int = 0):
         
         return {"success": True, "data": mock_data}
 
-@app.post("/api/logs")
+@app.post("/api/logs", dependencies=[Depends(require_database)])
 async def add_log(log: LogEntry):
     """添加操作日志"""
     try:
@@ -603,7 +643,7 @@ async def add_log(log: LogEntry):
         traceback.print_exc()
         return {"success": False, "error": str(e)}
 
-@app.delete("/api/logs")
+@app.delete("/api/logs", dependencies=[Depends(require_database)])
 async def clear_logs():
     """清空日志"""
     try:
@@ -621,7 +661,7 @@ async def clear_logs():
         traceback.print_exc()
         return {"success": False, "error": str(e)}
 
-@app.get("/api/logs/export")
+@app.get("/api/logs/export", dependencies=[Depends(require_database)])
 async def export_logs():
     """导出日志"""
     try:
@@ -659,58 +699,7 @@ async def export_logs():
 async def detect_browser():
     """检测浏览器并返回状态"""
     try:
-        # 如果浏览器已经在运行，获取当前状态
-        if browser_manager.browser and browser_manager.page:
-            # 更新页面类型
-            await browser_manager.detect_page_type()
-            return {
-                "success": True,
-                "connected": True,
-                "pageType": browser_manager.current_page_type,
-                "message": f"已连接浏览器，当前页面类型：{browser_manager.current_page_type}"
-            }
-        
-        # 先检查是否有浏览器在调试模式下运行
-        debug_mode_running = is_browser_running_with_debugging(9222)
-        if not debug_mode_running:
-            return {
-                "success": True,
-                "connected": False,
-                "pageType": "unknown",
-                "message": "未发现以调试模式运行的Chrome浏览器，请使用启动浏览器功能"
-            }
-            
-        # 尝试检测和连接到已打开的浏览器
-        browser, context, page, page_type = await browser_manager.browser_detector.detect_chrome_with_boss_page()
-        
-        if browser and page:
-            # 关闭之前的连接
-            if browser_manager.browser:
-                await browser_manager.close_browser()
-            
-            # 设置浏览器管理器
-            browser_manager.browser = browser
-            browser_manager.context = context
-            browser_manager.page = page
-            browser_manager.playwright = browser_manager.browser_detector.playwright
-            browser_manager.current_page_type = page_type
-            
-            # 设置页面加载事件
-            browser_manager.page.on("load", browser_manager._on_page_load)
-            
-            return {
-                "success": True,
-                "connected": True,
-                "pageType": page_type,
-                "message": f"已连接到浏览器，当前页面类型：{page_type}"
-            }
-        else:
-            return {
-                "success": True,
-                "connected": False,
-                "pageType": "unknown",
-                "message": "未检测到已打开的Boss直聘页面，请前往Boss直聘"
-            }
+        return await automation.call("detect_browser", timeout=60)
     except Exception as e:
         print(f"检测浏览器出错: {e}")
         return {
@@ -752,98 +741,16 @@ async def show_browser_reminder():
 async def launch_browser(request: LaunchBrowserRequest = LaunchBrowserRequest()):
     """启动Chrome浏览器"""
     try:
-        url = request.url
-        port = request.port
-        force_new = request.force_new
-        use_default_profile = request.use_default_profile
-        wait_for_pages = request.wait_for_pages
-        
-        # 先检查是否已经有我们管理的浏览器在运行
-        if not force_new and browser_manager.browser and browser_manager.page:
-            try:
-                # 检查浏览器是否还活着
-                await browser_manager.page.evaluate("1")  # 简单测试页面是否响应
-                
-                # 如果已经连接到浏览器，只需要导航到指定URL
-                await browser_manager.page.goto(url, wait_until="domcontentloaded")
-                await browser_manager.detect_page_type()
-                
-                return {
-                    "success": True,
-                    "message": f"浏览器已经在运行，已导航到 {url}",
-                    "pageType": browser_manager.current_page_type
-                }
-            except Exception as e:
-                print(f"浏览器可能已关闭，需要重新启动: {e}")
-                # 关闭已失效的浏览器连接
-                await browser_manager.close_browser()
-        
-        # 检查指定端口是否已有调试模式Chrome在运行
-        debug_mode_running = is_browser_running_with_debugging(port)
-        
-        if debug_mode_running and not force_new:
-            print(f"检测到端口 {port} 上已有调试模式Chrome，尝试连接...")
-            # 尝试连接到现有的调试模式浏览器
-            success = await browser_manager.start_browser(use_existing=True)
-            
-            if success:
-                # 导航到指定URL
-                await browser_manager.page.goto(url, wait_until="domcontentloaded")
-                await browser_manager.detect_page_type()
-                
-                return {
-                    "success": True,
-                    "message": f"已连接到现有调试模式浏览器并导航到 {url}",
-                    "pageType": browser_manager.current_page_type
-                }
-            else:
-                print(f"连接到端口 {port} 的Chrome失败，将启动新的Chrome实例")
-        
-        # 启动新的Chrome实例（带调试模式）
-        print(f"启动新的Chrome浏览器实例，调试端口: {port}")
-        success, actual_port = start_chrome_with_debugging(
-            url=url, 
-            port=port, 
-            use_default_profile=use_default_profile
+        return await automation.call(
+            "launch_browser",
+            timeout=120,
+            url=request.url,
+            port=request.port,
+            force_new=request.force_new,
+            use_default_profile=request.use_default_profile
         )
-        
-        if success:
-            # 等待Chrome启动
-            print("等待Chrome启动完成...")
-            await asyncio.sleep(3)  # 增加等待时间
-            
-            # 连接到新启动的浏览器，使用实际端口
-            browser_success = await browser_manager.start_browser(use_existing=True, cdp_port=actual_port)
-            
-            if browser_success:
-                # 导航到指定URL（如果还没有打开的话）
-                current_url = await browser_manager.page.url
-                if not current_url.startswith("https://www.zhipin.com"):
-                    await browser_manager.page.goto(url, wait_until="domcontentloaded")
-                    
-                await browser_manager.detect_page_type()
-                
-                return {
-                    "success": True,
-                    "message": f"已启动新的Chrome浏览器并导航到 {url} (端口: {actual_port})",
-                    "pageType": browser_manager.current_page_type,
-                    "port": actual_port
-                }
-            else:
-                return {
-                    "success": False,
-                    "message": f"Chrome启动成功（端口: {actual_port}），但无法建立Playwright连接，请重试或刷新页面"
-                }
-        else:
-            return {
-                "success": False,
-                "message": "启动Chrome浏览器失败，请确保Chrome浏览器已安装且端口未被占用"
-            }
-            
     except Exception as e:
         print(f"启动浏览器出错: {e}")
-        import traceback
-        traceback.print_exc()
         return {
             "success": False,
             "error": str(e),
@@ -853,14 +760,13 @@ async def launch_browser(request: LaunchBrowserRequest = LaunchBrowserRequest())
 @app.get("/api/selectors")
 async def get_selectors():
     """获取选择器配置"""
-    return browser_manager.selectors
+    return await automation.call("get_selectors")
 
 @app.post("/api/selectors")
 async def update_selectors(selectors: Dict[str, Any]):
     """更新选择器配置"""
     try:
-        browser_manager.selectors = selectors
-        return {"success": True, "message": "选择器配置已更新"}
+        return await automation.call("update_selectors", selectors=selectors)
     except Exception as e:
         return {
             "success": False,
@@ -908,19 +814,22 @@ async def scan_screenshots_directory():
     screenshots = screenshot_manager.scan_directory()
     return {"success": True, "data": screenshots}
 
+# 模块导入耗时，随就绪检查一起返回
+warmup.import_seconds = round(time.perf_counter() - _IMPORT_STARTED, 3)
+
 # 事件处理
 @app.on_event("startup")
 async def startup_event():
-    """应用启动时执行"""
-    print("API服务已启动")
+    """应用启动时执行：只安排后台预热，不阻塞端口绑定"""
+    warmup.start()
+    print(f"API服务已启动（模块导入耗时 {warmup.import_seconds}s），正在后台初始化数据库和自动化工作进程")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """应用关闭时执行"""
     print("API服务已关闭")
-    if browser_manager:
-        browser_manager.stop_automation()
-        asyncio.create_task(browser_manager.close_browser())
+    # 通知工作进程停止自动化、关闭浏览器连接后退出
+    await automation.stop()
 
 # 主函数
 def main():
@@ -933,6 +842,10 @@ def main():
     
     args = parser.parse_args()
     
+    # 打包后的可执行文件启动工作进程时需要
+    import multiprocessing
+    multiprocessing.freeze_support()
+    
     # 启动FastAPI应用
     uvicorn.run(app, host=args.host, port=args.port)
 
@@ -0,0 +1,135 @@
+"""
+API服务启动预热模块
+模块导入时只注册路由，数据库初始化和自动化工作进程在端口绑定后于后台启动，
+各组件的就绪状态和耗时通过就绪检查接口返回
+"""
+
+import asyncio
+import time
+import traceback
+
+
+class StartupWarmup:
+    """后台预热：初始化数据库、启动自动化工作进程并记录就绪状态"""
+
+    # 等待工作进程完成初始化（导入Playwright、创建BrowserManager）的最长时间（秒）
+    WORKER_READY_TIMEOUT = 60.0
+
+    def __init__(self, automation, import_seconds=None):
+        """
+        初始化预热器
+
+        Args:
+            automation: 自动化工作进程客户端
+            import_seconds: API服务模块的导入耗时
+        """
+        self.automation = automation
+        self.import_seconds = import_seconds
+        self.started_at = None
+        self.components = {
+            "database": {"ready": False, "error": None, "seconds": None},
+            "worker": {"ready": False, "error": None, "seconds": None}
+        }
+        self._database_task = None
+        self._worker_task = None
+
+    def start(self):
+        """在API服务的事件循环中启动后台预热（不等待完成）"""
+        if self.started_at is not None:
+            return
+        self.started_at = time.time()
+        loop = asyncio.get_running_loop()
+        self._database_task = loop.create_task(self._run("database", self._init_database))
+        self._worker_task = loop.create_task(self._run("worker", self._start_worker))
+
+    async def _run(self, name, step):
+        started = time.perf_counter()
+        component = self.components[name]
+        try:
+            ok = await step()
+            component["ready"] = bool(ok)
+            if not ok:
+                component["error"] = component["error"] or "初始化失败"
+        except Exception as e:
+            print(f"预热 {name} 失败: {e}")
+            traceback.print_exc()
+            component["error"] = str(e)
+        component["seconds"] = round(time.perf_counter() - started, 3)
+        print(f"{'✅' if component['ready'] else '⚠️'} 预热 {name} 完成，耗时 {component['seconds']}s")
+
+    async def _init_database(self):
+        """在线程池中创建数据表并测试连接"""
+        from automation.database.db import init_db, check_db_connection
+
+        def init():
+            print("正在初始化数据库...")
+            if not init_db():
+                print("错误：数据库初始化失败")
+                return False
+            if not check_db_connection():
+                print("警告：数据库连接测试失败")
+                return False
+            return True
+
+        return await asyncio.get_running_loop().run_in_executor(None, init)
+
+    async def _start_worker(self):
+        """启动自动化工作进程并等待其完成初始化"""
+        self.automation.start()
+        ready = await self.automation.wait_ready(self.WORKER_READY_TIMEOUT)
+        if not ready:
+            self.components["worker"]["error"] = self.automation.last_error or "工作进程初始化超时"
+        return ready
+
+    async def wait_database(self):
+        """
+        等待数据库初始化完成（需要数据库的接口在处理前调用）
+
+        Returns:
+            bool: 数据库是否可用
+        """
+        if self._database_task is None:
+            # 没有经过启动事件（例如直接调用接口函数）时立即初始化
+            self.started_at = self.started_at or time.time()
+            self._database_task = asyncio.get_running_loop().create_task(self._run("database", self._init_database))
+        await asyncio.shield(self._database_task)
+        return self.components["database"]["ready"]
+
+    def _component_status(self):
+        """
+        各组件的当前状态：工作进程的就绪状态按进程当前是否存活和已初始化实时计算，
+        工作进程崩溃或重启后立即反映在就绪检查中
+
+        Returns:
+            dict: 组件名 -> 状态
+        """
+        components = {name: dict(component) for name, component in self.components.items()}
+        if self._worker_task is not None:
+            info = self.automation.get_info()
+            worker = components["worker"]
+            worker["ready"] = bool(info.get("alive") and info.get("ready"))
+            worker["restarts"] = info.get("restarts", 0)
+            if not worker["ready"] and info.get("lastError"):
+                worker["error"] = info.get("lastError")
+            elif worker["ready"]:
+                worker["error"] = None
+        return components
+
+    @property
+    def is_ready(self):
+        return all(component["ready"] for component in self._component_status().values())
+
+    def get_status(self):
+        """
+        获取就绪状态
+
+        Returns:
+            dict: 是否就绪、各组件状态、模块导入耗时和启动以来的时间
+        """
+        components = self._component_status()
+        return {
+            "ready": all(component["ready"] for component in components.values()),
+            "components": components,
+            "importSeconds": self.import_seconds,
+            "uptimeSeconds": round(time.time() - self.started_at, 3) if self.started_at else None
+        }
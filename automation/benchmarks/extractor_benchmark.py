@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+提取器离线基准测试
+基于版本化的匿名样本库，测量EnhancedDataExtractor和CardExtractor的
+吞吐量（文档/秒）、逐字段准确率以及单文档内存占用
+
+用法:
+    python -m automation.benchmarks.extractor_benchmark
+    python -m automation.benchmarks.extractor_benchmark --corpus v1 --iterations 50 --output result.json
+    python -m automation.benchmarks.extractor_benchmark --no-browser
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import json
+import os
+import platform
+import re
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# 样本库目录，每个版本一个子目录（v1、v2...），内含corpus.json
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# 参与准确率统计的字段
+BENCHMARK_FIELDS = [
+    "name", "education", "position", "company", "schools", "skills",
+    "experience", "phone", "email", "salary_expectation", "work_location"
+]
+
+
+def list_corpus_versions() -> List[str]:
+    """
+    列出可用的样本库版本
+
+    Returns:
+        List[str]: 按版本号排序的版本列表
+    """
+    if not os.path.isdir(FIXTURES_DIR):
+        return []
+    versions = [
+        name for name in os.listdir(FIXTURES_DIR)
+        if os.path.isfile(os.path.join(FIXTURES_DIR, name, "corpus.json"))
+    ]
+    return sorted(versions, key=lambda v: int(re.sub(r'\D', '', v) or 0))
+
+
+def load_corpus(version: Optional[str] = None) -> Dict[str, Any]:
+    """
+    加载指定版本的样本库
+
+    Args:
+        version: 样本库版本，默认使用最新版本
+
+    Returns:
+        Dict[str, Any]: 样本库内容
+    """
+    versions = list_corpus_versions()
+    if not versions:
+        raise FileNotFoundError(f"未找到样本库: {FIXTURES_DIR}")
+    version = version or versions[-1]
+    if version not in versions:
+        raise FileNotFoundError(f"样本库版本不存在: {version}，可用版本: {', '.join(versions)}")
+
+    with open(os.path.join(FIXTURES_DIR, version, "corpus.json"), "r", encoding="utf-8") as f:
+        corpus = json.load(f)
+    corpus.setdefault("version", version)
+    return corpus
+
+
+def _normalize(value) -> str:
+    """统一字段值的比较形式"""
+    return re.sub(r'\s+', '', str(value or "")).lower()
+
+
+def compare_field(expected, actual) -> bool:
+    """
+    比较单个字段的期望值和实际值
+
+    列表字段要求期望的每一项都出现在实际结果中（允许实际结果带有额外内容），
+    数字字段要求完全相等，字符串字段忽略空白和大小写后比较
+
+    Args:
+        expected: 期望值
+        actual: 提取结果
+
+    Returns:
+        bool: 是否匹配
+    """
+    if isinstance(expected, list):
+        if isinstance(actual, list):
+            actual_items = [_normalize(item) for item in actual]
+        else:
+            actual_items = [_normalize(actual)]
+        for item in expected:
+            target = _normalize(item)
+            if not any(target in candidate for candidate in actual_items if candidate):
+                return False
+        return True
+
+    if isinstance(expected, int):
+        try:
+            return int(actual) == expected
+        except (TypeError, ValueError):
+            return False
+
+    return _normalize(expected) == _normalize(actual)
+
+
+class BenchmarkResult:
+    """单项基准测试结果"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.documents = 0
+        self.elapsed = 0.0
+        self.memory_per_doc = 0.0
+        self.field_hits: Dict[str, int] = {}
+        self.field_totals: Dict[str, int] = {}
+        self.failures: List[Dict[str, Any]] = []
+
+    def record_accuracy(self, doc: Dict[str, Any], actual: Dict[str, Any]):
+        """
+        记录单个文档的逐字段比较结果
+
+        Args:
+            doc: 样本文档
+            actual: 提取结果
+        """
+        for field, expected in doc.get("expected", {}).items():
+            if field not in BENCHMARK_FIELDS:
+                continue
+            self.field_totals[field] = self.field_totals.get(field, 0) + 1
+            if compare_field(expected, (actual or {}).get(field)):
+                self.field_hits[field] = self.field_hits.get(field, 0) + 1
+            else:
+                self.failures.append({
+                    "doc": doc.get("id"),
+                    "field": field,
+                    "expected": expected,
+                    "actual": (actual or {}).get(field)
+                })
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.documents / self.elapsed if self.elapsed > 0 else 0.0
+
+    def field_accuracy(self) -> Dict[str, float]:
+        """
+        获取逐字段准确率
+
+        Returns:
+            Dict[str, float]: 字段 -> 准确率(0~1)
+        """
+        return {
+            field: self.field_hits.get(field, 0) / total
+            for field, total in self.field_totals.items() if total
+        }
+
+    def overall_accuracy(self) -> float:
+        total = sum(self.field_totals.values())
+        return sum(self.field_hits.values()) / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "documents": self.documents,
+            "elapsed_seconds": round(self.elapsed, 6),
+            "docs_per_second": round(self.docs_per_second, 2),
+            "memory_per_doc_bytes": int(self.memory_per_doc),
+            "overall_accuracy": round(self.overall_accuracy(), 4),
+            "field_accuracy": {k: round(v, 4) for k, v in self.field_accuracy().items()},
+            "failures": self.failures
+        }
+
+    def print_summary(self, verbose: bool = False):
+        """打印测试结果摘要"""
+        print(f"\n📊 {self.name}")
+        print(f"   📄 文档数: {self.documents}，耗时: {self.elapsed:.3f}秒")
+        print(f"   ⚡ 吞吐量: {self.docs_per_second:.1f} 文档/秒")
+        print(f"   💾 单文档内存峰值: {self.memory_per_doc / 1024:.1f} KB")
+        print(f"   🎯 总体准确率: {self.overall_accuracy() * 100:.1f}%")
+        for field, accuracy in sorted(self.field_accuracy().items()):
+            print(f"      {field:<20} {accuracy * 100:6.1f}%  ({self.field_hits.get(field, 0)}/{self.field_totals[field]})")
+        if verbose and self.failures:
+            print("   ❌ 未匹配字段:")
+            for failure in self.failures:
+                print(f"      [{failure['doc']}] {failure['field']}: 期望={failure['expected']!r} 实际={failure['actual']!r}")
+
+
+@contextlib.contextmanager
+def _quiet():
+    """屏蔽提取器的调试输出，避免打印影响计时"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _measure_memory(docs: List[Dict[str, Any]], func: Callable[[Dict[str, Any]], Any]) -> float:
+    """
+    使用tracemalloc测量单文档处理的平均内存峰值
+
+    Args:
+        docs: 样本文档列表
+        func: 同步处理函数
+
+    Returns:
+        float: 平均每文档内存峰值（字节）
+    """
+    if not docs:
+        return 0.0
+    gc.collect()
+    tracemalloc.start()
+    try:
+        peaks = []
+        for doc in docs:
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            with _quiet():
+                func(doc)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(max(0, peak - baseline))
+        return sum(peaks) / len(peaks)
+    finally:
+        tracemalloc.stop()
+
+
+async def _measure_memory_async(docs: List[Dict[str, Any]], prepare, func) -> float:
+    """
+    测量异步处理函数的单文档内存峰值（只统计Python侧内存）
+
+    Args:
+        docs: 样本文档列表
+        prepare: 每个文档处理前的准备协程，不计入统计
+        func: 异步处理函数
+
+    Returns:
+        float: 平均每文档内存峰值（字节）
+    """
+    if not docs:
+        return 0.0
+    gc.collect()
+    tracemalloc.start()
+    try:
+        peaks = []
+        for doc in docs:
+            context = await prepare(doc)
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            with _quiet():
+                await func(doc, context)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(max(0, peak - baseline))
+        return sum(peaks) / len(peaks)
+    finally:
+        tracemalloc.stop()
+
+
+def extract_text_fields(extractor, text: str) -> Dict[str, Any]:
+    """
+    纯文本提取流程，与extract_resume_data在获取文本之后的处理保持一致
+
+    Args:
+        extractor: EnhancedDataExtractor实例
+        text: 原始文本
+
+    Returns:
+        Dict[str, Any]: 提取结果
+    """
+    cleaned_text = extractor._clean_text(text)
+    data = extractor._extract_from_text(cleaned_text)
+    data['fullText'] = cleaned_text
+    data['salary_expectation'] = extractor._extract_salary_expectation(cleaned_text)
+    data['work_location'] = extractor._extract_work_location(cleaned_text)
+    data['position_experience'] = extractor._extract_position_experience(cleaned_text)
+    return data
+
+
+def run_text_benchmark(docs: List[Dict[str, Any]], iterations: int, name: str) -> BenchmarkResult:
+    """
+    纯文本提取基准，不依赖浏览器
+
+    Args:
+        docs: 样本文档列表
+        iterations: 重复轮数
+        name: 测试名称
+
+    Returns:
+        BenchmarkResult: 测试结果
+    """
+    from automation.processors.enhanced_data_extractor import EnhancedDataExtractor
+
+    extractor = EnhancedDataExtractor()
+    result = BenchmarkResult(name)
+
+    # 第一轮用于准确率统计
+    with _quiet():
+        for doc in docs:
+            result.record_accuracy(doc, extract_text_fields(extractor, doc["text"]))
+
+    # 计时轮次
+    with _quiet():
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for doc in docs:
+                extract_text_fields(extractor, doc["text"])
+        result.elapsed = time.perf_counter() - start
+    result.documents = len(docs) * iterations
+
+    result.memory_per_doc = _measure_memory(docs, lambda doc: extract_text_fields(extractor, doc["text"]))
+    return result
+
+
+async def _block_network(route):
+    """拦截所有网络请求，保证基准测试完全离线"""
+    await route.abort()
+
+
+async def run_browser_benchmarks(docs: List[Dict[str, Any]], iterations: int) -> List[BenchmarkResult]:
+    """
+    基于无头Chromium的DOM提取基准，样本通过set_content加载，不访问网络
+
+    Args:
+        docs: 样本文档列表
+        iterations: 重复轮数
+
+    Returns:
+        List[BenchmarkResult]: 各项测试结果
+    """
+    try:
+        from playwright.async_api import async_playwright
+    except ImportError:
+        print("⚠️ 未安装playwright，跳过浏览器基准测试")
+        return []
+
+    from automation.processors.enhanced_data_extractor import EnhancedDataExtractor
+    from automation.processors.card_extractor import CardExtractor
+
+    card_docs = [doc for doc in docs if doc.get("kind") == "card"]
+    detail_docs = [doc for doc in docs if doc.get("kind") == "detail"]
+    results = []
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            page = await browser.new_page()
+            await page.route("**/*", _block_network)
+            extractor = EnhancedDataExtractor()
+
+            async def load_doc(doc):
+                await page.set_content(doc["html"])
+                return None
+
+            # 1. EnhancedDataExtractor.extract_resume_data（详情页）
+            async def extract_detail(doc, _context):
+                return await extractor.extract_resume_data(page)
+
+            results.append(await _run_async_benchmark(
+                "EnhancedDataExtractor.extract_resume_data（详情页DOM）",
+                detail_docs, iterations, load_doc, extract_detail
+            ))
+
+            # 2. CardExtractor.extract_data_from_card_element（逐元素提取）
+            async def load_card(doc):
+                await page.set_content(doc["html"])
+                return await page.query_selector('[data-id]')
+
+            async def extract_card(doc, card):
+                return await CardExtractor.extract_data_from_card_element(card)
+
+            results.append(await _run_async_benchmark(
+                "CardExtractor.extract_data_from_card_element（逐元素）",
+                card_docs, iterations, load_card, extract_card
+            ))
+
+            # 3. CardExtractor.snapshot_cards + 文本提取（批量快照路径）
+            if card_docs:
+                result = BenchmarkResult("CardExtractor.snapshot_cards + 文本提取（批量快照）")
+                docs_by_id = {doc["id"]: doc for doc in card_docs}
+                list_html = '<div class="card-list">' + "".join(doc["html"] for doc in card_docs) + '</div>'
+                await page.set_content(list_html)
+
+                with _quiet():
+                    snapshot = await CardExtractor.snapshot_cards(page, ['.card-inner.common-wrap'])
+                    for card in snapshot.get("cards", []):
+                        doc = docs_by_id.get(card.get("id"))
+                        if doc:
+                            result.record_accuracy(doc, extract_text_fields(extractor, card.get("text", "")))
+
+                    start = time.perf_counter()
+                    for _ in range(iterations):
+                        snapshot = await CardExtractor.snapshot_cards(page, ['.card-inner.common-wrap'])
+                        for card in snapshot.get("cards", []):
+                            extract_text_fields(extractor, card.get("text", ""))
+                    result.elapsed = time.perf_counter() - start
+                result.documents = len(card_docs) * iterations
+
+                async def snapshot_one(doc, _context):
+                    snap = await CardExtractor.snapshot_cards(page, ['.card-inner.common-wrap'])
+                    for card in snap.get("cards", []):
+                        extract_text_fields(extractor, card.get("text", ""))
+
+                result.memory_per_doc = await _measure_memory_async(card_docs, load_doc, snapshot_one)
+                results.append(result)
+        finally:
+            await browser.close()
+
+    return results
+
+
+async def _run_async_benchmark(name, docs, iterations, prepare, func) -> BenchmarkResult:
+    """
+    运行异步提取基准，只统计提取函数本身的耗时
+
+    Args:
+        name: 测试名称
+        docs: 样本文档列表
+        iterations: 重复轮数
+        prepare: 每个文档处理前的准备协程（加载HTML等），不计时
+        func: 异步提取函数
+
+    Returns:
+        BenchmarkResult: 测试结果
+    """
+    result = BenchmarkResult(name)
+    if not docs:
+        return result
+
+    with _quiet():
+        for doc in docs:
+            context = await prepare(doc)
+            result.record_accuracy(doc, await func(doc, context))
+
+        for _ in range(iterations):
+            for doc in docs:
+                context = await prepare(doc)
+                start = time.perf_counter()
+                await func(doc, context)
+                result.elapsed += time.perf_counter() - start
+    result.documents = len(docs) * iterations
+
+    result.memory_per_doc = await _measure_memory_async(docs, prepare, func)
+    return result
+
+
+async def run_benchmarks(version: Optional[str] = None, iterations: int = 20, use_browser: bool = True) -> Dict[str, Any]:
+    """
+    运行全部基准测试
+
+    Args:
+        version: 样本库版本，默认最新
+        iterations: 重复轮数
+        use_browser: 是否运行基于浏览器的DOM提取基准
+
+    Returns:
+        Dict[str, Any]: 测试报告
+    """
+    corpus = load_corpus(version)
+    docs = corpus.get("documents", [])
+    card_docs = [doc for doc in docs if doc.get("kind") == "card"]
+    detail_docs = [doc for doc in docs if doc.get("kind") == "detail"]
+
+    print(f"📚 样本库版本: {corpus.get('version')}，卡片 {len(card_docs)} 份，详情页 {len(detail_docs)} 份，重复 {iterations} 轮")
+
+    results = [
+        run_text_benchmark(card_docs, iterations, "EnhancedDataExtractor 文本提取（卡片）"),
+        run_text_benchmark(detail_docs, iterations, "EnhancedDataExtractor 文本提取（详情页）")
+    ]
+
+    if use_browser:
+        results.extend(await run_browser_benchmarks(docs, iterations))
+
+    return {
+        "corpus_version": corpus.get("version"),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "iterations": iterations,
+        "results": [r.to_dict() for r in results],
+        "_results": results
+    }
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="提取器离线基准测试")
+    parser.add_argument("--corpus", default=None, help="样本库版本，默认使用最新版本")
+    parser.add_argument("--iterations", type=int, default=20, help="每项测试的重复轮数")
+    parser.add_argument("--no-browser", action="store_true", help="只运行纯文本基准，不启动浏览器")
+    parser.add_argument("--output", default=None, help="将结果写入JSON文件")
+    parser.add_argument("--verbose", action="store_true", help="打印未匹配的字段明细")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmarks(args.corpus, max(1, args.iterations), not args.no_browser))
+
+    for result in report.pop("_results"):
+        result.print_summary(args.verbose)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 基准测试结果已保存到: {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    # 添加项目根目录到路径，支持直接运行脚本
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    sys.exit(main())
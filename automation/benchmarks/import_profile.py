@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+API服务冷启动导入分析
+在全新的子进程中用 -X importtime 导入 automation.api.server，统计导入耗时、
+最慢的模块，并检查重量级子系统（Playwright、OpenAI、模糊匹配、浏览器管理器）
+没有在导入时被加载。Electron应用在API端口可用后才显示首屏，导入耗时超过预算时返回非零退出码
+
+用法:
+    python -m automation.benchmarks.import_profile
+    python -m automation.benchmarks.import_profile --runs 5 --budget-ms 1500 --output import_profile.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 冷启动预算：导入 automation.api.server 的墙钟时间（毫秒，取多次运行的中位数）
+COLD_START_BUDGET_MS = 1500
+
+# API进程导入时不应加载的模块，这些子系统只在工作进程中或第一次使用时加载
+DEFERRED_MODULES = [
+    "playwright",
+    "openai",
+    "thefuzz",
+    "automation.browser_control.browser_manager",
+    "automation.processors.resume_processor",
+    "automation.processors.enhanced_data_extractor"
+]
+
+_CHILD_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import automation.api.server
+elapsed = time.perf_counter() - started
+deferred = json.loads(sys.argv[1])
+print(json.dumps({
+    "seconds": elapsed,
+    "loaded": [name for name in deferred if name in sys.modules]
+}))
+"""
+
+
+def _parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """解析 -X importtime 输出，返回每个模块的自身耗时和累计耗时（微秒）"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append({"module": name.strip(), "selfUs": self_us, "cumulativeUs": cumulative_us, "depth": depth})
+    return modules
+
+
+def profile_once(sandbox: str) -> Dict[str, Any]:
+    """
+    在全新的子进程中导入一次API服务模块
+
+    Args:
+        sandbox: 临时HOME目录，导入时创建的配置目录不影响真实数据
+
+    Returns:
+        dict: 导入耗时、被提前加载的模块和逐模块耗时
+    """
+    env = dict(os.environ)
+    env["HOME"] = sandbox
+    env["DATABASE_URL"] = f"sqlite:///{os.path.join(sandbox, 'profile.db')}"
+    env["PYTHONPATH"] = PROJECT_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD_SCRIPT, json.dumps(DEFERRED_MODULES)],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    if completed.returncode != 0:
+        errors = [line for line in completed.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError("导入 automation.api.server 失败:\n" + "\n".join(errors[-20:]))
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["modules"] = _parse_importtime(completed.stderr)
+    return result
+
+
+def run_profile(runs: int = 3, budget_ms: int = COLD_START_BUDGET_MS, top: int = 15) -> Dict[str, Any]:
+    """
+    多次导入API服务模块并生成报告
+
+    Args:
+        runs: 运行次数（第一次包含编译字节码的耗时，报告取中位数）
+        budget_ms: 冷启动预算（毫秒）
+        top: 报告中列出的最慢模块数
+
+    Returns:
+        dict: 导入耗时统计、最慢的顶层依赖、被提前加载的重量级模块和是否在预算内
+    """
+    sandbox = tempfile.mkdtemp(prefix="sourcing-import-")
+    results = [profile_once(sandbox) for _ in range(max(1, runs))]
+    durations = [result["seconds"] * 1000 for result in results]
+    median_ms = statistics.median(durations)
+
+    # 用最后一次（字节码已缓存）的逐模块耗时，按累计耗时列出最慢的直接依赖
+    modules = results[-1]["modules"]
+    direct = [module for module in modules if module["depth"] <= 1]
+    slowest = sorted(direct, key=lambda module: module["cumulativeUs"], reverse=True)[:top]
+
+    loaded = sorted({name for result in results for name in result["loaded"]})
+    return {
+        "budgetMs": budget_ms,
+        "runs": len(results),
+        "importMs": [round(duration, 1) for duration in durations],
+        "medianMs": round(median_ms, 1),
+        "withinBudget": median_ms <= budget_ms,
+        "deferredModulesLoaded": loaded,
+        "slowest": [
+            {"module": module["module"], "cumulativeMs": round(module["cumulativeUs"] / 1000, 1),
+             "selfMs": round(module["selfUs"] / 1000, 1)}
+            for module in slowest
+        ]
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    """打印导入分析报告摘要"""
+    status = "✅" if report["withinBudget"] else "❌"
+    print("\n📊 API服务冷启动导入分析")
+    print(f"   {status} 导入耗时中位数: {report['medianMs']}ms（预算 {report['budgetMs']}ms，"
+          f"各次: {', '.join(str(ms) for ms in report['importMs'])}）")
+    if report["deferredModulesLoaded"]:
+        print(f"   ❌ 导入时加载了应延迟加载的模块: {', '.join(report['deferredModulesLoaded'])}")
+    else:
+        print("   ✅ 重量级子系统均未在导入时加载")
+    print("   🐢 最慢的依赖（累计耗时）:")
+    for module in report["slowest"]:
+        print(f"      {module['cumulativeMs']:>8.1f}ms  {module['module']}")
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="API服务冷启动导入分析")
+    parser.add_argument("--runs", type=int, default=3, help="导入次数，取中位数")
+    parser.add_argument("--budget-ms", type=int, default=COLD_START_BUDGET_MS, help="冷启动预算（毫秒）")
+    parser.add_argument("--top", type=int, default=15, help="列出的最慢依赖数")
+    parser.add_argument("--output", default=None, help="将结果写入JSON文件")
+    args = parser.parse_args()
+
+    report = run_profile(args.runs, args.budget_ms, args.top)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 导入分析结果已保存到: {args.output}")
+
+    return 0 if report["withinBudget"] and not report["deferredModulesLoaded"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,598 @@
+#!/usr/bin/env python3
+"""
+离线端到端回放测试
+启动本地模拟推荐站点（推荐列表iframe布局、每批15张卡片的无限滚动、弹窗详情页），
+在无头Chromium中通过BrowserManager.start_automation完整流程处理（与API启动自动化的路径一致），
+列表处理到末尾后停止自动化，统计每小时处理候选人数、各阶段延迟和内存占用，不需要真实的Boss直聘账号
+
+吞吐量在不开启tracemalloc的情况下测量；Python内存峰值需要tracemalloc，
+通过--trace-memory在单独的一轮回放中测量，不影响吞吐量数据
+
+模拟站点作为浏览器的HTTP代理运行，页面URL与线上一致（http://www.zhipin.com/web/boss/recommend），
+页面类型检测无需修改；其余所有请求都返回404，保证测试完全离线。
+
+用法:
+    python -m automation.benchmarks.replay_harness
+    python -m automation.benchmarks.replay_harness --batches 4 --latency-ms 150 --output replay.json
+    python -m automation.benchmarks.replay_harness --layout flat --pacing default
+    python -m automation.benchmarks.replay_harness --trace-memory
+    python -m automation.benchmarks.replay_harness --serve --port 8765
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+# 模拟站点的入口地址（通过代理访问，与线上推荐页URL一致）
+RECOMMEND_URL = "http://www.zhipin.com/web/boss/recommend"
+
+# 每批卡片数量，与Boss直聘一致
+BATCH_SIZE = 15
+
+_SURNAMES = "王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾"
+_GIVEN_NAMES = ["晓峰", "子涵", "思远", "雨辰", "浩然", "佳怡", "俊杰", "欣怡", "宇航", "梓萱",
+                "明轩", "诗涵", "博文", "雅琪", "天佑", "可欣", "志强", "婉婷", "嘉懿", "睿泽"]
+_HIGHLIGHTS = ["分布式系统", "高并发", "微服务", "性能优化", "数据平台", "推荐系统", "支付链路",
+               "容器化", "监控告警", "自动化测试", "前端工程化", "实时计算", "搜索引擎", "风控模型",
+               "消息队列", "缓存架构", "云原生", "DevOps", "大模型应用", "数据治理"]
+
+_SHELL_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>推荐牛人</title></head>
+<body style="margin:0">
+<div class="boss-header" style="height:60px">推荐牛人（回放测试）</div>
+<iframe name="recommendFrame" src="/web/frame/recommend/" style="width:100%;height:900px;border:0"></iframe>
+</body></html>"""
+
+_LIST_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>推荐列表</title>
+<style>
+  .card-inner {{ display:block; min-height:180px; border-bottom:1px solid #eee; padding:8px; cursor:pointer; }}
+  .dialog-wrap {{ position:fixed; top:40px; left:10%; width:80%; height:80%; overflow:auto; background:#fff; border:1px solid #ccc; z-index:10; }}
+  .loading-more {{ display:none; }}
+</style></head>
+<body>
+<div class="card-list">{cards}</div>
+<div class="loading-more">加载中...</div>
+<script>
+(() => {{
+  const totalBatches = {batches};
+  let loadedBatches = 1;
+  let loading = false;
+  const list = document.querySelector('.card-list');
+  const loadingEl = document.querySelector('.loading-more');
+
+  async function loadMore() {{
+    if (loading || loadedBatches >= totalBatches) return;
+    loading = true;
+    loadingEl.style.display = 'block';
+    const html = await (await fetch('/mock/cards?batch=' + loadedBatches)).text();
+    list.insertAdjacentHTML('beforeend', html);
+    loadedBatches += 1;
+    loadingEl.style.display = 'none';
+    if (loadedBatches >= totalBatches) {{
+      const end = document.createElement('div');
+      end.className = 'end-tip';
+      end.textContent = '没有更多了';
+      document.body.appendChild(end);
+    }}
+    loading = false;
+  }}
+
+  window.addEventListener('scroll', () => {{
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 300) loadMore();
+  }});
+
+  function closeDetail() {{
+    document.querySelectorAll('.dialog-wrap').forEach(el => el.remove());
+  }}
+
+  document.addEventListener('keydown', e => {{ if (e.key === 'Escape') closeDetail(); }});
+
+  document.addEventListener('click', async e => {{
+    if (e.target.closest('.icon-close')) {{ closeDetail(); return; }}
+    const greet = e.target.closest('.btn-greet');
+    if (greet) {{
+      e.stopPropagation();
+      const card = greet.closest('[data-id]');
+      const id = card ? card.getAttribute('data-id') : greet.getAttribute('data-geek');
+      greet.textContent = '继续沟通';
+      fetch('/mock/greet?id=' + encodeURIComponent(id || ''), {{method: 'POST'}});
+      return;
+    }}
+    const card = e.target.closest('.card-inner[data-id]');
+    if (card && !e.target.closest('.dialog-wrap')) {{
+      closeDetail();
+      const html = await (await fetch('/mock/detail?id=' + encodeURIComponent(card.getAttribute('data-id')))).text();
+      document.body.insertAdjacentHTML('beforeend', html);
+    }}
+  }});
+}})();
+</script>
+</body></html>"""
+
+
+class MockRecommendSite:
+    """
+    模拟推荐站点：根据样本库生成可复现的卡片和详情页
+
+    同时支持作为HTTP代理（请求行为绝对URL）和普通HTTP服务（请求行为路径）访问
+    """
+
+    def __init__(self, batches: int = 4, latency_ms: int = 150, layout: str = "iframe",
+                 corpus_version: Optional[str] = None, seed: int = 42):
+        """
+        初始化模拟站点
+
+        Args:
+            batches: 列表总批次数（每批15张卡片）
+            latency_ms: 卡片批次和详情页接口的模拟延迟（毫秒）
+            layout: 页面布局，iframe（列表在recommendFrame中）或flat（列表直接在页面中）
+            corpus_version: 样本库版本，默认最新
+            seed: 随机种子，相同参数生成相同的站点内容
+        """
+        from automation.benchmarks.extractor_benchmark import load_corpus
+
+        corpus = load_corpus(corpus_version)
+        docs = corpus.get("documents", [])
+        self.corpus_version = corpus.get("version")
+        self.card_docs = [doc for doc in docs if doc.get("kind") == "card"]
+        self.detail_docs = [doc for doc in docs if doc.get("kind") == "detail"]
+        if not self.card_docs or not self.detail_docs:
+            raise ValueError("样本库中需要同时包含卡片和详情页样本")
+
+        self.batches = max(1, batches)
+        self.latency = max(0, latency_ms) / 1000.0
+        self.layout = layout
+        self.seed = seed
+
+        self.cards: List[Dict[str, str]] = [self._make_card(i) for i in range(self.batches * BATCH_SIZE)]
+        self.cards_by_id = {card["id"]: card for card in self.cards}
+
+        self.server: Optional[ThreadingHTTPServer] = None
+        self.thread: Optional[threading.Thread] = None
+        self.stats = {"pages": 0, "batches": 0, "details": 0, "greets": 0, "blocked": 0}
+        self.greeted: List[str] = []
+        self._lock = threading.Lock()
+        # 最后一批卡片发出时的页面请求数；之后再次请求页面说明处理流程已到列表末尾并刷新了页面
+        self._last_batch_pages: Optional[int] = 1 if self.batches == 1 else None
+
+    def _make_card(self, index: int) -> Dict[str, str]:
+        """生成第index张卡片：轮换使用样本卡片，替换姓名、年龄和优势描述，避免被判为重复候选人"""
+        rng = random.Random(self.seed * 100003 + index)
+        template = self.card_docs[index % len(self.card_docs)]
+        original_name = (template.get("expected") or {}).get("name", "")
+        name = rng.choice(_SURNAMES) + rng.choice(_GIVEN_NAMES)
+        card_id = f"replay-{index + 1:04d}"
+        highlight = "、".join(rng.sample(_HIGHLIGHTS, 4))
+
+        html = re.sub(r'data-id="[^"]*"', f'data-id="{card_id}"', template["html"], count=1)
+        if original_name:
+            html = html.replace(original_name, name)
+        html = re.sub(r'\d{2}岁', f"{rng.randint(23, 45)}岁", html, count=1)
+        html = re.sub(r'(<span class="label">优势</span>\s*<span class="content">)[^<]*',
+                      lambda m: m.group(1) + f"擅长{highlight}，负责过{rng.randint(2, 9)}个核心项目", html, count=1)
+
+        detail_template = self.detail_docs[index % len(self.detail_docs)]
+        detail_name = (detail_template.get("expected") or {}).get("name", "")
+        body = re.search(r"<body[^>]*>(.*)</body>", detail_template["html"], re.S)
+        detail = body.group(1) if body else detail_template["html"]
+        if detail_name:
+            detail = detail.replace(detail_name, name)
+        if "icon-close" not in detail:
+            detail = detail.replace('<div class="boss-dialog__body">',
+                                    '<div class="boss-dialog__body"><i class="icon-close">×</i>', 1)
+        return {"id": card_id, "name": name, "html": html, "detail": detail}
+
+    def batch_html(self, batch: int) -> str:
+        """第batch批（从0开始）的卡片HTML"""
+        return "".join(card["html"] for card in self.cards[batch * BATCH_SIZE:(batch + 1) * BATCH_SIZE])
+
+    def list_html(self) -> str:
+        return _LIST_HTML.format(cards=self.batch_html(0), batches=self.batches)
+
+    def _handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body, content_type="text/html; charset=utf-8"):
+                data = body.encode("utf-8") if isinstance(body, str) else body
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _route(self):
+                parts = urlsplit(self.path)
+                # 代理请求只处理模拟站点的域名，其余请求一律拒绝（保证离线）
+                if parts.netloc and parts.hostname != "www.zhipin.com":
+                    with site._lock:
+                        site.stats["blocked"] += 1
+                    self._send(404, "offline")
+                    return
+                path = parts.path.rstrip("/") or "/"
+                query = parse_qs(parts.query)
+
+                if path in ("/", "/web/boss/recommend"):
+                    with site._lock:
+                        site.stats["pages"] += 1
+                    self._send(200, _SHELL_HTML if site.layout == "iframe" else site.list_html())
+                elif path == "/web/frame/recommend":
+                    self._send(200, site.list_html())
+                elif path == "/mock/cards":
+                    time.sleep(site.latency)
+                    batch = int((query.get("batch") or ["0"])[0])
+                    with site._lock:
+                        site.stats["batches"] += 1
+                        if batch >= site.batches - 1 and site._last_batch_pages is None:
+                            site._last_batch_pages = site.stats["pages"]
+                    self._send(200, site.batch_html(batch))
+                elif path == "/mock/detail":
+                    time.sleep(site.latency)
+                    card = site.cards_by_id.get((query.get("id") or [""])[0])
+                    if not card:
+                        self._send(404, "not found")
+                        return
+                    with site._lock:
+                        site.stats["details"] += 1
+                    self._send(200, card["detail"])
+                elif path == "/mock/greet":
+                    with site._lock:
+                        site.stats["greets"] += 1
+                        site.greeted.append((query.get("id") or [""])[0])
+                    self._send(200, "{}", "application/json")
+                elif path == "/mock/stats":
+                    self._send(200, json.dumps(site.get_stats(), ensure_ascii=False), "application/json")
+                else:
+                    self._send(404, "not found")
+
+            def do_GET(self):
+                self._route()
+
+            def do_POST(self):
+                self._route()
+
+            def do_CONNECT(self):
+                # HTTPS隧道请求（第三方资源）直接拒绝
+                with site._lock:
+                    site.stats["blocked"] += 1
+                self.send_response(403)
+                self.end_headers()
+
+        return Handler
+
+    def start(self, port: int = 0) -> int:
+        """
+        在后台线程启动站点
+
+        Args:
+            port: 监听端口，0表示随机端口
+
+        Returns:
+            int: 实际监听的端口
+        """
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self.server.server_address[1]
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def list_exhausted(self) -> bool:
+        """处理流程是否已到列表末尾：最后一批卡片已加载，并且之后页面被重新请求（滚动无更多后刷新）"""
+        with self._lock:
+            return self._last_batch_pages is not None and self.stats["pages"] > self._last_batch_pages
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, cards=len(self.cards), uniqueGreeted=len(set(self.greeted)))
+
+
+def prepare_sandbox(base_dir: Optional[str] = None) -> str:
+    """
+    把HOME和DATABASE_URL指向临时目录，回放产生的配置、日志、候选人记录和数据库不影响真实数据
+
+    必须在导入automation其他模块之前调用（部分路径在导入时计算）
+
+    Args:
+        base_dir: 沙箱目录，默认新建临时目录
+
+    Returns:
+        str: 沙箱目录
+    """
+    sandbox = base_dir or tempfile.mkdtemp(prefix="sourcing-replay-")
+    os.makedirs(sandbox, exist_ok=True)
+    os.environ["HOME"] = sandbox
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(sandbox, 'replay.db')}"
+    return sandbox
+
+
+def _replay_config(manager, pacing: str) -> Dict[str, Any]:
+    """回放使用的配置：沙箱中的默认配置，关闭AI筛选（离线），每轮回放使用独立的岗位范围"""
+    config = dict(manager._load_config())
+    config["aiEnabled"] = False
+    config["jobId"] = f"replay-{uuid.uuid4().hex[:12]}"
+    if pacing == "none":
+        # 去掉节奏等待和频率预算，只测量流程本身的耗时
+        config["pacing"] = {
+            "greetsPerMinute": 0,
+            "detailOpensPerMinute": 0,
+            "scrollIntervalSeconds": 0,
+            "delayScale": 0
+        }
+    return config
+
+
+async def _browser_memory(page) -> Dict[str, Any]:
+    """通过CDP读取页面的JS堆和DOM节点数"""
+    try:
+        cdp = await page.context.new_cdp_session(page)
+        await cdp.send("Performance.enable")
+        metrics = {m["name"]: m["value"] for m in (await cdp.send("Performance.getMetrics")).get("metrics", [])}
+        await cdp.detach()
+        return {
+            "jsHeapUsedBytes": int(metrics.get("JSHeapUsedSize", 0)),
+            "jsHeapTotalBytes": int(metrics.get("JSHeapTotalSize", 0)),
+            "domNodes": int(metrics.get("Nodes", 0))
+        }
+    except Exception as e:
+        print(f"⚠️ 读取浏览器内存指标失败: {e}")
+        return {}
+
+
+def _process_rss_bytes() -> int:
+    """当前进程的峰值常驻内存"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS以字节为单位，Linux以KB为单位
+        return int(peak if sys.platform == "darwin" else peak * 1024)
+    except Exception:
+        return 0
+
+
+async def run_replay(batches: int = 4, latency_ms: int = 150, layout: str = "iframe",
+                     pacing: str = "none", corpus_version: Optional[str] = None,
+                     headless: bool = True, seed: int = 42, trace_memory: bool = False,
+                     timeout: float = 1800.0) -> Dict[str, Any]:
+    """
+    运行一次端到端回放：通过BrowserManager.start_automation处理模拟列表，列表处理到末尾后停止自动化
+
+    Args:
+        batches: 列表总批次数（每批15张卡片）
+        latency_ms: 模拟接口延迟（毫秒）
+        layout: iframe或flat
+        pacing: none（去掉节奏等待）或default（使用默认节奏）
+        corpus_version: 样本库版本
+        headless: 是否无头运行
+        seed: 随机种子
+        trace_memory: 是否开启tracemalloc测量Python内存峰值（会显著拖慢处理，吞吐量不可与未开启时比较）
+        timeout: 最长运行秒数，超时后停止自动化
+
+    Returns:
+        Dict[str, Any]: 回放报告
+    """
+    from playwright.async_api import async_playwright
+    from automation.browser_control.browser_manager import BrowserManager
+
+    site = MockRecommendSite(batches, latency_ms, layout, corpus_version, seed)
+    port = site.start()
+    print(f"🧪 模拟站点已启动: 127.0.0.1:{port}，{len(site.cards)} 张卡片（{site.batches} 批），布局 {layout}，延迟 {latency_ms}ms"
+          f"{'，开启tracemalloc' if trace_memory else ''}")
+
+    manager = BrowserManager()
+    playwright = await async_playwright().start()
+    automation = None
+    tracing = False
+    try:
+        browser = await playwright.chromium.launch(
+            headless=headless,
+            proxy={"server": f"http://127.0.0.1:{port}"}
+        )
+        context = await browser.new_context(locale="zh-CN", timezone_id="Asia/Shanghai")
+        page = await context.new_page()
+
+        # 与连接已有浏览器的方式一致，直接设置管理器的浏览器对象，start_automation不会再去连接浏览器
+        manager.playwright = playwright
+        manager.browser = browser
+        manager.context = context
+        manager.page = page
+        await page.goto(RECOMMEND_URL, wait_until="domcontentloaded")
+
+        # start_automation从配置存储读取配置（沙箱目录中的配置文件）
+        manager.config_store.save(_replay_config(manager, pacing))
+
+        gc.collect()
+        if trace_memory:
+            tracemalloc.start()
+            tracing = True
+        start = time.perf_counter()
+        automation = asyncio.create_task(manager.start_automation())
+
+        # 处理流程到达列表末尾（或超时）后停止自动化，与用户点击停止的路径一致
+        deadline = start + timeout
+        while not automation.done():
+            if site.list_exhausted():
+                print("🧪 模拟列表已处理到末尾，停止自动化")
+                break
+            if time.perf_counter() >= deadline:
+                print(f"⚠️ 回放超过 {timeout} 秒，停止自动化")
+                break
+            await asyncio.sleep(0.2)
+        elapsed = time.perf_counter() - start
+        manager.stop_automation()
+        await asyncio.wait_for(asyncio.shield(automation), 60)
+
+        python_peak = None
+        if tracing:
+            _, python_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            tracing = False
+
+        processor = manager.resume_processor
+        processed = processor.get_processed_count()
+        memory = dict(processPeakRssBytes=_process_rss_bytes(), **await _browser_memory(manager.page))
+        if python_peak is not None:
+            memory["pythonPeakBytes"] = python_peak
+        report = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "corpus_version": site.corpus_version,
+            "params": {
+                "batches": site.batches,
+                "cards": len(site.cards),
+                "latencyMs": latency_ms,
+                "layout": layout,
+                "pacing": pacing,
+                "seed": seed,
+                "traceMemory": trace_memory
+            },
+            "elapsedSeconds": round(elapsed, 3),
+            "processed": processed,
+            "greeted": processor.get_greeted_count(),
+            "candidatesPerHour": round(processed / elapsed * 3600, 1) if elapsed > 0 else 0.0,
+            "counters": processor.get_session_counters(),
+            "stages": {
+                "readiness": processor.get_latency_stats(),
+                "pacing": processor.get_pacing_stats(),
+                "lookahead": processor.get_lookahead_stats(),
+                "detailPool": processor.get_detail_pool_stats(),
+                "requestPolicy": manager.request_policy.get_stats()
+            },
+            "memory": memory,
+            "site": site.get_stats()
+        }
+        return report
+    finally:
+        if tracing:
+            tracemalloc.stop()
+        if automation is not None and not automation.done():
+            manager.stop_automation()
+            automation.cancel()
+        try:
+            if manager.browser:
+                await manager.browser.close()
+        except Exception:
+            pass
+        await playwright.stop()
+        site.stop()
+
+
+async def run_replay_with_memory(**kwargs) -> Dict[str, Any]:
+    """
+    先在不开启tracemalloc的情况下测量吞吐量，再单独回放一轮测量Python内存峰值
+
+    Args:
+        **kwargs: run_replay的参数
+
+    Returns:
+        Dict[str, Any]: 吞吐量回放的报告，memory中补充tracemalloc测得的pythonPeakBytes
+    """
+    report = await run_replay(**kwargs, trace_memory=False)
+    traced = await run_replay(**kwargs, trace_memory=True)
+    report["memory"]["pythonPeakBytes"] = traced["memory"].get("pythonPeakBytes", 0)
+    report["tracedPass"] = {
+        "elapsedSeconds": traced["elapsedSeconds"],
+        "processed": traced["processed"]
+    }
+    return report
+
+
+def print_report(report: Dict[str, Any]):
+    """打印回放报告摘要"""
+    params = report["params"]
+    print("\n📊 端到端回放结果")
+    print(f"   📄 卡片: {params['cards']}（{params['batches']} 批，布局 {params['layout']}，接口延迟 {params['latencyMs']}ms，节奏 {params['pacing']}）")
+    print(f"   ⏱️ 耗时: {report['elapsedSeconds']}秒，处理 {report['processed']} 个，打招呼 {report['greeted']} 人")
+    print(f"   ⚡ 吞吐量: {report['candidatesPerHour']} 候选人/小时")
+    for name, stats in sorted((report["stages"].get("readiness") or {}).items()):
+        print(f"   ⏱️ {name:<16} {stats['count']}次, 平均 {stats['meanMs']}ms, P90 {stats['p90Ms']}ms, 超时 {stats['timeouts']}次")
+    memory = report.get("memory") or {}
+    python_peak = memory.get("pythonPeakBytes")
+    print(f"   💾 Python峰值: {f'{python_peak / 1024 / 1024:.1f} MB（tracemalloc单独一轮）' if python_peak is not None else '未测量（--trace-memory）'}，"
+          f"进程RSS峰值: {memory.get('processPeakRssBytes', 0) / 1024 / 1024:.1f} MB，"
+          f"JS堆: {memory.get('jsHeapUsedBytes', 0) / 1024 / 1024:.1f} MB，DOM节点: {memory.get('domNodes', 0)}")
+    site = report.get("site") or {}
+    print(f"   🌐 模拟站点: 批次请求 {site.get('batches', 0)}，详情页 {site.get('details', 0)}，"
+          f"打招呼 {site.get('greets', 0)}，拦截外部请求 {site.get('blocked', 0)}")
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="离线端到端回放测试")
+    parser.add_argument("--batches", type=int, default=4, help="列表批次数（每批15张卡片）")
+    parser.add_argument("--latency-ms", type=int, default=150, help="模拟接口延迟（毫秒）")
+    parser.add_argument("--layout", choices=["iframe", "flat"], default="iframe", help="推荐列表布局")
+    parser.add_argument("--pacing", choices=["none", "default"], default="none", help="none去掉节奏等待，default使用默认节奏")
+    parser.add_argument("--corpus", default=None, help="样本库版本，默认使用最新版本")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--headed", action="store_true", help="显示浏览器窗口")
+    parser.add_argument("--trace-memory", action="store_true", help="额外回放一轮，开启tracemalloc测量Python内存峰值")
+    parser.add_argument("--sandbox", default=None, help="沙箱目录（HOME和数据库），默认新建临时目录")
+    parser.add_argument("--output", default=None, help="将结果写入JSON文件")
+    parser.add_argument("--serve", action="store_true", help="只启动模拟站点，用于手动调试")
+    parser.add_argument("--port", type=int, default=8765, help="--serve模式的监听端口")
+    args = parser.parse_args()
+
+    if args.serve:
+        site = MockRecommendSite(args.batches, args.latency_ms, args.layout, args.corpus, args.seed)
+        port = site.start(args.port)
+        print(f"🧪 模拟站点: http://127.0.0.1:{port}/web/boss/recommend （Ctrl+C 退出）")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            site.stop()
+        return 0
+
+    sandbox = prepare_sandbox(args.sandbox)
+    print(f"📦 沙箱目录: {sandbox}")
+
+    replay_args = dict(
+        batches=args.batches,
+        latency_ms=args.latency_ms,
+        layout=args.layout,
+        pacing=args.pacing,
+        corpus_version=args.corpus,
+        headless=not args.headed,
+        seed=args.seed
+    )
+    report = asyncio.run(run_replay_with_memory(**replay_args) if args.trace_memory else run_replay(**replay_args))
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 回放结果已保存到: {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    # 添加项目根目录到路径，支持直接运行脚本
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    sys.exit(main())
@@ -17,18 +17,37 @@ from automation.browser_control.page_detector import PageDetector
 class BrowserDetector:
     """浏览器检测器类，用于检测和连接已打开的浏览器"""
     
-    def __init__(self):
-        """初始化浏览器检测器"""
+    # 候选调试端口：默认端口及启动器在端口被占用时依次尝试的后续端口
+    DEFAULT_PORTS = list(range(9222, 9232))
+    
+    # 单次探测的超时（秒），本机端口未监听时连接会立即被拒绝，超时只防止卡住的端口拖慢检测
+    PROBE_TIMEOUT = 0.3
+    
+    def __init__(self, endpoint_file=None):
+        """
+        初始化浏览器检测器
+        
+        Args:
+            endpoint_file: 保存上次成功连接的调试端点的文件
+        """
         self.playwright = None
         self.page_detector = PageDetector()
+        self.endpoint_file = endpoint_file or os.path.expanduser(
+            "~/Library/Application Support/SourcingCopilot/cdp_endpoint.json"
+        )
+        self._last_good = None
         
     async def find_existing_browsers(self):
         """
-        查找系统中已经打开的Chrome浏览器
+        查找系统中已经打开的Chrome浏览器（进程扫描在线程池中执行，不阻塞事件循环）
         
         Returns:
             list: 已打开浏览器的调试端口列表
         """
+        return await asyncio.get_running_loop().run_in_executor(None, self._scan_debug_ports)
+    
+    def _scan_debug_ports(self):
+        """从进程命令行中查找Chrome的远程调试端口"""
         # Mac系统下查找Chrome进程
         if platform.system() == "Darwin":  # macOS
             try:
@@ -143,7 +162,7 @@ class BrowserDetector:
         """
         try:
             # 尝试获取调试信息
-            response = requests.get(f"http://localhost:{port}/json/version")
+            response = requests.get(f"http://localhost:{port}/json/version", timeout=2)
             if response.status_code == 200:
                 data = response.json()
                 if "webSocketDebuggerUrl" in data:
@@ -153,32 +172,197 @@ class BrowserDetector:
             
         return None
     
-    async def connect_to_browser(self, port=9222):
+    # ---------- 调试端点探测 ----------
+    
+    def load_last_endpoint(self):
+        """
+        读取上次成功连接的调试端点
+        
+        Returns:
+            dict: {"port", "wsUrl", "updatedAt"}，没有时返回None
+        """
+        if self._last_good is None and os.path.exists(self.endpoint_file):
+            try:
+                with open(self.endpoint_file, "r", encoding="utf-8") as f:
+                    self._last_good = json.load(f)
+            except Exception as e:
+                print(f"读取上次的调试端点失败: {e}")
+                self._last_good = {}
+        return self._last_good or None
+    
+    def remember_endpoint(self, port, ws_url=None):
+        """
+        保存成功连接的调试端点，下次检测时优先尝试
+        
+        Args:
+            port: 调试端口
+            ws_url: WebSocket调试URL
+        """
+        endpoint = {"port": int(port), "wsUrl": ws_url, "updatedAt": time.time()}
+        last = self._last_good or {}
+        self._last_good = endpoint
+        if last.get("port") == endpoint["port"] and last.get("wsUrl") == ws_url:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.endpoint_file), exist_ok=True)
+            with open(self.endpoint_file, "w", encoding="utf-8") as f:
+                json.dump(endpoint, f)
+        except Exception as e:
+            print(f"保存调试端点失败: {e}")
+    
+    async def _http_get_json(self, port, path, timeout):
+        """向本机调试端口发送GET请求并解析JSON（asyncio原生连接，可并发且有超时）"""
+        reader, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), timeout)
+        try:
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost:{port}\r\nConnection: close\r\n\r\n".encode())
+            await writer.drain()
+            header = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+            lines = header.decode("latin-1").split("\r\n")
+            if " 200 " not in lines[0] + " ":
+                return None
+            length = None
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value.strip())
+            if length is not None:
+                body = await asyncio.wait_for(reader.readexactly(length), timeout)
+            else:
+                body = await asyncio.wait_for(reader.read(), timeout)
+            return json.loads(body.decode("utf-8"))
+        finally:
+            writer.close()
+    
+    async def probe_endpoint(self, port, timeout=None):
+        """
+        探测端口上是否有Chrome调试服务
+        
+        Args:
+            port: 调试端口
+            timeout: 超时秒数，默认PROBE_TIMEOUT
+            
+        Returns:
+            dict: {"port", "wsUrl", "browser"}，端口上没有调试服务时返回None
+        """
+        try:
+            data = await self._http_get_json(port, "/json/version", timeout or self.PROBE_TIMEOUT)
+        except Exception:
+            return None
+        if not data or not data.get("webSocketDebuggerUrl"):
+            return None
+        return {"port": port, "wsUrl": data["webSocketDebuggerUrl"], "browser": data.get("Browser")}
+    
+    async def wait_for_endpoint(self, port, timeout=20.0, interval=0.2, process=None):
+        """
+        轮询等待新启动的Chrome在端口上提供调试服务，端口就绪后立即返回
+        
+        Args:
+            port: 调试端口
+            timeout: 最长等待秒数
+            interval: 两次探测之间的间隔（秒）
+            process: Chrome进程，进程提前退出时不再等待
+            
+        Returns:
+            dict: {"port", "wsUrl", "browser"}，超时或进程已退出时返回None
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            endpoint = await self.probe_endpoint(port)
+            if endpoint:
+                return endpoint
+            if process is not None and process.poll() is not None:
+                print(f"Chrome进程已退出（退出码 {process.returncode}），端口 {port} 未提供调试服务")
+                return None
+            if loop.time() >= deadline:
+                return None
+            await asyncio.sleep(interval)
+    
+    async def list_page_urls(self, port, timeout=None):
+        """
+        通过调试接口列出浏览器中打开的页面URL（不需要建立Playwright连接）
+        
+        Args:
+            port: 调试端口
+            timeout: 超时秒数
+            
+        Returns:
+            list: 页面URL列表，读取失败时返回None
+        """
+        try:
+            targets = await self._http_get_json(port, "/json/list", timeout or self.PROBE_TIMEOUT * 3)
+        except Exception:
+            return None
+        return [target.get("url", "") for target in targets or [] if target.get("type") == "page"]
+    
+    async def find_endpoint(self, port=None):
+        """
+        查找可连接的调试端点：指定端口时只探测该端口；
+        否则先单独探测上次成功的端点，失败后并发探测所有候选端口
+        
+        Args:
+            port: 指定的调试端口
+            
+        Returns:
+            dict: 调试端点，没有找到时返回None
+        """
+        if port is not None:
+            return await self.probe_endpoint(port)
+        last = self.load_last_endpoint()
+        if last and last.get("port"):
+            endpoint = await self.probe_endpoint(last["port"])
+            if endpoint:
+                return endpoint
+        endpoints = await self.discover_endpoints(scan_processes=False)
+        return endpoints[0] if endpoints else None
+    
+    async def discover_endpoints(self, scan_processes=True):
+        """
+        并发探测所有候选端口上的调试服务
+        
+        Args:
+            scan_processes: 是否同时扫描进程命令行中的调试端口（比探测端口慢，与探测并行执行）
+            
+        Returns:
+            list: 调试端点列表，上次成功的端点排在最前
+        """
+        last = self.load_last_endpoint() or {}
+        ports = list(self.DEFAULT_PORTS)
+        if last.get("port") and last["port"] not in ports:
+            ports.insert(0, last["port"])
+        
+        scan_task = asyncio.ensure_future(self.find_existing_browsers()) if scan_processes else None
+        results = await asyncio.gather(*(self.probe_endpoint(p) for p in ports))
+        endpoints = [endpoint for endpoint in results if endpoint]
+        
+        if scan_task is not None:
+            extra_ports = [p for p in await scan_task if p not in ports]
+            if extra_ports:
+                results = await asyncio.gather(*(self.probe_endpoint(p) for p in extra_ports))
+                endpoints.extend(endpoint for endpoint in results if endpoint)
+        
+        endpoints.sort(key=lambda endpoint: endpoint["port"] != last.get("port"))
+        return endpoints
+    
+    # ---------- 连接 ----------
+    
+    async def connect_to_browser(self, port=9222, endpoint=None):
         """
         连接到指定调试端口的Chrome浏览器
         
         Args:
             port: Chrome远程调试端口
+            endpoint: 已探测到的调试端点，提供时不再重复探测
             
         Returns:
             tuple: (browser, context, page) 浏览器实例、上下文和页面
         """
         try:
-            # 验证端口是否开放
-            import socket
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            result = sock.connect_ex(('127.0.0.1', port))
-            sock.close()
-            
-            if result != 0:
-                print(f"端口 {port} 未开放，无法连接到Chrome")
-                return None, None, None
-                
-            # 获取WebSocket URL
-            ws_url = self.get_chrome_debugging_url(port)
-            if not ws_url:
-                print(f"无法获取Chrome调试WebSocket URL")
+            endpoint = endpoint or await self.probe_endpoint(port)
+            if not endpoint:
+                print(f"端口 {port} 上没有Chrome调试服务，无法连接到Chrome")
                 return None, None, None
+            ws_url = endpoint["wsUrl"]
             
             print(f"正在连接到浏览器，WebSocket URL: {ws_url}")
             
@@ -219,81 +403,48 @@ class BrowserDetector:
                 
             return None, None, None
     
+    def _has_boss_page(self, urls):
+        return any(self.page_detector.get_current_page_type(url) in ["recommend", "detail"] for url in urls)
+    
     async def detect_chrome_with_boss_page(self):
         """
         检测已打开的Chrome浏览器中是否有Boss直聘推荐页面
         
+        并发探测所有候选端口，通过调试接口的页面列表判断哪个浏览器打开了Boss直聘页面，
+        只对这些浏览器建立Playwright连接；上次成功的端点优先
+        
         Returns:
             tuple: (browser, context, page, page_type) 浏览器实例、上下文、页面和页面类型
         """
-        # 先尝试连接到默认端口9222
-        print("尝试连接到默认端口9222")
-        browser, context, page = await self.connect_to_browser(9222)
-        
-        if browser and page:
-            try:
-                # 检查页面URL
-                url = page.url
-                page_type = self.page_detector.get_current_page_type(url)
-                
-                # 如果是Boss直聘推荐页面或详情页，返回该页面
-                if page_type in ["recommend", "detail"]:
-                    print(f"成功连接到浏览器，发现Boss直聘页面，类型: {page_type}")
-                    return browser, context, page, page_type
-                    
-                # 尝试检查所有打开的标签页
-                pages = context.pages
-                for p in pages:
-                    url = p.url
-                    page_type = self.page_detector.get_current_page_type(url)
-                    if page_type in ["recommend", "detail"]:
-                        print(f"成功连接到浏览器，发现Boss直聘页面，类型: {page_type}")
-                        return browser, context, p, page_type
-                
-                # 如果没有找到Boss直聘页面，关闭连接
-                print("已连接到浏览器，但未找到Boss直聘页面")
-                await browser.close()
-                if self.playwright:
-                    await self.playwright.stop()
-                    self.playwright = None
-                    
-            except Exception as e:
-                print(f"检查页面失败: {e}")
-                if browser:
-                    await browser.close()
-                if self.playwright:
-                    await self.playwright.stop()
-                    self.playwright = None
+        started = time.monotonic()
+        endpoints = await self.discover_endpoints()
+        if not endpoints:
+            print("未检测到以调试模式运行的Chrome浏览器")
+            return None, None, None, "unknown"
         
-        # 查找其他可能的Chrome实例
-        ports = await self.find_existing_browsers()
-        ports = [p for p in ports if p != 9222]  # 排除已经检查过的端口
+        # 并发读取各浏览器的页面列表，跳过明确没有Boss直聘页面的浏览器
+        url_lists = await asyncio.gather(*(self.list_page_urls(endpoint["port"]) for endpoint in endpoints))
+        candidates = [endpoint for endpoint, urls in zip(endpoints, url_lists) if urls is None or self._has_boss_page(urls)]
+        print(f"发现 {len(endpoints)} 个调试端点，其中 {len(candidates)} 个可能有Boss直聘页面，"
+              f"耗时 {(time.monotonic() - started) * 1000:.0f}ms")
         
-        # 如果没有找到其他已打开的浏览器，返回None
-        if not ports:
-            print("未检测到其他已打开的Chrome浏览器")
-            return None, None, None, "unknown"
-            
-        # 尝试连接每个浏览器并检查页面
-        for port in ports:
+        for endpoint in candidates:
+            port = endpoint["port"]
             print(f"尝试连接到端口 {port}")
-            browser, context, page = await self.connect_to_browser(port)
+            browser, context, page = await self.connect_to_browser(port, endpoint=endpoint)
             
             if not browser or not page:
                 continue
                 
             try:
-                # 获取所有页面
-                pages = context.pages
-                
                 # 检查每个页面是否是Boss直聘页面
-                for p in pages:
-                    url = p.url
-                    page_type = self.page_detector.get_current_page_type(url)
+                for p in context.pages:
+                    page_type = self.page_detector.get_current_page_type(p.url)
                     
                     # 如果是Boss直聘推荐页面或详情页，返回该页面
                     if page_type in ["recommend", "detail"]:
                         print(f"成功连接到浏览器，发现Boss直聘页面，类型: {page_type}")
+                        self.remember_endpoint(port, endpoint["wsUrl"])
                         return browser, context, p, page_type
                         
                 # 如果没有找到Boss直聘页面，关闭连接
@@ -313,4 +464,4 @@ class BrowserDetector:
                     
         # 如果所有浏览器都没有Boss直聘页面，返回None
         print("未检测到已打开的Boss直聘页面")
-        return None, None, None, "unknown" 
\ No newline at end of file
+        return None, None, None, "unknown"
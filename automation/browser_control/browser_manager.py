@@ -4,13 +4,18 @@
 """
 
 import asyncio
+import functools
 import os
-import json
 from playwright.async_api import async_playwright
 
 from automation.browser_control.page_detector import PageDetector
 from automation.browser_control.browser_detector import BrowserDetector
 from automation.processors.resume_processor import ResumeProcessor
+from automation.browser_control.job_orchestrator import JobOrchestrator
+from automation.browser_control.connection_supervisor import ConnectionSupervisor
+from automation.browser_control.request_policy import RequestPolicy
+from automation.processors.activity_feed import ActivityFeed
+from automation.utils.config_store import get_config_store
 from automation.rules_engine.simple_rules_engine import SimpleRulesEngine
 
 class BrowserManager:
@@ -32,6 +37,22 @@ class BrowserManager:
         self.rules_engine = SimpleRulesEngine()
         self.resume_processor = None
         
+        # 共享的配置存储，配置变化时才重新读取并打印摘要
+        self.config_store = get_config_store(self.rules_engine.create_default_config)
+        self.config_store.subscribe(self._print_config_summary)
+        
+        # 多岗位任务编排器，每个任务在独立标签页中并发运行
+        self.jobs = JobOrchestrator(self)
+        
+        # 请求拦截策略：按页面类型拦截提取逻辑用不到的图片、字体、媒体和统计脚本
+        self.request_policy = RequestPolicy(self.page_detector)
+        
+        # 最近处理记录（环形缓冲区），主流程和所有任务共用，状态接口直接读取
+        self.activity = ActivityFeed()
+        
+        # 连接监控器：后台心跳，故障时只恢复出问题的那一层
+        self.supervisor = ConnectionSupervisor(self)
+        
         # stealth.min.js路径
         self.stealth_js_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "stealth.min.js")
         
@@ -66,14 +87,14 @@ class BrowserManager:
             "sendButton": ".send-message-btn,button:has-text('发送')"
         }
         
-    async def start_browser(self, use_existing=True, connect_cdp=True, cdp_port=9222):
+    async def start_browser(self, use_existing=True, connect_cdp=True, cdp_port=None):
         """
         启动浏览器
         
         Args:
             use_existing: 是否尝试连接已存在的浏览器
             connect_cdp: 是否尝试通过CDP连接到调试模式的Chrome
-            cdp_port: CDP调试端口
+            cdp_port: CDP调试端口，为None时先尝试上次成功连接的端点，再并发探测候选端口
             
         Returns:
             bool: 是否成功启动或连接浏览器
@@ -88,17 +109,13 @@ class BrowserManager:
                 # 1. 首先尝试通过CDP连接到远程调试模式的Chrome (推荐方式)
                 if connect_cdp:
                     try:
-                        print(f"尝试通过CDP连接到端口 {cdp_port} 的Chrome浏览器...")
+                        print(f"尝试通过CDP连接到{f'端口 {cdp_port} 的' if cdp_port else '调试模式的'}Chrome浏览器...")
                         
-                        # 检查端口是否开放
-                        import socket
-                        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                        result = sock.connect_ex(('127.0.0.1', cdp_port))
-                        sock.close()
+                        # 探测调试端点（带超时，未指定端口时优先尝试上次成功的端点）
+                        endpoint = await self.browser_detector.find_endpoint(cdp_port)
                         
-                        if result == 0:  # 端口开放
-                            # 获取WebSocket URL
-                            ws_url = self._get_chrome_debugging_url(cdp_port)
+                        if endpoint:
+                            ws_url = endpoint["wsUrl"]
                             if ws_url:
                                 print(f"找到Chrome WebSocket URL: {ws_url}")
                                 
@@ -160,6 +177,7 @@ class BrowserManager:
                                 except Exception as e:
                                     print(f"注入stealth.min.js脚本失败: {e}")
                                 
+                                self.browser_detector.remember_endpoint(endpoint["port"], ws_url)
                                 print(f"已通过CDP成功连接到Chrome浏览器，当前页面: {self.page.url}")
                                 return True
                     except Exception as e:
@@ -200,8 +218,7 @@ class BrowserManager:
             # 如果没有找到已存在的浏览器或不使用已存在的浏览器，启动新的浏览器
             # 先检查是否已有Chrome在运行
             try:
-                from automation.utils.start_chrome import is_browser_running_with_debugging
-                if is_browser_running_with_debugging(9222):
+                if await self.browser_detector.probe_endpoint(cdp_port or 9222):
                     print("检测到Chrome浏览器已在运行，但无法连接，请检查Chrome是否正常或关闭正在运行的Chrome")
             except Exception as e:
                 print(f"检查Chrome运行状态时出错: {e}")
@@ -272,27 +289,194 @@ class BrowserManager:
             print(f"启动浏览器失败: {e}")
             return False
     
-    def _get_chrome_debugging_url(self, port=9222):
+    async def inject_stealth(self, page):
         """
-        获取Chrome远程调试WebSocket URL
+        为页面注入stealth.min.js脚本
         
         Args:
-            port: 远程调试端口
+            page: Playwright页面对象
             
         Returns:
-            str: WebSocket URL
+            bool: 是否注入成功
+        """
+        try:
+            if os.path.exists(self.stealth_js_path):
+                with open(self.stealth_js_path, "r") as f:
+                    stealth_script = f.read()
+                await page.add_init_script(stealth_script)
+                return True
+            print(f"stealth.min.js脚本文件不存在: {self.stealth_js_path}")
+        except Exception as e:
+            print(f"注入stealth.min.js脚本失败: {e}")
+        return False
+    
+    async def detect_browser(self):
+        """
+        检测浏览器：已连接时更新页面类型，否则尝试连接调试模式下已打开Boss直聘页面的Chrome
+        
+        Returns:
+            dict: {"success", "connected", "pageType", "message"}
         """
         try:
-            import requests
-            response = requests.get(f"http://localhost:{port}/json/version")
-            if response.status_code == 200:
-                data = response.json()
-                if "webSocketDebuggerUrl" in data:
-                    return data["webSocketDebuggerUrl"]
+            # 如果浏览器已经在运行，获取当前状态
+            if self.browser and self.page:
+                await self.detect_page_type()
+                return {
+                    "success": True,
+                    "connected": True,
+                    "pageType": self.current_page_type,
+                    "message": f"已连接浏览器，当前页面类型：{self.current_page_type}"
+                }
+            
+            # 先检查是否有浏览器在调试模式下运行（优先探测上次成功的端点，再并发探测候选端口）
+            if not await self.browser_detector.find_endpoint():
+                return {
+                    "success": True,
+                    "connected": False,
+                    "pageType": "unknown",
+                    "message": "未发现以调试模式运行的Chrome浏览器，请使用启动浏览器功能"
+                }
+                
+            # 尝试检测和连接到已打开的浏览器
+            browser, context, page, page_type = await self.browser_detector.detect_chrome_with_boss_page()
+            
+            if browser and page:
+                # 关闭之前的连接
+                if self.browser:
+                    await self.close_browser()
+                
+                self.browser = browser
+                self.context = context
+                self.page = page
+                self.playwright = self.browser_detector.playwright
+                self.current_page_type = page_type
+                
+                # 设置页面加载事件
+                self.page.on("load", self._on_page_load)
+                
+                return {
+                    "success": True,
+                    "connected": True,
+                    "pageType": page_type,
+                    "message": f"已连接到浏览器，当前页面类型：{page_type}"
+                }
+            return {
+                "success": True,
+                "connected": False,
+                "pageType": "unknown",
+                "message": "未检测到已打开的Boss直聘页面，请前往Boss直聘"
+            }
         except Exception as e:
-            print(f"获取Chrome调试URL失败: {e}")
+            print(f"检测浏览器出错: {e}")
+            return {
+                "success": False,
+                "connected": False,
+                "error": str(e),
+                "message": "检测浏览器失败"
+            }
+            
+    async def launch_browser(self, url="https://www.zhipin.com/web/boss/recommend", port=9222,
+                             force_new=False, use_default_profile=True):
+        """
+        启动或连接调试模式的Chrome浏览器并导航到指定URL
+        
+        Args:
+            url: 目标URL
+            port: 调试端口
+            force_new: 是否强制启动新的Chrome实例
+            use_default_profile: 是否使用默认用户配置
             
-        return None
+        Returns:
+            dict: {"success", "message", "pageType", ...}
+        """
+        from automation.utils.start_chrome import spawn_chrome_with_debugging
+        try:
+            # 先检查是否已经有我们管理的浏览器在运行
+            if not force_new and self.browser and self.page:
+                try:
+                    # 检查浏览器是否还活着
+                    await self.page.evaluate("1")
+                    
+                    # 如果已经连接到浏览器，只需要导航到指定URL
+                    await self.page.goto(url, wait_until="domcontentloaded")
+                    await self.detect_page_type()
+                    
+                    return {
+                        "success": True,
+                        "message": f"浏览器已经在运行，已导航到 {url}",
+                        "pageType": self.current_page_type
+                    }
+                except Exception as e:
+                    print(f"浏览器可能已关闭，需要重新启动: {e}")
+                    # 关闭已失效的浏览器连接
+                    await self.close_browser()
+            
+            # 检查指定端口是否已有调试模式Chrome在运行
+            if not force_new and await self.browser_detector.probe_endpoint(port):
+                print(f"检测到端口 {port} 上已有调试模式Chrome，尝试连接...")
+                if await self.start_browser(use_existing=True, cdp_port=port):
+                    await self.page.goto(url, wait_until="domcontentloaded")
+                    await self.detect_page_type()
+                    return {
+                        "success": True,
+                        "message": f"已连接到现有调试模式浏览器并导航到 {url}",
+                        "pageType": self.current_page_type
+                    }
+                print(f"连接到端口 {port} 的Chrome失败，将启动新的Chrome实例")
+            
+            # 启动新的Chrome实例（带调试模式）
+            print(f"启动新的Chrome浏览器实例，调试端口: {port}")
+            # 查找Chrome、复制配置文件和启动进程都是阻塞操作，在线程池中执行
+            process, actual_port = await asyncio.get_running_loop().run_in_executor(
+                None,
+                functools.partial(
+                    spawn_chrome_with_debugging,
+                    url=url,
+                    port=port,
+                    use_default_profile=use_default_profile
+                )
+            )
+            if process is None:
+                return {
+                    "success": False,
+                    "message": "启动Chrome浏览器失败，请确保Chrome浏览器已安装且端口未被占用"
+                }
+            
+            # 轮询调试端口，Chrome就绪后立即连接
+            print("等待Chrome调试端口就绪...")
+            if not await self.browser_detector.wait_for_endpoint(actual_port, process=process):
+                return {
+                    "success": False,
+                    "message": f"Chrome已启动，但端口 {actual_port} 未开始提供调试服务，请检查Chrome是否正常启动"
+                }
+            
+            # 连接到新启动的浏览器，使用实际端口
+            if not await self.start_browser(use_existing=True, cdp_port=actual_port):
+                return {
+                    "success": False,
+                    "message": f"Chrome启动成功（端口: {actual_port}），但无法建立Playwright连接，请重试或刷新页面"
+                }
+            
+            # 导航到指定URL（如果还没有打开的话）
+            if not self.page.url.startswith("https://www.zhipin.com"):
+                await self.page.goto(url, wait_until="domcontentloaded")
+            await self.detect_page_type()
+            
+            return {
+                "success": True,
+                "message": f"已启动新的Chrome浏览器并导航到 {url} (端口: {actual_port})",
+                "pageType": self.current_page_type,
+                "port": actual_port
+            }
+        except Exception as e:
+            print(f"启动浏览器出错: {e}")
+            import traceback
+            traceback.print_exc()
+            return {
+                "success": False,
+                "error": str(e),
+                "message": "启动浏览器失败"
+            }
 
     async def detect_page_type(self):
         """
@@ -329,11 +513,31 @@ class BrowserManager:
             print(f"检测页面类型失败: {e}")
             return "unknown"
             
+    async def release_browser(self):
+        """
+        释放已断开的浏览器连接：只丢弃Playwright对象，不关闭用户的页面和浏览器
+        （浏览器层故障恢复时使用，之后重新连接即可）
+        """
+        self.page = None
+        self.context = None
+        self.browser = None
+        if self.playwright:
+            try:
+                await self.playwright.stop()
+            except Exception as e:
+                print(f"停止Playwright失败: {e}")
+            self.playwright = None
+            
     async def close_browser(self):
         """关闭浏览器"""
         try:
+            await self.supervisor.stop()
+            
             if self.resume_processor:
                 self.resume_processor.stop_processing()
+            
+            # 浏览器关闭后任务的标签页也不再可用
+            self.jobs.stop_all()
                 
             if self.page:
                 await self.page.close()
@@ -416,12 +620,21 @@ class BrowserManager:
                     data_extractor=self.data_extractor
                 )
             
-            # 重置已处理ID，以便重新处理所有卡片
-            self.resume_processor.reset_processed_ids()
+            # 按岗位加载已处理候选人，之前会话处理过的候选人直接跳过
+            await self.resume_processor.open_seen_store(config)
+            
+            # 最近处理记录的历史数据（工作进程启动时已读取过则直接返回）
+            await self.activity.load()
                 
             # 设置运行状态
             self.is_running = True
             
+            # 在主页面上应用请求拦截策略
+            await self.request_policy.apply(self.page, config)
+            
+            # 启动后台心跳监控
+            await self.supervisor.start()
+            
             # 根据当前页面类型执行不同的处理逻辑
             while self.is_running:
                 try:
@@ -434,17 +647,15 @@ class BrowserManager:
                             self.is_running = False
                             break
                             
-                    # 简单测试页面是否响应
-                    try:
-                        await self.page.evaluate("1")
-                    except Exception as e:
-                        print(f"页面不响应，尝试重新连接: {e}")
-                        await self.close_browser()
-                        success = await self.start_browser(use_existing=True)
-                        if not success:
-                            print("无法重新连接到浏览器，自动化流程停止")
-                            self.is_running = False
-                            break
+                    # 通过CDP心跳确认页面响应，故障时只恢复出问题的那一层；
+                    # 后台心跳只标记故障，页面切换都在这里进行，不会打断正在处理的卡片
+                    if not await self.supervisor.ensure_healthy():
+                        print("无法恢复浏览器连接，自动化流程停止")
+                        self.is_running = False
+                        break
+                    
+                    # 获取最新配置，配置文件未变化时不读取文件
+                    config = self._load_config()
                     
                     # 检测页面类型
                     await self.detect_page_type()
@@ -475,12 +686,9 @@ class BrowserManager:
                     import traceback
                     traceback.print_exc()
                     
-                    # 尝试恢复连接
+                    # 按异常类型恢复：页面故障切换到备用页面，浏览器断开才重新连接
                     try:
-                        await self.close_browser()
-                        print("尝试重新启动浏览器...")
-                        success = await self.start_browser(use_existing=True)
-                        if not success:
+                        if not await self.supervisor.recover_from_error(e):
                             print("无法重新连接到浏览器，自动化流程停止")
                             self.is_running = False
                             break
@@ -489,8 +697,8 @@ class BrowserManager:
                         self.is_running = False
                         break
                         
-                # 等待用户导航或交互
-                await asyncio.sleep(5)
+                # 等待用户导航或交互，后台心跳发现故障时立即进入下一轮恢复
+                await self.supervisor.wait_for_failure(5)
                 
                 # 如果不再运行，退出循环
                 if not self.is_running:
@@ -503,6 +711,11 @@ class BrowserManager:
             import traceback
             traceback.print_exc()
             self.is_running = False
+        finally:
+            await self.supervisor.stop()
+            # 主页面是用户自己的标签页，自动化结束后恢复正常加载
+            if self.page:
+                await self.request_policy.remove(self.page)
             
     def stop_automation(self):
         """停止自动化流程"""
@@ -515,6 +728,8 @@ class BrowserManager:
         if self.resume_processor:
             print("🛑 停止简历处理器...")
             self.resume_processor.stop_processing()
+            # 用户主动停止，下次启动不再恢复本轮的计数器
+            self.resume_processor.finish_checkpoint()
             
             # 如果详情页正在处理，强制停止
             if hasattr(self.resume_processor, 'detail_processor') and self.resume_processor.detail_processor.processing_detail:
@@ -542,100 +757,67 @@ class BrowserManager:
             print(f"页面加载事件处理出错: {e}")
             
     def _load_config(self):
-        """加载规则配置"""
-        config_path = os.path.expanduser("~/Library/Application Support/SourcingCopilot/config.json")
+        """
+        加载规则配置，配置文件未变化时直接返回缓存，不读取文件
         
-        # 如果配置文件存在，加载配置
-        if os.path.exists(config_path):
-            try:
-                with open(config_path, "r", encoding="utf-8") as f:
-                    config = json.load(f)
-                    print(f"成功加载配置文件: {config_path}")
-                    
-                    # 检查筛选配置类型
-                    ai_enabled = config.get("aiEnabled", False)
-                    position_rules = [r for r in config.get("rules", []) if r.get("type") == "岗位" and r.get("enabled")]
-                    
-                    if ai_enabled:
-                        # AI智能筛选已启用
-                        basic_position = config.get("basicPosition", "")
-                        basic_companies = config.get("basicCompanies", [])
-                        filter_criteria = config.get("filterCriteria", "")
-                        
-                        print("✅ AI智能筛选已启用:")
-                        print(f"  - 目标岗位: {basic_position}")
-                        print(f"  - 竞对公司: {', '.join(basic_companies) if basic_companies else '未设置'}")
-                        print(f"  - 筛选标准: {'已配置' if filter_criteria else '未配置'}")
-                        
-                        # 检查AI筛选配置完整性
-                        if not basic_position:
-                            print("⚠️ 警告: AI智能筛选已启用但未设置目标岗位")
-                        elif not filter_criteria:
-                            print("⚠️ 警告: AI智能筛选已启用但未生成筛选标准")
-                        else:
-                            print("✅ AI智能筛选配置完整，将使用AI进行候选人筛选")
-                    elif position_rules:
-                        # 传统规则筛选
-                        print("已启用的传统岗位规则:")
-                        for rule in position_rules:
-                            print(f"  - 关键词: {rule.get('keywords', [])}")
-                            print(f"    必须匹配: {rule.get('mustMatch', False)}")
-                    else:
-                        print("警告: 未启用AI智能筛选且未找到传统岗位规则，所有候选人将通过岗位筛选")
-                    
-                    return config
-            except Exception as e:
-                print(f"加载配置失败: {e}")
-                
-        # 返回默认配置
-        print("未找到配置文件或加载失败，将使用默认配置")
-        return self.rules_engine.create_default_config()
+        Returns:
+            dict: 规则配置（调用方不应修改，需要修改时先复制）
+        """
+        return self.config_store.get()
+    
+    def _print_config_summary(self, config, version):
+        """配置变化时打印配置摘要（配置存储的订阅回调）"""
+        if not os.path.exists(self.config_store.path):
+            print("未找到配置文件或加载失败，将使用默认配置")
+            return
+        
+        print(f"成功加载配置文件: {self.config_store.path} (版本 {version})")
+        
+        # 检查筛选配置类型
+        ai_enabled = config.get("aiEnabled", False)
+        position_rules = [r for r in config.get("rules", []) if r.get("type") == "岗位" and r.get("enabled")]
+        
+        if ai_enabled:
+            # AI智能筛选已启用
+            basic_position = config.get("basicPosition", "")
+            basic_companies = config.get("basicCompanies", [])
+            filter_criteria = config.get("filterCriteria", "")
+            
+            print("✅ AI智能筛选已启用:")
+            print(f"  - 目标岗位: {basic_position}")
+            print(f"  - 竞对公司: {', '.join(basic_companies) if basic_companies else '未设置'}")
+            print(f"  - 筛选标准: {'已配置' if filter_criteria else '未配置'}")
+            
+            # 检查AI筛选配置完整性
+            if not basic_position:
+                print("⚠️ 警告: AI智能筛选已启用但未设置目标岗位")
+            elif not filter_criteria:
+                print("⚠️ 警告: AI智能筛选已启用但未生成筛选标准")
+            else:
+                print("✅ AI智能筛选配置完整，将使用AI进行候选人筛选")
+        elif position_rules:
+            # 传统规则筛选
+            print("已启用的传统岗位规则:")
+            for rule in position_rules:
+                print(f"  - 关键词: {rule.get('keywords', [])}")
+                print(f"    必须匹配: {rule.get('mustMatch', False)}")
+        else:
+            print("警告: 未启用AI智能筛选且未找到传统岗位规则，所有候选人将通过岗位筛选")
     
     def get_greeted_candidates(self, limit=100):
         """
-        获取已打招呼的候选人列表，用于前端展示
+        获取最近处理的候选人列表，用于前端展示
+        
+        直接读取内存中的环形缓冲区，只有冷启动时才读取磁盘上的候选人文件
         
         Args:
             limit: 返回的最大记录数
             
         Returns:
-            list: 候选人记录列表
+            list: 候选人记录列表（最新的在前）
         """
         try:
-            # 首先尝试读取JSON格式的候选人数据
-            json_file = os.path.expanduser("~/Library/Application Support/SourcingCopilot/candidates.json")
-            if os.path.exists(json_file):
-                try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        candidates = json.load(f)
-                    
-                    # 返回最新的limit条记录
-                    return candidates[:limit]
-                except Exception as e:
-                    print(f"读取JSON候选人数据失败: {e}")
-            
-            # 如果JSON文件不存在或读取失败，尝试读取CSV格式
-            if not self.resume_processor:
-                return []
-                
-            log_file = self.resume_processor.candidates_log
-            if not os.path.exists(log_file):
-                return []
-                
-            # 读取CSV文件
-            import csv
-            candidates = []
-            
-            with open(log_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    candidates.append(row)
-                    if len(candidates) >= limit:
-                        break
-                        
-            # 返回最新的记录（倒序）
-            return list(reversed(candidates))
-            
+            return self.activity.recent(limit)
         except Exception as e:
             print(f"获取候选人列表失败: {e}")
             return []
@@ -652,6 +834,8 @@ class BrowserManager:
             "pageType": self.current_page_type,
             "processedCount": self.processed_count,
             "activeCandidates": self.get_greeted_candidates(10),  # 最近10条记录
+            "connection": self.supervisor.get_stats(),
+            "requestPolicy": self.request_policy.get_stats(),
             "config": self._load_config()
         }
         
@@ -0,0 +1,451 @@
+"""
+连接监控模块
+在后台通过CDP会话发送轻量心跳，区分页面崩溃、目标分离、页面无响应和浏览器断开；
+后台心跳只标记故障，由自动化主循环在两轮处理之间恢复出问题的那一层
+（切换到备用页面或重新连接浏览器），避免正在处理的页面被中途替换，并记录恢复耗时
+"""
+
+import asyncio
+import time
+
+
+class ConnectionSupervisor:
+    """连接监控器，为浏览器管理器的主页面提供心跳检测、分层恢复和备用页面"""
+
+    # 心跳间隔和单次心跳超时（秒）
+    HEARTBEAT_INTERVAL = 5.0
+    HEARTBEAT_TIMEOUT = 3.0
+
+    # 连续无响应多少次后认为页面已卡死，需要切换页面
+    MAX_UNRESPONSIVE = 2
+
+    # 故障类型
+    PAGE_CRASHED = "page_crashed"
+    TARGET_DETACHED = "target_detached"
+    UNRESPONSIVE = "unresponsive"
+    BROWSER_GONE = "browser_gone"
+
+    # 根据异常信息判断故障类型
+    _BROWSER_GONE_MARKERS = ("browser has been closed", "browser has disconnected", "connection closed",
+                             "websocket", "econnrefused", "not connected")
+    _DETACHED_MARKERS = ("target closed", "detached", "target page, context or browser has been closed",
+                         "page has been closed", "session closed", "no target with given id")
+    _CRASH_MARKERS = ("crash",)
+
+    def __init__(self, manager, standby=True):
+        """
+        初始化连接监控器
+
+        Args:
+            manager: 浏览器管理器
+            standby: 是否预先打开一个备用页面，主页面失效时直接切换
+        """
+        self.manager = manager
+        self.standby_enabled = standby
+        self.standby_page = None
+        self.task = None
+
+        self._cdp = None
+        self._cdp_page = None
+        self._crashed_page = None
+        self._browser_disconnected = False
+        self._watched_browser = None
+        self._last_url = None
+        self._lock = asyncio.Lock()
+        self._failure_event = None
+
+        self.pending_failure = None   # 后台心跳发现、尚未由主循环恢复的故障
+
+        self.heartbeats = 0
+        self.heartbeat_failures = 0
+        self.unresponsive_count = 0
+        self.last_heartbeat_ms = None
+        self.last_heartbeat_at = None
+        self.recoveries = {}
+        self.last_failure = None
+
+    # ---------- 事件监听 ----------
+
+    def attach(self):
+        """连接浏览器后调用：监听主页面崩溃和浏览器断开事件"""
+        browser = self.manager.browser
+        if browser is not None and browser is not self._watched_browser:
+            self._watched_browser = browser
+            self._browser_disconnected = False
+            try:
+                browser.on("disconnected", self._on_browser_disconnected)
+            except Exception as e:
+                print(f"监听浏览器断开事件失败: {e}")
+        self._watch_page(self.manager.page)
+
+    def _watch_page(self, page):
+        """监听页面崩溃事件"""
+        if page is None:
+            return
+        try:
+            page.on("crash", self._on_page_crash)
+        except Exception as e:
+            print(f"监听页面崩溃事件失败: {e}")
+
+    def _on_page_crash(self, page):
+        print("💥 检测到页面崩溃")
+        self._crashed_page = page
+
+    def _on_browser_disconnected(self, browser):
+        print("🔌 检测到浏览器连接断开")
+        self._browser_disconnected = True
+
+    # ---------- 心跳 ----------
+
+    def classify(self, error):
+        """
+        根据异常判断故障类型
+
+        Args:
+            error: 异常对象
+
+        Returns:
+            str: 故障类型
+        """
+        if self._browser_disconnected or self.manager.browser is None:
+            return self.BROWSER_GONE
+        try:
+            if not self.manager.browser.is_connected():
+                return self.BROWSER_GONE
+        except Exception:
+            return self.BROWSER_GONE
+        if self.manager.page is not None and self.manager.page is self._crashed_page:
+            return self.PAGE_CRASHED
+        if isinstance(error, asyncio.TimeoutError):
+            return self.UNRESPONSIVE
+
+        message = str(error).lower()
+        if any(marker in message for marker in self._CRASH_MARKERS):
+            return self.PAGE_CRASHED
+        if any(marker in message for marker in self._DETACHED_MARKERS):
+            return self.TARGET_DETACHED
+        if any(marker in message for marker in self._BROWSER_GONE_MARKERS):
+            return self.BROWSER_GONE
+        return self.UNRESPONSIVE
+
+    async def _cdp_session(self, page):
+        """获取主页面的CDP会话，页面切换后重新创建"""
+        if self._cdp is not None and self._cdp_page is page:
+            return self._cdp
+        await self._detach_cdp()
+        self._cdp = await page.context.new_cdp_session(page)
+        self._cdp_page = page
+        return self._cdp
+
+    async def _detach_cdp(self):
+        if self._cdp is not None:
+            try:
+                await self._cdp.detach()
+            except Exception:
+                pass
+        self._cdp = None
+        self._cdp_page = None
+
+    async def heartbeat(self):
+        """
+        发送一次心跳：在主页面上通过CDP执行最小的Runtime.evaluate
+
+        Returns:
+            str: 故障类型，正常时返回None
+        """
+        page = self.manager.page
+        if self.manager.browser is None or self._browser_disconnected:
+            return self.BROWSER_GONE
+        if page is None:
+            return self.TARGET_DETACHED
+        if page is self._crashed_page:
+            return self.PAGE_CRASHED
+        try:
+            if page.is_closed():
+                return self.TARGET_DETACHED
+        except Exception:
+            pass
+
+        start = time.monotonic()
+        self.heartbeats += 1
+        try:
+            cdp = await self._cdp_session(page)
+            await asyncio.wait_for(
+                cdp.send("Runtime.evaluate", {"expression": "1", "returnByValue": True}),
+                self.HEARTBEAT_TIMEOUT
+            )
+        except Exception as e:
+            self.heartbeat_failures += 1
+            await self._detach_cdp()
+            failure = self.classify(e)
+            if failure == self.UNRESPONSIVE:
+                self.unresponsive_count += 1
+                # 偶尔一次超时（页面正在执行长任务）不立即切换页面
+                if self.unresponsive_count < self.MAX_UNRESPONSIVE:
+                    print(f"⚠️ 心跳超时 ({self.unresponsive_count}/{self.MAX_UNRESPONSIVE})")
+                    return None
+            print(f"⚠️ 心跳失败 [{failure}]: {e}")
+            return failure
+
+        self.unresponsive_count = 0
+        self.last_heartbeat_ms = round((time.monotonic() - start) * 1000, 1)
+        self.last_heartbeat_at = time.time()
+        try:
+            if not page.url.startswith("about:"):
+                self._last_url = page.url
+        except Exception:
+            pass
+        return None
+
+    @property
+    def failure_event(self):
+        """后台心跳发现故障时被设置，主循环据此提前结束两轮之间的等待"""
+        if self._failure_event is None:
+            self._failure_event = asyncio.Event()
+        return self._failure_event
+
+    def _flag_failure(self, failure):
+        """记录后台心跳发现的故障，留给主循环恢复"""
+        if self.pending_failure is None:
+            print(f"⚠️ 心跳发现故障 [{failure}]，等待当前处理结束后恢复")
+        self.pending_failure = failure
+        self.failure_event.set()
+
+    def _clear_failure(self):
+        self.pending_failure = None
+        if self._failure_event is not None:
+            self._failure_event.clear()
+
+    async def wait_for_failure(self, timeout):
+        """
+        等待后台心跳发现故障（用于主循环两轮之间的等待）
+
+        Args:
+            timeout: 最长等待秒数
+
+        Returns:
+            bool: 是否发现了待恢复的故障
+        """
+        if self.pending_failure is not None:
+            return True
+        try:
+            await asyncio.wait_for(self.failure_event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def ensure_healthy(self):
+        """
+        检查连接状态，有故障时立即恢复出问题的那一层
+        （在自动化主循环的两轮处理之间调用，此时没有处理流程持有主页面）
+
+        Returns:
+            bool: 连接是否可用
+        """
+        async with self._lock:
+            failure = await self.heartbeat()
+            self._clear_failure()
+            if failure is None:
+                return True
+            return await self._recover(failure)
+
+    async def recover_from_error(self, error):
+        """
+        处理过程中出现异常时调用：按异常类型只恢复出问题的那一层
+
+        Args:
+            error: 异常对象
+
+        Returns:
+            bool: 恢复后连接是否可用
+        """
+        async with self._lock:
+            failure = self.classify(error)
+            self._clear_failure()
+            if failure != self.BROWSER_GONE:
+                # 异常可能来自其他标签页（如关闭的详情页），也可能是普通的处理异常，
+                # 用主页面的心跳确认，主页面正常时不切换页面
+                failure = await self.heartbeat()
+                if failure is None:
+                    return True
+            return await self._recover(failure)
+
+    # ---------- 恢复 ----------
+
+    async def _recover(self, failure):
+        """按故障类型恢复，并记录恢复耗时"""
+        start = time.monotonic()
+        self.last_failure = {"type": failure, "at": time.time()}
+        print(f"🔧 开始恢复连接 [{failure}]")
+
+        if failure == self.BROWSER_GONE:
+            recovered = await self._reconnect_browser()
+        else:
+            recovered = await self._failover_page()
+            if not recovered:
+                # 上下文已不可用时退回到重新连接浏览器
+                recovered = await self._reconnect_browser()
+
+        elapsed_ms = (time.monotonic() - start) * 1000
+        stats = self.recoveries.setdefault(failure, {"count": 0, "failed": 0, "totalMs": 0.0, "maxMs": 0.0, "lastMs": 0.0})
+        stats["count"] += 1
+        if not recovered:
+            stats["failed"] += 1
+        stats["totalMs"] += elapsed_ms
+        stats["maxMs"] = max(stats["maxMs"], elapsed_ms)
+        stats["lastMs"] = elapsed_ms
+        print(f"{'✅' if recovered else '❌'} 连接恢复{'完成' if recovered else '失败'} [{failure}]，耗时 {elapsed_ms:.0f}ms")
+        return recovered
+
+    async def _failover_page(self):
+        """页面层故障：切换到备用页面（没有备用页面时新开一个），并导航回原来的页面"""
+        manager = self.manager
+        if manager.context is None:
+            return False
+
+        old_page = manager.page
+        try:
+            page = self.standby_page
+            self.standby_page = None
+            if page is None or page.is_closed():
+                page = await manager.context.new_page()
+                await manager.inject_stealth(page)
+                await manager.request_policy.apply(page, manager._load_config())
+        except Exception as e:
+            print(f"打开新页面失败: {e}")
+            return False
+
+        manager.page = page
+        page.on("load", manager._on_page_load)
+        self._watch_page(page)
+        self._crashed_page = None
+        self.unresponsive_count = 0
+
+        try:
+            await page.goto(self._last_url or "https://www.zhipin.com/web/boss/recommend", wait_until="domcontentloaded")
+            await page.bring_to_front()
+        except Exception as e:
+            print(f"备用页面导航失败: {e}")
+
+        if old_page is not None and old_page is not page:
+            try:
+                await old_page.close()
+            except Exception:
+                pass
+
+        await manager.detect_page_type()
+        print(f"已切换到新页面: {page.url}")
+        await self._prepare_standby()
+        return True
+
+    async def _reconnect_browser(self):
+        """浏览器层故障：重新连接浏览器"""
+        manager = self.manager
+        await self._detach_cdp()
+        self.standby_page = None
+        try:
+            await manager.release_browser()
+            if not await manager.start_browser(use_existing=True):
+                return False
+        except Exception as e:
+            print(f"重新连接浏览器失败: {e}")
+            return False
+        self._crashed_page = None
+        self.unresponsive_count = 0
+        self.attach()
+        await manager.request_policy.apply(manager.page, manager._load_config())
+        await self._prepare_standby()
+        return True
+
+    async def _prepare_standby(self):
+        """预先打开备用页面（已注入stealth脚本），主页面失效时直接切换"""
+        if not self.standby_enabled or self.manager.context is None:
+            return
+        try:
+            if self.standby_page is not None and not self.standby_page.is_closed():
+                return
+            self.standby_page = await self.manager.context.new_page()
+            await self.manager.inject_stealth(self.standby_page)
+            await self.manager.request_policy.apply(self.standby_page, self.manager._load_config())
+            # 备用页面留在后台，焦点保持在主页面
+            if self.manager.page is not None:
+                await self.manager.page.bring_to_front()
+        except Exception as e:
+            print(f"打开备用页面失败: {e}")
+            self.standby_page = None
+
+    # ---------- 后台任务 ----------
+
+    async def _run(self):
+        """后台心跳循环：只检测和标记故障，不替换或关闭处理流程正在使用的页面"""
+        while True:
+            try:
+                await asyncio.sleep(self.HEARTBEAT_INTERVAL)
+                if self.manager.browser is None and not self._browser_disconnected:
+                    continue
+                async with self._lock:
+                    failure = await self.heartbeat()
+                if failure is not None:
+                    self._flag_failure(failure)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"连接监控出错: {e}")
+                import traceback
+                traceback.print_exc()
+
+    async def start(self):
+        """启动后台心跳，并准备备用页面"""
+        self._clear_failure()
+        self.attach()
+        await self._prepare_standby()
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+            print(f"🩺 连接监控已启动，心跳间隔 {self.HEARTBEAT_INTERVAL} 秒")
+
+    async def stop(self, close_standby=True):
+        """
+        停止后台心跳
+
+        Args:
+            close_standby: 是否关闭备用页面
+        """
+        if self.task is not None and not self.task.done():
+            if self.task is not asyncio.current_task():
+                self.task.cancel()
+        self.task = None
+        await self._detach_cdp()
+        if close_standby and self.standby_page is not None:
+            try:
+                await self.standby_page.close()
+            except Exception:
+                pass
+        self.standby_page = None
+
+    def get_stats(self):
+        """
+        获取心跳和恢复统计
+
+        Returns:
+            dict: 统计信息
+        """
+        recoveries = {}
+        for failure, stats in self.recoveries.items():
+            recoveries[failure] = {
+                "count": stats["count"],
+                "failed": stats["failed"],
+                "meanMs": round(stats["totalMs"] / stats["count"], 1) if stats["count"] else 0.0,
+                "maxMs": round(stats["maxMs"], 1),
+                "lastMs": round(stats["lastMs"], 1)
+            }
+        return {
+            "running": self.task is not None and not self.task.done(),
+            "heartbeats": self.heartbeats,
+            "heartbeatFailures": self.heartbeat_failures,
+            "lastHeartbeatMs": self.last_heartbeat_ms,
+            "lastHeartbeatAt": self.last_heartbeat_at,
+            "standbyReady": self.standby_page is not None,
+            "lastFailure": self.last_failure,
+            "pendingFailure": self.pending_failure,
+            "recoveries": recoveries
+        }
@@ -0,0 +1,361 @@
+"""
+多岗位任务编排模块
+同时运行多个筛选任务：每个任务有自己的规则配置、打招呼配额和节奏预算，
+在同一浏览器上下文中使用独立的标签页和独立的简历处理器
+"""
+
+import asyncio
+import time
+import uuid
+
+from automation.processors.resume_processor import ResumeProcessor
+
+
+class ScreeningJob:
+    """
+    单个筛选任务
+
+    简历处理器通过browser属性访问is_running和_load_config，任务对象提供同样的接口，
+    因此处理器无需区分自己运行在BrowserManager还是任务中
+    """
+
+    DEFAULT_URL = "https://www.zhipin.com/web/boss/recommend"
+
+    def __init__(self, manager, job_id, name, config, quota=0, url=None):
+        """
+        初始化筛选任务
+
+        Args:
+            manager: 浏览器管理器（提供浏览器上下文、规则引擎、选择器等）
+            job_id: 任务ID
+            name: 任务名称（通常是岗位名称）
+            config: 任务的规则配置
+            quota: 打招呼配额，0表示不限制
+            url: 任务使用的推荐列表URL
+        """
+        self.manager = manager
+        self.job_id = job_id
+        self.name = name
+        self.config = config
+        self.quota = quota
+        self.url = url or self.DEFAULT_URL
+
+        self.status = "pending"   # pending | running | stopping | stopped | finished | error
+        self.is_running = False
+        self.page = None
+        self.processor = None
+        self.task = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.stopped_at = None
+        self.rounds = 0
+
+    def _load_config(self):
+        """返回任务自己的规则配置（与BrowserManager._load_config接口一致）"""
+        return self.config
+
+    @property
+    def request_policy(self):
+        """任务共用浏览器管理器的请求拦截策略（详情页池新建标签页时使用）"""
+        return self.manager.request_policy
+
+    @property
+    def activity(self):
+        """任务的处理记录推入浏览器管理器共用的最近处理记录"""
+        return self.manager.activity
+
+    async def _open_page(self):
+        """在共享的浏览器上下文中为任务打开独立的标签页"""
+        if self.page is not None:
+            try:
+                if not self.page.is_closed():
+                    return self.page
+            except Exception:
+                pass
+
+        self.page = await self.manager.context.new_page()
+        await self.manager.inject_stealth(self.page)
+        # 请求拦截默认关闭，任务可以通过配置requestPolicy.enabled=true开启
+        await self.manager.request_policy.apply(self.page, self.config)
+        await self.page.goto(self.url, wait_until="domcontentloaded")
+        print(f"📋 任务 {self.name} 已打开标签页: {self.url}")
+        return self.page
+
+    async def run(self):
+        """任务主循环：在自己的标签页中处理推荐列表，直到达到配额或被停止"""
+        self.status = "running"
+        self.is_running = True
+        self.error = None
+        self.started_at = time.time()
+        self.stopped_at = None
+        try:
+            if self.processor is None:
+                self.processor = ResumeProcessor(
+                    self,
+                    self.manager.rules_engine,
+                    self.manager.selectors,
+                    data_extractor=self.manager.data_extractor
+                )
+            self.processor.set_max_process_count(self.quota)
+            await self.processor.open_seen_store(self.config)
+
+            while self.is_running:
+                page = await self._open_page()
+                page_type = self.manager.page_detector.get_current_page_type(page.url)
+
+                if page_type == "recommend":
+                    self.rounds += 1
+                    count = await self.processor.process_recommend_list_page(page, self.config)
+                    print(f"📋 任务 {self.name} 第 {self.rounds} 轮处理了 {count} 个简历，已打招呼 {self.processor.get_greeted_count()} 人")
+                elif page_type == "detail":
+                    # 任务标签页只处理推荐列表，误入详情页时退回
+                    await page.keyboard.press('Escape')
+                else:
+                    await page.goto(self.url, wait_until="domcontentloaded")
+
+                if self.quota > 0 and self.processor.get_greeted_count() >= self.quota:
+                    print(f"✅ 任务 {self.name} 已达到打招呼配额 {self.quota}")
+                    self.processor.finish_checkpoint()
+                    self.status = "finished"
+                    break
+
+                if not self.is_running:
+                    break
+                # 两轮之间稍作等待，停止任务时立即结束等待
+                try:
+                    await asyncio.wait_for(self.processor.stop_event.wait(), timeout=5)
+                except asyncio.TimeoutError:
+                    pass
+
+            if self.status == "running" or self.status == "stopping":
+                self.status = "stopped"
+        except asyncio.CancelledError:
+            self.status = "stopped"
+        except Exception as e:
+            print(f"❌ 任务 {self.name} 出错: {e}")
+            import traceback
+            traceback.print_exc()
+            self.status = "error"
+            self.error = str(e)
+        finally:
+            self.is_running = False
+            self.stopped_at = time.time()
+            if self.processor:
+                self.processor.stop_processing()
+                await self.processor.detail_pool.close()
+
+    def start(self):
+        """在后台启动任务"""
+        if self.task is not None and not self.task.done():
+            return False
+        # 立即标记为运行中，避免任务真正开始前被重复启动或超出并发上限
+        self.status = "running"
+        self.is_running = True
+        self.task = asyncio.create_task(self.run())
+        return True
+
+    def stop(self):
+        """停止任务，正在进行的等待会被立即唤醒"""
+        if not self.is_running:
+            return False
+        print(f"🛑 停止任务 {self.name}")
+        self.status = "stopping"
+        self.is_running = False
+        if self.processor:
+            self.processor.stop_processing()
+            self.processor.finish_checkpoint()
+        return True
+
+    async def close(self):
+        """停止任务并关闭其标签页"""
+        self.stop()
+        if self.task is not None and not self.task.done():
+            try:
+                await asyncio.wait_for(self.task, timeout=30)
+            except asyncio.TimeoutError:
+                self.task.cancel()
+        if self.page is not None:
+            try:
+                await self.page.close()
+            except Exception:
+                pass
+            self.page = None
+
+    def get_status(self):
+        """
+        获取任务状态和计数器
+
+        Returns:
+            dict: 任务状态信息
+        """
+        status = {
+            "id": self.job_id,
+            "name": self.name,
+            "status": self.status,
+            "quota": self.quota,
+            "url": self.url,
+            "rounds": self.rounds,
+            "error": self.error,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "stoppedAt": self.stopped_at,
+            "processedCount": 0,
+            "greetedCount": 0,
+            "counters": None,
+            "pacing": None
+        }
+        if self.processor:
+            status["processedCount"] = self.processor.get_processed_count()
+            status["greetedCount"] = self.processor.get_greeted_count()
+            status["counters"] = self.processor.get_session_counters()
+            status["pacing"] = self.processor.get_pacing_stats()
+        return status
+
+
+class JobOrchestrator:
+    """任务编排器，管理多个并发运行的筛选任务"""
+
+    # 同时运行的任务数量上限，避免同一账号下过多标签页同时操作
+    MAX_RUNNING_JOBS = 4
+
+    def __init__(self, manager):
+        """
+        初始化任务编排器
+
+        Args:
+            manager: 浏览器管理器
+        """
+        self.manager = manager
+        self.jobs = {}
+
+    async def _ensure_browser(self):
+        """确保已连接浏览器"""
+        if self.manager.browser and self.manager.context:
+            return True
+        return await self.manager.start_browser(use_existing=True)
+
+    def _running_count(self):
+        return sum(1 for job in self.jobs.values() if job.is_running)
+
+    def build_config(self, overrides=None, pacing=None):
+        """
+        构建任务配置：以当前保存的配置为基础，合并任务自己的规则和节奏设置
+
+        Args:
+            overrides: 覆盖的配置字段
+            pacing: 任务自己的节奏预算（config["pacing"]）
+
+        Returns:
+            dict: 任务配置
+        """
+        config = dict(self.manager._load_config())
+        config.update(overrides or {})
+        if pacing:
+            config["pacing"] = pacing
+        return config
+
+    async def create_job(self, name, config=None, quota=0, pacing=None, url=None, start=True):
+        """
+        创建任务，默认立即启动
+
+        Args:
+            name: 任务名称
+            config: 覆盖的配置字段（规则、岗位描述等）
+            quota: 打招呼配额，0表示不限制
+            pacing: 任务的节奏预算
+            url: 推荐列表URL（不同岗位的推荐列表）
+            start: 是否立即启动
+
+        Returns:
+            dict: {"success", "message", "job"}
+        """
+        job_id = uuid.uuid4().hex[:8]
+        job = ScreeningJob(self.manager, job_id, name or job_id, self.build_config(config, pacing), quota or 0, url)
+        self.jobs[job_id] = job
+        print(f"📋 已创建任务 {job.name} ({job_id})，配额 {job.quota}")
+
+        if start:
+            result = await self.start_job(job_id)
+            if not result["success"]:
+                return result
+        return {"success": True, "message": "任务已创建", "job": job.get_status()}
+
+    async def start_job(self, job_id):
+        """
+        启动或重新启动任务
+
+        Args:
+            job_id: 任务ID
+
+        Returns:
+            dict: {"success", "message", "job"}
+        """
+        job = self.jobs.get(job_id)
+        if not job:
+            return {"success": False, "message": "任务不存在"}
+        if job.is_running:
+            return {"success": False, "message": "任务已在运行", "job": job.get_status()}
+        if self._running_count() >= self.MAX_RUNNING_JOBS:
+            return {"success": False, "message": f"同时运行的任务不能超过 {self.MAX_RUNNING_JOBS} 个", "job": job.get_status()}
+        if not await self._ensure_browser():
+            return {"success": False, "message": "无法启动或连接到浏览器", "job": job.get_status()}
+
+        job.start()
+        return {"success": True, "message": "任务已启动", "job": job.get_status()}
+
+    def stop_job(self, job_id):
+        """
+        停止任务
+
+        Args:
+            job_id: 任务ID
+
+        Returns:
+            dict: {"success", "message", "job"}
+        """
+        job = self.jobs.get(job_id)
+        if not job:
+            return {"success": False, "message": "任务不存在"}
+        stopped = job.stop()
+        return {"success": True, "message": "任务已停止" if stopped else "任务未在运行", "job": job.get_status()}
+
+    async def remove_job(self, job_id):
+        """
+        停止任务、关闭其标签页并移除
+
+        Args:
+            job_id: 任务ID
+
+        Returns:
+            dict: {"success", "message"}
+        """
+        job = self.jobs.pop(job_id, None)
+        if not job:
+            return {"success": False, "message": "任务不存在"}
+        await job.close()
+        return {"success": True, "message": "任务已移除"}
+
+    def stop_all(self):
+        """停止所有任务"""
+        for job in self.jobs.values():
+            job.stop()
+
+    async def close_all(self):
+        """停止所有任务并关闭其标签页"""
+        for job in list(self.jobs.values()):
+            await job.close()
+
+    def get_job_status(self, job_id):
+        """获取单个任务状态，任务不存在时返回None"""
+        job = self.jobs.get(job_id)
+        return job.get_status() if job else None
+
+    def get_status(self):
+        """
+        获取所有任务状态
+
+        Returns:
+            list: 任务状态列表，按创建时间排序
+        """
+        return [job.get_status() for job in sorted(self.jobs.values(), key=lambda job: job.created_at)]
@@ -0,0 +1,294 @@
+"""
+请求拦截策略模块
+按页面类型拦截或替换提取逻辑用不到的资源（头像图片、字体、媒体、第三方统计脚本），
+统计拦截的请求数、估算节省的字节数，并对比启用/未启用策略时的页面加载耗时。
+拦截默认关闭，需要在配置中设置requestPolicy.enabled=true开启
+"""
+
+import asyncio
+import fnmatch
+import re
+from urllib.parse import urlsplit
+
+from automation.processors.readiness_waiter import LatencyHistogram
+
+
+class RequestPolicy:
+    """请求拦截策略，按页面（任务）启用，规则按请求所在frame的页面类型选择"""
+
+    # 第三方统计和监控服务的域名（按请求的主机名匹配，包括子域名），
+    # 不按路径匹配，避免误拦截zhipin自己的日志、埋点等接口
+    ANALYTICS_HOSTS = [
+        "hm.baidu.com",
+        "google-analytics.com",
+        "googletagmanager.com",
+        "cnzz.com",
+        "growingio.com",
+        "sensorsdata.cn",
+        "sentry.io",
+        "sentry-cdn.com"
+    ]
+
+    # 默认规则：block直接中止请求，stub返回空内容（页面的onerror/重试逻辑不会被触发）
+    DEFAULT_RULES = {
+        "recommend": {
+            "blockTypes": ["media", "font"],
+            "stubTypes": ["image"],
+            "blockHosts": ANALYTICS_HOSTS,
+            "blockPatterns": [],
+            "stubPatterns": []
+        },
+        "detail": {
+            # 部分简历内容以图片或自定义字体渲染，详情页只拦截头像、媒体和统计脚本
+            "blockTypes": ["media"],
+            "stubTypes": [],
+            "blockHosts": ANALYTICS_HOSTS,
+            "blockPatterns": [],
+            "stubPatterns": ["*avatar*", "*/headimg/*"]
+        },
+        "unknown": {
+            "blockTypes": [],
+            "stubTypes": [],
+            "blockHosts": ANALYTICS_HOSTS,
+            "blockPatterns": [],
+            "stubPatterns": []
+        }
+    }
+
+    # 被拦截请求的估算大小（字节），同类资源放行时按实际响应大小更新平均值
+    DEFAULT_SIZES = {
+        "image": 15000,
+        "media": 200000,
+        "font": 40000,
+        "script": 30000,
+        "stylesheet": 20000,
+        "xhr": 2000,
+        "fetch": 2000,
+        "other": 5000
+    }
+
+    # 1x1透明GIF
+    _EMPTY_GIF = (b"GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\x00\x00\x00"
+                  b"!\xf9\x04\x01\x00\x00\x00\x00,\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;")
+
+    _STUB_CONTENT_TYPES = {
+        "image": "image/gif",
+        "script": "application/javascript",
+        "stylesheet": "text/css",
+        "font": "font/woff2"
+    }
+
+    def __init__(self, page_detector):
+        """
+        初始化请求拦截策略
+
+        Args:
+            page_detector: 页面类型检测器，用于判断请求所在frame的页面类型
+        """
+        self.page_detector = page_detector
+        self._handlers = {}
+        self._load_modes = {}
+        self._learned_sizes = {}
+
+        self.blocked = {}
+        self.stubbed = {}
+        self.bytes_saved = 0
+        self.load_times = {}
+
+    def _compile_rules(self, config):
+        """根据配置合并默认规则，并把URL通配符编译成正则"""
+        overrides = ((config or {}).get("requestPolicy") or {}).get("rules") or {}
+        compiled = {}
+        for page_type, default_rule in self.DEFAULT_RULES.items():
+            rule = dict(default_rule)
+            rule.update(overrides.get(page_type) or {})
+            compiled[page_type] = {
+                "blockTypes": set(rule.get("blockTypes") or []),
+                "blockHosts": tuple(host.lower().lstrip(".") for host in rule.get("blockHosts") or []),
+                "stubTypes": set(rule.get("stubTypes") or []),
+                "blockPattern": self._compile_patterns(rule.get("blockPatterns")),
+                "stubPattern": self._compile_patterns(rule.get("stubPatterns"))
+            }
+        return compiled
+
+    @staticmethod
+    def _compile_patterns(patterns):
+        if not patterns:
+            return None
+        return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns), re.IGNORECASE)
+
+    @staticmethod
+    def _host_matches(url, hosts):
+        """请求的主机名是否是hosts中的域名或其子域名"""
+        if not hosts:
+            return False
+        try:
+            hostname = (urlsplit(url).hostname or "").lower()
+        except ValueError:
+            return False
+        return any(hostname == host or hostname.endswith("." + host) for host in hosts)
+
+    @staticmethod
+    def is_enabled(config):
+        """
+        配置中是否启用了请求拦截（默认关闭，通过requestPolicy.enabled=true开启）
+
+        Args:
+            config: 规则配置
+
+        Returns:
+            bool: 是否启用
+        """
+        return ((config or {}).get("requestPolicy") or {}).get("enabled", False) is True
+
+    def _action_for(self, rules, request):
+        """判断请求的处理方式：'block'、'stub'或None（放行）"""
+        resource_type = request.resource_type
+        if resource_type == "document":
+            return None
+        try:
+            page_type = self.page_detector.get_current_page_type(request.frame.url)
+        except Exception:
+            page_type = "unknown"
+        rule = rules.get(page_type) or rules["unknown"]
+
+        url = request.url
+        if rule["stubPattern"] is not None and rule["stubPattern"].match(url):
+            return "stub"
+        if self._host_matches(url, rule["blockHosts"]):
+            return "block"
+        if rule["blockPattern"] is not None and rule["blockPattern"].match(url):
+            return "block"
+        if resource_type in rule["stubTypes"]:
+            return "stub"
+        if resource_type in rule["blockTypes"]:
+            return "block"
+        return None
+
+    def _make_handler(self, rules):
+        """为页面生成路由处理函数"""
+        async def handle(route, request):
+            try:
+                action = self._action_for(rules, request)
+                if action is None:
+                    await route.continue_()
+                    return
+                resource_type = request.resource_type
+                self._count(action, resource_type)
+                if action == "stub":
+                    body = self._EMPTY_GIF if resource_type == "image" else b""
+                    await route.fulfill(
+                        status=200,
+                        content_type=self._STUB_CONTENT_TYPES.get(resource_type, "text/plain"),
+                        body=body
+                    )
+                else:
+                    await route.abort("blockedbyclient")
+            except Exception as e:
+                # 页面关闭或请求已被处理时忽略
+                if "closed" not in str(e).lower() and "already handled" not in str(e).lower():
+                    print(f"请求拦截处理失败: {e}")
+        return handle
+
+    def _count(self, action, resource_type):
+        counts = self.stubbed if action == "stub" else self.blocked
+        counts[resource_type] = counts.get(resource_type, 0) + 1
+        self.bytes_saved += self._estimated_size(resource_type)
+
+    def _estimated_size(self, resource_type):
+        learned = self._learned_sizes.get(resource_type)
+        if learned and learned[1]:
+            return learned[0] / learned[1]
+        return self.DEFAULT_SIZES.get(resource_type, self.DEFAULT_SIZES["other"])
+
+    def _on_response(self, response):
+        """记录放行资源的实际大小，用于估算被拦截资源的大小"""
+        try:
+            length = response.headers.get("content-length")
+            if not length:
+                return
+            resource_type = response.request.resource_type
+            learned = self._learned_sizes.setdefault(resource_type, [0, 0])
+            learned[0] += int(length)
+            learned[1] += 1
+        except Exception:
+            pass
+
+    async def _record_load(self, page, enabled):
+        """页面加载完成后读取导航耗时，按页面类型和是否启用策略分别统计"""
+        try:
+            duration_ms = await page.evaluate("""() => {
+                const nav = performance.getEntriesByType('navigation')[0];
+                return nav && nav.loadEventEnd > 0 ? nav.loadEventEnd - nav.startTime : null;
+            }""")
+            if duration_ms is None:
+                return
+            page_type = self.page_detector.get_current_page_type(page.url)
+            key = f"{page_type}:{'on' if enabled else 'off'}"
+            histogram = self.load_times.get(key)
+            if histogram is None:
+                histogram = self.load_times[key] = LatencyHistogram(key)
+            histogram.record(duration_ms / 1000.0)
+        except Exception:
+            pass
+
+    async def apply(self, page, config=None):
+        """
+        为页面应用请求拦截策略；配置关闭策略时只统计加载耗时（作为对照）
+
+        Args:
+            page: Playwright页面对象
+            config: 规则配置（任务自己的配置）
+
+        Returns:
+            bool: 是否启用了拦截
+        """
+        enabled = self.is_enabled(config)
+        try:
+            await self.remove(page)
+            if id(page) not in self._load_modes:
+                page.on("load", lambda: asyncio.ensure_future(self._record_load(page, self._load_modes.get(id(page), False))))
+            self._load_modes[id(page)] = enabled
+            if not enabled:
+                print("请求拦截策略已关闭，只统计页面加载耗时")
+                return False
+            handler = self._make_handler(self._compile_rules(config))
+            await page.route("**/*", handler)
+            page.on("response", self._on_response)
+            self._handlers[id(page)] = (page, handler)
+            print("已启用请求拦截策略，拦截图片、字体、媒体和统计脚本")
+            return True
+        except Exception as e:
+            print(f"应用请求拦截策略失败: {e}")
+            return False
+
+    async def remove(self, page):
+        """
+        移除页面上的请求拦截
+
+        Args:
+            page: Playwright页面对象
+        """
+        entry = self._handlers.pop(id(page), None)
+        if entry is None:
+            return
+        try:
+            await page.unroute("**/*", entry[1])
+            page.remove_listener("response", self._on_response)
+        except Exception:
+            pass
+
+    def get_stats(self):
+        """
+        获取拦截统计和加载耗时对比
+
+        Returns:
+            dict: 统计信息
+        """
+        return {
+            "blocked": dict(self.blocked),
+            "stubbed": dict(self.stubbed),
+            "blockedTotal": sum(self.blocked.values()) + sum(self.stubbed.values()),
+            "estimatedBytesSaved": int(self.bytes_saved),
+            "loadTimes": {key: histogram.snapshot() for key, histogram in self.load_times.items()}
+        }
@@ -6,7 +6,7 @@
 import enum
 from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import Column, String, Integer, DateTime, Text, JSON, ForeignKey, Table, Enum, Float
+from sqlalchemy import Column, String, Integer, DateTime, Text, JSON, ForeignKey, Table, Enum, Float, Index, UniqueConstraint, BigInteger, Boolean
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -159,4 +159,35 @@ class OperationLog(Base):
     data_type = Column(String(50))
     data_id = Column(String(100))
     log_metadata = Column(JSON)  # 改名为log_metadata避免与SQLAlchemy的metadata冲突
-    created_at = Column(DateTime, default=datetime.now) 
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.now) 
+
+class SeenCandidate(Base):
+    """已处理候选人模型，按岗位记录已看过的候选人，用于跨会话去重"""
+    __tablename__ = 'seen_candidates'
+    __table_args__ = (
+        UniqueConstraint('job_key', 'candidate_key', name='uq_seen_candidates_job_candidate'),
+        Index('ix_seen_candidates_expires_at', 'expires_at'),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_key = Column(String(64), nullable=False)  # 岗位范围（配置中的jobId或岗位规则摘要）
+    candidate_key = Column(String(100), nullable=False)  # Boss候选人ID或卡片指纹
+    simhash = Column(BigInteger)  # 卡片文本的SimHash（按有符号64位存储），用于识别重复展示
+    first_seen = Column(DateTime, default=datetime.now)
+    last_seen = Column(DateTime, default=datetime.now)
+    expires_at = Column(DateTime, nullable=False)  # 过期后允许重新处理
+
+class AutomationCheckpoint(Base):
+    """自动化检查点模型，记录每个岗位的处理进度，断线重连或重启后从检查点继续"""
+    __tablename__ = 'automation_checkpoints'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_key = Column(String(64), nullable=False, unique=True)  # 岗位范围（与seen_candidates一致）
+    batch_index = Column(Integer, default=0)  # 已处理的批次数
+    last_candidate_key = Column(String(100))  # 最后处理的候选人ID或卡片指纹
+    card_count = Column(Integer, default=0)  # 检查点时列表中已加载的卡片数，用于快速滚动到原位置
+    card_index = Column(Integer, default=0)  # 最后处理的卡片在列表中的位置
+    processed_count = Column(Integer, default=0)
+    counters = Column(JSON)  # 会话计数器快照
+    interrupted = Column(Boolean, default=True)  # 运行中途中断时为True，正常停止或达到配额后为False，只恢复位置不恢复计数器
+    updated_at = Column(DateTime, default=datetime.now)
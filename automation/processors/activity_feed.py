@@ -0,0 +1,141 @@
+"""
+最近处理记录模块
+处理流程把每条打招呼/跳过记录推入固定长度的环形缓冲区，状态接口直接读取缓冲区，
+耗时与日志文件大小无关；磁盘上的候选人文件只在工作进程启动时于线程池中读取一次
+"""
+
+import asyncio
+import csv
+import json
+import os
+import threading
+from collections import deque
+
+
+class ActivityFeed:
+    """
+    最近处理记录的环形缓冲区（线程安全）
+
+    record()和recent()在事件循环中调用，只读写内存；磁盘上的历史记录由启动时的load()
+    在线程池中读取，读取完成前recent()只返回本次运行的记录
+    """
+
+    # 冷启动时CSV表头到记录字段的映射
+    CSV_FIELDS = {
+        "时间": "timestamp",
+        "姓名": "name",
+        "期望职位": "position",
+        "过往公司": "company",
+        "技能": "skills",
+        "链接": "link"
+    }
+
+    def __init__(self, capacity=100, json_file=None, csv_file=None):
+        """
+        初始化最近处理记录
+
+        Args:
+            capacity: 缓冲区保留的最大记录数
+            json_file: 冷启动时读取的候选人JSON文件
+            csv_file: 冷启动时读取的已打招呼CSV文件（JSON不可用时使用）
+        """
+        app_dir = os.path.expanduser("~/Library/Application Support/SourcingCopilot")
+        self.json_file = json_file or os.path.join(app_dir, "candidates.json")
+        self.csv_file = csv_file or os.path.join(app_dir, "logs", "greeted_candidates.csv")
+        self._entries = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._seeded = False
+        self.recorded = 0
+
+    def record(self, log_entry):
+        """
+        推入一条处理记录
+
+        Args:
+            log_entry: 日志助手生成的候选人记录
+        """
+        entry = {
+            "timestamp": log_entry.get("timestamp"),
+            "name": log_entry.get("name"),
+            "position": log_entry.get("position"),
+            "company": log_entry.get("company"),
+            "action": log_entry.get("action"),
+            "reason": log_entry.get("reason"),
+            "link": log_entry.get("link")
+        }
+        ai_evaluation = log_entry.get("ai_evaluation")
+        if ai_evaluation:
+            entry["score"] = ai_evaluation.get("score")
+        with self._lock:
+            self._entries.append(entry)
+            self.recorded += 1
+
+    def recent(self, limit=10):
+        """
+        获取最近的处理记录
+
+        Args:
+            limit: 返回的最大记录数
+
+        Returns:
+            list: 记录列表，最新的在前
+        """
+        with self._lock:
+            count = min(limit, len(self._entries))
+            return [self._entries[-1 - i] for i in range(count)]
+
+    async def load(self):
+        """启动时在线程池中读取磁盘上的历史记录（只执行一次），不阻塞事件循环"""
+        if self._seeded:
+            return
+        await asyncio.get_running_loop().run_in_executor(None, self._seed_from_disk)
+
+    def _seed_from_disk(self):
+        """冷启动：从候选人JSON或已打招呼CSV读取最近的记录（只执行一次）"""
+        with self._lock:
+            if self._seeded:
+                return
+            self._seeded = True
+        capacity = self._entries.maxlen
+        try:
+            entries = self._read_json(capacity)
+            if entries is None:
+                entries = self._read_csv(capacity)
+            if not entries:
+                return
+            with self._lock:
+                # 磁盘记录按时间顺序排在前面，读取期间新推入的记录保持在末尾
+                merged = deque(entries, maxlen=capacity)
+                merged.extend(self._entries)
+                self._entries = merged
+            print(f"已从磁盘加载 {len(entries)} 条最近处理记录")
+        except Exception as e:
+            print(f"加载最近处理记录失败: {e}")
+            import traceback
+            traceback.print_exc()
+
+    def _read_json(self, capacity):
+        if not os.path.exists(self.json_file):
+            return None
+        try:
+            with open(self.json_file, "r", encoding="utf-8") as f:
+                candidates = json.load(f)
+        except Exception as e:
+            print(f"读取JSON候选人数据失败: {e}")
+            return None
+        if not isinstance(candidates, list):
+            return None
+        # JSON文件中最新的记录在前
+        return list(reversed(candidates[:capacity]))
+
+    def _read_csv(self, capacity):
+        if not os.path.exists(self.csv_file):
+            return []
+        with open(self.csv_file, "r", encoding="utf-8") as f:
+            rows = deque(csv.DictReader(f), maxlen=capacity)
+        entries = []
+        for row in rows:
+            entry = {self.CSV_FIELDS.get(key, key): value for key, value in row.items() if key}
+            entry.setdefault("action", "greet")
+            entries.append(entry)
+        return entries
@@ -0,0 +1,217 @@
+"""
+候选人指纹模块
+为没有稳定ID的卡片生成确定性的指纹：规范化文本的带密钥摘要用于精确去重，
+SimHash加汉明距离索引用于识别文本略有变化的重复展示
+"""
+
+import hashlib
+import os
+import re
+import secrets
+from collections import OrderedDict
+
+
+class CandidateFingerprinter:
+    """候选人指纹服务，指纹在进程重启后保持不变"""
+
+    # 规范化时去掉的易变内容：活跃状态、在线状态、时间
+    VOLATILE_PATTERNS = [
+        r'刚刚活跃|今日活跃|昨日活跃|本周活跃|本月活跃|\d+日内活跃|\d+周内活跃|\d+月内活跃|半年前活跃',
+        r'在线|离线|新牛人|刚刚',
+        r'\d{1,2}:\d{2}',
+        r'\d{4}[-/.]\d{1,2}[-/.]\d{1,2}'
+    ]
+
+    # SimHash使用的字符n-gram长度
+    SHINGLE_SIZE = 3
+
+    def __init__(self, key_path=None, key=None):
+        """
+        初始化指纹服务
+
+        Args:
+            key_path: 摘要密钥文件路径，文件不存在时生成新密钥并保存
+            key: 直接指定的摘要密钥（bytes），优先于key_path
+        """
+        self.key = key or self._load_key(key_path)
+        self._volatile = re.compile('|'.join(f'(?:{p})' for p in self.VOLATILE_PATTERNS))
+
+    @staticmethod
+    def _load_key(key_path):
+        """读取或生成摘要密钥，密钥只保存在本机，避免指纹被用于跨设备关联"""
+        if not key_path:
+            return b''
+        try:
+            if os.path.exists(key_path):
+                with open(key_path, 'rb') as f:
+                    key = f.read()
+                if key:
+                    return key[:64]
+            key = secrets.token_bytes(32)
+            os.makedirs(os.path.dirname(key_path) or '.', exist_ok=True)
+            with open(key_path, 'wb') as f:
+                f.write(key)
+            return key
+        except Exception as e:
+            print(f"⚠️ 读取指纹密钥失败，使用无密钥摘要: {e}")
+            return b''
+
+    def normalize(self, text):
+        """
+        规范化卡片文本：去掉易变内容，只保留小写的字母和数字
+
+        Args:
+            text: 卡片文本
+
+        Returns:
+            str: 规范化后的文本
+        """
+        text = self._volatile.sub(' ', (text or '').lower())
+        return ''.join(ch for ch in text if ch.isalnum())
+
+    def digest(self, text):
+        """
+        计算规范化文本的带密钥摘要
+
+        Args:
+            text: 卡片文本
+
+        Returns:
+            str: 指纹字符串（fp:前缀），文本为空时返回None
+        """
+        normalized = self.normalize(text)
+        if not normalized:
+            return None
+        return 'fp:' + hashlib.blake2b(normalized.encode('utf-8'), key=self.key, digest_size=12).hexdigest()
+
+    def simhash(self, text):
+        """
+        计算规范化文本的64位SimHash
+
+        Args:
+            text: 卡片文本
+
+        Returns:
+            int: SimHash值，文本为空时返回None
+        """
+        normalized = self.normalize(text)
+        if not normalized:
+            return None
+
+        size = self.SHINGLE_SIZE
+        shingles = {}
+        if len(normalized) <= size:
+            shingles[normalized] = 1
+        else:
+            for i in range(len(normalized) - size + 1):
+                shingle = normalized[i:i + size]
+                shingles[shingle] = shingles.get(shingle, 0) + 1
+
+        weights = [0] * 64
+        for shingle, count in shingles.items():
+            value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+            for bit in range(64):
+                weights[bit] += count if value >> bit & 1 else -count
+
+        result = 0
+        for bit in range(64):
+            if weights[bit] > 0:
+                result |= 1 << bit
+        return result
+
+    def fingerprint(self, text):
+        """
+        同时计算摘要和SimHash
+
+        Args:
+            text: 卡片文本
+
+        Returns:
+            tuple: (摘要, SimHash)
+        """
+        return self.digest(text), self.simhash(text)
+
+
+class SimHashIndex:
+    """
+    SimHash汉明距离索引
+
+    把64位SimHash分成max_distance+1段，距离不超过max_distance的两个值至少有一段完全相同，
+    因此只需比较同段相同的候选项
+    """
+
+    def __init__(self, max_distance=8, max_entries=50000):
+        """
+        初始化索引
+
+        Args:
+            max_distance: 认为是同一候选人的最大汉明距离
+            max_entries: 最多保留的条目数，超出后淘汰最早加入的条目
+        """
+        self.max_distance = max(0, int(max_distance))
+        self.max_entries = max(1, int(max_entries))
+        self.band_count = self.max_distance + 1
+        self.band_bits = 64 // self.band_count
+        self._entries = OrderedDict()
+        self._bands = [dict() for _ in range(self.band_count)]
+
+    def _band_values(self, simhash):
+        mask = (1 << self.band_bits) - 1
+        return [(simhash >> (i * self.band_bits)) & mask for i in range(self.band_count)]
+
+    def add(self, key, simhash):
+        """
+        加入索引
+
+        Args:
+            key: 候选人键
+            simhash: SimHash值
+        """
+        if simhash is None or key in self._entries:
+            return
+        self._entries[key] = simhash
+        for band, value in zip(self._bands, self._band_values(simhash)):
+            band.setdefault(value, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            old_key, old_hash = self._entries.popitem(last=False)
+            for band, value in zip(self._bands, self._band_values(old_hash)):
+                keys = band.get(value)
+                if keys:
+                    keys.discard(old_key)
+                    if not keys:
+                        del band[value]
+
+    def find(self, simhash, exclude=None):
+        """
+        查找距离最近且不超过max_distance的条目
+
+        Args:
+            simhash: SimHash值
+            exclude: 排除的键（通常是当前卡片自身）
+
+        Returns:
+            tuple: (键, 汉明距离)，没有时返回(None, None)
+        """
+        if simhash is None:
+            return None, None
+
+        best_key, best_distance = None, None
+        checked = set()
+        for band, value in zip(self._bands, self._band_values(simhash)):
+            for key in band.get(value, ()):
+                if key in checked or key == exclude:
+                    continue
+                checked.add(key)
+                distance = bin(self._entries[key] ^ simhash).count('1')
+                if distance <= self.max_distance and (best_distance is None or distance < best_distance):
+                    best_key, best_distance = key, distance
+        return best_key, best_distance
+
+    def clear(self):
+        self._entries.clear()
+        for band in self._bands:
+            band.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -658,4 +658,205 @@ class CardExtractor:
             
         except Exception as e:
             print(f"Boss直聘专用职位提取失败: {e}")
-            return None 
\ No newline at end of file
+            return None 
+    # 卡片内打招呼按钮的候选选择器（按优先级排列）
+    GREET_BUTTON_SELECTORS = [
+        '.btn.btn-greet',
+        'button[class*="btn-greet"]',
+        '.start-chat-btn',
+        '.btn-greet'
+    ]
+    
+    # 快照写入卡片元素的标记属性，用于之后按需重新定位卡片
+    SNAPSHOT_ATTR = 'data-sc-snapshot'
+    
+    # 卡片ID属性的查找顺序
+    CARD_ID_ATTRS = ['data-id', 'id', 'data-geek', 'data-uid', 'data-index']
+    
+    # 批量快照脚本：一次evaluate返回所有卡片的ID、文本、HTML片段和打招呼按钮状态
+    _SNAPSHOT_SCRIPT = """
+        ({cardSelectors, greetSelectors, idAttrs, snapshotAttr, htmlLimit, root, prefilter}) => {
+            const scope = root || document;
+            const token = Date.now().toString(36);
+            
+            let cards = [];
+            let usedSelector = null;
+            if (root) {
+                cards = [root];
+            } else {
+                for (const selector of cardSelectors) {
+                    try {
+                        const found = Array.from(scope.querySelectorAll(selector));
+                        if (found.length > 0) {
+                            cards = found;
+                            usedSelector = selector;
+                            break;
+                        }
+                    } catch (e) {
+                        // 非法选择器直接忽略
+                    }
+                }
+            }
+            
+            const hasGreetButton = (card) => {
+                for (const selector of greetSelectors) {
+                    try {
+                        if (card.querySelector(selector)) return true;
+                    } catch (e) {}
+                }
+                return Array.from(card.querySelectorAll('button, a, span'))
+                    .some(el => (el.textContent || '').trim() === '打招呼');
+            };
+            
+            // 页面内预筛：只保留字母和数字后比较，是Python侧清洗文本后子串匹配的必要条件
+            const normalize = (value) => String(value || '').toLowerCase().replace(/[^\\p{L}\\p{N}]+/gu, '');
+            const positionGroups = prefilter ? prefilter.positionGroups.map(group => group.map(k => [k, normalize(k)])) : [];
+            const companyKeywords = prefilter ? prefilter.companyKeywords.map(k => [k, normalize(k)]) : [];
+            const rejected = [];
+            
+            const snapshots = cards.map((card, index) => {
+                let id = null;
+                let idSource = null;
+                for (const attr of idAttrs) {
+                    const value = card.getAttribute(attr);
+                    if (value) {
+                        id = value;
+                        idSource = attr;
+                        break;
+                    }
+                }
+                
+                let matched = null;
+                if (prefilter) {
+                    const text = card.textContent || '';
+                    const normalized = normalize(text);
+                    const position = [];
+                    for (const group of positionGroups) {
+                        if (group.every(([, k]) => normalized.includes(k))) {
+                            position.push(...group.map(([raw]) => raw));
+                        }
+                    }
+                    if (position.length === 0) {
+                        // 未命中任何岗位关键词，只返回ID用于计数和去重；
+                        // 没有ID属性时返回文本，由Python侧计算与正常卡片一致的指纹
+                        rejected.push({index: index, id: id, text: id ? null : text});
+                        return null;
+                    }
+                    matched = {
+                        position: position,
+                        company: companyKeywords.filter(([, k]) => normalized.includes(k)).map(([raw]) => raw)
+                    };
+                }
+                
+                const key = token + '-' + index;
+                card.setAttribute(snapshotAttr, key);
+                
+                const rect = card.getBoundingClientRect();
+                const html = card.outerHTML || '';
+                const link = card.querySelector('a[href]');
+                const detailUrl = link && /^https?:/.test(link.href) ? link.href : null;
+                
+                return {
+                    index: index,
+                    key: key,
+                    id: id,
+                    idSource: idSource,
+                    text: card.textContent || '',
+                    html: html.length > htmlLimit ? html.slice(0, htmlLimit) : html,
+                    htmlLength: html.length,
+                    hasGreetButton: hasGreetButton(card),
+                    hasLink: !!card.querySelector('a'),
+                    detailUrl: detailUrl,
+                    visible: rect.width > 0 && rect.height > 0,
+                    prefilter: matched
+                };
+            }).filter(snapshot => snapshot !== null);
+            
+            return {selector: usedSelector, cards: snapshots, rejected: rejected};
+        }
+    """
+    
+    @staticmethod
+    async def snapshot_cards(target, card_selectors, greet_selectors=None, html_limit=4000, prefilter=None):
+        """
+        一次evaluate批量获取当前页面所有卡片的快照
+        
+        快照在Python侧离线处理，只有需要打招呼或点击的卡片才通过
+        resolve_card重新获取元素句柄。提供预筛条件时，未命中岗位关键词的卡片
+        在页面内就被排除，只返回其ID（没有ID属性时返回卡片文本）
+        
+        Args:
+            target: Playwright页面或iframe对象
+            card_selectors: 卡片选择器列表，按顺序尝试，使用第一个命中的选择器
+            greet_selectors: 打招呼按钮选择器列表，默认使用GREET_BUTTON_SELECTORS
+            html_limit: 每张卡片保留的HTML片段最大长度
+            prefilter: EvaluationHelper.compile_card_prefilter编译的预筛条件
+            
+        Returns:
+            dict: {"selector": 命中的选择器, "cards": [卡片快照, ...], "rejected": [{"index", "id", "text"}, ...]}
+        """
+        try:
+            result = await target.evaluate(CardExtractor._SNAPSHOT_SCRIPT, {
+                "cardSelectors": [s for s in card_selectors if s],
+                "greetSelectors": [s for s in (greet_selectors or CardExtractor.GREET_BUTTON_SELECTORS) if s],
+                "idAttrs": CardExtractor.CARD_ID_ATTRS,
+                "snapshotAttr": CardExtractor.SNAPSHOT_ATTR,
+                "htmlLimit": html_limit,
+                "root": None,
+                "prefilter": prefilter
+            })
+            return result or {"selector": None, "cards": [], "rejected": []}
+        except Exception as e:
+            print(f"批量获取卡片快照失败: {e}")
+            return {"selector": None, "cards": [], "rejected": []}
+    
+    @staticmethod
+    async def snapshot_card_element(card, greet_selectors=None, html_limit=4000):
+        """
+        获取单个卡片元素的快照，结构与snapshot_cards返回的卡片快照一致
+        
+        Args:
+            card: 卡片元素
+            greet_selectors: 打招呼按钮选择器列表
+            html_limit: 保留的HTML片段最大长度
+            
+        Returns:
+            dict: 卡片快照，失败时返回None
+        """
+        try:
+            result = await card.evaluate(
+                "(el, args) => (" + CardExtractor._SNAPSHOT_SCRIPT + ")(Object.assign({}, args, {root: el}))",
+                {
+                    "cardSelectors": [],
+                    "greetSelectors": [s for s in (greet_selectors or CardExtractor.GREET_BUTTON_SELECTORS) if s],
+                    "idAttrs": CardExtractor.CARD_ID_ATTRS,
+                    "snapshotAttr": CardExtractor.SNAPSHOT_ATTR,
+                    "htmlLimit": html_limit
+                }
+            )
+            cards = (result or {}).get("cards") or []
+            return cards[0] if cards else None
+        except Exception as e:
+            print(f"获取卡片快照失败: {e}")
+            return None
+    
+    @staticmethod
+    async def resolve_card(target, snapshot):
+        """
+        根据快照标记重新定位卡片元素，只在需要对卡片进行操作时调用
+        
+        Args:
+            target: Playwright页面或iframe对象
+            snapshot: snapshot_cards返回的卡片快照
+            
+        Returns:
+            ElementHandle: 卡片元素，未找到时返回None
+        """
+        key = snapshot.get("key") if snapshot else None
+        if not key:
+            return None
+        try:
+            return await target.query_selector(f'[{CardExtractor.SNAPSHOT_ATTR}="{key}"]')
+        except Exception as e:
+            print(f"重新定位卡片元素失败: {e}")
+            return None
@@ -0,0 +1,161 @@
+"""
+卡片预读模块
+在当前候选人等待详情页、AI评估或节奏延迟时，提前解析并完成后续几张卡片的卡片阶段评估，
+使串行执行的只剩下真正的页面操作
+"""
+
+import asyncio
+import time
+
+
+class CardLookahead:
+    """卡片预读器，基于卡片快照在后台解析后续K张卡片并写入解析缓存"""
+
+    def __init__(self, card_processor, depth=3):
+        """
+        初始化卡片预读器
+
+        Args:
+            card_processor: 卡片处理器（ResumeCardProcessor）
+            depth: 预读深度，即当前卡片之后提前解析的卡片数，0表示关闭预读
+        """
+        self.card_processor = card_processor
+        self.depth = max(0, int(depth))
+        self._cards = []
+        self._page = None
+        self._config = None
+        self._queue = []
+        self._queued = set()
+        self._prefetched = set()
+        self._task = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        """重置统计"""
+        self.prefetched = 0          # 后台解析的卡片数
+        self.prefetch_seconds = 0.0  # 后台解析耗时
+        self.ready = 0               # 轮到处理时已解析好的卡片数
+        self.missed = 0              # 轮到处理时仍需前台解析的卡片数
+
+    def start(self, page, cards, config):
+        """
+        开始一批卡片的预读，取消上一批尚未完成的预读
+
+        Args:
+            page: Playwright页面对象
+            cards: CardExtractor.snapshot_cards返回的卡片快照列表
+            config: 规则配置
+        """
+        self.cancel()
+        self._page = page
+        self._cards = list(cards or [])
+        self._config = config
+        self._queue = []
+        self._queued = set()
+
+        # 配置中可以调整预读深度
+        depth = (config or {}).get('lookaheadDepth')
+        if depth is not None:
+            try:
+                self.depth = max(0, int(depth))
+            except (TypeError, ValueError):
+                print(f"⚠️ 无效的预读深度: {depth}，保持 {self.depth}")
+
+    def advance(self, index):
+        """
+        即将处理第index张卡片，安排其后depth张卡片进入预读队列
+
+        Args:
+            index: 当前卡片在快照列表中的索引
+        """
+        if self.depth <= 0:
+            return
+
+        for next_index in range(index + 1, min(index + 1 + self.depth, len(self._cards))):
+            if next_index not in self._queued:
+                self._queued.add(next_index)
+                self._queue.append(next_index)
+
+        if self._queue and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    def consume(self, snapshot):
+        """
+        前台开始处理某张卡片时调用，记录该卡片是否已被预读
+
+        Args:
+            snapshot: 卡片快照
+        """
+        if self.depth <= 0:
+            return
+        key = self._key(snapshot)
+        if key is not None and self.card_processor.processor.processed_ids.peek(key[0]):
+            # 已处理过的卡片会被直接跳过，不计入统计
+            return
+        if key is not None and key in self._prefetched:
+            self._prefetched.discard(key)
+            self.ready += 1
+        else:
+            self.missed += 1
+
+    def cancel(self):
+        """取消正在进行的预读"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        self._queue = []
+
+    def _key(self, snapshot):
+        """预读记录使用的卡片键"""
+        card_id = self.card_processor._snapshot_card_id(snapshot)
+        if card_id is None:
+            return None
+        return (card_id, snapshot.get('text') or '')
+
+    async def _run(self):
+        """后台预读任务，每解析一张卡片让出一次事件循环，不阻塞前台的页面操作"""
+        processor = self.card_processor.processor
+        try:
+            while self._queue:
+                if not processor.is_processing or processor.is_stop_requested():
+                    break
+
+                snapshot = self._cards[self._queue.pop(0)]
+                key = self._key(snapshot)
+                if key is not None and not await processor.processed_ids.contains(key[0]):
+                    start = time.monotonic()
+                    if self.card_processor.prefetch_snapshot(self._page, snapshot, self._config):
+                        self.prefetch_seconds += time.monotonic() - start
+                        self.prefetched += 1
+                        self._prefetched.add(key)
+
+                await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"卡片预读出错: {e}")
+            import traceback
+            traceback.print_exc()
+
+    def get_stats(self):
+        """
+        获取预读统计
+
+        Returns:
+            dict: 预读数量、预读耗时以及前台处理时卡片已就绪的比例
+        """
+        total = self.ready + self.missed
+        return {
+            "depth": self.depth,
+            "prefetched": self.prefetched,
+            "prefetchSeconds": round(self.prefetch_seconds, 3),
+            "ready": self.ready,
+            "missed": self.missed,
+            "overlapRatio": round(self.ready / total, 4) if total else 0.0
+        }
+
+    def print_stats(self):
+        """打印预读统计摘要"""
+        stats = self.get_stats()
+        print(f"🔭 卡片预读: 深度 {stats['depth']}, 后台解析 {stats['prefetched']} 张 ({stats['prefetchSeconds']}秒), "
+              f"就绪 {stats['ready']} 张, 前台解析 {stats['missed']} 张, 重叠率 {stats['overlapRatio'] * 100:.1f}%")
@@ -0,0 +1,136 @@
+"""
+卡片解析缓存模块
+缓存卡片文本的解析结果和卡片阶段评估结论，避免滚动后重复解析已渲染过的卡片
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+
+
+class CardParseCache:
+    """卡片解析缓存，以(卡片ID, 卡片文本摘要)为键的有界LRU缓存"""
+
+    def __init__(self, max_size=500):
+        """
+        初始化卡片解析缓存
+
+        Args:
+            max_size: 最大缓存条目数，超出后淘汰最久未使用的条目
+        """
+        self.max_size = max(1, int(max_size))
+        self._entries = OrderedDict()
+        self._config_digest = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def text_digest(text):
+        """
+        计算卡片文本摘要
+
+        Args:
+            text: 卡片文本
+
+        Returns:
+            str: 文本摘要
+        """
+        return hashlib.blake2b((text or "").encode("utf-8"), digest_size=16).hexdigest()
+
+    def ensure_config(self, config):
+        """
+        确认缓存对应的规则配置，配置变化时清空缓存（评估结论依赖配置）
+
+        Args:
+            config: 规则配置
+        """
+        # 每次都按内容计算摘要：配置可能被原地修改，或被替换成恰好复用了旧对象id的新对象，
+        # 按对象id判断会沿用过期的评估结论（配置只有几KB，序列化和摘要的开销远小于解析一张卡片）
+        try:
+            digest = hashlib.blake2b(
+                json.dumps(config, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"),
+                digest_size=16
+            ).hexdigest()
+        except Exception:
+            digest = None
+
+        if digest is None or digest != self._config_digest:
+            if self._entries:
+                print(f"规则配置已变化，清空卡片解析缓存 ({len(self._entries)} 条)")
+            self._entries.clear()
+        self._config_digest = digest
+
+    def get(self, card_id, card_text):
+        """
+        获取缓存的解析结果
+
+        Args:
+            card_id: 卡片ID
+            card_text: 卡片文本
+
+        Returns:
+            tuple: (resume_data副本, evaluation)，未命中时返回None
+        """
+        key = (card_id, self.text_digest(card_text))
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        resume_data, evaluation = entry
+        # 返回副本，调用方修改resume_data不影响缓存
+        return resume_data.copy(), evaluation
+
+    def contains(self, card_id, card_text):
+        """
+        检查是否已缓存解析结果（不计入命中统计）
+
+        Args:
+            card_id: 卡片ID
+            card_text: 卡片文本
+
+        Returns:
+            bool: 是否已缓存
+        """
+        return (card_id, self.text_digest(card_text)) in self._entries
+
+    def put(self, card_id, card_text, resume_data, evaluation):
+        """
+        写入解析结果
+
+        Args:
+            card_id: 卡片ID
+            card_text: 卡片文本
+            resume_data: 卡片解析出的简历数据
+            evaluation: 卡片阶段评估结果
+        """
+        key = (card_id, self.text_digest(card_text))
+        self._entries[key] = (resume_data.copy(), evaluation)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """清空缓存"""
+        self._entries.clear()
+
+    def get_stats(self):
+        """
+        获取缓存统计信息
+
+        Returns:
+            dict: 缓存条目数和命中情况
+        """
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxSize": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / total, 4) if total else 0.0
+        }
+
+    def __len__(self):
+        return len(self._entries)
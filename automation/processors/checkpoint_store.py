@@ -0,0 +1,155 @@
+"""
+自动化检查点模块
+定期把每个岗位的处理进度（批次、最后处理的候选人、列表位置、计数器）保存到数据库，
+断线重连或进程重启后可以快速滚动回原位置，而不必从列表顶部重新遍历
+"""
+
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import inspect, text
+
+from automation.database.db import engine, get_db_session
+from automation.database.models import AutomationCheckpoint
+
+
+class CheckpointStore:
+    """检查点存储，按岗位范围保存一条最新的检查点"""
+
+    def __init__(self, save_interval=30, max_age_hours=12):
+        """
+        初始化检查点存储
+
+        Args:
+            save_interval: 两次非强制保存之间的最短间隔（秒）
+            max_age_hours: 检查点有效时长，推荐列表会随时间刷新，过旧的检查点不再使用
+        """
+        self.save_interval = save_interval
+        self.max_age_hours = max_age_hours
+        self._last_save = 0.0
+        self._table_ready = False
+        self.saves = 0
+
+    def _ensure_table(self):
+        if not self._table_ready:
+            AutomationCheckpoint.__table__.create(bind=engine, checkfirst=True)
+            self._migrate_schema()
+            self._table_ready = True
+
+    @staticmethod
+    def _migrate_schema():
+        """为旧版本创建的检查点表补齐后来新增的列（旧检查点的interrupted为空，视为已结束）"""
+        columns = {column['name'] for column in inspect(engine).get_columns(AutomationCheckpoint.__tablename__)}
+        if 'interrupted' not in columns:
+            with engine.begin() as connection:
+                connection.execute(text(f"ALTER TABLE {AutomationCheckpoint.__tablename__} ADD COLUMN interrupted BOOLEAN"))
+
+    def load(self, job_key):
+        """
+        读取岗位的检查点
+
+        Args:
+            job_key: 岗位范围键
+
+        Returns:
+            dict: 检查点，没有或已过期时返回None
+        """
+        try:
+            self._ensure_table()
+            with get_db_session() as session:
+                record = session.query(AutomationCheckpoint).filter(
+                    AutomationCheckpoint.job_key == job_key
+                ).first()
+                if not record:
+                    return None
+                if record.updated_at and record.updated_at < datetime.now() - timedelta(hours=self.max_age_hours):
+                    print(f"岗位 {job_key} 的检查点已超过 {self.max_age_hours} 小时，从列表顶部开始")
+                    return None
+                return {
+                    "jobKey": record.job_key,
+                    "batchIndex": record.batch_index or 0,
+                    "lastCandidate": record.last_candidate_key,
+                    "cardCount": record.card_count or 0,
+                    "cardIndex": record.card_index or 0,
+                    "processedCount": record.processed_count or 0,
+                    "counters": record.counters or {},
+                    "interrupted": bool(record.interrupted),
+                    "updatedAt": record.updated_at.isoformat() if record.updated_at else None
+                }
+        except Exception as e:
+            print(f"⚠️ 读取检查点失败: {e}")
+            return None
+
+    def save(self, job_key, state, force=False):
+        """
+        保存检查点，非强制保存时按save_interval节流
+
+        Args:
+            job_key: 岗位范围键
+            state: 检查点内容（batchIndex, lastCandidate, cardCount, cardIndex, processedCount, counters,
+                interrupted表示运行是否尚未结束，默认为True）
+            force: 是否忽略节流立即保存
+
+        Returns:
+            bool: 是否已保存
+        """
+        now = time.monotonic()
+        if not force and now - self._last_save < self.save_interval:
+            return False
+
+        try:
+            self._ensure_table()
+            with get_db_session() as session:
+                record = session.query(AutomationCheckpoint).filter(
+                    AutomationCheckpoint.job_key == job_key
+                ).first()
+                if not record:
+                    record = AutomationCheckpoint(job_key=job_key)
+                    session.add(record)
+                record.batch_index = state.get("batchIndex", 0)
+                record.last_candidate_key = (state.get("lastCandidate") or None) and str(state.get("lastCandidate"))[:100]
+                record.card_count = state.get("cardCount", 0)
+                record.card_index = state.get("cardIndex", 0)
+                record.processed_count = state.get("processedCount", 0)
+                record.counters = state.get("counters")
+                record.interrupted = bool(state.get("interrupted", True))
+                record.updated_at = datetime.now()
+            self._last_save = now
+            self.saves += 1
+            return True
+        except Exception as e:
+            print(f"⚠️ 保存检查点失败: {e}")
+            return False
+
+    def clear(self, job_key):
+        """
+        删除岗位的检查点（列表已处理完时调用，下次从顶部开始）
+
+        Args:
+            job_key: 岗位范围键
+        """
+        try:
+            self._ensure_table()
+            with get_db_session() as session:
+                session.query(AutomationCheckpoint).filter(
+                    AutomationCheckpoint.job_key == job_key
+                ).delete(synchronize_session=False)
+        except Exception as e:
+            print(f"⚠️ 删除检查点失败: {e}")
+
+    def mark_finished(self, job_key):
+        """
+        标记岗位的运行已结束（正常停止或达到配额），保留列表位置，
+        但下次启动时不再恢复计数器，避免新一轮运行沿用上次的打招呼数量
+
+        Args:
+            job_key: 岗位范围键
+        """
+        try:
+            self._ensure_table()
+            with get_db_session() as session:
+                session.query(AutomationCheckpoint).filter(
+                    AutomationCheckpoint.job_key == job_key
+                ).update({"interrupted": False}, synchronize_session=False)
+        except Exception as e:
+            print(f"⚠️ 标记检查点失败: {e}")
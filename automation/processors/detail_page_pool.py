@@ -0,0 +1,383 @@
+"""
+详情页并行处理模块
+可选模式：在同一浏览器上下文的少量后台标签页中打开候选人详情页URL，并行完成提取和评估，
+评估结果再回到推荐列表上对应的卡片进行打招呼
+"""
+
+import asyncio
+import time
+
+from automation.processors.card_extractor import CardExtractor
+from automation.processors.enhanced_data_extractor import EnhancedDataExtractor
+from automation.processors.evaluation_helper import EvaluationHelper
+from automation.processors.resume_record import ResumeRecord
+
+
+class DetailPagePool:
+    """后台详情页池，同时打开的标签页数量有上限，打开详情页仍受节奏预算约束"""
+
+    # 后台标签页数量上限，配置的数量超过时按上限处理
+    MAX_SIZE = 4
+
+    # 启用时未指定数量的默认值
+    DEFAULT_SIZE = 2
+
+    def __init__(self, resume_processor):
+        """
+        初始化详情页池
+
+        Args:
+            resume_processor: 父简历处理器对象
+        """
+        self.processor = resume_processor
+        self.size = 0
+        self.url_template = None
+        self.extractor = EnhancedDataExtractor()
+        self._context = None
+        self._pages = []
+        self._idle_pages = []
+        self._slots = None
+        self._open_lock = None
+        self._tasks = {}
+        self._results = []
+        self.reset_stats()
+
+    def reset_stats(self):
+        """重置统计"""
+        self.submitted = 0        # 交给后台标签页的详情页数
+        self.completed = 0        # 完成评估的详情页数
+        self.failed = 0           # 打开或评估失败的详情页数
+        self.busy_seconds = 0.0   # 所有后台标签页处理耗时之和
+        self.max_in_flight = 0    # 同时处理的最大详情页数
+
+    def configure(self, config):
+        """
+        从规则配置中读取详情页池设置（config["detailPool"]）
+
+        配置示例:
+            "detailPool": {
+                "enabled": true,
+                "size": 2,
+                "urlTemplate": "https://www.zhipin.com/web/boss/resumeDetail?id={id}"
+            }
+
+        Args:
+            config: 规则配置
+        """
+        pool = (config or {}).get('detailPool') or {}
+        size = 0
+        if pool.get('enabled'):
+            try:
+                size = int(pool.get('size', self.DEFAULT_SIZE))
+            except (TypeError, ValueError):
+                print(f"⚠️ 无效的详情页池大小: {pool.get('size')}，使用默认值 {self.DEFAULT_SIZE}")
+                size = self.DEFAULT_SIZE
+            if size > self.MAX_SIZE:
+                print(f"⚠️ 详情页池大小 {size} 超过上限，使用 {self.MAX_SIZE}")
+            size = max(0, min(size, self.MAX_SIZE))
+
+        # 运行中更新配置时，正在处理的任务还持有旧信号量的名额，替换信号量会让同时打开的标签页超过上限
+        if self._tasks:
+            if size != self.size:
+                print("⚠️ 详情页池仍有未完成的任务，保持当前大小")
+            return
+
+        self.url_template = pool.get('urlTemplate') or None
+        if size == self.size and self._open_lock is not None:
+            return
+
+        self.size = size
+        self._slots = asyncio.Semaphore(size) if size else None
+        self._open_lock = asyncio.Lock()
+        if size:
+            print(f"🗂️ 详情页池已启用: {size} 个后台标签页")
+
+    @property
+    def enabled(self):
+        """是否启用了详情页池"""
+        return self.size > 0
+
+    @property
+    def has_pending(self):
+        """是否还有进行中的任务或未处理的结果（运行中关闭详情页池后也要把它们处理完）"""
+        return bool(self._tasks or self._results)
+
+    def detail_url_for(self, snapshot):
+        """
+        获取卡片对应的详情页URL：优先使用卡片内链接，其次按urlTemplate用卡片ID拼接
+
+        Args:
+            snapshot: 卡片快照
+
+        Returns:
+            str: 详情页URL，无法获取时返回None
+        """
+        if snapshot.get('detailUrl'):
+            return snapshot.get('detailUrl')
+        if self.url_template and snapshot.get('id'):
+            try:
+                return self.url_template.format(id=snapshot.get('id'))
+            except (KeyError, IndexError, ValueError) as e:
+                print(f"⚠️ 详情页URL模板无效: {e}")
+        return None
+
+    def in_flight(self, card_id):
+        """卡片是否正在后台标签页中处理"""
+        return card_id in self._tasks
+
+    async def submit(self, list_page, snapshot, card_id, simhash, resume_data, config):
+        """
+        把卡片的详情页交给后台标签页处理，没有空闲标签页时等待
+
+        Args:
+            list_page: 推荐列表所在的页面或iframe，打招呼时在其中重新定位卡片
+            snapshot: 卡片快照
+            card_id: 卡片ID
+            simhash: 卡片文本的SimHash
+            resume_data: 卡片阶段提取的简历数据
+            config: 规则配置
+
+        Returns:
+            bool: 是否已提交（未启用或没有详情页URL时返回False，由调用方走原有的点击流程）
+        """
+        if not self.enabled:
+            return False
+        if card_id in self._tasks:
+            return True
+        url = self.detail_url_for(snapshot)
+        if not url:
+            return False
+
+        await self._slots.acquire()
+        if self.processor.is_stop_requested():
+            self._slots.release()
+            return False
+
+        job = {
+            "listPage": list_page,
+            "snapshot": snapshot,
+            "cardId": card_id,
+            "simhash": simhash,
+            "resumeData": resume_data,
+            "config": config,
+            "url": url
+        }
+        self._tasks[card_id] = asyncio.create_task(self._run(job))
+        self.submitted += 1
+        self.max_in_flight = max(self.max_in_flight, len(self._tasks))
+        print(f"🗂️ 卡片 {card_id} 的详情页已交给后台标签页处理 (进行中 {len(self._tasks)}/{self.size})")
+        return True
+
+    async def _checkout(self, list_page, config=None):
+        """取出一个空闲的后台标签页，没有时在列表页所在的浏览器上下文中新建（并应用请求拦截策略）"""
+        if self._idle_pages:
+            return self._idle_pages.pop()
+        if self._context is None:
+            # 列表可能在iframe中，iframe没有context属性，需要通过其所属页面获取
+            owner = list_page if hasattr(list_page, 'context') else list_page.page
+            self._context = owner.context
+        page = await self._context.new_page()
+        self._pages.append(page)
+        request_policy = getattr(self.processor.browser, 'request_policy', None)
+        if request_policy is not None:
+            await request_policy.apply(page, config)
+        return page
+
+    def _checkin(self, page):
+        """归还后台标签页，已关闭的标签页直接丢弃"""
+        try:
+            if page.is_closed():
+                self._pages.remove(page)
+                return
+        except Exception:
+            pass
+        self._idle_pages.append(page)
+
+    async def _run(self, job):
+        """后台任务：打开详情页、提取并评估，结果等待回到列表页处理"""
+        card_id = job["cardId"]
+        card_resume_data = job["resumeData"]
+        start = time.monotonic()
+        page = None
+        result = {"job": job, "passed": False, "reason": "", "resumeData": card_resume_data, "aiEvaluation": None, "error": None}
+        try:
+            page = await self._checkout(job["listPage"], job["config"])
+
+            # 打开详情页的频率预算在各标签页之间共享
+            async with self._open_lock:
+                await self.processor.pacing.acquire('detail_open')
+            if self.processor.is_stop_requested():
+                result["error"] = "stopped"
+                return
+
+            await page.goto(job["url"], wait_until='domcontentloaded', timeout=15000)
+            await self.processor.detail_processor.readiness.wait_for_detail_ready(page)
+
+            resume_data = ResumeRecord.copy_of(card_resume_data)
+            detail_data = await self.extractor.extract_resume_data(page, None, self.processor.selectors)
+            if detail_data:
+                resume_data = await self.extractor.merge_resume_data(card_resume_data, detail_data)
+            else:
+                print(f"⚠️ 后台详情页未提取到数据，使用卡片数据评估: {card_id}")
+                resume_data['is_using_card_data_only'] = True
+            resume_data['link'] = job["url"]
+
+            passed, reject_reason = await EvaluationHelper.evaluate_resume(resume_data, job["config"])
+            try:
+                ai_evaluation = await EvaluationHelper.evaluate_keywords_ai(resume_data, job["config"])
+            except Exception as eval_error:
+                print(f"⚠️ 获取AI评估详细结果失败: {eval_error}")
+                ai_evaluation = {
+                    "score": 0,
+                    "passed": passed,
+                    "reason": reject_reason if not passed else "通过评估"
+                }
+
+            result.update({"passed": passed, "reason": reject_reason, "resumeData": resume_data, "aiEvaluation": ai_evaluation})
+            self.completed += 1
+            print(f"🗂️ 后台详情页评估完成: {resume_data.get('name')} -> {'通过' if passed else '未通过'}")
+        except asyncio.CancelledError:
+            result["error"] = "cancelled"
+        except Exception as e:
+            print(f"❌ 后台详情页处理出错 ({card_id}): {e}")
+            import traceback
+            traceback.print_exc()
+            result["error"] = str(e)
+            self.failed += 1
+        finally:
+            self.busy_seconds += time.monotonic() - start
+            if page is not None:
+                self._checkin(page)
+            self._results.append(result)
+            self._tasks.pop(card_id, None)
+            self._slots.release()
+
+    async def reconcile(self, wait=False, timeout=120):
+        """
+        在列表页上处理已完成的后台评估结果：通过的候选人在其卡片上打招呼，未通过的记录跳过
+
+        Args:
+            wait: 是否先等待所有进行中的详情页完成（重新获取卡片快照之前必须等待，
+                  否则旧快照的卡片标记会失效）
+            timeout: 等待的最长秒数
+
+        Returns:
+            int: 本次打招呼的人数
+        """
+        if wait and self._tasks:
+            print(f"🗂️ 等待 {len(self._tasks)} 个后台详情页处理完成...")
+            waiters = [asyncio.ensure_future(asyncio.wait(list(self._tasks.values()), timeout=timeout)),
+                       asyncio.ensure_future(self.processor.stop_event.wait())]
+            try:
+                await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.cancel()
+
+        results, self._results = self._results, []
+        greeted = 0
+        for result in results:
+            job = result["job"]
+            card_id = job["cardId"]
+            resume_data = result["resumeData"]
+
+            if result["error"]:
+                # 被取消的任务允许之后重新处理
+                if result["error"] not in ("cancelled", "stopped"):
+                    self.processor.processed_ids.add(card_id, job["simhash"])
+                continue
+
+            if not result["passed"]:
+                print(f"❌ 候选人 {resume_data.get('name')} 未通过筛选: {result['reason']}")
+                self.processor.processed_ids.add(card_id, job["simhash"])
+                self.processor.log_candidate(resume_data, "skip", result["reason"], result["aiEvaluation"])
+                continue
+
+            if self.processor.is_stop_requested():
+                # 未打招呼的候选人不标记为已处理，下次仍可处理
+                continue
+
+            max_count = self.processor.max_process_count
+            if max_count > 0 and self.processor.get_greeted_count() >= max_count:
+                print(f"已达到目标打招呼数量，候选人 {resume_data.get('name')} 留待下次处理")
+                continue
+
+            greet_button = await self._find_greet_button(job["listPage"], job["snapshot"])
+            if not greet_button:
+                print(f"❌ 候选人 {resume_data.get('name')} 通过筛选，但列表中未找到其打招呼按钮")
+                self.processor.processed_ids.add(card_id, job["simhash"])
+                continue
+
+            success = await self.processor.interaction_handler.greet_candidate(greet_button, resume_data, job["listPage"])
+            self.processor.processed_ids.add(card_id, job["simhash"])
+            if success:
+                greeted += 1
+                print(f"✅ 成功向候选人 {resume_data.get('name')} 打招呼")
+                self.processor.log_candidate(resume_data, "greet", "通过评估筛选", result["aiEvaluation"])
+            else:
+                print(f"❌ 向候选人 {resume_data.get('name')} 打招呼失败")
+        return greeted
+
+    async def _find_greet_button(self, list_page, snapshot):
+        """在列表页中重新定位卡片并查找打招呼按钮"""
+        if not snapshot.get('hasGreetButton'):
+            return None
+        card = await CardExtractor.resolve_card(list_page, snapshot)
+        if not card:
+            return None
+        for selector in self.processor.card_processor._greet_button_selectors() + ['button:has-text("打招呼")']:
+            try:
+                button = await card.query_selector(selector)
+            except Exception:
+                button = None
+            if button:
+                return button
+        return None
+
+    async def cancel(self):
+        """取消所有进行中的后台详情页"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            print(f"🗂️ 已取消 {len(tasks)} 个后台详情页")
+
+    async def close(self):
+        """取消进行中的任务并关闭所有后台标签页"""
+        await self.cancel()
+        self._results = []
+        for page in self._pages:
+            try:
+                await page.close()
+            except Exception:
+                pass
+        self._pages = []
+        self._idle_pages = []
+        self._context = None
+
+    def get_stats(self):
+        """
+        获取详情页池统计
+
+        Returns:
+            dict: 池大小、提交/完成/失败数量、最大并发数和后台处理耗时
+        """
+        return {
+            "size": self.size,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "inFlight": len(self._tasks),
+            "maxInFlight": self.max_in_flight,
+            "busySeconds": round(self.busy_seconds, 3)
+        }
+
+    def print_stats(self):
+        """打印详情页池统计摘要"""
+        if not self.enabled and not self.submitted:
+            return
+        stats = self.get_stats()
+        print(f"🗂️ 详情页池: 大小 {stats['size']}, 提交 {stats['submitted']} 个, 完成 {stats['completed']} 个, "
+              f"失败 {stats['failed']} 个, 最大并发 {stats['maxInFlight']}, 后台耗时 {stats['busySeconds']}秒")
@@ -6,8 +6,13 @@
 
 import re
 import uuid
-from typing import Dict, List, Optional, Any
-from playwright.async_api import Page, ElementHandle
+from typing import Dict, List, Optional, Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # 只用于类型注解，纯文本提取（离线基准测试）不需要安装Playwright
+    from playwright.async_api import Page, ElementHandle
+
+from automation.processors.resume_record import ResumeRecord
 
 
 class EnhancedDataExtractor:
@@ -45,39 +50,22 @@ class EnhancedDataExtractor:
             '云服务': ['AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', '微服务', '分布式'],
             '工具': ['Git', 'Jenkins', 'Maven', 'Gradle', 'npm', 'yarn', 'Linux', 'Windows']
         }
+        
+        # 记录最近一次提取命中的容器选择器及各选择器命中次数
+        self.last_container_selector = None
+        self.container_selector_stats = {}
 
-    async def extract_resume_data(self, page: Page, card_selector: str = None, selectors: dict = None) -> Dict[str, Any]:
+    async def extract_resume_data(self, page: "Page", card_selector: str = None, selectors: dict = None) -> Dict[str, Any]:
         """
         增强的简历数据提取器
         使用多种策略提取简历信息
         """
-        data = {}
+        data = ResumeRecord()
         
         try:
-            # 获取页面完整文本 - 修复：添加选择器参数
-            # 先尝试获取弹窗内容，如果没有则获取整个页面
-            full_text = None
-            
-            # 优先尝试获取BOSS直聘弹窗内容 - 按优先级排序
-            selectors_to_try = [
-                '.resume-detail-wrap',           # 简历详情主容器
-                '.dialog-wrap.active',           # 活动的弹窗
-                '.boss-dialog__body',            # 弹窗主体
-                '.lib-resume-recommend',         # 简历推荐容器
-                '#boss-dynamic-dialog-1it1ej9u8', # 特定的弹窗ID（如果存在）
-                '.dialog-wrap',                  # 通用弹窗
-                'body'                           # 最后尝试整个页面
-            ]
-            
-            for selector in selectors_to_try:
-                try:
-                    full_text = await page.text_content(selector)
-                    if full_text and len(full_text.strip()) > 100:  # 确保获取到了足够的内容
-                        print(f"✅ 成功使用选择器获取内容: {selector}")
-                        break
-                except Exception as e:
-                    print(f"❌ 选择器 {selector} 失败: {str(e)}")
-                    continue
+            # 获取页面完整文本
+            # 一次页面内探测同时检查所有候选容器，优先取弹窗内容，最后才回退到整个页面
+            full_text = await self._probe_container_text(page)
             
             if not full_text:
                 print("❌ 无法获取页面文本内容")
@@ -124,7 +112,92 @@ class EnhancedDataExtractor:
             
         return data
 
-    async def _extract_from_dom(self, page: Page, card_selector: str = None) -> Dict[str, Any]:
+    # 简历内容容器选择器 - 按优先级排序
+    CONTAINER_SELECTORS = [
+        '.resume-detail-wrap',           # 简历详情主容器
+        '.dialog-wrap.active',           # 活动的弹窗
+        '.boss-dialog__body',            # 弹窗主体
+        '.lib-resume-recommend',         # 简历推荐容器
+        '#boss-dynamic-dialog-1it1ej9u8', # 特定的弹窗ID（如果存在）
+        '.dialog-wrap',                  # 通用弹窗
+        'body'                           # 最后尝试整个页面
+    ]
+    
+    # 容器文本的最小有效长度
+    MIN_CONTAINER_TEXT_LENGTH = 100
+    
+    # 回退到body时最多截取的文本长度，避免整页文本进入后续正则提取
+    BODY_TEXT_LIMIT = 20000
+    
+    # 页面内容器探测脚本：一次性检查所有候选容器，返回第一个内容足够的容器文本
+    _CONTAINER_PROBE_SCRIPT = """
+        ({selectors, minLength, bodyLimit}) => {
+            let longest = null;
+            for (const selector of selectors) {
+                let el = null;
+                try {
+                    el = document.querySelector(selector);
+                } catch (e) {
+                    continue;
+                }
+                if (!el) continue;
+                
+                let text = el.textContent || '';
+                const length = text.trim().length;
+                const truncated = selector === 'body' && text.length > bodyLimit;
+                if (truncated) {
+                    text = text.slice(0, bodyLimit);
+                }
+                
+                if (length > minLength) {
+                    return {selector, text, length, truncated};
+                }
+                if (!longest || length > longest.length) {
+                    longest = {selector, text, length, truncated};
+                }
+            }
+            return longest;
+        }
+    """
+    
+    async def _probe_container_text(self, page: "Page") -> Optional[str]:
+        """
+        在页面内一次性探测所有简历容器，返回优先级最高且内容足够的容器文本
+        
+        Args:
+            page: Playwright页面或iframe对象
+            
+        Returns:
+            Optional[str]: 容器文本，未找到时返回None
+        """
+        try:
+            result = await page.evaluate(self._CONTAINER_PROBE_SCRIPT, {
+                "selectors": self.CONTAINER_SELECTORS,
+                "minLength": self.MIN_CONTAINER_TEXT_LENGTH,
+                "bodyLimit": self.BODY_TEXT_LIMIT
+            })
+        except Exception as e:
+            print(f"❌ 页面内容器探测失败: {str(e)}")
+            return None
+            
+        if not result or not result.get('text'):
+            self.last_container_selector = None
+            return None
+            
+        selector = result.get('selector')
+        self.last_container_selector = selector
+        self.container_selector_stats[selector] = self.container_selector_stats.get(selector, 0) + 1
+        
+        if result.get('length', 0) > self.MIN_CONTAINER_TEXT_LENGTH:
+            print(f"✅ 成功使用选择器获取内容: {selector}")
+        else:
+            print(f"⚠️ 所有容器内容都不足{self.MIN_CONTAINER_TEXT_LENGTH}字符，使用内容最多的容器: {selector}")
+        if result.get('truncated'):
+            print(f"⚠️ 页面文本过长，已截取前 {self.BODY_TEXT_LIMIT} 个字符")
+            
+        return result.get('text')
+
+    async def _extract_from_dom(self, page: "Page", card_selector: str = None) -> Dict[str, Any]:
         """
         使用DOM选择器精确提取信息
         
@@ -768,7 +841,7 @@ class EnhancedDataExtractor:
         Returns:
             dict: 合并后的数据
         """
-        merged_data = card_data.copy() if card_data else {}
+        merged_data = ResumeRecord.copy_of(card_data)
         
         if not detail_data:
             return merged_data
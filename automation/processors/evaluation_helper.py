@@ -15,6 +15,67 @@ from automation.utils.debug_logger import DebugLogger
 class EvaluationHelper:
     """评估帮助类，提供简历评估方法"""
     
+    @staticmethod
+    def get_card_stage_keywords(config):
+        """
+        获取卡片阶段使用的岗位关键词和竞对公司关键词（整合传统规则和AI配置）
+        
+        Args:
+            config: 规则配置
+            
+        Returns:
+            tuple: (岗位关键词列表, 竞对公司关键词列表)，岗位关键词中的列表项表示关键词组
+        """
+        position_keywords = []
+        for rule in config.get('rules', []):
+            if rule.get('type') == '岗位' and rule.get('enabled'):
+                position_keywords.extend(rule.get('keywords', []))
+        if config.get("targetPosition", ""):
+            position_keywords.append(config.get("targetPosition"))
+        
+        company_keywords = []
+        for rule in config.get("rules", []):
+            if rule.get("type") == "公司":
+                company_keywords.extend(rule.get("keywords", []))
+        if config.get("competitorCompany", ""):
+            company_keywords.append(config.get("competitorCompany"))
+        
+        return position_keywords, company_keywords
+    
+    @staticmethod
+    def compile_card_prefilter(config):
+        """
+        将卡片阶段的岗位规则编译为页面内预筛条件，供CardExtractor在页面中执行
+        
+        预筛只做保守的必要条件检查：卡片文本中一个岗位关键词（组）都不包含时，
+        evaluate_card_stage必然判定"期望职位不匹配"，这样的卡片不需要传回Python
+        
+        Args:
+            config: 规则配置
+            
+        Returns:
+            dict: 预筛条件 {positionGroups, companyKeywords}，无法预筛或已关闭时返回None
+        """
+        if not config or config.get('cardPrefilter') is False:
+            return None
+        
+        position_keywords, company_keywords = EvaluationHelper.get_card_stage_keywords(config)
+        
+        position_groups = []
+        for item in position_keywords:
+            group = [str(k) for k in item if k] if isinstance(item, list) else ([str(item)] if item else [])
+            if group:
+                position_groups.append(group)
+        
+        # 没有岗位关键词时所有卡片都会通过岗位检查，不需要预筛
+        if not position_groups:
+            return None
+        
+        return {
+            "positionGroups": position_groups,
+            "companyKeywords": [str(k) for k in company_keywords if k]
+        }
+    
     @staticmethod
     def evaluate_card_stage(resume_data, config):
         """
@@ -71,17 +132,9 @@ class EvaluationHelper:
         # 获取传统岗位规则
         position_rules = [r for r in config.get('rules', []) if r.get('type') == '岗位' and r.get('enabled')]
         
-        # 整合AI配置和传统规则的岗位关键词
-        position_keywords = []
-        
-        # 1. 从传统规则获取关键词
-        for rule in position_rules:
-            position_keywords.extend(rule.get('keywords', []))
-        
-        # 2. 从AI配置的目标岗位提取关键词
+        # 整合AI配置和传统规则的关键词
+        position_keywords, company_keywords = EvaluationHelper.get_card_stage_keywords(config)
         if target_position:
-            # 将目标岗位作为关键词添加
-            position_keywords.append(target_position)
             print(f"🤖 从AI配置添加目标岗位关键词: {target_position}")
         
         # 进行岗位匹配检查
@@ -158,16 +211,8 @@ class EvaluationHelper:
         # 打印公司信息提取过程
         DebugLogger.print_company_extraction(resume_data.get('company'), company_list)
         
-        # 整合传统规则和AI配置的竞对公司关键词
-        company_keywords = []
-        
-        # 1. 从传统规则获取关键词
-        for rule in company_rules:
-            company_keywords.extend(rule.get("keywords", []))
-        
-        # 2. 从AI配置的竞对公司提取关键词
+        # 竞对公司关键词已在上面整合
         if competitor_company:
-            company_keywords.append(competitor_company)
             print(f"🤖 从AI配置添加竞对公司关键词: {competitor_company}")
         
         # 进行竞对公司匹配
@@ -4,20 +4,24 @@
 """
 
 import random
-import asyncio
 import os
 import datetime
 
+from automation.processors.pacing_scheduler import PacingScheduler
+
 class InteractionHandler:
     """交互处理类，处理与候选人的互动"""
     
-    def __init__(self, log_dir=None):
+    def __init__(self, log_dir=None, pacing=None):
         """
         初始化交互处理器
         
         Args:
             log_dir: 日志目录路径，默认为None，会使用系统默认路径
+            pacing: 节奏调度器，默认创建一个使用默认预算的调度器
         """
+        self.pacing = pacing or PacingScheduler()
+        
         # 确保日志目录存在
         self.log_dir = log_dir or os.path.expanduser("~/Library/Application Support/SourcingCopilot/logs")
         os.makedirs(self.log_dir, exist_ok=True)
@@ -60,27 +64,19 @@ class InteractionHandler:
                     print(f"❌ 获取页面对象失败: {e}")
                     return False
             
-            # 随机延迟，模拟人工操作
-            delay = random.uniform(0.8, 1.5)
-            print(f"⏳ 模拟人工操作延迟 {delay:.1f}秒...")
-            await asyncio.sleep(delay)
+            # 打招呼频率预算，然后随机延迟，模拟人工操作
+            await self.pacing.acquire('greet')
+            delay = await self.pacing.pause('before_greet')
+            print(f"⏳ 已模拟人工操作延迟 {delay:.1f}秒")
             
             # 点击打招呼按钮
             print(f"🎯 点击打招呼按钮...")
             await button.click()
             print(f"✅ 已点击打招呼按钮")
             
-            # 等待操作完成，并在等待期间标记正在进行打招呼操作
-            completion_delay = random.uniform(1.0, 2.0)
-            print(f"⏳ 等待打招呼操作完成 {completion_delay:.1f}秒...")
-            
-            # 分段等待，确保在等待期间不会被其他操作干扰
-            segments = 4
-            segment_delay = completion_delay / segments
-            for i in range(segments):
-                await asyncio.sleep(segment_delay)
-                # 在等待期间可以添加额外的状态检查
-                print(f"⏳ 打招呼操作进行中... ({i+1}/{segments})")
+            # 等待操作完成
+            completion_delay = await self.pacing.pause('after_greet')
+            print(f"⏳ 已等待打招呼操作完成 {completion_delay:.1f}秒")
             
             # 记录候选人信息
             print(f"📊 记录候选人信息...")
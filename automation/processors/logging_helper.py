@@ -10,6 +10,7 @@ import os
 from candidate_repository import CandidateRepository
 from automation.database.models import CandidateStatus, OperationLog
 from automation.database.db import get_db_session
+from automation.processors.resume_record import ResumeRecord
 from datetime import datetime
 
 class LoggingHelper:
@@ -24,6 +25,86 @@ class LoggingHelper:
         """
         self.processor = resume_processor
         self.debug_level = 1  # 默认日志级别: 0=精简, 1=正常, 2=详细, 3=全部
+        self.reset_counters()
+        
+    # 按原因计数时保留的原因文本长度和最多原因种类，避免AI评估原因等长文本让计数无限增长
+    MAX_REASON_LENGTH = 50
+    MAX_REASON_KINDS = 100
+    OTHER_REASON = "其他"
+    
+    def reset_counters(self):
+        """重置会话计数器"""
+        self.processed_total = 0
+        self.greeted_total = 0
+        self.skipped_total = 0
+        self.reason_counts = {}
+        
+    def _count_candidate(self, action, reason, count=1):
+        """
+        增量更新会话计数器
+        
+        Args:
+            action: 执行的操作 ('greet'|'skip')
+            reason: 操作原因
+            count: 候选人数量
+        """
+        self.processed_total += count
+        if action == "greet":
+            self.greeted_total += count
+        elif action == "skip":
+            self.skipped_total += count
+            
+        reason_key = (reason or "").strip()[:self.MAX_REASON_LENGTH] or "未知"
+        if reason_key not in self.reason_counts and len(self.reason_counts) >= self.MAX_REASON_KINDS:
+            reason_key = self.OTHER_REASON
+        self.reason_counts[reason_key] = self.reason_counts.get(reason_key, 0) + count
+        
+    def restore_counters(self, counters):
+        """
+        从检查点恢复会话计数器（进程重启后继续计算配额）
+        
+        Args:
+            counters: get_counters返回的计数器快照
+        """
+        counters = counters or {}
+        self.processed_total = int(counters.get("processed", 0))
+        self.greeted_total = int(counters.get("greeted", 0))
+        self.skipped_total = int(counters.get("skipped", 0))
+        self.reason_counts = dict(counters.get("reasons") or {})
+        
+    def count_skipped(self, count, reason):
+        """
+        只计数、不写日志和数据库的跳过记录（用于页面内预筛排除的卡片）
+        
+        Args:
+            count: 跳过的候选人数量
+            reason: 跳过原因
+        """
+        if count > 0:
+            self._count_candidate("skip", reason, count)
+        
+    def get_greeted_count(self):
+        """
+        获取本次会话已打招呼的数量
+        
+        Returns:
+            int: 已打招呼数量
+        """
+        return self.greeted_total
+        
+    def get_counters(self):
+        """
+        获取会话计数器快照
+        
+        Returns:
+            dict: 已记录、已打招呼、已跳过数量以及按原因的计数
+        """
+        return {
+            "processed": self.processed_total,
+            "greeted": self.greeted_total,
+            "skipped": self.skipped_total,
+            "reasons": dict(self.reason_counts)
+        }
         
     def set_max_process_count(self, count):
         """
@@ -113,8 +194,14 @@ class LoggingHelper:
                 if ai_evaluation.get('concerns'):
                     print(f"   ⚠️ 关注点: {ai_evaluation.get('concerns')}")
             
-            # 保存到内存日志
+            # 保存到内存日志，并增量更新计数器（内存日志会截断，计数器不会）
             self.processor.candidates_log.append(log_entry)
+            self._count_candidate(action, reason)
+            
+            # 推入状态接口读取的最近处理记录
+            activity = getattr(self.processor.browser, "activity", None)
+            if activity is not None:
+                activity.record(log_entry)
             
             candidate_id = None
             
@@ -149,8 +236,8 @@ class LoggingHelper:
                     # 其他情况也标记为新候选人
                     status = CandidateStatus.NEW
                 
-                # 准备扩展的原始数据，包含AI评估信息
-                extended_raw_data = candidate_data.copy()
+                # 准备扩展的原始数据，包含AI评估信息（在数据库边界转换为普通dict）
+                extended_raw_data = ResumeRecord.wrap(candidate_data).to_dict()
                 if ai_evaluation:
                     extended_raw_data['ai_evaluation'] = ai_evaluation
                 
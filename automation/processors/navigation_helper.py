@@ -5,10 +5,154 @@
 
 import asyncio
 import random
+import time
 
 class NavigationHelper:
     """导航助手类，处理页面导航相关功能"""
     
+    # 卡片列表选择器，按顺序取第一个有结果的选择器计数
+    CARD_LIST_SELECTORS = [
+        '.card-list .card-item',
+        '.recommend-list .recommend-item',
+        '.geek-list .geek-item',
+        '.user-list .user-item',
+        '.list-wrap .list-item',
+        '.card'
+    ]
+    
+    # 列表结束提示文字
+    END_MARKER_TEXTS = ['没有更多', '全部加载完成', '已经到底了', 'No more', 'End of list']
+    
+    # 加载指示器
+    LOADING_SELECTOR = '.loading-more, .loading-text, .loading-spinner, .loading-indicator, .loading'
+    
+    # Boss直聘滚动加载时每批新增的卡片数
+    EXPECTED_BATCH_SIZE = 15
+    
+    # 安装新卡片观察器：MutationObserver在DOM变化后（合并50ms内的变化）重新计数卡片并检查结束提示，
+    # 状态保存在window.__scCardWatch，之后的状态查询和等待都只读取该状态
+    _CARD_WATCH_SCRIPT = """
+        ({cardSelectors, endTexts, loadingSelector}) => {
+            const isVisible = (el) => {
+                const rect = el.getBoundingClientRect();
+                const style = window.getComputedStyle(el);
+                return rect.width > 0 && rect.height > 0 && style.display !== 'none' && style.visibility !== 'hidden';
+            };
+            const countCards = () => {
+                for (const selector of cardSelectors) {
+                    let count = 0;
+                    try {
+                        count = document.querySelectorAll(selector).length;
+                    } catch (e) {}
+                    if (count > 0) return count;
+                }
+                return 0;
+            };
+            const hasEndMarker = () => endTexts.some(text => {
+                const result = document.evaluate(`//*[contains(text(), "${text}")]`, document, null,
+                    XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                for (let i = 0; i < result.snapshotLength; i++) {
+                    if (isVisible(result.snapshotItem(i))) return true;
+                }
+                return false;
+            });
+            const isLoading = () => {
+                try {
+                    return Array.from(document.querySelectorAll(loadingSelector)).some(isVisible);
+                } catch (e) {
+                    return false;
+                }
+            };
+
+            const previous = window.__scCardWatch;
+            if (previous) {
+                if (previous.observer) previous.observer.disconnect();
+                if (previous.timer) clearTimeout(previous.timer);
+            }
+
+            const watch = window.__scCardWatch = {
+                baseline: 0, count: 0, ended: false, lastChange: performance.now(), timer: null, observer: null
+            };
+            watch.refresh = () => {
+                watch.timer = null;
+                const count = countCards();
+                if (count !== watch.count) {
+                    watch.count = count;
+                    watch.lastChange = performance.now();
+                }
+                watch.ended = hasEndMarker();
+            };
+            watch.isLoading = isLoading;
+
+            watch.refresh();
+            watch.baseline = watch.count;
+            watch.observer = new MutationObserver(() => {
+                if (!watch.timer) watch.timer = setTimeout(watch.refresh, 50);
+            });
+            watch.observer.observe(document.body || document.documentElement, {childList: true, subtree: true});
+
+            return {
+                count: watch.count,
+                ended: watch.ended,
+                scrollY: window.scrollY,
+                viewportHeight: window.innerHeight,
+                pageHeight: document.body.scrollHeight
+            };
+        }
+    """
+    
+    # 读取观察器的当前状态
+    _CARD_WATCH_STATUS_SCRIPT = """
+        () => {
+            const watch = window.__scCardWatch;
+            if (!watch) return null;
+            watch.refresh();
+            return {
+                count: watch.count,
+                added: watch.count - watch.baseline,
+                ended: watch.ended,
+                loading: watch.isLoading(),
+                scrollY: window.scrollY,
+                pageHeight: document.body.scrollHeight
+            };
+        }
+    """
+    
+    # 在页面内等待：新增卡片达到minNew、出现结束提示、已有新增且settleMs内无变化，或超时
+    _CARD_WATCH_WAIT_SCRIPT = """
+        ({minNew, settleMs, timeoutMs}) => new Promise(resolve => {
+            const watch = window.__scCardWatch;
+            if (!watch) {
+                resolve(null);
+                return;
+            }
+            const start = performance.now();
+            const finish = (reason) => {
+                clearInterval(timer);
+                resolve({
+                    count: watch.count,
+                    added: watch.count - watch.baseline,
+                    ended: watch.ended,
+                    reason: reason,
+                    elapsedMs: performance.now() - start
+                });
+            };
+            const timer = setInterval(() => {
+                const now = performance.now();
+                const added = watch.count - watch.baseline;
+                if (added >= minNew) {
+                    finish('batch');
+                } else if (watch.ended) {
+                    finish('ended');
+                } else if (added > 0 && now - watch.lastChange >= settleMs) {
+                    finish('settled');
+                } else if (now - start >= timeoutMs) {
+                    finish('timeout');
+                }
+            }, 50);
+        })
+    """
+    
     def __init__(self, resume_processor):
         """
         初始化导航助手
@@ -39,6 +183,9 @@ class NavigationHelper:
                 print("🛑 检测到正在进行打招呼操作，暂停滚动操作")
                 return False
             
+            # 滚动加载频率预算
+            await self.processor.pacing.acquire('scroll')
+            
             # 使用精确的弹窗检测功能
             has_active_popup = await self.check_for_active_detail_popup(page)
             if has_active_popup:
@@ -61,95 +208,18 @@ class NavigationHelper:
             
             print("✅ 详情页已确认关闭且无活跃弹窗，开始滚动加载更多卡片...")
             
-            # 记录滚动前的卡片数量
-            before_card_count = await page.evaluate('''
-                () => {
-                    const selectors = [
-                        '.card-list .card-item',
-                        '.recommend-list .recommend-item',
-                        '.geek-list .geek-item',
-                        '.user-list .user-item',
-                        '.list-wrap .list-item',
-                        '.card'
-                    ];
-                    
-                    for (const selector of selectors) {
-                        const cards = document.querySelectorAll(selector);
-                        if (cards && cards.length > 0) {
-                            return cards.length;
-                        }
-                    }
-                    return 0;
-                }
-            ''')
-            
+            # 在卡片列表上安装MutationObserver，之后由页面内通知新卡片和列表结束，不再反复查询卡片数量
+            watch = await self._arm_card_watch(page)
+            before_card_count = watch.get('count', 0)
             print(f"当前页面卡片数量: {before_card_count}")
             
-            if before_card_count == 0:
-                print("未找到任何卡片，尝试多种选择器和方法查找")
-                
-                # 尝试执行更广泛的查找
-                expanded_card_count = await page.evaluate('''
-                    () => {
-                        // 扩展选择器数组，包含更多可能的选择器
-                        const expandedSelectors = [
-                            '.card-list .card-item',
-                            '.recommend-list .recommend-item',
-                            '.geek-list .geek-item',
-                            '.user-list .user-item',
-                            '.list-wrap .list-item',
-                            '.card',
-                            'div[data-id]',
-                            'div[data-geek]',
-                            'div[data-uid]',
-                            '.candidate-card',
-                            '.resume-card',
-                            '.candidate-list-content > div',
-                            '.recommend-list-content > div',
-                            '*:has(.candidate-name)',
-                            '*:has(.name-text)',
-                            '*:has(.candidate-position-text)',
-                            '*:has(.company-text)'
-                        ];
-                        
-                        let totalFound = 0;
-                        
-                        for (const selector of expandedSelectors) {
-                            try {
-                                const elements = document.querySelectorAll(selector);
-                                if (elements && elements.length > 0) {
-                                    console.log(`找到 ${elements.length} 个元素使用选择器: ${selector}`);
-                                    totalFound = Math.max(totalFound, elements.length);
-                                }
-                            } catch (e) {
-                                // 忽略选择器错误
-                            }
-                        }
-                        
-                        return totalFound;
-                    }
-                ''')
-                
-                if expanded_card_count > 0:
-                    print(f"使用扩展选择器找到了 {expanded_card_count} 个可能的卡片")
-                    before_card_count = expanded_card_count
-                else:
-                    print("即使使用扩展选择器也未找到任何卡片")
-            
-            # 获取当前视窗高度，用于小幅度滚动
-            viewport_height = await page.evaluate('window.innerHeight')
-            current_scroll_position = await page.evaluate('window.scrollY')
-            
-            # 获取页面总高度
-            page_height = await page.evaluate('''
-                Math.max(
-                    document.body.scrollHeight,
-                    document.body.offsetHeight,
-                    document.documentElement.clientHeight,
-                    document.documentElement.scrollHeight,
-                    document.documentElement.offsetHeight
-                )
-            ''')
+            if watch.get('ended'):
+                print("检测到列表结束提示，没有更多卡片")
+                return False
+            
+            viewport_height = watch.get('viewportHeight', 800)
+            current_scroll_position = watch.get('scrollY', 0)
+            page_height = watch.get('pageHeight', 0)
             
             print(f"当前滚动位置: {current_scroll_position}, 视窗高度: {viewport_height}, 页面总高度: {page_height}")
             
@@ -196,14 +266,14 @@ class NavigationHelper:
                 await page.evaluate(f'window.scrollBy(0, {random_scroll})')
                 
                 # 添加随机延迟，模拟人类思考和查看内容的时间
-                random_delay = random.uniform(0.5, 1.2)
+                random_delay = self.processor.pacing.sample('scroll_step')
                 
                 # 在延迟期间也要检查状态，分段检查
                 delay_segments = 4  # 将延迟分为4段检查
                 segment_delay = random_delay / delay_segments
                 
                 for i in range(delay_segments):
-                    await asyncio.sleep(segment_delay)
+                    await self.processor.pacing.sleep(segment_delay, 'scroll_step')
                     
                     # 在延迟期间检查详情页处理状态
                     if hasattr(self.processor, 'detail_processor') and self.processor.detail_processor.processing_detail:
@@ -226,152 +296,51 @@ class NavigationHelper:
                         print("🛑 延迟期间收到停止信号，停止滚动")
                         return False
                 
-                # 更新当前滚动位置
-                current_scroll_position = await page.evaluate('window.scrollY')
+                # 由页面内的MutationObserver判断是否已有新卡片、列表结束或正在加载
+                status = await self._card_watch_status(page)
+                current_scroll_position = status.get('scrollY', current_scroll_position)
+                page_height = status.get('pageHeight', page_height)
                 scroll_count += 1
                 
                 print(f"小幅度滚动 #{scroll_count}: 距离 {random_scroll}px, 当前位置 {current_scroll_position}px")
                 
-                # 检查是否有"正在加载中"提示
-                loading_indicators = [
-                    '.loading-more',
-                    '.loading-text',
-                    '.loading-spinner',
-                    '.loading-indicator',
-                    '.loading',
-                    '*:has-text("正在加载")',
-                    '*:has-text("加载中")',
-                    '*:has-text("loading")',
-                    '*:has-text("Loading")'
-                ]
-                
-                for indicator in loading_indicators:
-                    try:
-                        loading_element = await page.query_selector(indicator)
-                        if loading_element and await loading_element.is_visible():
-                            loading_text = await loading_element.text_content()
-                            print(f"检测到加载指示器: \"{loading_text}\"")
-                            loading_detected = True
-                            
-                            # 等待加载完成
-                            await asyncio.sleep(2)
-                            
-                            # 尝试检查加载指示器是否消失
-                            try:
-                                still_loading = await loading_element.is_visible()
-                                if not still_loading:
-                                    print("加载指示器已消失，可能已完成加载")
-                                else:
-                                    print("加载指示器仍然存在，继续等待...")
-                                    # 再等待一段时间
-                                    await asyncio.sleep(2)
-                            except Exception:
-                                print("无法检查加载指示器状态，假设已完成加载")
-                            
-                            break
-                    except Exception:
-                        pass
-                
-                # 如果检测到加载指示器，再等待一段时间确保新内容加载完成
-                if loading_detected:
-                    await asyncio.sleep(1.5)
+                if status.get('added', 0) > 0:
+                    print(f"滚动过程中发现新卡片: {status['added']} 个")
                     break
-                
-                # 检查当前卡片数量，如果增加了则表示加载成功
-                current_card_count = await page.evaluate('''
-                    () => {
-                        const selectors = [
-                            '.card-list .card-item',
-                            '.recommend-list .recommend-item',
-                            '.geek-list .geek-item',
-                            '.user-list .user-item',
-                            '.list-wrap .list-item',
-                            '.card'
-                        ];
-                        
-                        for (const selector of selectors) {
-                            const cards = document.querySelectorAll(selector);
-                            if (cards && cards.length > 0) {
-                                return cards.length;
-                            }
-                        }
-                        return 0;
-                    }
-                ''')
-                
-                if current_card_count > before_card_count:
-                    print(f"滚动过程中发现新卡片: {current_card_count - before_card_count} 个")
+                if status.get('ended'):
+                    print("滚动过程中检测到列表结束提示")
+                    break
+                if status.get('loading'):
+                    print("检测到加载指示器，等待新卡片挂载")
+                    loading_detected = True
                     break
             
             # 最后一次额外的小滚动，确保触发加载
-            if not loading_detected and scroll_count < max_scroll_count:
+            status = await self._card_watch_status(page)
+            if (not loading_detected and status.get('added', 0) == 0 and not status.get('ended')
+                    and scroll_count < max_scroll_count):
                 await page.evaluate(f'window.scrollBy(0, {scroll_step})')
-                await asyncio.sleep(1)
-            
-            # 最终检查卡片数量
-            after_card_count = await page.evaluate('''
-                () => {
-                    const selectors = [
-                        '.card-list .card-item',
-                        '.recommend-list .recommend-item',
-                        '.geek-list .geek-item',
-                        '.user-list .user-item',
-                        '.list-wrap .list-item',
-                        '.card'
-                    ];
-                    
-                    for (const selector of selectors) {
-                        const cards = document.querySelectorAll(selector);
-                        if (cards && cards.length > 0) {
-                            return cards.length;
-                        }
-                    }
-                    return 0;
-                }
-            ''')
+            
+            # 等待新一批卡片挂载或出现列表结束提示，等待时长由网络决定
+            result = await self._wait_for_new_cards(page)
+            after_card_count = result.get('count', before_card_count)
             
             print(f"滚动后卡片数量: {after_card_count} (之前: {before_card_count})")
             
             # 判断是否加载了更多卡片
-            if after_card_count > before_card_count:
-                print(f"成功加载了 {after_card_count - before_card_count} 个新卡片")
+            if result.get('added', 0) > 0:
+                new_cards = result['added']
+                print(f"成功加载了 {new_cards} 个新卡片，等待 {result.get('elapsedMs', 0):.0f}ms")
                 
                 # 批量加载检测 - Boss直聘通常一次加载15个
-                new_cards = after_card_count - before_card_count
                 if new_cards >= 10:
                     print(f"检测到批量加载，可能是一个新批次 (约 {new_cards} 个)")
                 
                 return True
             else:
-                # 如果没有检测到新卡片但检测到了加载指示器，可能是正在加载或加载失败
-                if loading_detected:
-                    print("检测到加载指示器但未加载到新卡片，可能需要更长时间或刷新")
-                    # 再次等待并检查
-                    await asyncio.sleep(3)
-                    final_check_count = await page.evaluate('''
-                        () => {
-                            const selectors = [
-                                '.card-list .card-item',
-                                '.recommend-list .recommend-item',
-                                '.geek-list .geek-item',
-                                '.user-list .user-item',
-                                '.list-wrap .list-item',
-                                '.card'
-                            ];
-                            
-                            for (const selector of selectors) {
-                                const cards = document.querySelectorAll(selector);
-                                if (cards && cards.length > 0) {
-                                    return cards.length;
-                                }
-                            }
-                            return 0;
-                        }
-                    ''')
-                    
-                    if final_check_count > before_card_count:
-                        print(f"最终检查: 成功加载了 {final_check_count - before_card_count} 个新卡片")
-                        return True
+                if result.get('ended'):
+                    print("检测到列表结束提示，没有更多卡片")
+                    return False
                 
                 # 尝试查找"加载更多"按钮
                 load_more_selectors = [
@@ -398,38 +367,14 @@ class NavigationHelper:
                             try:
                                 # 模拟人类行为：先将鼠标悬停在按钮上，然后点击
                                 await load_more_btn.hover()
-                                await asyncio.sleep(random.uniform(0.3, 0.7))
+                                await self.processor.pacing.pause('hover')
                                 await load_more_btn.click()
                                 print("已点击'加载更多'按钮")
                                 
-                                # 添加随机等待时间
-                                random_wait = random.uniform(1.5, 3.0)
-                                await asyncio.sleep(random_wait)
-                                
-                                # 再次检查卡片数量
-                                final_card_count = await page.evaluate('''
-                                    () => {
-                                        const selectors = [
-                                            '.card-list .card-item',
-                                            '.recommend-list .recommend-item',
-                                            '.geek-list .geek-item',
-                                            '.user-list .user-item',
-                                            '.list-wrap .list-item',
-                                            '.card'
-                                        ];
-                                        
-                                        for (const selector of selectors) {
-                                            const cards = document.querySelectorAll(selector);
-                                            if (cards && cards.length > 0) {
-                                                return cards.length;
-                                            }
-                                        }
-                                        return 0;
-                                    }
-                                ''')
-                                
-                                if final_card_count > after_card_count:
-                                    print(f"点击加载更多后，卡片数量增加到 {final_card_count}")
+                                # 等待新卡片挂载
+                                result = await self._wait_for_new_cards(page)
+                                if result.get('added', 0) > 0:
+                                    print(f"点击加载更多后，卡片数量增加到 {result.get('count')}")
                                     return True
                                 
                                 print("点击按钮后卡片数量未变化")
@@ -438,46 +383,6 @@ class NavigationHelper:
                     except Exception as e:
                         continue  # 忽略查找按钮错误，尝试下一个选择器
                 
-                # 检查是否已到达页面底部
-                bottom_reached = await page.evaluate('''
-                    () => {
-                        const scrollPosition = window.scrollY;
-                        const viewportHeight = window.innerHeight;
-                        const pageHeight = Math.max(
-                            document.body.scrollHeight,
-                            document.body.offsetHeight,
-                            document.documentElement.clientHeight,
-                            document.documentElement.scrollHeight,
-                            document.documentElement.offsetHeight
-                        );
-                        
-                        // 如果滚动位置+视窗高度接近页面总高度，说明已到达底部
-                        return (scrollPosition + viewportHeight) >= (pageHeight - 50);
-                    }
-                ''')
-                
-                if bottom_reached:
-                    print("已到达页面底部，可能没有更多内容")
-                    
-                    # 检查是否有"没有更多"或"已加载全部"等提示
-                    end_indicators = [
-                        '*:has-text("没有更多")',
-                        '*:has-text("全部加载完成")',
-                        '*:has-text("已经到底了")',
-                        '*:has-text("No more")',
-                        '*:has-text("End of list")'
-                    ]
-                    
-                    for indicator in end_indicators:
-                        try:
-                            end_element = await page.query_selector(indicator)
-                            if end_element and await end_element.is_visible():
-                                end_text = await end_element.text_content()
-                                print(f"检测到列表结束提示: \"{end_text}\"")
-                                return False
-                        except Exception:
-                            pass
-                
                 print("滚动后卡片数量未增加，尝试其他方法")
                 
                 # 尝试JavaScript触发滚动事件
@@ -513,7 +418,10 @@ class NavigationHelper:
                             }
                         }
                     ''')
-                    await asyncio.sleep(2)
+                    result = await self._wait_for_new_cards(page, timeout=3.0)
+                    if result.get('added', 0) > 0:
+                        print(f"触发滚动事件后加载了 {result['added']} 个新卡片")
+                        return True
                 except Exception as e:
                     print(f"JavaScript触发滚动事件出错: {e}")
                 
@@ -644,13 +552,13 @@ class NavigationHelper:
                 if close_button:
                     await close_button.click()
                     print(f"使用选择器 {selector} 关闭了详情页")
-                    await asyncio.sleep(0.5)
+                    await self.processor.detail_processor.readiness.wait_for_detail_closed(page)
                     return True
                     
             # 如果上面都失败，尝试使用ESC键关闭
             await page.keyboard.press('Escape')
             print("尝试使用ESC键关闭详情页")
-            await asyncio.sleep(0.5)
+            await self.processor.detail_processor.readiness.wait_for_detail_closed(page)
             
             return False
         except Exception as e:
@@ -750,7 +658,8 @@ class NavigationHelper:
                 # 优先使用ESC键关闭，因为这是最可靠的方法
                 print("使用ESC键关闭详情页...")
                 await page.keyboard.press('Escape')
-                await asyncio.sleep(1)  # 等待关闭动画完成
+                # 等待关闭动画完成（弹窗消失即返回）
+                await self.processor.detail_processor.readiness.wait_for_detail_closed(page)
                 
                 # 再次检查是否成功关闭
                 for indicator in detail_page_indicators:
@@ -779,12 +688,105 @@ class NavigationHelper:
             # 即使出错，也尝试按一次ESC键确保安全
             try:
                 await page.keyboard.press('Escape')
-                await asyncio.sleep(0.5)
+                await self.processor.detail_processor.readiness.wait_for_detail_closed(page, timeout=1.0)
                 print("出错后已尝试ESC键关闭可能的详情页")
             except:
                 pass
             return False
             
+    async def fast_forward(self, page, target_count, max_attempts=40):
+        """
+        连续滚动加载，直到列表中的卡片数量达到检查点记录的数量（只加载，不处理卡片）
+        
+        Args:
+            page: 页面对象
+            target_count: 目标卡片数量
+            max_attempts: 最多滚动加载次数
+            
+        Returns:
+            int: 最终加载的卡片数量
+        """
+        count = (await self._arm_card_watch(page)).get('count', 0)
+        attempts = 0
+        while count < target_count and attempts < max_attempts:
+            if self.processor.is_stop_requested():
+                break
+            attempts += 1
+            if not await self.go_to_next_page(page):
+                print(f"⏩ 快速滚动在 {count} 张卡片处无法继续加载")
+                break
+            count = (await self._card_watch_status(page)).get('count', count)
+            print(f"⏩ 快速滚动: 已加载 {count}/{target_count} 张卡片")
+        return count
+    
+    async def _arm_card_watch(self, page):
+        """
+        在页面中安装新卡片观察器，以当前卡片数量为基线
+        
+        Args:
+            page: 页面对象
+            
+        Returns:
+            dict: 当前卡片数量、是否已到列表结尾、滚动位置、视窗高度和页面高度，出错时返回空字典
+        """
+        try:
+            return await page.evaluate(self._CARD_WATCH_SCRIPT, {
+                "cardSelectors": self.CARD_LIST_SELECTORS,
+                "endTexts": self.END_MARKER_TEXTS,
+                "loadingSelector": self.LOADING_SELECTOR
+            }) or {}
+        except Exception as e:
+            print(f"⚠️ 安装新卡片观察器失败: {e}")
+            return {}
+    
+    async def _card_watch_status(self, page):
+        """
+        读取新卡片观察器的当前状态
+        
+        Args:
+            page: 页面对象
+            
+        Returns:
+            dict: 卡片数量、新增数量、是否到结尾、是否正在加载、滚动位置和页面高度，出错时返回空字典
+        """
+        try:
+            return await page.evaluate(self._CARD_WATCH_STATUS_SCRIPT) or {}
+        except Exception as e:
+            print(f"⚠️ 读取新卡片观察器状态失败: {e}")
+            return {}
+    
+    async def _wait_for_new_cards(self, page, min_new=None, timeout=8.0, settle_ms=400):
+        """
+        等待新卡片挂载，等待时长由页面实际加载决定，并记录到就绪等待的延迟直方图（card_batch）
+        
+        Args:
+            page: 页面对象
+            min_new: 新增多少张卡片即认为一批已加载完成，默认EXPECTED_BATCH_SIZE
+            timeout: 超时秒数
+            settle_ms: 已有新增卡片后，DOM静默多久认为这一批已加载完成（毫秒）
+            
+        Returns:
+            dict: 卡片数量、新增数量、是否到结尾、结束原因和等待毫秒数，出错时返回空字典
+        """
+        start = time.monotonic()
+        result = {}
+        try:
+            result = await asyncio.wait_for(
+                page.evaluate(self._CARD_WATCH_WAIT_SCRIPT, {
+                    "minNew": min_new or self.EXPECTED_BATCH_SIZE,
+                    "settleMs": settle_ms,
+                    "timeoutMs": int(timeout * 1000)
+                }),
+                timeout + 1.0
+            ) or {}
+        except Exception as e:
+            print(f"⚠️ 等待新卡片失败: {e}")
+        
+        readiness = getattr(getattr(self.processor, 'detail_processor', None), 'readiness', None)
+        if readiness is not None:
+            readiness.record('card_batch', start, timed_out=result.get('reason') in (None, 'timeout'))
+        return result
+    
     async def scroll_page(self, page, distance):
         """
         滚动页面指定距离
@@ -800,8 +802,11 @@ class NavigationHelper:
             # 首先确保详情页已关闭，避免在详情页中滑动
             await self.ensure_detail_page_closed(page)
             
-            # 记录滚动前位置
-            before_position = await page.evaluate("window.scrollY")
+            # 记录滚动前位置，同时安装新卡片观察器
+            watch = await self._arm_card_watch(page)
+            before_position = watch.get('scrollY')
+            if before_position is None:
+                before_position = await page.evaluate("window.scrollY")
             target_position = before_position + distance
             
             # 分段滚动，使行为更像人类
@@ -830,33 +835,23 @@ class NavigationHelper:
                 total_scrolled += current_scroll
                 
                 # 随机延迟，模拟人类思考和查看
-                delay = random.uniform(0.2, 0.6)
-                await asyncio.sleep(delay)
+                await self.processor.pacing.pause('scroll_segment')
                 
                 # 获取当前滚动位置
                 current_position = await page.evaluate("window.scrollY")
                 print(f"滚动段 {i+1}/{segments}: 滚动了 {current_scroll:.1f}px, 当前位置 {current_position}px")
-                
-                # 检查是否有加载指示器
-                try:
-                    loading_indicators = [
-                        '.loading-more', '.loading-text', '.loading-spinner',
-                        '.loading-indicator', '.loading',
-                        '*:has-text("正在加载")', '*:has-text("加载中")'
-                    ]
-                    
-                    for indicator in loading_indicators:
-                        loading_element = await page.query_selector(indicator)
-                        if loading_element and await loading_element.is_visible():
-                            loading_text = await loading_element.text_content() or "加载中"
-                            print(f"检测到加载指示器: \"{loading_text}\"，等待加载完成...")
-                            await asyncio.sleep(2)  # 等待加载完成
-                            break
-                except Exception:
-                    pass  # 忽略检查加载指示器的错误
+            
+            # 滚动触发了加载时，等待新卡片挂载而不是固定等待
+            status = await self._card_watch_status(page)
+            if status.get('loading'):
+                print("检测到加载指示器，等待新卡片挂载...")
+                await self._wait_for_new_cards(page, min_new=1, timeout=5.0)
+                status = await self._card_watch_status(page)
             
             # 最终检查滚动结果
-            final_position = await page.evaluate("window.scrollY")
+            final_position = status.get('scrollY')
+            if final_position is None:
+                final_position = await page.evaluate("window.scrollY")
             total_scrolled = final_position - before_position
             
             print(f"滚动完成: 从 {before_position}px 到 {final_position}px, 实际滚动了 {total_scrolled}px")
@@ -874,7 +869,7 @@ class NavigationHelper:
                 if abs(remaining) > 50:  # 如果差距较大，尝试额外滚动
                     print(f"尝试额外滚动 {remaining}px 以达到目标")
                     await page.evaluate(f"window.scrollBy(0, {remaining})")
-                    await asyncio.sleep(0.5)
+                    await self.processor.pacing.pause('scroll_segment')
                     
                     # 再次检查
                     extra_position = await page.evaluate("window.scrollY")
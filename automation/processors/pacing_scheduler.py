@@ -0,0 +1,269 @@
+"""
+节奏调度模块
+统一管理所有刻意的人工模拟延迟和动作频率预算，并统计节奏等待与实际工作的时间占比
+"""
+
+import asyncio
+import random
+import time
+
+
+class PacingScheduler:
+    """节奏调度器，所有模拟人工操作的延迟都通过它执行"""
+
+    # 各类延迟的默认区间（秒），与原先分散在各模块中的random.uniform区间一致
+    DEFAULT_DELAYS = {
+        'page_start': (0.5, 1.5),      # 开始处理一页前
+        'card_gap': (0.3, 0.8),        # 相邻卡片之间
+        'hover': (0.3, 0.7),           # 悬停后再点击
+        'before_greet': (0.8, 1.5),    # 点击打招呼前
+        'after_greet': (1.0, 2.0),     # 点击打招呼后
+        'scroll_step': (0.5, 1.2),     # 小幅滚动之间查看内容
+        'scroll_segment': (0.2, 0.6),  # 平滑滚动的分段间隔
+        'batch_load': (2.5, 4.0),      # 滚动加载新批次后
+        'load_more': (1.5, 3.0),       # 点击“加载更多”后
+        'before_reload': (1.0, 2.0),   # 刷新页面前
+        'after_reload': (2.0, 3.5),    # 刷新页面后
+        'retry': (1.5, 2.5)            # 出错重试前
+    }
+
+    # 默认动作预算：全部为0（不限制），保持原有的处理节奏；需要限速时在config["pacing"]中开启
+    DEFAULT_BUDGETS = {
+        'greetsPerMinute': 0,           # 每分钟最多打招呼次数，0表示不限制
+        'detailOpensPerMinute': 0,      # 每分钟最多打开详情页次数，0表示不限制
+        'scrollIntervalSeconds': 0.0    # 两次滚动加载之间的最短间隔，0表示不限制
+    }
+
+    # 预算名称与动作的对应关系
+    _ACTION_BUDGETS = {
+        'greet': 'greetsPerMinute',
+        'detail_open': 'detailOpensPerMinute',
+        'scroll': 'scrollIntervalSeconds'
+    }
+
+    def __init__(self, stop_event_getter=None):
+        """
+        初始化节奏调度器
+
+        Args:
+            stop_event_getter: 返回停止事件的函数，停止事件被设置时立即结束等待
+        """
+        self.stop_event_getter = stop_event_getter
+        self.delays = dict(self.DEFAULT_DELAYS)
+        self.budgets = dict(self.DEFAULT_BUDGETS)
+        self.jitter = 'uniform'       # 延迟分布: uniform | normal
+        self.budget_jitter = 0.2      # 预算间隔的随机上浮比例
+        self.delay_scale = 1.0        # 所有延迟的整体缩放系数
+        self._last_action = {}
+        self._action_locks = {}       # 每类动作一把锁，并发调用者依次占用时间槽
+        self.reset_stats()
+
+    def configure(self, config=None):
+        """
+        从规则配置中读取节奏设置（config["pacing"]）
+        动作预算默认关闭，只有配置中给出大于0的值时才限制频率
+
+        配置示例:
+            "pacing": {
+                "greetsPerMinute": 10,
+                "detailOpensPerMinute": 20,
+                "scrollIntervalSeconds": 3,
+                "jitter": "normal",
+                "budgetJitter": 0.2,
+                "delayScale": 0.8,
+                "delays": {"card_gap": [0.3, 0.8]}
+            }
+
+        Args:
+            config: 规则配置
+        """
+        pacing = (config or {}).get('pacing') or {}
+
+        self.delays = dict(self.DEFAULT_DELAYS)
+        self.budgets = dict(self.DEFAULT_BUDGETS)
+
+        for key in self.DEFAULT_BUDGETS:
+            if key in pacing:
+                try:
+                    self.budgets[key] = max(0.0, float(pacing[key]))
+                except (TypeError, ValueError):
+                    print(f"⚠️ 无效的节奏预算 {key}: {pacing[key]}，使用默认值")
+
+        for kind, value in (pacing.get('delays') or {}).items():
+            try:
+                low, high = float(value[0]), float(value[1])
+                self.delays[kind] = (max(0.0, min(low, high)), max(0.0, low, high))
+            except (TypeError, ValueError, IndexError):
+                print(f"⚠️ 无效的延迟区间 {kind}: {value}，使用默认值")
+
+        self.jitter = pacing.get('jitter', 'uniform') if pacing.get('jitter') in ('uniform', 'normal') else 'uniform'
+        try:
+            self.budget_jitter = max(0.0, float(pacing.get('budgetJitter', 0.2)))
+            self.delay_scale = max(0.0, float(pacing.get('delayScale', 1.0)))
+        except (TypeError, ValueError):
+            self.budget_jitter = 0.2
+            self.delay_scale = 1.0
+
+        def describe(key, unit):
+            value = self.budgets[key]
+            return f"{value:g}{unit}" if value > 0 else "不限制"
+
+        print(f"⏱️ 节奏配置: 打招呼 {describe('greetsPerMinute', '/分钟')}, 详情页 {describe('detailOpensPerMinute', '/分钟')}, "
+              f"滚动间隔 {describe('scrollIntervalSeconds', '秒')}, 分布 {self.jitter}, 延迟系数 {self.delay_scale}")
+
+    def reset_stats(self):
+        """重置统计"""
+        self.started_at = time.monotonic()
+        self.pacing_seconds = 0.0
+        self.by_kind = {}
+        self.action_counts = {}
+
+    def sample(self, kind):
+        """
+        按配置的分布抽取一个延迟时长
+
+        Args:
+            kind: 延迟类型
+
+        Returns:
+            float: 延迟秒数
+        """
+        low, high = self.delays.get(kind, (0.0, 0.0))
+        if high <= low:
+            value = low
+        elif self.jitter == 'normal':
+            # 截断正态分布：均值取区间中点，区间覆盖±3σ
+            mean = (low + high) / 2
+            value = min(high, max(low, random.gauss(mean, (high - low) / 6)))
+        else:
+            value = random.uniform(low, high)
+        return value * self.delay_scale
+
+    def _stop_event(self):
+        if self.stop_event_getter is None:
+            return None
+        try:
+            return self.stop_event_getter()
+        except Exception:
+            return None
+
+    async def sleep(self, seconds, kind):
+        """
+        执行一段节奏等待并计入统计，收到停止信号时提前结束
+
+        Args:
+            seconds: 等待秒数
+            kind: 延迟类型（用于统计）
+
+        Returns:
+            bool: 是否完整等待（收到停止信号时返回False）
+        """
+        if seconds <= 0:
+            return True
+
+        start = time.monotonic()
+        completed = True
+        stop_event = self._stop_event()
+        try:
+            if stop_event is not None:
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=seconds)
+                    completed = False
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(seconds)
+        finally:
+            elapsed = time.monotonic() - start
+            self.pacing_seconds += elapsed
+            stats = self.by_kind.setdefault(kind, {'count': 0, 'seconds': 0.0})
+            stats['count'] += 1
+            stats['seconds'] += elapsed
+        return completed
+
+    async def pause(self, kind):
+        """
+        按延迟类型抽样并等待
+
+        Args:
+            kind: 延迟类型
+
+        Returns:
+            float: 实际抽取的延迟秒数
+        """
+        delay = self.sample(kind)
+        await self.sleep(delay, kind)
+        return delay
+
+    async def acquire(self, action):
+        """
+        在执行受预算约束的动作前调用，必要时等待直到预算允许
+        （同类动作的并发调用者依次占用时间槽，不会在同一时刻一起通过）
+
+        Args:
+            action: 动作类型 ('greet' | 'detail_open' | 'scroll')
+
+        Returns:
+            float: 为满足预算而等待的秒数
+        """
+        budget_key = self._ACTION_BUDGETS.get(action)
+        interval = 0.0
+        if budget_key:
+            value = self.budgets.get(budget_key, 0)
+            if budget_key == 'scrollIntervalSeconds':
+                interval = value
+            elif value > 0:
+                interval = 60.0 / value
+
+        lock = self._action_locks.get(action)
+        if lock is None:
+            lock = self._action_locks[action] = asyncio.Lock()
+
+        async with lock:
+            waited = 0.0
+            now = time.monotonic()
+            last = self._last_action.get(action)
+            if interval > 0 and last is not None:
+                interval *= 1.0 + random.uniform(0, self.budget_jitter)
+                waited = max(0.0, last + interval - now)
+
+            # 等待前先占用时间槽，下一个调用者从这个时间点开始计算间隔
+            self._last_action[action] = now + waited
+            self.action_counts[action] = self.action_counts.get(action, 0) + 1
+            if waited > 0:
+                print(f"⏱️ {action} 频率预算限制，等待 {waited:.1f} 秒")
+                await self.sleep(waited, f"budget:{action}")
+        return waited
+
+    def get_stats(self):
+        """
+        获取节奏统计：节奏等待时间与实际工作时间
+
+        Returns:
+            dict: 统计信息
+        """
+        wall = time.monotonic() - self.started_at
+        working = max(0.0, wall - self.pacing_seconds)
+        minutes = wall / 60 if wall > 0 else 0
+        return {
+            'wallSeconds': round(wall, 2),
+            'pacingSeconds': round(self.pacing_seconds, 2),
+            'workingSeconds': round(working, 2),
+            'pacingRatio': round(self.pacing_seconds / wall, 4) if wall > 0 else 0.0,
+            'byKind': {
+                kind: {'count': stats['count'], 'seconds': round(stats['seconds'], 2)}
+                for kind, stats in self.by_kind.items()
+            },
+            'actions': dict(self.action_counts),
+            'actionsPerMinute': {
+                action: round(count / minutes, 2) if minutes else 0.0
+                for action, count in self.action_counts.items()
+            },
+            'budgets': dict(self.budgets)
+        }
+
+    def print_stats(self):
+        """打印节奏统计摘要"""
+        stats = self.get_stats()
+        print(f"⏱️ 节奏统计: 总耗时 {stats['wallSeconds']}秒, 节奏等待 {stats['pacingSeconds']}秒 "
+              f"({stats['pacingRatio'] * 100:.1f}%), 实际工作 {stats['workingSeconds']}秒, 动作 {stats['actions']}")
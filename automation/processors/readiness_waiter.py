@@ -0,0 +1,367 @@
+"""
+就绪等待模块
+用页面的实际就绪信号（容器出现、网络请求静默、DOM稳定、弹窗关闭）代替固定时长的等待，
+并把每次等待的耗时记录到延迟直方图中
+"""
+
+import asyncio
+import time
+
+
+class LatencyHistogram:
+    """延迟直方图，按固定毫秒分桶统计等待耗时"""
+
+    # 分桶上界（毫秒）
+    BUCKETS_MS = (50, 100, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000, 8000)
+
+    def __init__(self, name):
+        """
+        初始化延迟直方图
+
+        Args:
+            name: 直方图名称
+        """
+        self.name = name
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.timeouts = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, seconds, timed_out=False):
+        """
+        记录一次等待耗时
+
+        Args:
+            seconds: 等待耗时（秒）
+            timed_out: 是否因超时结束
+        """
+        ms = seconds * 1000
+        index = len(self.BUCKETS_MS)
+        for i, upper in enumerate(self.BUCKETS_MS):
+            if ms <= upper:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        if timed_out:
+            self.timeouts += 1
+
+    def percentile(self, p):
+        """
+        估算百分位耗时（取所在分桶的上界）
+
+        Args:
+            p: 百分位（0~100）
+
+        Returns:
+            float: 耗时毫秒数
+        """
+        if not self.count:
+            return 0.0
+        target = self.count * p / 100.0
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target and count:
+                return float(self.BUCKETS_MS[i]) if i < len(self.BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self):
+        """
+        获取直方图快照
+
+        Returns:
+            dict: 统计信息
+        """
+        buckets = {}
+        for i, upper in enumerate(self.BUCKETS_MS):
+            buckets[f"<={upper}ms"] = self.counts[i]
+        buckets[f">{self.BUCKETS_MS[-1]}ms"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "timeouts": self.timeouts,
+            "meanMs": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "p50Ms": self.percentile(50),
+            "p90Ms": self.percentile(90),
+            "p99Ms": self.percentile(99),
+            "maxMs": round(self.max_ms, 1),
+            "buckets": buckets
+        }
+
+
+class ReadinessWaiter:
+    """就绪等待器，等待页面的具体就绪信号并记录延迟"""
+
+    # 简历详情内容容器
+    DETAIL_CONTAINER_SELECTORS = [
+        '.resume-detail-wrap',
+        '.geek-base-info-wrap',
+        '.geek-expect-wrap',
+        '.geek-work-experience-wrap',
+        # 推荐列表页本身也有.lib-resume-recommend，只认详情弹窗内的
+        '.dialog-wrap.active .lib-resume-recommend',
+        '.boss-dialog__body .lib-resume-recommend',
+        '.boss-dialog__body'
+    ]
+
+    # 详情弹窗，全部不可见时认为详情页已关闭
+    DETAIL_DIALOG_SELECTORS = [
+        '.dialog-wrap.active',
+        '.boss-dialog__body'
+    ]
+
+    # 进行中的请求超过该时长（毫秒）仍未结束时视为长轮询，不再阻止稳定
+    MAX_PENDING_MS = 5000
+
+    # 页面内稳定性探测：DOM无变化、没有进行中的XHR/fetch请求，并且最近一次请求结束后持续quietMs，认为稳定。
+    # 进行中的请求通过包装fetch和XMLHttpRequest.send直接计数（每个文档只安装一次），
+    # 不依赖资源计时条目（请求完成后才有条目，且缓冲区满后不再增加）；
+    # 超过maxPendingMs仍未结束的请求（长轮询）不再阻止稳定
+    _SETTLE_SCRIPT = """
+        ({selector, quietMs, timeoutMs, maxPendingMs}) => new Promise(resolve => {
+            const tracker = window.__sourcingNetTracker || (() => {
+                const t = {pending: new Map(), nextId: 0, lastActivity: performance.now()};
+                const begin = () => {
+                    const id = t.nextId++;
+                    t.pending.set(id, performance.now());
+                    t.lastActivity = performance.now();
+                    return id;
+                };
+                const end = (id) => {
+                    if (t.pending.delete(id)) {
+                        t.lastActivity = performance.now();
+                    }
+                };
+                const originalFetch = window.fetch;
+                if (typeof originalFetch === 'function') {
+                    window.fetch = function (...args) {
+                        const id = begin();
+                        try {
+                            const result = originalFetch.apply(this, args);
+                            Promise.resolve(result).then(() => end(id), () => end(id));
+                            return result;
+                        } catch (e) {
+                            end(id);
+                            throw e;
+                        }
+                    };
+                }
+                if (window.XMLHttpRequest) {
+                    const originalSend = XMLHttpRequest.prototype.send;
+                    XMLHttpRequest.prototype.send = function (...args) {
+                        const id = begin();
+                        this.addEventListener('loadend', () => end(id), {once: true});
+                        try {
+                            return originalSend.apply(this, args);
+                        } catch (e) {
+                            end(id);
+                            throw e;
+                        }
+                    };
+                }
+                Object.defineProperty(window, '__sourcingNetTracker', {value: t, enumerable: false});
+                return t;
+            })();
+            const inFlight = (now) => {
+                let count = 0;
+                tracker.pending.forEach(started => {
+                    if (now - started < maxPendingMs) count += 1;
+                });
+                return count;
+            };
+
+            const root = (selector && document.querySelector(selector)) || document.body || document.documentElement;
+            const start = performance.now();
+            let lastChange = start;
+            const observer = new MutationObserver(() => { lastChange = performance.now(); });
+            if (root) {
+                observer.observe(root, {childList: true, subtree: true, characterData: true, attributes: true});
+            }
+
+            const finish = (stable) => {
+                clearInterval(timer);
+                observer.disconnect();
+                resolve({stable: stable, elapsed: performance.now() - start});
+            };
+
+            const timer = setInterval(() => {
+                const now = performance.now();
+                if (inFlight(now) > 0) {
+                    lastChange = now;
+                } else {
+                    lastChange = Math.max(lastChange, Math.min(tracker.lastActivity, now));
+                }
+                if (now - lastChange >= quietMs) {
+                    finish(true);
+                } else if (now - start >= timeoutMs) {
+                    finish(false);
+                }
+            }, 50);
+        })
+    """
+
+    # 判断详情弹窗是否已全部关闭
+    _DIALOG_CLOSED_SCRIPT = """
+        (selectors) => !selectors.some(selector => {
+            let elements = [];
+            try {
+                elements = Array.from(document.querySelectorAll(selector));
+            } catch (e) {
+                return false;
+            }
+            return elements.some(el => {
+                const rect = el.getBoundingClientRect();
+                const style = window.getComputedStyle(el);
+                return rect.width > 0 && rect.height > 0 && style.display !== 'none' && style.visibility !== 'hidden';
+            });
+        })
+    """
+
+    def __init__(self):
+        """初始化就绪等待器"""
+        self.histograms = {}
+
+    def _record(self, name, start, timed_out=False):
+        """记录一次等待耗时"""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram(name)
+        histogram.record(time.monotonic() - start, timed_out)
+
+    def record(self, name, start, timed_out=False):
+        """
+        记录一次由其他模块执行的等待（如滚动后等待新卡片）
+
+        Args:
+            name: 直方图名称
+            start: 等待开始时的time.monotonic()
+            timed_out: 是否因超时结束
+        """
+        self._record(name, start, timed_out)
+
+    async def wait_for_container(self, target, selectors=None, timeout=5.0):
+        """
+        等待简历内容容器出现
+
+        Args:
+            target: Playwright页面或iframe对象
+            selectors: 容器选择器列表，默认使用DETAIL_CONTAINER_SELECTORS
+            timeout: 超时秒数
+
+        Returns:
+            bool: 容器是否已出现
+        """
+        start = time.monotonic()
+        try:
+            await target.wait_for_selector(
+                ", ".join(selectors or self.DETAIL_CONTAINER_SELECTORS),
+                state='attached',
+                timeout=int(timeout * 1000)
+            )
+            self._record('detail_container', start)
+            return True
+        except Exception as e:
+            print(f"⚠️ 等待简历容器超时（{timeout}秒）: {e}")
+            self._record('detail_container', start, timed_out=True)
+            return False
+
+    async def wait_for_settle(self, target, selector=None, quiet_ms=300, timeout=3.0, name='dom_settle'):
+        """
+        等待DOM和网络请求稳定（没有进行中的XHR/fetch请求，且quiet_ms内没有DOM变化和请求结束）
+
+        Args:
+            target: Playwright页面或iframe对象
+            selector: 观察的根元素选择器，默认整个body
+            quiet_ms: 静默时长（毫秒）
+            timeout: 超时秒数
+            name: 记录到的直方图名称
+
+        Returns:
+            bool: 是否在超时前稳定
+        """
+        start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(
+                target.evaluate(self._SETTLE_SCRIPT, {
+                    "selector": selector,
+                    "quietMs": quiet_ms,
+                    "timeoutMs": int(timeout * 1000),
+                    "maxPendingMs": self.MAX_PENDING_MS
+                }),
+                timeout + 1.0
+            )
+            stable = bool(result and result.get('stable'))
+            self._record(name, start, timed_out=not stable)
+            return stable
+        except Exception as e:
+            print(f"⚠️ 等待页面稳定失败: {e}")
+            self._record(name, start, timed_out=True)
+            return False
+
+    async def wait_for_detail_ready(self, target, timeout=6.0):
+        """
+        等待详情页就绪：容器出现后，再等待内容和详情接口请求稳定
+
+        Args:
+            target: Playwright页面或iframe对象
+            timeout: 总超时秒数
+
+        Returns:
+            bool: 详情页是否就绪
+        """
+        start = time.monotonic()
+        found = await self.wait_for_container(target, timeout=timeout)
+        remaining = max(0.5, timeout - (time.monotonic() - start))
+        selector = ", ".join(self.DETAIL_CONTAINER_SELECTORS) if found else None
+        stable = await self.wait_for_settle(target, selector, timeout=remaining, name='detail_settle')
+        ready = found and stable
+        self._record('detail_ready', start, timed_out=not ready)
+        print(f"{'✅' if ready else '⚠️'} 详情页就绪等待: {(time.monotonic() - start) * 1000:.0f}ms (容器={'是' if found else '否'}, 稳定={'是' if stable else '否'})")
+        return ready
+
+    async def wait_for_detail_closed(self, target, timeout=2.0):
+        """
+        等待详情弹窗关闭
+
+        Args:
+            target: 详情弹窗所在的Playwright页面或iframe对象
+            timeout: 超时秒数
+
+        Returns:
+            bool: 弹窗是否已关闭
+        """
+        start = time.monotonic()
+        try:
+            await target.wait_for_function(
+                self._DIALOG_CLOSED_SCRIPT,
+                arg=self.DETAIL_DIALOG_SELECTORS,
+                timeout=int(timeout * 1000),
+                polling=100
+            )
+            self._record('detail_close', start)
+            return True
+        except Exception as e:
+            # iframe随弹窗一起被移除时也视为已关闭
+            if 'detached' in str(e).lower():
+                self._record('detail_close', start)
+                return True
+            print(f"⚠️ 等待详情页关闭超时（{timeout}秒）")
+            self._record('detail_close', start, timed_out=True)
+            return False
+
+    def get_stats(self):
+        """
+        获取所有等待的延迟统计
+
+        Returns:
+            dict: 直方图名称 -> 统计快照
+        """
+        return {name: histogram.snapshot() for name, histogram in self.histograms.items()}
+
+    def print_stats(self):
+        """打印延迟统计摘要"""
+        for name, stats in self.get_stats().items():
+            print(f"⏱️ {name}: {stats['count']}次, 平均 {stats['meanMs']}ms, P90 {stats['p90Ms']}ms, 超时 {stats['timeouts']}次")
@@ -4,11 +4,12 @@
 """
 
 import random
-import asyncio
 import re
 
 from automation.processors.enhanced_data_extractor import EnhancedDataExtractor
 from automation.processors.card_extractor import CardExtractor
+from automation.processors.card_parse_cache import CardParseCache
+from automation.processors.resume_record import ResumeRecord
 from automation.processors.evaluation_helper import EvaluationHelper
 from automation.utils.debug_logger import DebugLogger
 
@@ -24,77 +25,110 @@ class ResumeCardProcessor:
         """
         self.processor = resume_processor
         self.enhanced_extractor = EnhancedDataExtractor()
+        self.parse_cache = CardParseCache()
         
-    async def process_resume_card(self, page, card, config):
+    def _greet_button_selectors(self):
         """
-        处理单个简历卡片
+        获取卡片内打招呼按钮的选择器列表，配置的选择器优先
+        
+        Returns:
+            list: 去重后的选择器列表
+        """
+        selectors = [self.processor.selectors.get('greetButton')] + CardExtractor.GREET_BUTTON_SELECTORS
+        result = []
+        for selector in selectors:
+            if selector and selector not in result:
+                result.append(selector)
+        return result
+        
+    def _snapshot_card_id(self, snapshot):
+        """
+        从卡片快照获取卡片ID，没有ID属性时使用文本指纹（进程重启后保持不变）
+        
+        Args:
+            snapshot: 卡片快照
+            
+        Returns:
+            str: 卡片ID，既没有ID也没有有效文本时返回None
+        """
+        if snapshot.get('id'):
+            return snapshot.get('id')
+        if snapshot.get('text'):
+            return self.processor.fingerprints.digest(snapshot.get('text'))
+        return None
+        
+    def prefetch_snapshot(self, page, snapshot, config):
+        """
+        预读卡片：解析卡片快照并完成卡片阶段评估，结果写入解析缓存
         
         Args:
             page: Playwright页面对象
-            card: 卡片元素
+            snapshot: 卡片快照
             config: 规则配置
             
         Returns:
-            bool: 是否处理了该卡片
+            bool: 解析结果是否已在缓存中就绪
         """
-        try:
-            # 提取卡片ID，用于去重
-            card_id = await card.get_attribute('data-id')
-            if not card_id:
-                # 尝试使用更多属性作为备用ID
-                for attr in ['id', 'data-geek', 'data-uid', 'data-index']:
-                    card_id = await card.get_attribute(attr)
-                    if card_id:
-                        print(f"使用 {attr} 作为卡片ID: {card_id}")
-                        break
-                        
-                # 如果仍然没有ID，使用卡片内文本作为备用ID
-                if not card_id:
-                    card_text = await card.text_content()
-                    if card_text:
-                        card_id = str(hash(card_text))
-                        print(f"使用文本哈希作为卡片ID: {card_id}")
-                    else:
-                        card_id = str(random.randint(1000000, 9999999))
-                        print(f"使用随机数作为卡片ID: {card_id}")
+        card_id = self._snapshot_card_id(snapshot)
+        card_text = snapshot.get('text') or ''
+        if not card_id or not card_text:
+            return False
             
-            # 检查是否已处理过该卡片
-            if card_id in self.processor.processed_ids:
-                print(f"卡片 {card_id} 已处理过，跳过")
-                return False
-                
-            # 使用增强数据提取器从卡片提取简历数据
-            print(f"🔍 使用增强提取器处理卡片 {card_id}...")
+        self.parse_cache.ensure_config(config)
+        if self.parse_cache.contains(card_id, card_text):
+            return True
             
-            # 获取卡片的完整文本内容
-            card_text = await card.text_content()
-            if not card_text:
-                print(f"卡片 {card_id} 无文本内容，跳过")
-                return False
+        resume_data, evaluation = self._parse_card(page, card_id, card_text, config, verbose=False)
+        if not resume_data:
+            return False
+        self.parse_cache.put(card_id, card_text, resume_data, evaluation)
+        return True
+        
+    def _parse_card(self, page, card_id, card_text, config, verbose=True):
+        """
+        解析卡片文本并进行卡片阶段评估
+        
+        Args:
+            page: Playwright页面对象
+            card_id: 卡片ID
+            card_text: 卡片文本
+            config: 规则配置
+            verbose: 是否打印详细的提取结果（后台预读时关闭）
             
-            # 使用增强提取器处理卡片文本
-            resume_data = {}
-            cleaned_text = self.enhanced_extractor._clean_text(card_text)
+        Returns:
+            tuple: (resume_data, evaluation)，解析失败时返回(None, None)
+        """
+        # 使用增强数据提取器从卡片提取简历数据
+        if verbose:
+            print(f"🔍 使用增强提取器处理卡片 {card_id}...")
+        else:
+            print(f"🔭 预读卡片 {card_id}")
+        
+        # 使用增强提取器处理卡片文本
+        resume_data = ResumeRecord()
+        cleaned_text = self.enhanced_extractor._clean_text(card_text)
+        
+        # 提取各种信息
+        resume_data['name'] = self.enhanced_extractor._extract_name(cleaned_text)
+        resume_data['education'] = self.enhanced_extractor._extract_education(cleaned_text)
+        resume_data['position'] = self.enhanced_extractor._extract_position(cleaned_text)
+        resume_data['company'] = self.enhanced_extractor._extract_companies(cleaned_text)
+        resume_data['schools'] = self.enhanced_extractor._extract_schools(cleaned_text)
+        resume_data['skills'] = self.enhanced_extractor._extract_skills(cleaned_text)
+        resume_data['experience'] = self.enhanced_extractor._extract_experience(cleaned_text)
+        resume_data['phone'] = self.enhanced_extractor._extract_phone(cleaned_text)
+        resume_data['email'] = self.enhanced_extractor._extract_email(cleaned_text)
+        resume_data['fullText'] = cleaned_text
+        
+        if verbose:
+            print(f"✅ 增强提取完成: 姓名={resume_data.get('name')}, 学历={resume_data.get('education')}, 职位={resume_data.get('position')}")
             
-            # 提取各种信息
-            resume_data['name'] = self.enhanced_extractor._extract_name(cleaned_text)
-            resume_data['education'] = self.enhanced_extractor._extract_education(cleaned_text)
-            resume_data['position'] = self.enhanced_extractor._extract_position(cleaned_text)
-            resume_data['company'] = self.enhanced_extractor._extract_companies(cleaned_text)
-            resume_data['schools'] = self.enhanced_extractor._extract_schools(cleaned_text)
-            resume_data['skills'] = self.enhanced_extractor._extract_skills(cleaned_text)
-            resume_data['experience'] = self.enhanced_extractor._extract_experience(cleaned_text)
-            resume_data['phone'] = self.enhanced_extractor._extract_phone(cleaned_text)
-            resume_data['email'] = self.enhanced_extractor._extract_email(cleaned_text)
-            resume_data['fullText'] = cleaned_text
+        if not resume_data:
+            print(f"未能从卡片提取数据，跳过")
+            return None, None
             
-            print(f"✅ 增强提取完成: 姓名={resume_data.get('name')}, 学历={resume_data.get('education')}, 职位={resume_data.get('position')}")
-                
-            if not resume_data:
-                print(f"未能从卡片提取数据，跳过")
-                return False
-                
-            # 打印完整的提取结果，方便调试
+        # 打印完整的提取结果，方便调试
+        if verbose:
             print(f"提取结果 - 卡片ID: {card_id}")
             print(f"姓名: {resume_data.get('name', '未提取')}")
             print(f"职位: {resume_data.get('position', '未提取')}")
@@ -106,19 +140,108 @@ class ResumeCardProcessor:
             if resume_data.get('fullText'):
                 print(f"完整文本预览: {resume_data.get('fullText', '')[:100]}...")
             print("=====================================\n")
+        
+        # 保存当前页面URL（作为链接）
+        resume_data['link'] = page.url
             
-            # 保存当前页面URL（作为链接）
-            resume_data['link'] = page.url
-                
-            # 使用规则引擎进行阶段1和阶段2的评估
-            # 只检查期望职位和过往公司，不进行关键词打分
+        # 使用规则引擎进行阶段1和阶段2的评估
+        # 只检查期望职位和过往公司，不进行关键词打分
+        if verbose:
             print(f"候选人 {resume_data.get('name')}: 开始评估期望职位和过往公司")
-            evaluation = EvaluationHelper.evaluate_card_stage(resume_data, config)
+        evaluation = EvaluationHelper.evaluate_card_stage(resume_data, config)
+        return resume_data, evaluation
+        
+    async def process_resume_card(self, page, card, config):
+        """
+        处理单个简历卡片
+        
+        Args:
+            page: Playwright页面对象
+            card: 卡片元素
+            config: 规则配置
+            
+        Returns:
+            bool: 是否处理了该卡片
+        """
+        # 一次evaluate获取卡片快照，之后的处理与批量快照路径一致
+        snapshot = await CardExtractor.snapshot_card_element(card, self._greet_button_selectors())
+        if not snapshot:
+            print("获取卡片快照失败，跳过")
+            return False
+        return await self.process_card_snapshot(page, snapshot, config, card=card)
+        
+    async def process_card_snapshot(self, page, snapshot, config, card=None):
+        """
+        基于卡片快照处理单个简历卡片
+        
+        卡片ID、文本和打招呼按钮信息都来自快照，只有需要打招呼或进入详情页
+        的卡片才会重新定位元素
+        
+        Args:
+            page: Playwright页面对象
+            snapshot: CardExtractor.snapshot_cards返回的卡片快照
+            config: 规则配置
+            card: 已获取的卡片元素，不提供时按需定位
+            
+        Returns:
+            bool: 是否处理了该卡片
+        """
+        try:
+            card_text = snapshot.get('text') or ''
+            
+            # 提取卡片ID，用于去重
+            card_id = self._snapshot_card_id(snapshot)
+            if snapshot.get('id'):
+                if snapshot.get('idSource') != 'data-id':
+                    print(f"使用 {snapshot.get('idSource')} 作为卡片ID: {card_id}")
+            elif card_id:
+                # 如果没有ID属性，使用卡片内文本指纹作为备用ID
+                print(f"使用文本指纹作为卡片ID: {card_id}")
+            else:
+                card_id = str(random.randint(1000000, 9999999))
+                print(f"使用随机数作为卡片ID: {card_id}")
+            
+            # 页面内预筛命中的关键词
+            matched = snapshot.get('prefilter')
+            if matched:
+                print(f"页面内预筛命中: 岗位关键词 {matched.get('position')}, 竞对公司关键词 {matched.get('company')}")
+            
+            # 检查是否已处理过该卡片
+            if await self.processor.processed_ids.contains(card_id):
+                print(f"卡片 {card_id} 已处理过，跳过")
+                return False
+            
+            # 没有ID属性的卡片（使用文本指纹）：文本近似的候选人视为同一人重复展示，不再进入详情页
+            # 近似判定不写入已处理记录，避免误判被持久化到这个指纹下
+            simhash = self.processor.fingerprints.simhash(card_text)
+            if not snapshot.get('id'):
+                similar_key, distance = self.processor.processed_ids.find_similar(simhash, exclude=card_id)
+                if similar_key:
+                    print(f"卡片 {card_id} 与已处理候选人 {similar_key} 文本近似（汉明距离 {distance}），视为重复展示，跳过")
+                    return False
+                
+            # 卡片的完整文本内容来自快照
+            if not card_text:
+                print(f"卡片 {card_id} 无文本内容，跳过")
+                return False
+            
+            # 滚动后重新渲染的卡片直接复用解析结果和卡片阶段结论
+            self.parse_cache.ensure_config(config)
+            cached = self.parse_cache.get(card_id, card_text)
+            if cached:
+                resume_data, evaluation = cached
+                resume_data['link'] = page.url
+                print(f"♻️ 卡片 {card_id} 命中解析缓存: 姓名={resume_data.get('name')}, 职位={resume_data.get('position')}")
+            else:
+                resume_data, evaluation = self._parse_card(page, card_id, card_text, config)
+                if not resume_data:
+                    return False
+                self.parse_cache.put(card_id, card_text, resume_data, evaluation)
             
             # 如果阶段1或阶段2未通过，则直接跳过
             if evaluation.get("action") == "skip":
                 print(f"候选人 {resume_data.get('name')} 未通过卡片阶段筛选: {evaluation.get('rejectReason')}")
-                self.processor.processed_ids.add(card_id)
+                self.processor.processed_ids.add(card_id, simhash)
                 # 记录跳过的候选人
                 self.processor.log_candidate(resume_data, "skip", evaluation.get('rejectReason', ''))
                 return True
@@ -126,18 +249,27 @@ class ResumeCardProcessor:
             # 如果是竞对公司（阶段2通过），直接打招呼
             if evaluation.get("stageResult", {}).get("competitorCompany"):
                 print(f"候选人 {resume_data.get('name')} 来自竞对公司，直接打招呼")
-                greet_button = await card.query_selector(
-                    self.processor.selectors.get('greetButton') or 
-                    '.btn.btn-greet' or
-                    'button[class*="btn-greet"]' or
-                    '.start-chat-btn' or 
-                    '.btn-greet' or
-                    'button:has-text("打招呼")'
-                )
+                # 快照中没有打招呼按钮时无需再访问DOM
+                if not snapshot.get('hasGreetButton'):
+                    print("未找到打招呼按钮")
+                    return False
+                
+                if card is None:
+                    card = await CardExtractor.resolve_card(page, snapshot)
+                
+                greet_button = None
+                if card:
+                    for selector in self._greet_button_selectors() + ['button:has-text("打招呼")']:
+                        try:
+                            greet_button = await card.query_selector(selector)
+                        except Exception:
+                            greet_button = None
+                        if greet_button:
+                            break
                 
                 if greet_button:
                     success = await self.processor.interaction_handler.greet_candidate(greet_button, resume_data, page)
-                    self.processor.processed_ids.add(card_id)
+                    self.processor.processed_ids.add(card_id, simhash)
                     # 记录打招呼的候选人
                     self.processor.log_candidate(resume_data, "greet", "来自竞对公司")
                     return True
@@ -148,6 +280,10 @@ class ResumeCardProcessor:
             # 阶段1和阶段2通过，但不是竞对公司，需要查看详情页进行关键词评分
             print(f"候选人 {resume_data.get('name')} 通过卡片阶段筛选，需查看详情页进行关键词评分")
 
+            # 启用详情页池时在后台标签页中打开详情页，评估结果稍后回到列表页打招呼
+            if await self.processor.detail_pool.submit(page, snapshot, card_id, simhash, resume_data, config):
+                return True
+
             # 点击前预处理页面
             try:
                 # 尝试清除可能的遮罩层和弹窗
@@ -175,11 +311,21 @@ class ResumeCardProcessor:
             except Exception as e:
                 print(f"清除页面遮罩和对话框时出错: {e}")
 
+            # 需要点击时才重新定位卡片元素
+            if card is None:
+                card = await CardExtractor.resolve_card(page, snapshot)
+                if not card:
+                    print(f"卡片 {card_id} 已不在页面中，跳过")
+                    return False
+
             # 尝试点击卡片进入详情页
             try:
                 # 尝试找到卡片中的链接或可点击区域
                 card_link = await card.query_selector("a") or card
                 
+                # 详情页打开频率预算
+                await self.processor.pacing.acquire('detail_open')
+                
                 # 点击进入详情页 - 增加重试和错误处理
                 try:
                     # 使用JavaScript强制点击
@@ -198,12 +344,12 @@ class ResumeCardProcessor:
                         print(f"常规点击方法失败: {click_error}，尝试其他方法")
                         # 尝试使用hover后点击
                         await card_link.hover()
-                        await asyncio.sleep(0.5)
+                        await self.processor.pacing.pause('hover')
                         await page.keyboard.press('Enter')
                         print(f"已使用hover+Enter方式尝试进入详情页")
                 
-                # 等待详情页加载（优化：减少到2秒）
-                await asyncio.sleep(2)  # 优化：从5秒减少到2秒，加快处理速度
+                # 等待详情页容器出现（出现即继续，不再固定等待）
+                await self.processor.detail_processor.readiness.wait_for_container(page, timeout=5.0)
                 
                 # 首先尝试直接检查当前页面是否是详情页
                 current_url = page.url
@@ -266,21 +412,14 @@ class ResumeCardProcessor:
                         # 调用详情页处理方法
                         detail_processed = await self.processor.process_detail_page(page, config, resume_data)
                         
-                        # 优化：减少等待详情页处理完成的时间
-                        max_wait = 8  # 优化：从15秒减少到8秒
-                        wait_count = 0
-                        while self.processor.detail_processor.processing_detail and wait_count < max_wait:
-                            print(f"⏳ 等待最终详情页处理完成... ({wait_count}/{max_wait}秒)")
-                            await asyncio.sleep(0.5)  # 优化：检查间隔从1秒改为0.5秒
-                            wait_count += 0.5
-                        
-                        if wait_count >= max_wait:
-                            print("⚠️ 等待最终详情页处理超时（15秒），强制继续")
+                        # 等待详情页处理完成，完成或收到停止信号时立即返回
+                        if await self.processor.detail_processor.wait_until_idle(8, self.processor.stop_event):
+                            print("✅ 最终详情页处理已完成")
                         else:
-                            print(f"✅ 最终详情页处理已完成，用时 {wait_count} 秒")
+                            print("⚠️ 等待最终详情页处理超时或已停止，继续")
                         
                         # 标记为已处理
-                        self.processor.processed_ids.add(card_id)
+                        self.processor.processed_ids.add(card_id, simhash)
                         return True
                         
                 except Exception as e:
@@ -343,21 +482,14 @@ class ResumeCardProcessor:
                                 # 直接调用处理详情页iframe的方法
                                 detail_processed = await self.processor.process_detail_page_iframe(detail_iframe, page, config, resume_data)
                                 
-                                # 优化：减少等待详情页处理完成的时间
-                                max_wait = 8  # 优化：从15秒减少到8秒
-                                wait_count = 0
-                                while self.processor.detail_processor.processing_detail and wait_count < max_wait:
-                                    print(f"⏳ 等待iframe详情页处理完成... ({wait_count}/{max_wait}秒)")
-                                    await asyncio.sleep(0.5)  # 优化：检查间隔从1秒改为0.5秒
-                                    wait_count += 0.5
-                                
-                                if wait_count >= max_wait:
-                                    print("⚠️ 等待iframe详情页处理超时（15秒），强制继续")
+                                # 等待详情页处理完成，完成或收到停止信号时立即返回
+                                if await self.processor.detail_processor.wait_until_idle(8, self.processor.stop_event):
+                                    print("✅ iframe详情页处理已完成")
                                 else:
-                                    print(f"✅ iframe详情页处理已完成，用时 {wait_count} 秒")
+                                    print("⚠️ 等待iframe详情页处理超时或已停止，继续")
                                 
                                 # 标记为已处理
-                                self.processor.processed_ids.add(card_id)
+                                self.processor.processed_ids.add(card_id, simhash)
                                 return True
                 except Exception as e:
                     print(f"查找详情页iframe时出错: {e}")
@@ -380,21 +512,14 @@ class ResumeCardProcessor:
                                     # 使用找到的frame处理详情页
                                     detail_processed = await self.processor.process_detail_page_iframe(frame, page, config, resume_data)
                                     
-                                    # 增加等待详情页处理完成的时间
-                                    max_wait = 15  # 从5秒增加到15秒
-                                    wait_count = 0
-                                    while self.processor.detail_processor.processing_detail and wait_count < max_wait:
-                                        print(f"⏳ 等待frame详情页处理完成... ({wait_count}/{max_wait}秒)")
-                                        await asyncio.sleep(1)
-                                        wait_count += 1
-                                    
-                                    if wait_count >= max_wait:
-                                        print("⚠️ 等待frame详情页处理超时（15秒），强制继续")
+                                    # 等待详情页处理完成，完成或收到停止信号时立即返回
+                                    if await self.processor.detail_processor.wait_until_idle(15, self.processor.stop_event):
+                                        print("✅ frame详情页处理已完成")
                                     else:
-                                        print(f"✅ frame详情页处理已完成，用时 {wait_count} 秒")
+                                        print("⚠️ 等待frame详情页处理超时或已停止，继续")
                                     
                                     # 标记为已处理
-                                    self.processor.processed_ids.add(card_id)
+                                    self.processor.processed_ids.add(card_id, simhash)
                                     return True
                             except Exception as frame_error:
                                 print(f"检查frame {i} 时出错: {frame_error}")
@@ -404,28 +529,21 @@ class ResumeCardProcessor:
                 else:
                     print(f"URL未包含详情页特征: {current_url}")
                     print("点击卡片后未能正确跳转到详情页")
-                    self.processor.processed_ids.add(card_id)
+                    self.processor.processed_ids.add(card_id, simhash)
                     return False
                 
                 # 调用详情页处理方法
                 print("调用详情页处理方法")
                 detail_processed = await self.processor.process_detail_page(page, config, resume_data)
                 
-                # 增加等待详情页处理完成的时间
-                max_wait = 15  # 从5秒增加到15秒
-                wait_count = 0
-                while self.processor.detail_processor.processing_detail and wait_count < max_wait:
-                    print(f"⏳ 等待最终详情页处理完成... ({wait_count}/{max_wait}秒)")
-                    await asyncio.sleep(1)
-                    wait_count += 1
-                
-                if wait_count >= max_wait:
-                    print("⚠️ 等待最终详情页处理超时（15秒），强制继续")
+                # 等待详情页处理完成，完成或收到停止信号时立即返回
+                if await self.processor.detail_processor.wait_until_idle(15, self.processor.stop_event):
+                    print("✅ 最终详情页处理已完成")
                 else:
-                    print(f"✅ 最终详情页处理已完成，用时 {wait_count} 秒")
+                    print("⚠️ 等待最终详情页处理超时或已停止，继续")
                 
                 # 标记为已处理
-                self.processor.processed_ids.add(card_id)
+                self.processor.processed_ids.add(card_id, simhash)
                 
                 return True
                 
@@ -433,7 +551,7 @@ class ResumeCardProcessor:
                 print(f"点击卡片进入详情页时出错: {e}")
                 import traceback
                 traceback.print_exc()
-                self.processor.processed_ids.add(card_id)
+                self.processor.processed_ids.add(card_id, simhash)
                 return False
                 
         except Exception as e:
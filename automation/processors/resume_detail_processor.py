@@ -8,6 +8,8 @@ import time
 import os
 import re
 from automation.processors.enhanced_data_extractor import EnhancedDataExtractor
+from automation.processors.resume_record import ResumeRecord
+from automation.processors.readiness_waiter import ReadinessWaiter
 
 class ResumeDetailProcessor:
     """简历详情页处理器，处理简历详情页相关功能"""
@@ -20,12 +22,61 @@ class ResumeDetailProcessor:
             resume_processor: 父简历处理器对象
         """
         self.processor = resume_processor
+        self._idle_event = None  # 详情页处理完成事件，首次等待时创建
         self.processing_detail = False  # 添加详情页处理状态标记
         self.greeting_in_progress = False  # 添加打招呼进行中状态标记
         
         # 初始化增强数据提取器
         self.enhanced_extractor = EnhancedDataExtractor()
         
+        # 就绪等待器，代替固定时长的等待并记录延迟
+        self.readiness = ReadinessWaiter()
+        
+    @property
+    def processing_detail(self):
+        """详情页是否正在处理中"""
+        return self._processing_detail
+        
+    @processing_detail.setter
+    def processing_detail(self, value):
+        """设置详情页处理状态，同时更新完成事件，唤醒所有等待者"""
+        self._processing_detail = bool(value)
+        if self._idle_event is not None:
+            if self._processing_detail:
+                self._idle_event.clear()
+            else:
+                self._idle_event.set()
+                
+    async def wait_until_idle(self, timeout=None, stop_event=None):
+        """
+        等待详情页处理完成
+        
+        Args:
+            timeout: 最长等待秒数，None表示不限制
+            stop_event: 停止事件，被设置时立即结束等待
+            
+        Returns:
+            bool: 详情页处理是否已完成（超时或收到停止信号时返回False）
+        """
+        if not self._processing_detail:
+            return True
+            
+        if self._idle_event is None:
+            self._idle_event = asyncio.Event()
+            
+        waiters = [asyncio.ensure_future(self._idle_event.wait())]
+        if stop_event is not None:
+            waiters.append(asyncio.ensure_future(stop_event.wait()))
+            
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.cancel()
+                    
+        return not self._processing_detail
+        
     async def process_detail_page(self, page, config, card_resume_data=None):
         """
         处理简历详情页
@@ -59,15 +110,15 @@ class ResumeDetailProcessor:
             detail_id = url_match.group(1) if url_match else f"detail_{int(time.time())}"
             
             # 避免重复处理同一个详情页
-            if detail_id in self.processor.processed_ids:
+            if await self.processor.processed_ids.contains(detail_id):
                 print(f"该详情页已处理过，跳过: {detail_id}")
                 # 尝试关闭详情页
                 await self.processor._try_close_detail_page(page)
                 self.processing_detail = False
                 return True
                 
-            # 等待页面加载完成（优化：减少到1.5秒）
-            await asyncio.sleep(1.5)  # 优化：从3.0秒减少到1.5秒，加快处理速度
+            # 等待简历容器出现且内容、详情接口请求稳定
+            await self.readiness.wait_for_detail_ready(page)
             
             # 检查停止信号
             if not self.processor.is_processing or (hasattr(self.processor, 'browser') and hasattr(self.processor.browser, 'is_running') and not self.processor.browser.is_running):
@@ -76,11 +127,9 @@ class ResumeDetailProcessor:
                 return False
                 
             # 尝试获取基本信息
-            resume_data = {}
-            
-            # 如果提供了卡片数据，合并
+            # 如果提供了卡片数据，合并（写时复制，不会复制全文等大字段）
+            resume_data = ResumeRecord.copy_of(card_resume_data)
             if card_resume_data:
-                resume_data.update(card_resume_data)
                 print(f"📋 卡片数据: 姓名={card_resume_data.get('name')}, 职位={card_resume_data.get('position')}")
             
             # 使用增强数据提取器从详情页提取数据
@@ -126,7 +175,7 @@ class ResumeDetailProcessor:
             # 如果没有足够的数据进行评估，但有卡片数据，则使用卡片数据进行评估
             if not resume_data.get('name') and card_resume_data and card_resume_data.get('name'):
                 print("⚠️ 从详情页提取的简历数据不完整，将使用卡片数据进行评估")
-                resume_data = card_resume_data.copy()
+                resume_data = ResumeRecord.copy_of(card_resume_data)
                 resume_data['is_using_card_data_only'] = True
             elif not resume_data.get('name'):
                 print("❌ 未提取到足够的简历数据，且卡片数据也不完整，无法进行评估")
@@ -259,8 +308,8 @@ class ResumeDetailProcessor:
                     self.processor.processed_count += 1
                     # 记录打招呼的候选人，包含AI评估详细结果
                     self.processor.log_candidate(resume_data, "greet", "通过评估筛选", ai_evaluation_result)
-                    # 等待操作完成
-                    await asyncio.sleep(2)
+                    # 等待打招呼后的页面变化稳定
+                    await self.readiness.wait_for_settle(page, timeout=2.0, name='greet_settle')
                     return True
                 else:
                     print("❌ 未找到打招呼按钮，尝试关闭详情页...")
@@ -270,7 +319,7 @@ class ResumeDetailProcessor:
                         # 如果关闭失败，尝试按ESC键
                         print("🔄 尝试使用ESC键关闭详情页...")
                         await page.keyboard.press('Escape')
-                        await asyncio.sleep(1)  # 等待ESC键生效
+                        await self.readiness.wait_for_detail_closed(page)
                     self.processing_detail = False
                     return True
             else:
@@ -289,7 +338,7 @@ class ResumeDetailProcessor:
                     # 如果关闭失败，尝试按ESC键
                     print("🔄 尝试使用ESC键关闭详情页...")
                     await page.keyboard.press('Escape')
-                    await asyncio.sleep(1)  # 等待ESC键生效
+                    await self.readiness.wait_for_detail_closed(page)
                 
                 self.processing_detail = False
                 return True
@@ -304,7 +353,7 @@ class ResumeDetailProcessor:
                 await self.processor._try_close_detail_page(page)
                 # 尝试ESC键退出
                 await page.keyboard.press('Escape')
-                await asyncio.sleep(1)
+                await self.readiness.wait_for_detail_closed(page)
             except:
                 pass
             
@@ -380,28 +429,21 @@ class ResumeDetailProcessor:
             
             # 检查页面是否已加载完成（优化：减少等待时间）
             try:
-                await asyncio.sleep(1.5)  # 优化：从3.0秒减少到1.5秒，确保iframe充分加载
+                # 等待iframe中的简历容器出现且内容、详情接口请求稳定
+                await self.readiness.wait_for_detail_ready(iframe)
                 
                 # 检查停止信号
                 if not self.processor.is_processing or (hasattr(self.processor, 'browser') and hasattr(self.processor.browser, 'is_running') and not self.processor.browser.is_running):
                     print("🛑 收到停止信号，停止详情页处理")
                     self.processing_detail = False
                     return False
-                
-                # 尝试等待页面内容加载完成
-                try:
-                    await iframe.wait_for_selector('body', timeout=2000)  # 从15000ms改为2000ms
-                except Exception as e:
-                    print(f"⚠️ 等待iframe加载完成时出错: {e}")
             except Exception as e:
                 print(f"⚠️ 等待iframe加载时出错: {e}")
             
             # 尝试获取基本信息
-            resume_data = {}
-            
-            # 如果提供了卡片数据，合并
+            # 如果提供了卡片数据，合并（写时复制，不会复制全文等大字段）
+            resume_data = ResumeRecord.copy_of(card_resume_data)
             if card_resume_data:
-                resume_data.update(card_resume_data)
                 print(f"📋 卡片数据: 姓名={card_resume_data.get('name')}, 职位={card_resume_data.get('position')}")
             
             # 增加调试信息
@@ -463,7 +505,7 @@ class ResumeDetailProcessor:
             # 如果没有足够的数据进行评估，但有卡片数据，则使用卡片数据进行评估
             if not resume_data.get('name') and card_resume_data and card_resume_data.get('name'):
                 print("⚠️ 从iframe提取的简历数据不完整，将使用卡片数据进行评估")
-                resume_data = card_resume_data.copy()
+                resume_data = ResumeRecord.copy_of(card_resume_data)
                 resume_data['is_using_card_data_only'] = True
             elif not resume_data.get('name'):
                 print("❌ 从iframe提取的简历数据不完整，且卡片数据也不完整，无法进行评估")
@@ -475,7 +517,7 @@ class ResumeDetailProcessor:
                     await parent_page.keyboard.press('Escape')
                 except Exception as e:
                     print(f"❌ 使用ESC键关闭详情页失败: {e}")
-                await asyncio.sleep(0.5)  # 只等待0.5秒
+                await self.readiness.wait_for_detail_closed(iframe, timeout=1.0)
                 
                 self.processing_detail = False
                 return False
@@ -653,15 +695,15 @@ class ResumeDetailProcessor:
                     self.processor.processed_count += 1
                     # 记录打招呼的候选人，包含AI评估详细结果
                     self.processor.log_candidate(resume_data, "greet", "通过评估筛选", ai_evaluation_result)
-                    # 等待操作完成
-                    await asyncio.sleep(2)
+                    # 等待打招呼后的页面变化稳定
+                    await self.readiness.wait_for_settle(parent_page, timeout=2.0, name='greet_settle')
                     return True
                 else:
                     print("❌ 未找到打招呼按钮，尝试关闭详情页...")
                     # 尝试使用ESC键关闭详情页
                     try:
                         await parent_page.keyboard.press('Escape')
-                        await asyncio.sleep(1)
+                        await self.readiness.wait_for_detail_closed(iframe)
                     except Exception as e:
                         print(f"❌ 使用ESC键关闭详情页失败: {e}")
                     
@@ -680,7 +722,7 @@ class ResumeDetailProcessor:
                 # 尝试使用ESC键关闭详情页
                 try:
                     await parent_page.keyboard.press('Escape')
-                    await asyncio.sleep(1)
+                    await self.readiness.wait_for_detail_closed(iframe)
                 except Exception as e:
                     print(f"❌ 使用ESC键关闭详情页失败: {e}")
                 
@@ -695,7 +737,7 @@ class ResumeDetailProcessor:
             # 出错时也尝试关闭详情页
             try:
                 await parent_page.keyboard.press('Escape')
-                await asyncio.sleep(0.5)
+                await self.readiness.wait_for_detail_closed(iframe, timeout=1.0)
             except:
                 pass
             
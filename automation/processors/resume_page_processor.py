@@ -3,8 +3,11 @@
 负责处理推荐列表页面的逻辑
 """
 
-import asyncio
-import random
+import time
+
+from automation.processors.card_extractor import CardExtractor
+from automation.processors.card_lookahead import CardLookahead
+from automation.processors.evaluation_helper import EvaluationHelper
 
 class ResumePageProcessor:
     """简历页面处理器，处理简历列表页面"""
@@ -20,18 +23,83 @@ class ResumePageProcessor:
             resume_processor: 父简历处理器对象
         """
         self.processor = resume_processor
+        # 等待详情页/AI评估时，后台预读后续卡片
+        self.lookahead = CardLookahead(resume_processor.card_processor)
+        
+    async def _record_prefiltered(self, rejected):
+        """
+        记录页面内预筛排除的卡片：标记为已处理并计入跳过数量
+        
+        Args:
+            rejected: 快照中的rejected列表 [{"index", "id", "text"}, ...]
+            
+        Returns:
+            int: 新排除的卡片数量
+        """
+        new_rejected = 0
+        for item in rejected:
+            # 没有ID属性的卡片使用与正常处理相同的文本指纹（fp:）
+            card_id = self.processor.card_processor._snapshot_card_id(item)
+            if not card_id or await self.processor.processed_ids.contains(card_id):
+                continue
+            self.processor.processed_ids.add(card_id)
+            new_rejected += 1
         
-    async def process_recommend_list_page(self, page, config):
+        if new_rejected:
+            self.processor.processed_count += new_rejected
+            self.processor.logging_helper.count_skipped(new_rejected, "期望职位不匹配（页面内预筛）")
+            print(f"页面内预筛排除 {new_rejected} 个期望职位不匹配的卡片")
+        return new_rejected
+        
+    async def _wait_for_detail_idle(self, max_wait):
+        """
+        等待详情页处理完成，由详情页处理器在完成时直接唤醒，不再轮询
+        
+        Args:
+            max_wait: 最长等待秒数
+            
+        Returns:
+            bool: 是否可以继续处理（收到停止信号时返回False）
+        """
+        wait_start = time.monotonic()
+        result = await self.processor.wait_for_detail_idle(max_wait)
+        waited = time.monotonic() - wait_start
+        
+        if result == 'stopped':
+            print("等待详情页处理时收到停止信号，停止处理")
+            self.processor.is_processing = False
+            return False
+        if result == 'timeout':
+            print("等待详情页处理超时，强制继续")
+        else:
+            print(f"✅ 详情页处理已完成，等待时间: {waited:.2f} 秒")
+        return True
+        
+    async def process_recommend_list_page(self, page, config, _continuation=False):
         """
         处理推荐列表页
         
         Args:
             page: Playwright页面对象
             config: 规则配置
+            _continuation: 是否为加载更多后的递归调用
             
         Returns:
             int: 处理的简历数量
         """
+        if _continuation:
+            # 加载更多期间收到停止信号，不再继续处理
+            if self.processor.is_stop_requested():
+                print("加载更多期间收到停止信号，停止处理")
+                return 0
+            # 运行中保存的新规则从新加载的一批卡片开始生效
+            config = self.processor.refresh_config(config)
+        else:
+            # 新一轮处理，清除上一次的停止信号，并按配置更新节奏预算
+            self.processor.stop_event.clear()
+            self.processor.pacing.configure(config)
+            self.processor.detail_pool.configure(config)
+            
         # 设置处理状态
         self.processor.is_processing = True
         start_count = self.processor.processed_count
@@ -45,11 +113,11 @@ class ResumePageProcessor:
         total_greeted = 0     # 总共打招呼人数
         total_processed_pages = 0  # 总共处理的页面数
         
+        # 新一轮处理（包括断线重连后）从检查点记录的位置继续
+        resume_checkpoint = None if _continuation else self.processor.load_checkpoint()
+        
         # 获取已打招呼的总数
-        greeted_count = 0
-        for log in self.processor.get_candidates_log():
-            if log.get('action') == 'greet':
-                greeted_count += 1
+        greeted_count = self.processor.get_greeted_count()
                 
         print(f"当前已打招呼数量: {greeted_count}")
         
@@ -71,12 +139,12 @@ class ResumePageProcessor:
                 except Exception as scroll_err:
                     print(f"页面滚动出错，尝试刷新页面: {scroll_err}")
                     await page.reload()
-                    await asyncio.sleep(2)
+                    await self.processor.pacing.pause('after_reload')
                     # 重试滚动
                     await page.evaluate("window.scrollTo(0, 0)")
                 
                 # 随机短暂延迟，模拟人类行为
-                await asyncio.sleep(random.uniform(0.5, 1.5))
+                await self.processor.pacing.pause('page_start')
                 
                 # 检查页面是否包含iframe
                 iframe = None
@@ -122,21 +190,35 @@ class ResumePageProcessor:
                     '.card'                                                  # 通用卡片
                 ]
                 
-                cards = []
-                for selector in card_selectors:
-                    try:
-                        card_elements = await target_page.query_selector_all(selector)
-                        if card_elements and len(card_elements) > 0:
-                            print(f"找到 {len(card_elements)} 个推荐卡片，使用选择器: {selector}")
-                            cards = card_elements
-                            break
-                    except Exception as e:
-                        print(f"使用选择器 {selector} 查找卡片时出错: {e}")
+                # 一次evaluate获取所有卡片的快照，后续在Python侧离线处理
+                # 岗位关键词在页面内预筛，不匹配的卡片只返回ID
+                snapshot = await CardExtractor.snapshot_cards(
+                    target_page,
+                    card_selectors,
+                    self.processor.card_processor._greet_button_selectors(),
+                    prefilter=EvaluationHelper.compile_card_prefilter(config)
+                )
+                cards = snapshot.get('cards') or []
+                rejected = snapshot.get('rejected') or []
+                if cards or rejected:
+                    print(f"找到 {len(cards) + len(rejected)} 个推荐卡片（页面内预筛排除 {len(rejected)} 个），使用选择器: {snapshot.get('selector')}")
+                
+                # 有检查点时先快速滚动到检查点的位置，再重新获取卡片快照
+                if resume_checkpoint:
+                    checkpoint, resume_checkpoint = resume_checkpoint, None
+                    target_count = checkpoint.get('cardCount', 0)
+                    processed_batches = max(processed_batches, checkpoint.get('batchIndex', 0))
+                    if target_count > len(cards) + len(rejected):
+                        print(f"⏩ 从检查点恢复: 批次 {checkpoint.get('batchIndex')}，最后处理 {checkpoint.get('lastCandidate')}，"
+                              f"快速滚动到第 {target_count} 张卡片")
+                        loaded = await self.processor.navigation_helper.fast_forward(target_page, target_count)
+                        print(f"⏩ 快速滚动完成，列表中已有 {loaded} 张卡片")
+                        continue
                 
                 # 如果找到了卡片，处理每一个卡片
-                if cards and len(cards) > 0:
-                    total_cards = len(cards)
-                    print(f"开始处理 {total_cards} 个推荐卡片")
+                if cards or rejected:
+                    total_cards = len(cards) + len(rejected)
+                    print(f"开始处理 {len(cards)} 个推荐卡片")
                     
                     # 检测是否是一个新批次
                     if total_cards >= self.BATCH_SIZE - 3:  # 允许有小误差
@@ -152,11 +234,23 @@ class ResumePageProcessor:
                     before_processed_count = self.processor.processed_count
                     before_greeted_count = greeted_count
                     
+                    # 批量确认本批卡片是否已处理（一次数据库查询），之后的判断只读内存
+                    await self.processor.processed_ids.prefetch(
+                        [self.processor.card_processor._snapshot_card_id(item) for item in cards + rejected]
+                    )
+                    
+                    # 页面内预筛排除的卡片直接记为跳过
+                    await self._record_prefiltered(rejected)
+                    
+                    # 开始预读本批卡片：前台处理当前卡片时，后台解析后续卡片
+                    self.lookahead.start(target_page, cards, config)
+                    
                     # 逐个处理卡片
                     for i, card in enumerate(cards):
                         # 检查停止信号 - 增强停止检查
                         if not self.processor.is_processing:
                             print("处理被用户取消，停止处理")
+                            await self.processor.detail_pool.cancel()
                             return self.processor.processed_count - start_count
                             
                         # 检查browser_manager的停止信号
@@ -164,53 +258,34 @@ class ResumePageProcessor:
                             if not self.processor.browser.is_running:
                                 print("检测到browser_manager停止信号，停止处理")
                                 self.processor.is_processing = False
+                                await self.processor.detail_pool.cancel()
                                 return self.processor.processed_count - start_count
                         
                         # 更新总共打招呼数量
-                        current_greeted = 0
-                        for log in self.processor.get_candidates_log():
-                            if log.get('action') == 'greet':
-                                current_greeted += 1
-                        
-                        greeted_count = current_greeted
+                        greeted_count = self.processor.get_greeted_count()
                         
                         # 如果处理足够多的简历或用户取消，则退出
                         if (self.processor.max_process_count > 0 and 
                             greeted_count >= self.processor.max_process_count):
                             print(f"已达到目标打招呼数量: {greeted_count}/{self.processor.max_process_count}，停止处理")
+                            await self.processor.detail_pool.cancel()
+                            self.processor.finish_checkpoint()
                             return self.processor.processed_count - start_count
                         
+                        # 已处理过的卡片直接跳过，不做节奏停顿（从检查点恢复时列表前部都是已处理的卡片）
+                        card_id = self.processor.card_processor._snapshot_card_id(card)
+                        if card_id and await self.processor.processed_ids.contains(card_id):
+                            continue
+                        
                         # 计算当前卡片在当前批次中的索引
                         batch_index = (before_processed_count + i) % self.BATCH_SIZE
-                        print(f"\n===== 开始处理第 {i+1}/{total_cards} 个卡片 (批次 {processed_batches + 1} 中的第 {batch_index + 1} 个) =====")
+                        print(f"\n===== 开始处理第 {i+1}/{len(cards)} 个卡片 (批次 {processed_batches + 1} 中的第 {batch_index + 1} 个) =====")
                             
                         # 确保没有正在进行的详情页处理（加强检查）
                         if self.processor.is_detail_page_processing():
                             print("⚠️ 检测到详情页处理未完成，等待处理完成...")
-                            # 停止所有滚动操作，等待详情页处理完成
-                            max_wait = 60  # 最长等待60秒
-                            wait_count = 0
-                            while self.processor.is_detail_page_processing() and wait_count < max_wait:
-                                # 在等待期间也要检查停止信号
-                                if not self.processor.is_processing:
-                                    print("等待详情页处理时收到停止信号，停止处理")
-                                    return self.processor.processed_count - start_count
-                                    
-                                if hasattr(self.processor, 'browser') and hasattr(self.processor.browser, 'is_running'):
-                                    if not self.processor.browser.is_running:
-                                        print("等待详情页处理时检测到browser_manager停止信号，停止处理")
-                                        self.processor.is_processing = False
-                                        return self.processor.processed_count - start_count
-                                
-                                if wait_count % 5 == 0:  # 每5秒打印一次
-                                    print(f"等待详情页处理完成... ({wait_count}秒)")
-                                await asyncio.sleep(1)
-                                wait_count += 1
-                            
-                            if wait_count >= max_wait:
-                                print("等待详情页处理超时，强制继续")
-                            else:
-                                print(f"✅ 详情页处理已完成，等待时间: {wait_count} 秒")
+                            if not await self._wait_for_detail_idle(60):
+                                return self.processor.processed_count - start_count
                         
                         # 打印进度信息
                         print(f"当前进度: 已处理 {self.processor.processed_count} 个简历，已打招呼 {greeted_count} 人")
@@ -220,7 +295,9 @@ class ResumePageProcessor:
                         # 处理单个卡片 - 这里可能会进入详情页
                         try:
                             print(f"🎯 开始处理卡片...")
-                            processed = await self.processor.process_resume_card(target_page, card, config)
+                            self.lookahead.consume(card)
+                            self.lookahead.advance(i)
+                            processed = await self.processor.process_card_snapshot(target_page, card, config)
                             if processed:
                                 self.processor.processed_count += 1
                                 print(f"✅ 已处理 {self.processor.processed_count} 个卡片，总数: {len(self.processor.processed_ids)}")
@@ -228,61 +305,69 @@ class ResumePageProcessor:
                                 # 卡片处理完成后，检查是否进入了详情页，如果是则等待详情页完成
                                 if self.processor.is_detail_page_processing():
                                     print("🔄 卡片处理触发了详情页访问，等待详情页处理完成...")
-                                    max_detail_wait = 60  # 最长等待60秒
-                                    detail_wait_count = 0
-                                    while self.processor.is_detail_page_processing() and detail_wait_count < max_detail_wait:
-                                        # 在等待期间检查停止信号
-                                        if not self.processor.is_processing:
-                                            print("等待详情页处理时收到停止信号，停止处理")
-                                            return self.processor.processed_count - start_count
-                                            
-                                        if hasattr(self.processor, 'browser') and hasattr(self.processor.browser, 'is_running'):
-                                            if not self.processor.browser.is_running:
-                                                print("等待详情页处理时检测到browser_manager停止信号，停止处理")
-                                                self.processor.is_processing = False
-                                                return self.processor.processed_count - start_count
-                                        
-                                        if detail_wait_count % 3 == 0:  # 每3秒打印一次
-                                            print(f"⏳ 等待详情页处理完成... ({detail_wait_count}秒)")
-                                        await asyncio.sleep(1)
-                                        detail_wait_count += 1
-                                    
-                                    if detail_wait_count >= max_detail_wait:
-                                        print("⚠️ 等待详情页处理超时，强制继续")
-                                    else:
-                                        print(f"✅ 详情页处理已完成，用时: {detail_wait_count} 秒")
+                                    if not await self._wait_for_detail_idle(60):
+                                        return self.processor.processed_count - start_count
                         except Exception as e:
                             print(f"处理卡片时出错: {e}")
                             import traceback
                             traceback.print_exc()
                         
+                        # 后台详情页已完成的评估结果回到列表页处理（运行中关闭了详情页池时也要处理剩余结果）
+                        if self.processor.detail_pool.has_pending:
+                            await self.processor.detail_pool.reconcile()
+                        
+                        # 定期保存检查点
+                        self.processor.save_checkpoint({
+                            "batchIndex": processed_batches,
+                            "lastCandidate": card_id,
+                            "cardCount": total_cards,
+                            "cardIndex": card.get('index', i)
+                        })
+                        
                         # 临时停顿，避免频繁操作，为每个卡片添加随机延迟
-                        await asyncio.sleep(random.uniform(0.3, 0.8))
+                        await self.processor.pacing.pause('card_gap')
                         
                         # 如果是批次中的最后几个卡片，准备触发滚动加载下一批
-                        remaining_in_batch = total_cards - (i + 1)
+                        remaining_in_batch = len(cards) - (i + 1)
                         if remaining_in_batch <= 3 and i >= 10:  # 至少处理10个且剩余少于3个时
                             print(f"接近当前批次末尾，还剩 {remaining_in_batch} 个卡片")
                     
+                    # 重新获取卡片快照会使本批卡片标记失效，先等待后台详情页全部完成并打招呼
+                    if self.processor.detail_pool.has_pending:
+                        await self.processor.detail_pool.reconcile(wait=True)
+                    
                     # 检查本页是否有新卡片被处理或打了招呼
                     after_processed_count = self.processor.processed_count
                     
                     # 更新最新的打招呼数量
-                    after_greeted_count = 0
-                    for log in self.processor.get_candidates_log():
-                        if log.get('action') == 'greet':
-                            after_greeted_count += 1
+                    after_greeted_count = self.processor.get_greeted_count()
                     
                     new_processed = after_processed_count - before_processed_count
                     new_greeted = after_greeted_count - before_greeted_count
                     
                     print(f"本批处理统计: 新处理 {new_processed} 个候选人，新打招呼 {new_greeted} 人")
+                    counters = self.processor.get_session_counters()
+                    print(f"会话统计: 已记录 {counters['processed']} 人，打招呼 {counters['greeted']} 人，跳过 {counters['skipped']} 人")
+                    cache_stats = self.processor.card_processor.parse_cache.get_stats()
+                    print(f"卡片解析缓存: {cache_stats['size']} 条，命中 {cache_stats['hits']} 次，未命中 {cache_stats['misses']} 次")
+                    self.processor.detail_processor.readiness.print_stats()
+                    self.processor.pacing.print_stats()
+                    self.lookahead.print_stats()
+                    self.processor.detail_pool.print_stats()
                     
                     # 更新已处理批次计数
                     if new_processed > 0 and new_processed >= total_cards * 0.7:  # 如果处理了当前页面70%以上的卡片
                         processed_batches += 1
                         print(f"批次 {processed_batches} 处理完成")
                     
+                    # 本批处理完，滚动加载下一批之前保存检查点
+                    self.processor.save_checkpoint({
+                        "batchIndex": processed_batches,
+                        "lastCandidate": self.processor.card_processor._snapshot_card_id(cards[-1]) if cards else None,
+                        "cardCount": total_cards,
+                        "cardIndex": total_cards - 1
+                    }, force=True)
+                    
                     if new_processed == 0:
                         no_new_card_count += 1
                         print(f"连续 {no_new_card_count}/{max_no_new_cards} 页没有新的候选人被处理")
@@ -292,6 +377,7 @@ class ResumePageProcessor:
                     # 如果连续多页没有新的候选人，考虑结束处理
                     if no_new_card_count >= max_no_new_cards:
                         print(f"已连续 {no_new_card_count} 页没有新的候选人被处理，可能已浏览完所有有效候选人")
+                        self.processor.clear_checkpoint()
                         print(f"总计: 处理了 {self.processor.processed_count} 个候选人，打招呼 {after_greeted_count} 人，共 {processed_batches} 批次")
                         return self.processor.processed_count - start_count
                     
@@ -307,51 +393,28 @@ class ResumePageProcessor:
                         # 确保详情页处理已完成
                         if self.processor.is_detail_page_processing():
                             print("执行滚动前，等待详情页处理完成...")
-                            # 等待详情页处理完成
-                            max_wait = 30  # 最长等待30秒
-                            wait_count = 0
-                            while self.processor.is_detail_page_processing() and wait_count < max_wait:
-                                # 在等待期间检查停止信号
-                                if not self.processor.is_processing:
-                                    print("等待详情页处理时收到停止信号，停止处理")
-                                    return self.processor.processed_count - start_count
-                                    
-                                if hasattr(self.processor, 'browser') and hasattr(self.processor.browser, 'is_running'):
-                                    if not self.processor.browser.is_running:
-                                        print("等待详情页处理时检测到browser_manager停止信号，停止处理")
-                                        self.processor.is_processing = False
-                                        return self.processor.processed_count - start_count
-                                
-                                if wait_count % 5 == 0:  # 每5秒打印一次
-                                    print(f"等待详情页处理完成... ({wait_count}秒)")
-                                await asyncio.sleep(1)
-                                wait_count += 1
-                            
-                            if wait_count >= max_wait:
-                                print("等待详情页处理超时，强制继续")
-                            else:
-                                print(f"详情页处理已完成，等待时间: {wait_count} 秒")
+                            if not await self._wait_for_detail_idle(30):
+                                return self.processor.processed_count - start_count
                         
                         # 尝试滚动加载更多卡片
                         print(f"尝试滚动加载更多卡片，准备加载第 {processed_batches + 1} 批次")
                         has_more = await self.processor._go_to_next_page(target_page)
                         if has_more:
                             # 等待新卡片加载，为批量加载添加更长的等待时间
-                            load_wait = random.uniform(2.5, 4.0)
-                            print(f"正在等待新批次加载... ({load_wait:.1f}秒)")
-                            await asyncio.sleep(load_wait)
+                            load_wait = await self.processor.pacing.pause('batch_load')
+                            print(f"已等待新批次加载 ({load_wait:.1f}秒)")
                             
                             # 递归处理新加载的卡片
                             print(f"已加载更多卡片，继续处理第 {processed_batches + 1} 批次")
-                            return await self.process_recommend_list_page(page, config)
+                            return await self.process_recommend_list_page(page, config, _continuation=True)
                         else:
                             print("没有更多卡片可加载，尝试刷新页面后再试")
                             try:
                                 # 添加随机延迟模拟人类行为
-                                await asyncio.sleep(random.uniform(1.0, 2.0))
+                                await self.processor.pacing.pause('before_reload')
                                 await page.reload()
-                                await asyncio.sleep(random.uniform(2.0, 3.5))  # 等待页面加载
-                                return await self.process_recommend_list_page(page, config)
+                                await self.processor.pacing.pause('after_reload')  # 等待页面加载
+                                return await self.process_recommend_list_page(page, config, _continuation=True)
                             except Exception as e:
                                 print(f"刷新页面出错: {e}")
                                 return self.processor.processed_count - start_count
@@ -362,12 +425,10 @@ class ResumePageProcessor:
                     
                     if empty_page_count >= max_empty_pages:
                         print(f"已连续 {empty_page_count} 页未找到卡片，可能已浏览完所有候选人")
+                        self.processor.clear_checkpoint()
                         
                         # 更新最终打招呼数量
-                        final_greeted_count = 0
-                        for log in self.processor.get_candidates_log():
-                            if log.get('action') == 'greet':
-                                final_greeted_count += 1
+                        final_greeted_count = self.processor.get_greeted_count()
                         
                         print(f"总计: 处理了 {self.processor.processed_count} 个候选人，打招呼 {final_greeted_count} 人，共 {processed_batches} 批次")
                         return self.processor.processed_count - start_count
@@ -377,20 +438,20 @@ class ResumePageProcessor:
                     has_more = await self.processor._go_to_next_page(target_page)
                     if has_more:
                         # 等待新卡片加载，添加随机延迟
-                        await asyncio.sleep(random.uniform(2.0, 3.5))
+                        await self.processor.pacing.pause('batch_load')
                         # 重置连续空页面计数
                         empty_page_count = 0
                         # 递归处理新加载的卡片
-                        return await self.process_recommend_list_page(page, config)
+                        return await self.process_recommend_list_page(page, config, _continuation=True)
                     else:
                         # 刷新页面再试
                         print("未找到卡片且无法滚动加载更多，尝试刷新页面")
                         retry_count += 1
                         if retry_count < max_retries:
                             try:
-                                await asyncio.sleep(random.uniform(1.0, 2.0))
+                                await self.processor.pacing.pause('before_reload')
                                 await page.reload()
-                                await asyncio.sleep(random.uniform(2.0, 3.0))  # 等待页面加载
+                                await self.processor.pacing.pause('after_reload')  # 等待页面加载
                                 print(f"已刷新页面，重试第 {retry_count}/{max_retries} 次")
                             except Exception as e:
                                 print(f"刷新页面出错: {e}")
@@ -398,10 +459,7 @@ class ResumePageProcessor:
                             print(f"已达到最大重试次数: {max_retries}，停止处理")
                             
                             # 更新最终打招呼数量
-                            final_greeted_count = 0
-                            for log in self.processor.get_candidates_log():
-                                if log.get('action') == 'greet':
-                                    final_greeted_count += 1
+                            final_greeted_count = self.processor.get_greeted_count()
                             
                             print(f"总计: 处理了 {self.processor.processed_count} 个候选人，打招呼 {final_greeted_count} 人，共 {processed_batches} 批次")
                             return self.processor.processed_count - start_count
@@ -413,24 +471,18 @@ class ResumePageProcessor:
                 retry_count += 1
                 if retry_count < max_retries:
                     print(f"发生错误，重试第 {retry_count}/{max_retries} 次")
-                    await asyncio.sleep(random.uniform(1.5, 2.5))
+                    await self.processor.pacing.pause('retry')
                 else:
                     print(f"已达到最大重试次数: {max_retries}，停止处理")
                     
                     # 更新最终打招呼数量
-                    final_greeted_count = 0
-                    for log in self.processor.get_candidates_log():
-                        if log.get('action') == 'greet':
-                            final_greeted_count += 1
+                    final_greeted_count = self.processor.get_greeted_count()
                     
                     print(f"总计: 处理了 {self.processor.processed_count} 个候选人，打招呼 {final_greeted_count} 人，共 {processed_batches} 批次")
                     return self.processor.processed_count - start_count
         
         # 更新最终打招呼数量
-        final_greeted_count = 0
-        for log in self.processor.get_candidates_log():
-            if log.get('action') == 'greet':
-                final_greeted_count += 1
+        final_greeted_count = self.processor.get_greeted_count()
         
         print(f"处理完毕: 总共处理了 {self.processor.processed_count} 个候选人，打招呼 {final_greeted_count} 人，共 {processed_batches} 批次")
         return self.processor.processed_count - start_count 
\ No newline at end of file
@@ -13,6 +13,11 @@ from automation.processors.enhanced_data_extractor import EnhancedDataExtractor
 from automation.processors.evaluation_helper import EvaluationHelper
 from automation.processors.card_extractor import CardExtractor
 from automation.processors.interaction_handler import InteractionHandler
+from automation.processors.pacing_scheduler import PacingScheduler
+from automation.processors.seen_candidate_store import SeenCandidateStore
+from automation.processors.candidate_fingerprint import CandidateFingerprinter
+from automation.processors.detail_page_pool import DetailPagePool
+from automation.processors.checkpoint_store import CheckpointStore
 
 # 导入拆分后的模块
 from automation.processors.resume_page_processor import ResumePageProcessor
@@ -39,9 +44,10 @@ class ResumeProcessor:
         self.selectors = selectors or {}
         self.is_processing = False
         self.processed_count = 0
-        self.processed_ids = set()  # 已处理ID集合，避免重复处理
+        self.processed_ids = SeenCandidateStore()  # 已处理ID（跨会话持久化），避免重复处理
         self.max_process_count = 0  # 添加最大处理数量属性，0表示不限制
         self.candidates_log = []    # 添加候选人日志记录
+        self._stop_event = None     # 停止事件，用于立即唤醒所有等待
         
         # 设置增强数据提取器
         if data_extractor:
@@ -55,8 +61,14 @@ class ResumeProcessor:
         self.log_dir = os.path.expanduser("~/Library/Application Support/SourcingCopilot/logs")
         os.makedirs(self.log_dir, exist_ok=True)
         
+        # 候选人指纹服务，为没有ID的卡片生成重启后不变的指纹
+        self.fingerprints = CandidateFingerprinter(os.path.join(os.path.dirname(self.log_dir), "fingerprint.key"))
+        
+        # 节奏调度器，统一管理所有模拟人工操作的延迟和动作频率预算
+        self.pacing = PacingScheduler(lambda: self.stop_event)
+        
         # 初始化交互处理器
-        self.interaction_handler = InteractionHandler(self.log_dir)
+        self.interaction_handler = InteractionHandler(self.log_dir, self.pacing)
         
         # 初始化拆分后的处理器模块 - 注意初始化顺序，先初始化详情页处理器
         self.detail_processor = ResumeDetailProcessor(self)
@@ -65,6 +77,12 @@ class ResumeProcessor:
         self.navigation_helper = NavigationHelper(self)
         self.logging_helper = LoggingHelper(self)
         
+        # 可选的后台详情页池，在少量后台标签页中并行处理详情页
+        self.detail_pool = DetailPagePool(self)
+        
+        # 处理进度检查点，断线重连或重启后从检查点继续
+        self.checkpoints = CheckpointStore()
+        
         # 加载并打印规则配置
         self._print_rule_config()
         
@@ -143,10 +161,104 @@ class ResumeProcessor:
         except Exception as e:
             print(f"打印规则配置失败: {e}")
     
+    async def open_seen_store(self, config):
+        """
+        按当前岗位打开已处理候选人存储，之前会话处理过的候选人会被直接跳过
+        
+        Args:
+            config: 规则配置（jobId决定岗位范围，seenExpireDays决定记录有效天数）
+            
+        Returns:
+            int: 已加载的已处理候选人数量
+        """
+        ttl_days = None
+        if config and config.get('seenExpireDays') is not None:
+            try:
+                ttl_days = max(1, int(config.get('seenExpireDays')))
+            except (TypeError, ValueError):
+                print(f"无效的记录有效天数: {config.get('seenExpireDays')}，使用默认值")
+        count = await self.processed_ids.open_async(SeenCandidateStore.job_key_for(config), ttl_days)
+        
+        # 进程在运行中途重启时从检查点恢复计数器，打招呼配额继续累计；
+        # 上一轮已正常停止或达到配额时只恢复列表位置，计数从零开始
+        checkpoint = self.load_checkpoint()
+        if (checkpoint and checkpoint.get('interrupted')
+                and self.processed_count == 0 and self.logging_helper.processed_total == 0):
+            self.processed_count = checkpoint.get('processedCount', 0)
+            self.logging_helper.restore_counters(checkpoint.get('counters'))
+            print(f"已从检查点恢复计数: 已处理 {self.processed_count} 个，已打招呼 {self.get_greeted_count()} 人")
+        return count
+        
+    def _checkpoint_key(self):
+        """检查点使用的岗位范围键，与已处理候选人存储一致"""
+        return self.processed_ids.job_key or SeenCandidateStore.DEFAULT_JOB_KEY
+        
+    def load_checkpoint(self):
+        """
+        读取当前岗位的检查点
+        
+        Returns:
+            dict: 检查点，没有或已过期时返回None
+        """
+        return self.checkpoints.load(self._checkpoint_key())
+        
+    def save_checkpoint(self, state, force=False):
+        """
+        保存当前岗位的检查点（按间隔节流），自动附带处理数量、会话计数器和运行是否已结束
+        
+        Args:
+            state: 检查点内容（batchIndex, lastCandidate, cardCount, cardIndex）
+            force: 是否立即保存
+            
+        Returns:
+            bool: 是否已保存
+        """
+        state = dict(
+            state,
+            processedCount=self.processed_count,
+            counters=self.get_session_counters(),
+            interrupted=not (self.is_stop_requested() or self.is_quota_reached())
+        )
+        return self.checkpoints.save(self._checkpoint_key(), state, force)
+        
+    def clear_checkpoint(self):
+        """删除当前岗位的检查点，下次从列表顶部开始"""
+        self.checkpoints.clear(self._checkpoint_key())
+        
+    def finish_checkpoint(self):
+        """正常停止或达到配额时标记检查点已结束，下次启动只恢复列表位置"""
+        self.checkpoints.mark_finished(self._checkpoint_key())
+        
+    def is_quota_reached(self):
+        """检查是否已达到目标打招呼数量"""
+        return self.max_process_count > 0 and self.get_greeted_count() >= self.max_process_count
+        
+    def refresh_config(self, config):
+        """
+        获取最新的规则配置，运行中保存的新规则在下一批卡片生效
+        
+        Args:
+            config: 当前使用的配置
+            
+        Returns:
+            dict: 最新配置，没有变化时返回原配置
+        """
+        try:
+            latest = self.browser._load_config()
+        except Exception as e:
+            print(f"获取最新配置失败，继续使用当前配置: {e}")
+            return config
+        if latest is None or latest is config:
+            return config
+        
+        print("🔄 检测到规则配置更新，后续卡片使用新配置")
+        self.pacing.configure(latest)
+        self.detail_pool.configure(latest)
+        return latest
+        
     def reset_processed_ids(self):
-        """重置已处理ID，允许重新处理所有卡片"""
-        old_count = len(self.processed_ids)
-        self.processed_ids.clear()
+        """重置当前岗位的已处理ID，允许重新处理所有卡片"""
+        old_count = self.processed_ids.clear()
         print(f"已重置处理状态，清除了 {old_count} 个已处理ID")
         return old_count
         
@@ -158,6 +270,10 @@ class ResumeProcessor:
         """处理单个简历卡片"""
         return await self.card_processor.process_resume_card(page, card, config)
         
+    async def process_card_snapshot(self, page, snapshot, config):
+        """基于批量快照处理单个简历卡片"""
+        return await self.card_processor.process_card_snapshot(page, snapshot, config)
+        
     async def process_detail_page(self, page, config, card_resume_data=None):
         """处理简历详情页"""
         return await self.detail_processor.process_detail_page(page, config, card_resume_data)
@@ -174,9 +290,41 @@ class ResumeProcessor:
         """尝试关闭详情页"""
         return await self.navigation_helper.try_close_detail_page(page)
         
+    @property
+    def stop_event(self):
+        """停止事件，调用stop_processing时被设置"""
+        if self._stop_event is None:
+            self._stop_event = asyncio.Event()
+        return self._stop_event
+        
     def stop_processing(self):
         """停止处理"""
         self.is_processing = False
+        if self._stop_event is not None:
+            self._stop_event.set()
+            
+    def is_stop_requested(self):
+        """检查是否收到停止信号（处理器或browser_manager）"""
+        if not self.is_processing:
+            return True
+        if hasattr(self, 'browser') and hasattr(self.browser, 'is_running') and not self.browser.is_running:
+            return True
+        return False
+        
+    async def wait_for_detail_idle(self, timeout=None):
+        """
+        等待详情页处理完成，收到停止信号时立即返回
+        
+        Args:
+            timeout: 最长等待秒数
+            
+        Returns:
+            str: 'idle'已完成 | 'timeout'超时 | 'stopped'收到停止信号
+        """
+        idle = await self.detail_processor.wait_until_idle(timeout, self.stop_event)
+        if self.is_stop_requested():
+            return 'stopped'
+        return 'idle' if idle else 'timeout'
         
     def get_processed_count(self):
         """获取已处理数量"""
@@ -190,6 +338,14 @@ class ResumeProcessor:
         """获取候选人日志"""
         return self.logging_helper.get_candidates_log()
     
+    def get_greeted_count(self):
+        """获取本次会话已打招呼的数量"""
+        return self.logging_helper.get_greeted_count()
+        
+    def get_session_counters(self):
+        """获取会话计数器快照（已记录、已打招呼、已跳过、按原因）"""
+        return self.logging_helper.get_counters()
+        
     def log_candidate(self, candidate_data, action, reason="", ai_evaluation=None):
         """记录候选人处理信息"""
         return self.logging_helper.log_candidate(candidate_data, action, reason, ai_evaluation)
@@ -202,6 +358,22 @@ class ResumeProcessor:
         """保存处理日志到文件"""
         return self.logging_helper.save_processing_log(filename)
         
+    def get_pacing_stats(self):
+        """获取节奏等待与实际工作时间统计"""
+        return self.pacing.get_stats()
+        
+    def get_lookahead_stats(self):
+        """获取卡片预读统计（后台解析数量和与页面操作的重叠率）"""
+        return self.page_processor.lookahead.get_stats()
+        
+    def get_detail_pool_stats(self):
+        """获取后台详情页池统计"""
+        return self.detail_pool.get_stats()
+        
+    def get_latency_stats(self):
+        """获取详情页就绪等待的延迟统计"""
+        return self.detail_processor.readiness.get_stats()
+        
     def is_detail_page_processing(self):
         """检查详情页是否正在处理中"""
         return self.detail_processor.processing_detail
\ No newline at end of file
@@ -0,0 +1,161 @@
+"""
+简历记录模块
+在处理流程中代替普通dict传递简历数据，避免反复复制大文本字段
+"""
+
+from collections.abc import MutableMapping
+
+
+class ResumeRecord(MutableMapping):
+    """
+    简历记录类
+
+    兼容dict的读写接口，流程中的代码可以继续使用get/[]/update/in等操作。
+    fullText、html_content等大文本字段单独存放并在副本之间共享（str本身不可变），
+    copy()只共享底层存储，直到某一方写入时才复制小字段（写时复制）。
+    只有在写数据库、写索引文件或返回API时才通过to_dict()转换为普通dict。
+
+    注意：列表等可变字段值应整体替换，不要原地修改，否则会影响共享同一存储的副本。
+    """
+
+    __slots__ = ('_fields', '_texts', '_shared')
+
+    # 单独存放、在副本间共享的大文本字段
+    LARGE_TEXT_FIELDS = frozenset(['fullText', 'html_content'])
+
+    def __init__(self, data=None, **kwargs):
+        """
+        初始化简历记录
+
+        Args:
+            data: 初始数据（dict或ResumeRecord）
+            **kwargs: 额外字段
+        """
+        self._fields = {}
+        self._texts = {}
+        self._shared = False
+        if data:
+            self.update(data)
+        if kwargs:
+            self.update(kwargs)
+
+    @classmethod
+    def wrap(cls, data):
+        """
+        将数据包装为ResumeRecord，已经是ResumeRecord时直接返回
+
+        Args:
+            data: dict、ResumeRecord或None
+
+        Returns:
+            ResumeRecord: 简历记录
+        """
+        if isinstance(data, cls):
+            return data
+        return cls(data or {})
+
+    @classmethod
+    def copy_of(cls, data):
+        """
+        获取数据的独立副本，ResumeRecord使用写时复制，dict则转换为新记录
+
+        Args:
+            data: dict、ResumeRecord或None
+
+        Returns:
+            ResumeRecord: 新的简历记录
+        """
+        if isinstance(data, cls):
+            return data.copy()
+        return cls(data or {})
+
+    def _own(self):
+        """写入前确保独占底层存储"""
+        if self._shared:
+            self._fields = dict(self._fields)
+            self._texts = dict(self._texts)
+            self._shared = False
+
+    def __getitem__(self, key):
+        if key in self._texts:
+            return self._texts[key]
+        return self._fields[key]
+
+    def __setitem__(self, key, value):
+        self._own()
+        if key in self.LARGE_TEXT_FIELDS:
+            self._fields.pop(key, None)
+            self._texts[key] = value
+        else:
+            self._fields[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._own()
+        if key in self._texts:
+            del self._texts[key]
+        else:
+            del self._fields[key]
+
+    def __contains__(self, key):
+        return key in self._fields or key in self._texts
+
+    def __iter__(self):
+        yield from self._fields
+        yield from self._texts
+
+    def __len__(self):
+        return len(self._fields) + len(self._texts)
+
+    def get(self, key, default=None):
+        if key in self._texts:
+            return self._texts[key]
+        return self._fields.get(key, default)
+
+    def copy(self):
+        """
+        创建副本，副本与原记录共享存储，任一方写入时才复制小字段
+
+        Returns:
+            ResumeRecord: 副本
+        """
+        other = ResumeRecord.__new__(ResumeRecord)
+        other._fields = self._fields
+        other._texts = self._texts
+        other._shared = True
+        self._shared = True
+        return other
+
+    __copy__ = copy
+
+    def to_dict(self, include_large_text=True):
+        """
+        转换为普通dict，用于数据库、索引文件和API边界
+
+        Args:
+            include_large_text: 是否包含fullText等大文本字段
+
+        Returns:
+            dict: 简历数据
+        """
+        result = {
+            key: list(value) if isinstance(value, list) else value
+            for key, value in self._fields.items()
+        }
+        if include_large_text:
+            result.update(self._texts)
+        return result
+
+    def __eq__(self, other):
+        if isinstance(other, ResumeRecord):
+            return self._fields == other._fields and self._texts == other._texts
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        summary = dict(self._fields)
+        for key, value in self._texts.items():
+            summary[key] = f"<{len(value) if value else 0} chars>"
+        return f"ResumeRecord({summary!r})"
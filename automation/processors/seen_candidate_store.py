@@ -0,0 +1,531 @@
+"""
+已处理候选人存储模块
+跨会话记录已处理的候选人：内存中的布隆过滤器负责快速判断"一定没见过"，
+命中时再查询带索引的SQLite表确认，按岗位隔离并支持过期。
+数据库读写都在单独的存储线程中执行，写入合并成批，不阻塞自动化流程的事件循环
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import inspect, text
+
+from automation.database.db import engine, get_db_session
+from automation.database.models import SeenCandidate
+from automation.processors.candidate_fingerprint import SimHashIndex
+
+
+class BloomFilter:
+    """布隆过滤器，固定内存，可能误判为"存在"，不会误判为"不存在" """
+
+    def __init__(self, capacity=100000, error_rate=0.01):
+        """
+        初始化布隆过滤器
+
+        Args:
+            capacity: 预计容纳的元素数量
+            error_rate: 期望的误判率
+        """
+        capacity = max(1, int(capacity))
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        """使用双重哈希计算元素对应的各个比特位"""
+        digest = hashlib.blake2b(str(key).encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def clear(self):
+        self.bits = bytearray(len(self.bits))
+
+
+class SeenCandidateStore:
+    """
+    已处理候选人存储
+
+    兼容原processed_ids集合的接口（in/add/len/clear），流程中的代码无需修改。
+    内存占用由布隆过滤器和有界的最近结果缓存决定，不随会话长度增长。
+    异步流程中使用open_async()、contains()和prefetch()，数据库读取在存储线程中执行，
+    in判断只用于事件循环之外（事件循环中需要查询数据库时抛出异常，可用peek()只读内存）；
+    add()只更新内存并把记录放入待写队列，由存储线程批量写入。
+    """
+
+    DEFAULT_JOB_KEY = 'default'
+
+    # prefetch()单次IN查询的最大键数
+    LOOKUP_CHUNK = 500
+
+    def __init__(self, ttl_days=30, capacity=100000, recent_size=2000):
+        """
+        初始化已处理候选人存储
+
+        Args:
+            ttl_days: 记录的有效天数，过期后允许重新处理
+            capacity: 布隆过滤器容量
+            recent_size: 最近查询结果缓存的条目数
+        """
+        self.ttl_days = ttl_days
+        self.capacity = capacity
+        self.recent_size = max(1, int(recent_size))
+        self.job_key = None
+        self.bloom = BloomFilter(capacity)
+        self._recent = OrderedDict()
+        self._count = 0
+        self._persistent = True
+        self.near_index = SimHashIndex()
+        self.bloom_rejects = 0
+        self.db_lookups = 0
+        self.db_writes = 0
+        self.write_batches = 0
+
+        # 待写入的记录 {(岗位范围, 键): (SimHash, 处理时间)}，由存储线程批量写入
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._flush_scheduled = False
+        self._executor = None
+
+    def _store_executor(self):
+        """数据库读写使用的单线程执行器，保证写入和查询按提交顺序执行"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='seen-store')
+        return self._executor
+
+    @staticmethod
+    def _to_signed(simhash):
+        """64位无符号SimHash转换为SQLite可存储的有符号整数"""
+        if simhash is None:
+            return None
+        return simhash - (1 << 64) if simhash >= (1 << 63) else simhash
+
+    @staticmethod
+    def _to_unsigned(value):
+        if value is None:
+            return None
+        return value + (1 << 64) if value < 0 else value
+
+    @staticmethod
+    def job_key_for(config):
+        """
+        根据配置计算岗位范围：优先使用配置中的jobId，否则使用岗位相关配置的摘要
+
+        Args:
+            config: 规则配置
+
+        Returns:
+            str: 岗位范围键
+        """
+        config = config or {}
+        if config.get('jobId'):
+            return str(config.get('jobId'))[:64]
+
+        job_fields = {
+            'targetPosition': config.get('targetPosition', ''),
+            'jobDescription': config.get('jobDescription', ''),
+            'positionRules': [
+                rule.get('keywords', []) for rule in config.get('rules', [])
+                if rule.get('type') == '岗位' and rule.get('enabled')
+            ]
+        }
+        if not any(job_fields.values()):
+            return SeenCandidateStore.DEFAULT_JOB_KEY
+        return hashlib.blake2b(
+            json.dumps(job_fields, sort_keys=True, ensure_ascii=False).encode('utf-8'),
+            digest_size=16
+        ).hexdigest()
+
+    def open(self, job_key=None, ttl_days=None):
+        """
+        打开某个岗位范围：清理过期记录，并把该岗位未过期的记录加载到布隆过滤器
+
+        会读取整张表，耗时随记录数增长；自动化流程中使用open_async()，在存储线程中执行
+
+        Args:
+            job_key: 岗位范围键，默认使用DEFAULT_JOB_KEY
+            ttl_days: 记录有效天数，不提供时保持当前设置
+
+        Returns:
+            int: 加载的已处理候选人数量
+        """
+        # 先写入上一次会话尚未落盘的记录，保证重新打开时能加载到
+        self._write_pending()
+        job_key = job_key or self.DEFAULT_JOB_KEY
+        if ttl_days is not None:
+            self.ttl_days = ttl_days
+
+        # 加载到新的结构中，加载完成后再整体替换
+        bloom = BloomFilter(self.capacity)
+        near_index = SimHashIndex()
+        count = 0
+        persistent = True
+        try:
+            SeenCandidate.__table__.create(bind=engine, checkfirst=True)
+            self._migrate_schema()
+            now = datetime.now()
+            with get_db_session() as session:
+                expired = session.query(SeenCandidate).filter(SeenCandidate.expires_at <= now).delete(synchronize_session=False)
+                if expired:
+                    print(f"已清理 {expired} 条过期的已处理候选人记录")
+
+                rows = session.query(SeenCandidate.candidate_key, SeenCandidate.simhash).filter(
+                    SeenCandidate.job_key == job_key,
+                    SeenCandidate.expires_at > now
+                ).order_by(SeenCandidate.last_seen).yield_per(1000)
+                for candidate_key, simhash in rows:
+                    bloom.add(candidate_key)
+                    near_index.add(candidate_key, self._to_unsigned(simhash))
+                    count += 1
+            print(f"已加载岗位 {job_key} 的 {count} 个已处理候选人")
+        except Exception as e:
+            # 数据库不可用时退化为仅内存去重
+            print(f"⚠️ 加载已处理候选人记录失败，本次仅在内存中去重: {e}")
+            persistent = False
+
+        self.bloom = bloom
+        self.near_index = near_index
+        self._recent.clear()
+        self._count = count
+        self._persistent = persistent
+        self.job_key = job_key
+        return count
+
+    async def open_async(self, job_key=None, ttl_days=None):
+        """
+        在存储线程中打开岗位范围，不阻塞事件循环（参数和返回值同open）
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._store_executor(), self.open, job_key, ttl_days)
+
+    @staticmethod
+    def _migrate_schema():
+        """为旧版本创建的seen_candidates表补齐后来新增的列（create(checkfirst=True)不会修改已有表）"""
+        columns = {column['name'] for column in inspect(engine).get_columns(SeenCandidate.__tablename__)}
+        if 'simhash' not in columns:
+            with engine.begin() as connection:
+                connection.execute(text(f"ALTER TABLE {SeenCandidate.__tablename__} ADD COLUMN simhash BIGINT"))
+            print("已为已处理候选人表添加simhash列")
+
+    @staticmethod
+    def _in_event_loop():
+        try:
+            asyncio.get_running_loop()
+            return True
+        except RuntimeError:
+            return False
+
+    def _ensure_open(self):
+        """同步调用时按需打开默认岗位范围；事件循环中不允许阻塞加载，需要先调用open_async()"""
+        if self.job_key is not None:
+            return
+        if self._in_event_loop():
+            raise RuntimeError("已处理候选人存储尚未打开，请先调用 await open_async()")
+        self.open()
+
+    def _remember(self, key, seen):
+        """记录最近的查询结果，超出容量时淘汰最久未使用的条目"""
+        self._recent[key] = seen
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.recent_size:
+            self._recent.popitem(last=False)
+
+    def _check_memory(self, key):
+        """
+        只在内存中判断是否已处理
+
+        Returns:
+            bool: 能在内存中确定时返回结果，需要查询数据库时返回None
+        """
+        # 布隆过滤器判断不存在时一定不存在
+        if key not in self.bloom:
+            self.bloom_rejects += 1
+            return False
+
+        if key in self._recent:
+            self._recent.move_to_end(key)
+            return self._recent[key]
+
+        if (self.job_key, key) in self._pending:
+            return True
+
+        if not self._persistent:
+            # 没有数据库可确认时，接受布隆过滤器的小概率误判
+            return True
+        return None
+
+    def _lookup(self, job_key, keys):
+        """在存储线程中查询一组键，返回其中未过期的已处理键"""
+        self.db_lookups += 1
+        try:
+            with get_db_session() as session:
+                rows = session.query(SeenCandidate.candidate_key).filter(
+                    SeenCandidate.job_key == job_key,
+                    SeenCandidate.candidate_key.in_(keys),
+                    SeenCandidate.expires_at > datetime.now()
+                ).all()
+            return {row[0] for row in rows}
+        except Exception as e:
+            print(f"⚠️ 查询已处理候选人失败: {e}")
+            return set()
+
+    def __contains__(self, key):
+        if not key:
+            return False
+        self._ensure_open()
+        key = str(key)[:100]
+
+        seen = self._check_memory(key)
+        if seen is not None:
+            return seen
+
+        # 同步兼容路径（只用于事件循环之外）：布隆过滤器可能误判，查询数据库确认
+        if self._in_event_loop():
+            raise RuntimeError(f"在事件循环中判断 {key} 需要查询数据库，请使用 await contains() 或先 prefetch()")
+        seen = key in self._store_executor().submit(self._lookup, self.job_key, [key]).result()
+        self._remember(key, seen)
+        return seen
+
+    def peek(self, key):
+        """
+        只在内存中判断是否已处理（不查询数据库，可在事件循环中调用）
+
+        Args:
+            key: 候选人ID或卡片指纹
+
+        Returns:
+            bool: 确定已处理/未处理时返回True/False，需要查询数据库才能确定时返回None
+        """
+        if not key or self.job_key is None:
+            return None if key else False
+        return self._check_memory(str(key)[:100])
+
+    async def contains(self, key):
+        """
+        判断候选人是否已处理，需要查询数据库时在存储线程中执行，不阻塞事件循环
+
+        Args:
+            key: 候选人ID或卡片指纹
+
+        Returns:
+            bool: 是否已处理
+        """
+        if not key:
+            return False
+        if self.job_key is None:
+            await self.open_async()
+        key = str(key)[:100]
+
+        seen = self._check_memory(key)
+        if seen is not None:
+            return seen
+
+        job_key = self.job_key
+        found = await asyncio.get_running_loop().run_in_executor(self._store_executor(), self._lookup, job_key, [key])
+        seen = key in found
+        if job_key == self.job_key:
+            self._remember(key, seen)
+        return seen
+
+    async def prefetch(self, keys):
+        """
+        批量确认一组键（如一批卡片快照），结果写入最近结果缓存，
+        之后对这些键的in判断不再查询数据库
+
+        Args:
+            keys: 候选人ID或卡片指纹列表
+
+        Returns:
+            int: 查询数据库的键数量
+        """
+        if self.job_key is None:
+            await self.open_async()
+        unknown = []
+        for key in keys:
+            if not key:
+                continue
+            key = str(key)[:100]
+            if key not in unknown and self._check_memory(key) is None:
+                unknown.append(key)
+        if not unknown:
+            return 0
+
+        job_key = self.job_key
+        loop = asyncio.get_running_loop()
+        for start in range(0, len(unknown), self.LOOKUP_CHUNK):
+            chunk = unknown[start:start + self.LOOKUP_CHUNK]
+            found = await loop.run_in_executor(self._store_executor(), self._lookup, job_key, chunk)
+            if job_key != self.job_key:
+                break
+            for key in chunk:
+                self._remember(key, key in found)
+        return len(unknown)
+
+    def add(self, key, simhash=None):
+        """
+        记录已处理的候选人（内存立即生效，数据库写入由存储线程批量完成）
+
+        Args:
+            key: 候选人ID或卡片指纹
+            simhash: 卡片文本的SimHash，提供时加入近似重复索引
+        """
+        if not key:
+            return
+        self._ensure_open()
+        key = str(key)[:100]
+        is_new = self._recent.get(key) is not True
+        self.bloom.add(key)
+        self._remember(key, True)
+        self.near_index.add(key, simhash)
+
+        if not self._persistent:
+            if is_new:
+                self._count += 1
+            return
+
+        with self._pending_lock:
+            pending_key = (self.job_key, key)
+            previous = self._pending.get(pending_key)
+            if simhash is None and previous is not None:
+                simhash = previous[0]
+            self._pending[pending_key] = (simhash, datetime.now())
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        self._store_executor().submit(self._write_pending)
+
+    def _write_pending(self):
+        """存储线程：把待写队列中的记录合并为一个事务写入"""
+        with self._pending_lock:
+            batch, self._pending = self._pending, {}
+            self._flush_scheduled = False
+        if not batch:
+            return 0
+
+        inserted = 0
+        try:
+            with get_db_session() as session:
+                for (job_key, key), (simhash, seen_at) in batch.items():
+                    expires_at = seen_at + timedelta(days=self.ttl_days)
+                    record = session.query(SeenCandidate).filter(
+                        SeenCandidate.job_key == job_key,
+                        SeenCandidate.candidate_key == key
+                    ).first()
+                    if record:
+                        record.last_seen = seen_at
+                        record.expires_at = expires_at
+                        if simhash is not None:
+                            record.simhash = self._to_signed(simhash)
+                    else:
+                        session.add(SeenCandidate(
+                            job_key=job_key,
+                            candidate_key=key,
+                            simhash=self._to_signed(simhash),
+                            first_seen=seen_at,
+                            last_seen=seen_at,
+                            expires_at=expires_at
+                        ))
+                        inserted += 1
+            if self.job_key in {job_key for job_key, _ in batch}:
+                self._count += inserted
+            self.db_writes += len(batch)
+            self.write_batches += 1
+        except Exception as e:
+            print(f"⚠️ 保存 {len(batch)} 个已处理候选人失败: {e}")
+        return inserted
+
+    def flush(self, timeout=None):
+        """
+        等待待写队列写入数据库（打开新岗位范围和进程退出前调用）
+
+        Args:
+            timeout: 最长等待秒数，None表示一直等待
+        """
+        if self._executor is None:
+            return
+        try:
+            self._executor.submit(self._write_pending).result(timeout)
+        except Exception as e:
+            print(f"⚠️ 写入已处理候选人记录失败: {e}")
+
+    def find_similar(self, simhash, exclude=None):
+        """
+        查找文本近似的已处理候选人（同一个人换了展示文本）
+
+        Args:
+            simhash: 卡片文本的SimHash
+            exclude: 排除的键（当前卡片自身）
+
+        Returns:
+            tuple: (已处理候选人键, 汉明距离)，没有时返回(None, None)
+        """
+        self._ensure_open()
+        return self.near_index.find(simhash, exclude=exclude)
+
+    def clear(self):
+        """
+        清除当前岗位的所有已处理记录，允许重新处理所有候选人
+
+        Returns:
+            int: 清除前的记录数
+        """
+        self._ensure_open()
+        old_count = self._count
+        job_key = self.job_key
+        with self._pending_lock:
+            for pending_key in [pending_key for pending_key in self._pending if pending_key[0] == job_key]:
+                del self._pending[pending_key]
+        if self._persistent:
+            # 在存储线程中删除，排在已提交的写入之后执行
+            self._store_executor().submit(self._delete_job, job_key)
+        self.bloom.clear()
+        self._recent.clear()
+        self.near_index.clear()
+        self._count = 0
+        return old_count
+
+    def _delete_job(self, job_key):
+        """存储线程：删除某个岗位范围的所有记录"""
+        try:
+            with get_db_session() as session:
+                session.query(SeenCandidate).filter(
+                    SeenCandidate.job_key == job_key
+                ).delete(synchronize_session=False)
+        except Exception as e:
+            print(f"⚠️ 清除已处理候选人记录失败: {e}")
+
+    def __len__(self):
+        return self._count
+
+    def get_stats(self):
+        """
+        获取存储统计信息
+
+        Returns:
+            dict: 岗位范围、记录数、布隆过滤器直接排除次数、数据库查询和批量写入次数
+        """
+        return {
+            'jobKey': self.job_key,
+            'count': self._count,
+            'persistent': self._persistent,
+            'ttlDays': self.ttl_days,
+            'bloomBytes': len(self.bloom.bits),
+            'bloomRejects': self.bloom_rejects,
+            'dbLookups': self.db_lookups,
+            'dbWrites': self.db_writes,
+            'writeBatches': self.write_batches,
+            'pendingWrites': len(self._pending),
+            'nearIndexSize': len(self.near_index)
+        }
@@ -5,7 +5,13 @@ Boss直聘Sourcing智能助手 - 简化规则引擎
 
 import uuid
 from enum import Enum, IntEnum
-from thefuzz import fuzz
+
+
+def _partial_ratio(keyword, text):
+    """模糊匹配分数；thefuzz在第一次匹配时才导入，API服务只用默认配置时不需要加载"""
+    from thefuzz import fuzz
+    return fuzz.partial_ratio(keyword, text)
+
 
 class SimpleRuleType(str, Enum):
     """简化规则类型枚举"""
@@ -305,7 +311,7 @@ class SimpleRulesEngine:
                     break
                     
                 # 使用模糊匹配
-                ratio = fuzz.partial_ratio(keyword.lower(), text.lower())
+                ratio = _partial_ratio(keyword.lower(), text.lower())
                 if ratio >= 90:  # 90%以上相似度认为匹配
                     matched_count += 1
                     break
@@ -372,7 +378,7 @@ class SimpleRulesEngine:
                     matched_keywords.append(keyword)
                 else:
                     # 模糊匹配
-                    ratio = fuzz.partial_ratio(keyword.lower(), source.lower())
+                    ratio = _partial_ratio(keyword.lower(), source.lower())
                     if ratio >= 85:  # 85%以上相似度认为匹配
                         matched = True
                         matched_keywords.append(keyword)
@@ -392,7 +398,7 @@ class SimpleRulesEngine:
                             break
                             
                         # 模糊匹配
-                        ratio = fuzz.partial_ratio(keyword.lower(), item.lower())
+                        ratio = _partial_ratio(keyword.lower(), item.lower())
                         if ratio >= 85:  # 85%以上相似度认为匹配
                             matched = True
                             matched_keywords.append(keyword)
@@ -0,0 +1,151 @@
+"""
+配置存储模块
+缓存解析后的config.json，按文件修改时间和大小重新校验，内容变化时递增版本号并通知订阅者
+"""
+
+import json
+import os
+import threading
+
+CONFIG_DIR = os.path.expanduser("~/Library/Application Support/SourcingCopilot")
+CONFIG_PATH = os.path.join(CONFIG_DIR, "config.json")
+
+
+class ConfigStore:
+    """
+    共享的配置存储
+
+    get()只在文件的修改时间或大小变化时才重新读取和解析，状态轮询不再产生文件读取。
+    返回的配置对象在版本不变时是同一个对象，调用方不应修改它（需要修改时先复制）。
+    """
+
+    def __init__(self, path=CONFIG_PATH, default_factory=None):
+        """
+        初始化配置存储
+
+        Args:
+            path: 配置文件路径
+            default_factory: 配置文件不存在或解析失败时生成默认配置的函数
+        """
+        self.path = path
+        self.default_factory = default_factory or dict
+        self.version = 0
+        self._config = None
+        self._signature = None
+        self._subscribers = []
+        self._lock = threading.RLock()
+
+    def _stat_signature(self):
+        """文件签名：(修改时间纳秒, 大小)，文件不存在时返回None"""
+        try:
+            stat = os.stat(self.path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def get(self):
+        """
+        获取当前配置，文件未变化时直接返回缓存
+
+        Returns:
+            dict: 解析后的配置
+        """
+        signature = self._stat_signature()
+        if self._config is not None and signature == self._signature:
+            return self._config
+
+        with self._lock:
+            if self._config is not None and signature == self._signature:
+                return self._config
+            self._reload(signature)
+            return self._config
+
+    def _reload(self, signature):
+        """重新读取配置文件，内容变化时递增版本并通知订阅者"""
+        config = None
+        if signature is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    config = json.load(f)
+            except Exception as e:
+                print(f"加载配置失败: {e}")
+                if self._config is not None:
+                    # 文件正在被写入或格式错误时继续使用上一版配置，文件再次变化时重试
+                    self._signature = signature
+                    return
+        if config is None:
+            config = self.default_factory()
+
+        self._signature = signature
+        if config == self._config:
+            return
+        self._set(config)
+
+    def _set(self, config):
+        """替换缓存的配置并通知订阅者"""
+        self._config = config
+        self.version += 1
+        for callback in list(self._subscribers):
+            try:
+                callback(config, self.version)
+            except Exception as e:
+                print(f"配置变更通知失败: {e}")
+                import traceback
+                traceback.print_exc()
+
+    def save(self, config):
+        """
+        保存配置：先写临时文件再替换，读取方不会读到写了一半的文件
+
+        Args:
+            config: 新配置
+
+        Returns:
+            int: 保存后的版本号
+        """
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(config, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+            self._signature = self._stat_signature()
+            if config != self._config:
+                self._set(config)
+            return self.version
+
+    def subscribe(self, callback):
+        """
+        订阅配置变更
+
+        Args:
+            callback: 回调函数 callback(config, version)，配置内容变化时调用
+
+        Returns:
+            callable: 取消订阅的函数
+        """
+        self._subscribers.append(callback)
+
+        def unsubscribe():
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+        return unsubscribe
+
+
+_store = None
+
+
+def get_config_store(default_factory=None):
+    """
+    获取进程内共享的配置存储
+
+    Args:
+        default_factory: 默认配置生成函数，只在首次创建时生效
+
+    Returns:
+        ConfigStore: 配置存储
+    """
+    global _store
+    if _store is None:
+        _store = ConfigStore(CONFIG_PATH, default_factory)
+    return _store
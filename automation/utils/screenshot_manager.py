@@ -88,7 +88,7 @@ class ScreenshotManager:
                 "filename": filename,
                 "created": datetime.now().isoformat(),
                 "type": self._detect_screenshot_type(filename),
-                "resume_data": resume_data or {}
+                "resume_data": resume_data.to_dict() if hasattr(resume_data, 'to_dict') else (resume_data or {})
             }
             
             # 将截图添加到索引
@@ -68,10 +68,10 @@ def get_default_chrome_profile_path():
     
     return None
 
-def start_chrome_with_debugging(url="https://www.zhipin.com/web/boss/recommend", port=9222, 
+def spawn_chrome_with_debugging(url="https://www.zhipin.com/web/boss/recommend", port=9222,
                                 user_data_dir=None, use_default_profile=False):
     """
-    以远程调试模式启动Chrome浏览器
+    以远程调试模式启动Chrome进程，不等待调试端口就绪（由调用方探测端口）
     
     Args:
         url: 启动URL
@@ -80,13 +80,13 @@ def start_chrome_with_debugging(url="https://www.zhipin.com/web/boss/recommend",
         use_default_profile: 是否使用用户默认Chrome配置文件（保留登录信息）
         
     Returns:
-        tuple: (是否成功启动, 实际使用的端口号)
+        tuple: (Chrome进程，启动失败时为None, 实际使用的端口号)
     """
     chrome_path = get_chrome_path()
     
     if not chrome_path:
         print("未找到Chrome浏览器")
-        return False, port
+        return None, port
         
     try:
         # 检查端口是否已被使用
@@ -201,6 +201,34 @@ def start_chrome_with_debugging(url="https://www.zhipin.com/web/boss/recommend",
         print(f"启动独立Chrome实例，命令: {' '.join(args[:10])}... {url}")
         process = subprocess.Popen(args)
         print(f"✅ Chrome已启动，进程ID: {process.pid}, 调试端口: {final_port}")
+        return process, final_port
+        
+    except Exception as e:
+        print(f"启动Chrome失败: {e}")
+        import traceback
+        traceback.print_exc()
+        return None, port
+
+def start_chrome_with_debugging(url="https://www.zhipin.com/web/boss/recommend", port=9222, 
+                                user_data_dir=None, use_default_profile=False):
+    """
+    以远程调试模式启动Chrome浏览器，并同步等待调试端口开始监听（命令行使用）
+    
+    Args:
+        url: 启动URL
+        port: 远程调试端口
+        user_data_dir: 用户数据目录，如果为None则根据use_default_profile参数确定
+        use_default_profile: 是否使用用户默认Chrome配置文件（保留登录信息）
+        
+    Returns:
+        tuple: (是否成功启动, 实际使用的端口号)
+    """
+    process, final_port = spawn_chrome_with_debugging(url, port, user_data_dir, use_default_profile)
+    if process is None:
+        return False, final_port
+        
+    try:
+        import socket
         
         # 等待Chrome启动完成并验证调试端口，增加重试机制
         wait_time = 5 if use_default_profile else 3
@@ -0,0 +1,3 @@
+"""
+自动化工作进程模块
+"""
@@ -0,0 +1,240 @@
+"""
+自动化工作进程客户端
+API服务通过该客户端启动、调用和重启自动化工作进程；
+状态查询直接返回工作进程推送的最新快照，不经过进程间往返
+"""
+
+import asyncio
+import multiprocessing
+import queue
+import threading
+import time
+import uuid
+
+from automation.worker.worker_process import run_worker
+
+
+class WorkerUnavailableError(RuntimeError):
+    """工作进程未运行或命令超时"""
+
+
+class WorkerCommandError(RuntimeError):
+    """工作进程执行命令时出错"""
+
+
+class AutomationWorkerClient:
+    """自动化工作进程客户端"""
+
+    # 默认命令超时（秒），启动浏览器等命令需要更长的超时
+    DEFAULT_TIMEOUT = 30.0
+
+    # 工作进程退出后自动重启的最短间隔（秒），避免启动即崩溃时反复重启
+    RESTART_BACKOFF = 5.0
+
+    def __init__(self):
+        """初始化客户端（不会立即启动工作进程）"""
+        # 使用spawn启动，子进程不继承API进程的事件循环和Playwright状态
+        self._mp = multiprocessing.get_context("spawn")
+        self.process = None
+        self.command_queue = None
+        self.event_queue = None
+        self.status = self._idle_status()
+        self.started_at = None
+        self.restarts = 0
+        self.last_error = None
+
+        self._loop = None
+        self._pending = {}
+        self._reader = None
+        self._ready = threading.Event()
+        self._closing = False
+        self._last_start = 0.0
+
+    @staticmethod
+    def _idle_status():
+        """工作进程未运行时的状态"""
+        return {
+            "running": False,
+            "pageType": "unknown",
+            "processedCount": 0,
+            "candidates": []
+        }
+
+    # ---------- 进程管理 ----------
+
+    @property
+    def is_alive(self):
+        return self.process is not None and self.process.is_alive()
+
+    def start(self):
+        """启动工作进程和事件读取线程（在API服务的事件循环中调用）"""
+        if self.is_alive:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._closing = False
+        self._ready.clear()
+        self.command_queue = self._mp.Queue()
+        self.event_queue = self._mp.Queue()
+        self.process = self._mp.Process(
+            target=run_worker,
+            args=(self.command_queue, self.event_queue),
+            name="sourcing-automation-worker",
+            daemon=True
+        )
+        self.process.start()
+        self.started_at = time.time()
+        self._last_start = time.monotonic()
+        self._reader = threading.Thread(target=self._read_events, args=(self.event_queue,), name="worker-events", daemon=True)
+        self._reader.start()
+        print(f"🧰 已启动自动化工作进程 (pid {self.process.pid})")
+
+    async def stop(self, timeout=10.0):
+        """
+        通知工作进程关闭浏览器连接后退出，超时则强制结束
+
+        Args:
+            timeout: 等待退出的秒数
+        """
+        self._closing = True
+        if not self.is_alive:
+            return
+        try:
+            await self.call("shutdown", timeout=timeout)
+        except Exception as e:
+            print(f"工作进程未正常退出: {e}")
+        await asyncio.get_running_loop().run_in_executor(None, self.process.join, timeout)
+        if self.process.is_alive():
+            print("⚠️ 强制结束自动化工作进程")
+            self.process.terminate()
+        self._on_exit("工作进程已退出")
+
+    async def restart(self):
+        """
+        重启工作进程（浏览器连接会重新建立，正在运行的自动化会停止）
+
+        Returns:
+            dict: 工作进程信息
+        """
+        await self.stop()
+        self.restarts += 1
+        self.start()
+        return self.get_info()
+
+    def _ensure_running(self):
+        """工作进程意外退出时自动重启"""
+        if self.is_alive or self._closing:
+            return
+        if time.monotonic() - self._last_start < self.RESTART_BACKOFF:
+            raise WorkerUnavailableError("自动化工作进程不可用，请稍后重试")
+        print("⚠️ 自动化工作进程已退出，正在重启")
+        self._on_exit("工作进程已退出")
+        self.restarts += 1
+        self.start()
+
+    async def wait_ready(self, timeout=60.0):
+        """
+        等待工作进程完成初始化（导入Playwright、创建BrowserManager）
+
+        Args:
+            timeout: 最长等待秒数
+
+        Returns:
+            bool: 工作进程是否已就绪
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self._ready.wait, timeout)
+
+    # ---------- 命令和事件 ----------
+
+    async def call(self, command, timeout=None, **args):
+        """
+        向工作进程发送命令并等待结果
+
+        Args:
+            command: 命令名
+            timeout: 超时秒数，默认DEFAULT_TIMEOUT
+            **args: 命令参数（需要可序列化）
+
+        Returns:
+            命令的返回值
+        """
+        self._ensure_running()
+        request_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self.command_queue.put({"id": request_id, "command": command, "args": args})
+        try:
+            return await asyncio.wait_for(future, timeout or self.DEFAULT_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise WorkerUnavailableError(f"命令 {command} 超时")
+        finally:
+            self._pending.pop(request_id, None)
+
+    def _read_events(self, event_queue):
+        """事件读取线程：把工作进程的事件交给API服务的事件循环处理"""
+        while True:
+            try:
+                event = event_queue.get(timeout=1.0)
+            except queue.Empty:
+                if event_queue is not self.event_queue:
+                    break
+                if self.process is None or not self.process.is_alive():
+                    # 工作进程意外退出，等待中的命令立即失败，下一次调用时自动重启
+                    try:
+                        self._loop.call_soon_threadsafe(self._on_exit, "工作进程已退出")
+                    except RuntimeError:
+                        pass
+                    break
+                continue
+            except (EOFError, OSError):
+                break
+            try:
+                self._loop.call_soon_threadsafe(self._dispatch, event)
+            except RuntimeError:
+                # 事件循环已关闭
+                break
+
+    def _dispatch(self, event):
+        kind = event.get("type")
+        if kind == "result":
+            future = self._pending.get(event.get("id"))
+            if future is None or future.done():
+                return
+            if event.get("ok"):
+                future.set_result(event.get("result"))
+            else:
+                future.set_exception(WorkerCommandError(event.get("error") or "命令执行失败"))
+        elif kind == "status":
+            self.status = event.get("data") or self.status
+        elif kind == "ready":
+            self._ready.set()
+        elif kind == "error":
+            self.last_error = event.get("error")
+            self._fail_pending(f"工作进程出错: {self.last_error}")
+
+    def _on_exit(self, reason):
+        """工作进程退出或被停止：等待中的命令失败，状态恢复为未运行，不再返回进程退出前的快照"""
+        self.status = self._idle_status()
+        self._fail_pending(reason)
+
+    def _fail_pending(self, reason):
+        for future in list(self._pending.values()):
+            if not future.done():
+                future.set_exception(WorkerUnavailableError(reason))
+        self._pending.clear()
+
+    def get_info(self):
+        """
+        获取工作进程信息
+
+        Returns:
+            dict: 进程ID、是否存活、启动时间、重启次数、最近的状态快照时间
+        """
+        return {
+            "pid": self.process.pid if self.process else None,
+            "alive": self.is_alive,
+            "ready": self._ready.is_set(),
+            "startedAt": self.started_at,
+            "restarts": self.restarts,
+            "lastError": self.last_error,
+            "statusUpdatedAt": self.status.get("updatedAt")
+        }
@@ -0,0 +1,190 @@
+"""
+自动化工作进程
+在独立进程中运行BrowserManager和自动化流程，通过命令队列接收API服务的命令，
+通过事件队列返回命令结果并定期推送状态快照
+"""
+
+import asyncio
+import os
+import queue
+import threading
+import time
+import traceback
+
+
+class AutomationWorker:
+    """工作进程内的命令分发器，持有唯一的BrowserManager"""
+
+    # 状态快照推送间隔（秒）
+    STATUS_INTERVAL = 2.0
+
+    def __init__(self, command_queue, event_queue, manager=None):
+        """
+        初始化工作进程
+
+        Args:
+            command_queue: 命令队列（API进程 -> 工作进程）
+            event_queue: 事件队列（工作进程 -> API进程）
+            manager: 浏览器管理器，不提供时创建BrowserManager
+        """
+        if manager is None:
+            from automation.browser_control.browser_manager import BrowserManager
+            manager = BrowserManager()
+
+        self.command_queue = command_queue
+        self.event_queue = event_queue
+        self.manager = manager
+        self.automation_task = None
+        self.loop = None
+        self._stopped = None
+
+        # 命令名 -> 处理函数，处理函数可以是同步或异步函数
+        self.handlers = {
+            "ping": lambda: {"pid": os.getpid()},
+            "start_automation": self.start_automation,
+            "stop_automation": self.stop_automation,
+            "get_status": self.status_snapshot,
+            "get_connection_stats": lambda: self.manager.supervisor.get_stats(),
+            "get_request_policy_stats": lambda: self.manager.request_policy.get_stats(),
+            "detect_browser": self.manager.detect_browser,
+            "launch_browser": self.manager.launch_browser,
+            "get_selectors": lambda: self.manager.selectors,
+            "update_selectors": self.update_selectors,
+            "list_jobs": lambda: self.manager.jobs.get_status(),
+            "create_job": self.manager.jobs.create_job,
+            "get_job": self.manager.jobs.get_job_status,
+            "start_job": self.manager.jobs.start_job,
+            "stop_job": self.manager.jobs.stop_job,
+            "remove_job": self.manager.jobs.remove_job,
+            "shutdown": self.shutdown
+        }
+
+    def _emit(self, event):
+        try:
+            self.event_queue.put(event)
+        except Exception as e:
+            print(f"发送工作进程事件失败: {e}")
+
+    def status_snapshot(self):
+        """
+        获取状态快照（与/api/status返回的字段一致）
+
+        Returns:
+            dict: 状态快照
+        """
+        manager = self.manager
+        return {
+            "running": manager.is_running,
+            "pageType": manager.current_page_type,
+            "processedCount": manager.processed_count,
+            "candidates": manager.get_greeted_candidates(10)[::-1],
+            "connection": manager.supervisor.get_stats(),
+            "jobs": manager.jobs.get_status(),
+            "updatedAt": time.time()
+        }
+
+    def start_automation(self):
+        """在工作进程的事件循环中启动自动化流程"""
+        if self.manager.is_running or (self.automation_task and not self.automation_task.done()):
+            return {"success": False, "message": "自动化任务已在运行"}
+        self.automation_task = asyncio.ensure_future(self.manager.start_automation())
+        return {"success": True, "message": "自动化任务已启动"}
+
+    def stop_automation(self):
+        self.manager.stop_automation()
+        return {"success": True, "message": "自动化任务已停止"}
+
+    def update_selectors(self, selectors):
+        self.manager.selectors = selectors
+        return {"success": True, "message": "选择器配置已更新"}
+
+    async def shutdown(self):
+        """停止自动化和所有任务，关闭浏览器连接后退出"""
+        self.manager.stop_automation()
+        self.manager.jobs.stop_all()
+        await self.manager.close_browser()
+        self._stopped.set()
+        return {"success": True, "message": "工作进程已退出"}
+
+    async def _handle(self, message):
+        """执行一条命令并把结果发回API进程"""
+        request_id = message.get("id")
+        command = message.get("command")
+        handler = self.handlers.get(command)
+        if handler is None:
+            self._emit({"type": "result", "id": request_id, "ok": False, "error": f"未知命令: {command}"})
+            return
+        try:
+            result = handler(**(message.get("args") or {}))
+            if asyncio.iscoroutine(result):
+                result = await result
+            self._emit({"type": "result", "id": request_id, "ok": True, "result": result})
+        except Exception as e:
+            print(f"执行命令 {command} 失败: {e}")
+            traceback.print_exc()
+            self._emit({"type": "result", "id": request_id, "ok": False, "error": str(e)})
+        # 命令可能改变了状态，立即推送一次快照
+        await self._publish_status()
+
+    def _read_commands(self):
+        """读取命令的后台线程：阻塞读取命令队列，把命令交给事件循环执行"""
+        while not self._stopped.is_set():
+            try:
+                message = self.command_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                # API进程已退出
+                self.loop.call_soon_threadsafe(self._stopped.set)
+                break
+            self.loop.call_soon_threadsafe(asyncio.ensure_future, self._handle(message))
+
+    async def _publish_status(self):
+        """在事件循环中生成状态快照（自动化流程的状态只在事件循环中修改），只把写入队列交给线程池"""
+        try:
+            snapshot = self.status_snapshot()
+            await asyncio.get_running_loop().run_in_executor(None, self._emit, {"type": "status", "data": snapshot})
+        except Exception as e:
+            print(f"推送状态快照失败: {e}")
+
+    async def run(self):
+        """工作进程主循环：处理命令并定期推送状态，直到收到shutdown命令或API进程退出"""
+        self.loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        reader = threading.Thread(target=self._read_commands, name="worker-commands", daemon=True)
+        reader.start()
+
+        # 最近处理记录的历史数据在线程池中读取，状态快照之后只读内存
+        await self.manager.activity.load()
+        self._emit({"type": "ready", "pid": os.getpid()})
+        print(f"🧰 自动化工作进程已启动 (pid {os.getpid()})")
+        while not self._stopped.is_set():
+            await self._publish_status()
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=self.STATUS_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+        if self.manager.browser:
+            self.manager.stop_automation()
+            await self.manager.close_browser()
+        print("🧰 自动化工作进程已退出")
+
+
+def run_worker(command_queue, event_queue):
+    """
+    工作进程入口（multiprocessing的target）
+
+    Args:
+        command_queue: 命令队列
+        event_queue: 事件队列
+    """
+    try:
+        worker = AutomationWorker(command_queue, event_queue)
+        asyncio.run(worker.run())
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"自动化工作进程出错: {e}")
+        traceback.print_exc()
+        event_queue.put({"type": "error", "error": str(e)})
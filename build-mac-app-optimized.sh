@@ -65,6 +65,7 @@ pyinstaller --name=sourcing-copilot-server \
     --hidden-import=automation \
     --hidden-import=automation.api \
     --hidden-import=automation.api.server \
+    --hidden-import=automation.worker.worker_process \
     --hidden-import=uvicorn \
     --hidden-import=fastapi \
     --hidden-import=playwright \
@@ -204,7 +204,7 @@ async function startPythonBackend() {
     });
     
     // 等待服务启动
-    const isReady = await waitForApiServer(40, 1500); // 增加等待次数，减少间隔
+    const isReady = await waitForApiServer(120, 500); // API端口绑定后立即可用（数据库和工作进程在后台预热），缩短轮询间隔
     if (isReady) {
       apiReady = true;
       return true;
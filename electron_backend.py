@@ -41,4 +41,7 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # 打包后的可执行文件启动自动化工作进程时需要
+    import multiprocessing
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
@@ -0,0 +1,15 @@
+"""
+测试公共配置
+把项目根目录加入导入路径，数据库统一使用临时目录中的SQLite文件，不影响真实数据
+"""
+
+import os
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# automation.database.db在导入时根据DATABASE_URL创建引擎，必须在导入任何存储模块之前设置
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="sourcing-tests-"), "test.db")
@@ -0,0 +1,73 @@
+"""最近处理记录测试"""
+
+import asyncio
+import csv
+import json
+
+from automation.processors.activity_feed import ActivityFeed
+
+
+def _feed(tmp_path, capacity=100):
+    return ActivityFeed(capacity, str(tmp_path / "candidates.json"), str(tmp_path / "greeted.csv"))
+
+
+def test_recent_returns_newest_first_and_respects_capacity(tmp_path):
+    feed = _feed(tmp_path, capacity=3)
+    for i in range(5):
+        feed.record({"name": f"候选人{i}", "action": "greet", "ai_evaluation": {"score": i}})
+
+    recent = feed.recent(10)
+    assert [entry["name"] for entry in recent] == ["候选人4", "候选人3", "候选人2"]
+    assert recent[0]["score"] == 4
+    assert [entry["name"] for entry in feed.recent(1)] == ["候选人4"]
+    assert feed.recorded == 5
+
+
+def test_seeds_from_json_before_new_records(tmp_path):
+    # JSON文件中最新的记录在前
+    with open(tmp_path / "candidates.json", "w", encoding="utf-8") as f:
+        json.dump([{"name": "旧2"}, {"name": "旧1"}], f, ensure_ascii=False)
+    feed = _feed(tmp_path)
+
+    # 启动时的历史记录读取完成之前推入的记录仍排在历史记录之后
+    feed.record({"name": "新"})
+    assert [entry["name"] for entry in feed.recent(10)] == ["新"]
+    asyncio.run(feed.load())
+
+    assert [entry["name"] for entry in feed.recent(10)] == ["新", "旧2", "旧1"]
+
+
+def test_seeds_from_csv_when_json_missing(tmp_path):
+    with open(tmp_path / "greeted.csv", "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["时间", "姓名", "期望职位"])
+        writer.writerow(["2026-01-01", "甲", "后端"])
+        writer.writerow(["2026-01-02", "乙", "前端"])
+    feed = _feed(tmp_path)
+    asyncio.run(feed.load())
+
+    recent = feed.recent(10)
+    assert [entry["name"] for entry in recent] == ["乙", "甲"]
+    assert recent[0] == {"timestamp": "2026-01-02", "name": "乙", "position": "前端", "action": "greet"}
+
+
+def test_disk_is_read_only_once(tmp_path):
+    feed = _feed(tmp_path)
+    asyncio.run(feed.load())
+    assert feed.recent() == []
+
+    with open(tmp_path / "candidates.json", "w", encoding="utf-8") as f:
+        json.dump([{"name": "后来写入"}], f, ensure_ascii=False)
+
+    asyncio.run(feed.load())
+    assert feed.recent() == []
+
+
+def test_recent_never_reads_disk(tmp_path):
+    with open(tmp_path / "candidates.json", "w", encoding="utf-8") as f:
+        json.dump([{"name": "旧"}], f, ensure_ascii=False)
+    feed = _feed(tmp_path)
+
+    # 状态快照在事件循环中调用recent()，历史记录只由load()在线程池中读取
+    assert feed.recent() == []
+    assert not feed._seeded
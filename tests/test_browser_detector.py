@@ -0,0 +1,123 @@
+"""浏览器调试端点探测测试"""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from automation.browser_control.browser_detector import BrowserDetector  # noqa: E402
+
+
+async def _serve_cdp(ws_url="ws://127.0.0.1/devtools/browser/abc", port=0):
+    """启动一个只实现/json/version和/json/list的本地调试服务"""
+    async def handle(reader, writer):
+        request = await reader.readuntil(b"\r\n\r\n")
+        path = request.split(b" ")[1].decode()
+        if path == "/json/version":
+            body = {"Browser": "Chrome/120", "webSocketDebuggerUrl": ws_url}
+        elif path == "/json/list":
+            body = [{"type": "page", "url": "https://www.zhipin.com/web/boss/recommend"},
+                    {"type": "service_worker", "url": "https://sw"}]
+        else:
+            body = {}
+        data = json.dumps(body).encode()
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                     b"Content-Length: " + str(len(data)).encode() + b"\r\n\r\n" + data)
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", port)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def _unused_port():
+    import socket
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_probe_endpoint_and_list_pages(tmp_path):
+    detector = BrowserDetector(str(tmp_path / "endpoint.json"))
+
+    async def run():
+        server, port = await _serve_cdp()
+        async with server:
+            return port, await detector.probe_endpoint(port), await detector.list_page_urls(port)
+
+    port, endpoint, urls = asyncio.run(run())
+    assert endpoint == {"port": port, "wsUrl": "ws://127.0.0.1/devtools/browser/abc", "browser": "Chrome/120"}
+    assert urls == ["https://www.zhipin.com/web/boss/recommend"]
+
+
+def test_probe_closed_port_returns_none(tmp_path):
+    detector = BrowserDetector(str(tmp_path / "endpoint.json"))
+
+    assert asyncio.run(detector.probe_endpoint(_unused_port())) is None
+
+
+def test_wait_for_endpoint_returns_once_chrome_listens(tmp_path):
+    detector = BrowserDetector(str(tmp_path / "endpoint.json"))
+    port = _unused_port()
+
+    async def run():
+        async def launch_later():
+            await asyncio.sleep(0.3)
+            return await _serve_cdp(port=port)
+
+        launch = asyncio.create_task(launch_later())
+        endpoint = await detector.wait_for_endpoint(port, timeout=5, interval=0.05)
+        server, _ = await launch
+        server.close()
+        return endpoint
+
+    assert asyncio.run(run())["port"] == port
+
+
+def test_wait_for_endpoint_stops_when_process_exits(tmp_path):
+    detector = BrowserDetector(str(tmp_path / "endpoint.json"))
+
+    class _Exited:
+        returncode = 1
+
+        def poll(self):
+            return 1
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        endpoint = await detector.wait_for_endpoint(_unused_port(), timeout=5, process=_Exited())
+        return endpoint, loop.time() - started
+
+    endpoint, elapsed = asyncio.run(run())
+    assert endpoint is None
+    assert elapsed < 1
+
+def test_discover_puts_last_good_endpoint_first(tmp_path):
+    endpoint_file = tmp_path / "endpoint.json"
+
+    async def run():
+        first, first_port = await _serve_cdp("ws://first")
+        second, second_port = await _serve_cdp("ws://second")
+        async with first, second:
+            detector = BrowserDetector(str(endpoint_file))
+            detector.DEFAULT_PORTS = [first_port, _unused_port()]
+            detector.remember_endpoint(second_port, "ws://second")
+            endpoints = await detector.discover_endpoints(scan_processes=False)
+            found = await BrowserDetector(str(endpoint_file)).find_endpoint()
+            return endpoints, found
+
+    endpoints, found = asyncio.run(run())
+    assert [endpoint["wsUrl"] for endpoint in endpoints] == ["ws://second", "ws://first"]
+    assert found["wsUrl"] == "ws://second"
+
+
+def test_remember_endpoint_persists(tmp_path):
+    endpoint_file = tmp_path / "nested" / "endpoint.json"
+    BrowserDetector(str(endpoint_file)).remember_endpoint(9333, "ws://x")
+
+    last = BrowserDetector(str(endpoint_file)).load_last_endpoint()
+    assert last["port"] == 9333
+    assert last["wsUrl"] == "ws://x"
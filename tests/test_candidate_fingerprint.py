@@ -0,0 +1,83 @@
+"""候选人指纹和SimHash索引测试"""
+
+import sqlite3
+
+from automation.processors.candidate_fingerprint import CandidateFingerprinter, SimHashIndex
+
+
+CARD = "张三 刚刚活跃 28岁 5年 本科 期望 北京 • 后端开发 阿里巴巴 · Java工程师"
+
+
+def test_digest_ignores_volatile_text_and_is_keyed():
+    fingerprinter = CandidateFingerprinter(key=b"key-a")
+
+    same = fingerprinter.digest(CARD.replace("刚刚活跃", "3日内活跃"))
+    assert fingerprinter.digest(CARD) == same
+    assert fingerprinter.digest(CARD).startswith("fp:")
+    assert CandidateFingerprinter(key=b"key-b").digest(CARD) != same
+    assert fingerprinter.digest("  ··  ") is None
+
+
+def test_key_file_is_created_and_reused(tmp_path):
+    key_path = tmp_path / "fingerprint.key"
+    first = CandidateFingerprinter(str(key_path))
+    second = CandidateFingerprinter(str(key_path))
+
+    assert key_path.exists()
+    assert first.key == second.key
+    assert first.digest(CARD) == second.digest(CARD)
+
+
+def test_simhash_is_close_for_small_edits():
+    fingerprinter = CandidateFingerprinter()
+    base = fingerprinter.simhash(CARD)
+    edited = fingerprinter.simhash(CARD.replace("Java工程师", "Java高级工程师"))
+    other = fingerprinter.simhash("李四 35岁 10年 硕士 期望 深圳 • 产品经理 腾讯 · 高级产品经理")
+
+    assert bin(base ^ edited).count("1") <= 8
+    assert bin(base ^ other).count("1") > 8
+
+
+def test_index_finds_nearest_within_distance():
+    index = SimHashIndex(max_distance=3)
+    index.add("a", 0b1111)
+    index.add("b", 0b0000)
+    index.add("far", (1 << 64) - 1)
+
+    assert index.find(0b0001) == ("b", 1)
+    assert index.find(0b0111, exclude="a") == ("b", 3)
+    assert index.find(0b1111, exclude="a") == (None, None)
+    assert index.find(None) == (None, None)
+
+
+def test_index_evicts_oldest_entries():
+    index = SimHashIndex(max_distance=2, max_entries=2)
+    index.add("a", 1)
+    index.add("b", 1 << 40)
+    index.add("c", 1 << 20)
+
+    assert len(index) == 2
+    assert index.find(1)[0] != "a"
+
+
+def test_store_adds_simhash_column_to_old_tables(tmp_path, monkeypatch):
+    from sqlalchemy import create_engine
+
+    from automation.processors import seen_candidate_store
+
+    db_path = tmp_path / "old.db"
+    connection = sqlite3.connect(db_path)
+    connection.execute(
+        "CREATE TABLE seen_candidates (id INTEGER PRIMARY KEY, job_key VARCHAR(64) NOT NULL, "
+        "candidate_key VARCHAR(100) NOT NULL, first_seen DATETIME, last_seen DATETIME, expires_at DATETIME NOT NULL)"
+    )
+    connection.commit()
+    connection.close()
+
+    monkeypatch.setattr(seen_candidate_store, "engine", create_engine(f"sqlite:///{db_path}"))
+    seen_candidate_store.SeenCandidateStore._migrate_schema()
+
+    connection = sqlite3.connect(db_path)
+    columns = {row[1] for row in connection.execute("PRAGMA table_info(seen_candidates)")}
+    connection.close()
+    assert "simhash" in columns
@@ -0,0 +1,63 @@
+"""卡片解析缓存测试"""
+
+from automation.processors.card_parse_cache import CardParseCache
+
+
+CONFIG = {"rules": [{"type": "岗位", "keywords": ["后端"], "enabled": True}]}
+
+
+def test_hit_returns_copy_of_resume_data():
+    cache = CardParseCache()
+    cache.ensure_config(CONFIG)
+    cache.put("c1", "张三 后端工程师", {"name": "张三"}, {"passed": True})
+
+    resume_data, evaluation = cache.get("c1", "张三 后端工程师")
+    resume_data["name"] = "修改"
+
+    assert evaluation == {"passed": True}
+    assert cache.get("c1", "张三 后端工程师")[0] == {"name": "张三"}
+    assert cache.hits == 2
+
+
+def test_changed_card_text_misses():
+    cache = CardParseCache()
+    cache.ensure_config(CONFIG)
+    cache.put("c1", "旧文本", {"name": "张三"}, None)
+
+    assert cache.get("c1", "新文本") is None
+    assert cache.misses == 1
+
+
+def test_lru_eviction():
+    cache = CardParseCache(max_size=2)
+    cache.ensure_config(CONFIG)
+    cache.put("a", "a", {}, None)
+    cache.put("b", "b", {}, None)
+    cache.get("a", "a")
+    cache.put("c", "c", {}, None)
+
+    assert cache.contains("a", "a")
+    assert not cache.contains("b", "b")
+    assert cache.contains("c", "c")
+
+
+def test_equal_config_keeps_entries():
+    cache = CardParseCache()
+    cache.ensure_config(CONFIG)
+    cache.put("c1", "text", {}, None)
+
+    cache.ensure_config({"rules": [dict(CONFIG["rules"][0])]})
+
+    assert cache.contains("c1", "text")
+
+
+def test_config_mutated_in_place_invalidates():
+    config = {"rules": [{"type": "岗位", "keywords": ["后端"], "enabled": True}]}
+    cache = CardParseCache()
+    cache.ensure_config(config)
+    cache.put("c1", "text", {}, None)
+
+    config["rules"][0]["keywords"].append("Java")
+    cache.ensure_config(config)
+
+    assert not cache.contains("c1", "text")
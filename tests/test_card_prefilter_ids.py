@@ -0,0 +1,58 @@
+"""页面内预筛排除卡片的ID测试"""
+
+import asyncio
+from types import SimpleNamespace
+
+from automation.processors.candidate_fingerprint import CandidateFingerprinter
+from automation.processors.resume_card_processor import ResumeCardProcessor
+from automation.processors.resume_page_processor import ResumePageProcessor
+
+
+class _ProcessedIds(set):
+    """只在内存中记录的已处理集合，接口与SeenCandidateStore一致"""
+
+    async def contains(self, key):
+        return key in self
+
+
+class _LoggingHelper:
+    def __init__(self):
+        self.skipped = []
+
+    def count_skipped(self, count, reason):
+        self.skipped.append((count, reason))
+
+
+def _page_processor():
+    processor = SimpleNamespace(
+        fingerprints=CandidateFingerprinter(key=b"test-key"),
+        processed_ids=_ProcessedIds(),
+        processed_count=0,
+        logging_helper=_LoggingHelper()
+    )
+    processor.card_processor = ResumeCardProcessor(processor)
+    return ResumePageProcessor(processor), processor
+
+
+def test_rejected_card_without_id_uses_text_fingerprint():
+    page_processor, processor = _page_processor()
+    text = "李四 3年 本科 期望 上海 • 销售经理"
+
+    assert asyncio.run(page_processor._record_prefiltered([{"index": 0, "id": None, "text": text}])) == 1
+
+    # 与同一张卡片通过预筛后使用的键一致
+    expected = processor.card_processor._snapshot_card_id({"id": None, "text": text})
+    assert expected.startswith("fp:")
+    assert processor.processed_ids == {expected}
+    assert processor.processed_count == 1
+    assert processor.logging_helper.skipped == [(1, "期望职位不匹配（页面内预筛）")]
+
+
+def test_rejected_cards_are_counted_once():
+    page_processor, processor = _page_processor()
+    rejected = [{"index": 0, "id": "geek-1", "text": None}, {"index": 1, "id": None, "text": "王五 销售"}]
+
+    assert asyncio.run(page_processor._record_prefiltered(rejected)) == 2
+    assert asyncio.run(page_processor._record_prefiltered(rejected)) == 0
+    assert "geek-1" in processor.processed_ids
+    assert processor.processed_count == 2
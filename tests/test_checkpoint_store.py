@@ -0,0 +1,93 @@
+"""检查点存储测试"""
+
+import uuid
+from datetime import datetime, timedelta
+
+from automation.database.db import get_db_session
+from automation.database.models import AutomationCheckpoint
+from automation.processors.checkpoint_store import CheckpointStore
+
+
+STATE = {
+    "batchIndex": 3,
+    "lastCandidate": "geek-42",
+    "cardCount": 45,
+    "cardIndex": 44,
+    "processedCount": 40,
+    "counters": {"greeted": 5}
+}
+
+
+def _job():
+    return f"job-{uuid.uuid4().hex[:8]}"
+
+
+def test_save_and_load_round_trip():
+    job = _job()
+    store = CheckpointStore()
+
+    assert store.load(job) is None
+    assert store.save(job, STATE, force=True)
+
+    checkpoint = CheckpointStore().load(job)
+    assert checkpoint["batchIndex"] == 3
+    assert checkpoint["lastCandidate"] == "geek-42"
+    assert checkpoint["cardCount"] == 45
+    assert checkpoint["processedCount"] == 40
+    assert checkpoint["counters"] == {"greeted": 5}
+
+
+def test_save_is_throttled_unless_forced():
+    job = _job()
+    store = CheckpointStore(save_interval=60)
+
+    assert store.save(job, STATE)
+    assert not store.save(job, dict(STATE, batchIndex=4))
+    assert store.load(job)["batchIndex"] == 3
+
+    assert store.save(job, dict(STATE, batchIndex=5), force=True)
+    assert store.load(job)["batchIndex"] == 5
+    assert store.saves == 2
+
+
+def test_expired_checkpoint_is_ignored():
+    job = _job()
+    store = CheckpointStore(max_age_hours=1)
+    store.save(job, STATE, force=True)
+    with get_db_session() as session:
+        session.query(AutomationCheckpoint).filter(AutomationCheckpoint.job_key == job).update(
+            {"updated_at": datetime.now() - timedelta(hours=2)}
+        )
+
+    assert store.load(job) is None
+
+
+def test_clear_removes_checkpoint():
+    job = _job()
+    store = CheckpointStore()
+    store.save(job, STATE, force=True)
+
+    store.clear(job)
+
+    assert store.load(job) is None
+
+
+def test_checkpoint_is_interrupted_until_marked_finished():
+    job = _job()
+    store = CheckpointStore()
+    store.save(job, STATE, force=True)
+    assert store.load(job)["interrupted"] is True
+
+    store.mark_finished(job)
+
+    checkpoint = store.load(job)
+    assert checkpoint["interrupted"] is False
+    assert checkpoint["cardCount"] == 45
+
+
+def test_save_records_finished_run():
+    job = _job()
+    store = CheckpointStore()
+    store.save(job, dict(STATE, interrupted=False), force=True)
+
+    assert store.load(job)["interrupted"] is False
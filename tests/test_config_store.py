@@ -0,0 +1,88 @@
+"""配置存储测试"""
+
+import json
+import os
+
+from automation.utils.config_store import ConfigStore
+
+
+def _write(path, config, mtime_ns=None):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(config, f)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_missing_file_uses_default(tmp_path):
+    store = ConfigStore(str(tmp_path / "config.json"), default_factory=lambda: {"autoGreet": False})
+
+    assert store.get() == {"autoGreet": False}
+    assert store.version == 1
+
+
+def test_unchanged_file_returns_cached_object(tmp_path):
+    path = str(tmp_path / "config.json")
+    _write(path, {"a": 1})
+    store = ConfigStore(path)
+
+    first = store.get()
+    assert store.get() is first
+    assert store.version == 1
+
+
+def test_reload_on_change_bumps_version_and_notifies(tmp_path):
+    path = str(tmp_path / "config.json")
+    _write(path, {"a": 1}, mtime_ns=1_000_000_000)
+    store = ConfigStore(path)
+    store.get()
+    seen = []
+    store.subscribe(lambda config, version: seen.append((config, version)))
+
+    _write(path, {"a": 2}, mtime_ns=2_000_000_000)
+
+    assert store.get() == {"a": 2}
+    assert store.version == 2
+    assert seen == [({"a": 2}, 2)]
+
+
+def test_touch_without_content_change_keeps_version(tmp_path):
+    path = str(tmp_path / "config.json")
+    _write(path, {"a": 1}, mtime_ns=1_000_000_000)
+    store = ConfigStore(path)
+    store.get()
+
+    _write(path, {"a": 1}, mtime_ns=2_000_000_000)
+
+    assert store.get() == {"a": 1}
+    assert store.version == 1
+
+
+def test_invalid_json_keeps_previous_config(tmp_path):
+    path = str(tmp_path / "config.json")
+    _write(path, {"a": 1}, mtime_ns=1_000_000_000)
+    store = ConfigStore(path)
+    store.get()
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{broken")
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+
+    assert store.get() == {"a": 1}
+    assert store.version == 1
+
+
+def test_save_writes_atomically_and_unsubscribe(tmp_path):
+    path = str(tmp_path / "nested" / "config.json")
+    store = ConfigStore(path)
+    seen = []
+    unsubscribe = store.subscribe(lambda config, version: seen.append(version))
+
+    assert store.save({"a": 1}) == 1
+    unsubscribe()
+    store.save({"a": 2})
+
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == {"a": 2}
+    assert not os.path.exists(path + ".tmp")
+    assert store.get() == {"a": 2}
+    assert seen == [1]
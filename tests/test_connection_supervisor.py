@@ -0,0 +1,142 @@
+"""连接监控器测试"""
+
+import asyncio
+from types import SimpleNamespace
+
+from automation.browser_control.connection_supervisor import ConnectionSupervisor
+
+
+class _CDPSession:
+    def __init__(self, error=None):
+        self.error = error
+
+    async def send(self, method, params=None):
+        if self.error:
+            raise self.error
+        return {"result": {"value": 1}}
+
+    async def detach(self):
+        pass
+
+
+class _Page:
+    def __init__(self, cdp_error=None, closed=False):
+        self.url = "https://www.zhipin.com/web/boss/recommend"
+        self.closed = closed
+        self.context = SimpleNamespace(new_cdp_session=self._new_cdp_session)
+        self._cdp_error = cdp_error
+
+    async def _new_cdp_session(self, page):
+        return _CDPSession(self._cdp_error)
+
+    def is_closed(self):
+        return self.closed
+
+
+class _Browser:
+    def __init__(self, connected=True):
+        self.connected = connected
+
+    def is_connected(self):
+        return self.connected
+
+
+def _supervisor(page, browser=None):
+    manager = SimpleNamespace(page=page, browser=browser or _Browser())
+    supervisor = ConnectionSupervisor(manager, standby=False)
+    recovered = []
+
+    async def recover(failure):
+        recovered.append(failure)
+        return True
+
+    supervisor._recover = recover
+    return supervisor, recovered
+
+
+def test_classify_error_messages():
+    supervisor, _ = _supervisor(_Page())
+
+    assert supervisor.classify(Exception("Target closed")) == ConnectionSupervisor.TARGET_DETACHED
+    assert supervisor.classify(Exception("Page crashed!")) == ConnectionSupervisor.PAGE_CRASHED
+    assert supervisor.classify(asyncio.TimeoutError()) == ConnectionSupervisor.UNRESPONSIVE
+    assert supervisor.classify(Exception("element not found")) == ConnectionSupervisor.UNRESPONSIVE
+
+    supervisor.manager.browser.connected = False
+    assert supervisor.classify(Exception("Target closed")) == ConnectionSupervisor.BROWSER_GONE
+
+
+def test_detached_error_from_other_tab_keeps_healthy_main_page():
+    supervisor, recovered = _supervisor(_Page())
+
+    ok = asyncio.run(supervisor.recover_from_error(Exception("Target page, context or browser has been closed")))
+
+    assert ok is True
+    assert recovered == []
+    assert supervisor.heartbeats == 1
+
+
+def test_closed_main_page_fails_over():
+    supervisor, recovered = _supervisor(_Page(closed=True))
+
+    asyncio.run(supervisor.recover_from_error(Exception("Target closed")))
+
+    assert recovered == [ConnectionSupervisor.TARGET_DETACHED]
+
+
+def test_heartbeat_failure_uses_heartbeat_classification():
+    supervisor, recovered = _supervisor(_Page(cdp_error=Exception("Session closed. Most likely the page has been closed")))
+
+    asyncio.run(supervisor.recover_from_error(Exception("some processing error")))
+
+    assert recovered == [ConnectionSupervisor.TARGET_DETACHED]
+    assert supervisor.heartbeat_failures == 1
+
+
+def test_browser_gone_skips_heartbeat():
+    supervisor, recovered = _supervisor(_Page(), browser=_Browser(connected=False))
+
+    asyncio.run(supervisor.recover_from_error(Exception("Target closed")))
+
+    assert recovered == [ConnectionSupervisor.BROWSER_GONE]
+    assert supervisor.heartbeats == 0
+
+
+def test_single_heartbeat_timeout_is_tolerated():
+    supervisor, recovered = _supervisor(_Page(cdp_error=asyncio.TimeoutError()))
+
+    ok = asyncio.run(supervisor.recover_from_error(asyncio.TimeoutError()))
+
+    assert ok is True
+    assert recovered == []
+    assert supervisor.unresponsive_count == 1
+
+
+def test_background_heartbeat_only_flags_failure():
+    page = _Page(closed=True)
+    supervisor, recovered = _supervisor(page)
+    supervisor.HEARTBEAT_INTERVAL = 0.01
+
+    async def run():
+        supervisor.task = asyncio.create_task(supervisor._run())
+        flagged = await supervisor.wait_for_failure(1)
+        await supervisor.stop()
+        return flagged
+
+    assert asyncio.run(run()) is True
+    # 后台心跳不替换主页面，留给主循环恢复
+    assert recovered == []
+    assert supervisor.manager.page is page
+    assert supervisor.pending_failure == ConnectionSupervisor.TARGET_DETACHED
+    assert supervisor.get_stats()["pendingFailure"] == ConnectionSupervisor.TARGET_DETACHED
+
+
+def test_foreground_ensure_healthy_recovers_flagged_failure():
+    supervisor, recovered = _supervisor(_Page(closed=True))
+    supervisor.pending_failure = ConnectionSupervisor.TARGET_DETACHED
+
+    ok = asyncio.run(supervisor.ensure_healthy())
+
+    assert ok is True
+    assert recovered == [ConnectionSupervisor.TARGET_DETACHED]
+    assert supervisor.pending_failure is None
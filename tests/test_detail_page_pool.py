@@ -0,0 +1,72 @@
+"""详情页池配置测试"""
+
+from types import SimpleNamespace
+
+from automation.processors.detail_page_pool import DetailPagePool
+
+
+def _config(**pool):
+    return {"detailPool": dict({"enabled": True}, **pool)}
+
+
+def test_disabled_by_default():
+    pool = DetailPagePool(SimpleNamespace())
+    pool.configure({})
+
+    assert not pool.enabled
+    assert pool._slots is None
+
+
+def test_size_is_capped():
+    pool = DetailPagePool(SimpleNamespace())
+    pool.configure(_config(size=10))
+    assert pool.size == DetailPagePool.MAX_SIZE
+
+    pool.configure(_config(size="abc"))
+    assert pool.size == DetailPagePool.DEFAULT_SIZE
+
+
+def test_same_size_keeps_semaphore_and_updates_template():
+    pool = DetailPagePool(SimpleNamespace())
+    pool.configure(_config(size=2))
+    slots, lock = pool._slots, pool._open_lock
+
+    pool.configure(_config(size=2, urlTemplate="https://example.com/detail?id={id}"))
+
+    assert pool._slots is slots
+    assert pool._open_lock is lock
+    assert pool.detail_url_for({"id": "42"}) == "https://example.com/detail?id=42"
+
+
+def test_configure_during_run_keeps_current_slots():
+    pool = DetailPagePool(SimpleNamespace())
+    pool.configure(_config(size=2))
+    slots = pool._slots
+    pool._tasks["card-1"] = object()
+
+    pool.configure(_config(size=3))
+    pool.configure(_config(size=2))
+
+    assert pool.size == 2
+    assert pool._slots is slots
+
+
+def test_detail_url_prefers_card_link():
+    pool = DetailPagePool(SimpleNamespace())
+    pool.configure(_config(urlTemplate="https://example.com/{id}"))
+
+    assert pool.detail_url_for({"id": "1", "detailUrl": "https://example.com/link"}) == "https://example.com/link"
+    assert pool.detail_url_for({"id": None}) is None
+
+
+def test_pending_work_survives_disabling_pool():
+    pool = DetailPagePool(SimpleNamespace())
+    pool.configure(_config(size=2))
+    assert not pool.has_pending
+
+    pool._results.append({"job": {"cardId": "card-1"}})
+    pool.configure({})
+
+    # 运行中关闭详情页池后，已完成的结果仍需在列表页上处理
+    assert not pool.enabled
+    assert pool.has_pending
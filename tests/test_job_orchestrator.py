@@ -0,0 +1,258 @@
+"""多岗位任务编排测试"""
+
+import asyncio
+from types import SimpleNamespace
+
+from automation.browser_control import job_orchestrator
+from automation.browser_control.job_orchestrator import JobOrchestrator
+
+
+class _Keyboard:
+    async def press(self, key):
+        pass
+
+
+class _Page:
+    def __init__(self):
+        self.url = "about:blank"
+        self.closed = False
+        self.keyboard = _Keyboard()
+
+    async def goto(self, url, wait_until=None):
+        self.url = url
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class _Context:
+    def __init__(self):
+        self.pages = []
+
+    async def new_page(self):
+        page = _Page()
+        self.pages.append(page)
+        return page
+
+
+class _RequestPolicy:
+    def __init__(self):
+        self.applied = []
+
+    async def apply(self, page, config):
+        self.applied.append(page)
+
+
+class _Manager:
+    def __init__(self):
+        self.browser = object()
+        self.context = _Context()
+        self.request_policy = _RequestPolicy()
+        self.page_detector = SimpleNamespace(get_current_page_type=lambda url: "recommend")
+        self.rules_engine = None
+        self.selectors = {}
+        self.data_extractor = None
+        self.activity = None
+        self.stealth = []
+
+    def _load_config(self):
+        return {"rules": [], "jobId": "base"}
+
+    async def inject_stealth(self, page):
+        self.stealth.append(page)
+
+    async def start_browser(self, use_existing=True):
+        return True
+
+
+class _Processor:
+    """简历处理器替身：每轮打招呼greets_per_round人；quota为0时一直处理直到被停止"""
+
+    greets_per_round = 1
+
+    def __init__(self, browser, rules_engine, selectors, data_extractor=None):
+        self.browser = browser
+        self.stop_event = asyncio.Event()
+        self.max_process_count = 0
+        self.processed = 0
+        self.greeted = 0
+        self.finished_checkpoints = 0
+        self.detail_pool = SimpleNamespace(close=self._close_pool)
+        self.pool_closed = False
+
+    async def _close_pool(self):
+        self.pool_closed = True
+
+    def set_max_process_count(self, count):
+        self.max_process_count = count
+
+    async def open_seen_store(self, config):
+        return 0
+
+    async def process_recommend_list_page(self, page, config):
+        # 与ResumeProcessor一致：新一轮处理开始时清除上一次的停止信号
+        self.stop_event.clear()
+        self.processed += 2
+        self.greeted += self.greets_per_round
+        if self.max_process_count == 0:
+            await self.stop_event.wait()
+        return 2
+
+    def get_processed_count(self):
+        return self.processed
+
+    def get_greeted_count(self):
+        return self.greeted
+
+    def get_session_counters(self):
+        return {"processed": self.processed, "greeted": self.greeted, "skipped": 0}
+
+    def get_pacing_stats(self):
+        return {"pacingSeconds": 0.0}
+
+    def stop_processing(self):
+        self.stop_event.set()
+
+    def finish_checkpoint(self):
+        self.finished_checkpoints += 1
+
+
+def _orchestrator(monkeypatch, max_running=None):
+    monkeypatch.setattr(job_orchestrator, "ResumeProcessor", _Processor)
+    orchestrator = JobOrchestrator(_Manager())
+    if max_running is not None:
+        orchestrator.MAX_RUNNING_JOBS = max_running
+    return orchestrator
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_running_jobs_are_capped(monkeypatch):
+    orchestrator = _orchestrator(monkeypatch, max_running=2)
+
+    async def run():
+        first = await orchestrator.create_job("Java")
+        second = await orchestrator.create_job("Python")
+        third = await orchestrator.create_job("Go")
+        await _settle()
+
+        statuses = [job["status"] for job in orchestrator.get_status()]
+        orchestrator.stop_job(first["job"]["id"])
+        await _settle()
+        retried = await orchestrator.start_job(third["job"]["id"])
+        await _settle()
+        running = orchestrator._running_count()
+        await orchestrator.close_all()
+        return first, second, third, statuses, retried, running
+
+    first, second, third, statuses, retried, running = asyncio.run(run())
+    assert first["success"] and second["success"]
+    assert third["success"] is False
+    assert "不能超过 2 个" in third["message"]
+    assert statuses == ["running", "running", "pending"]
+    assert retried["success"] is True
+    assert running == 2
+
+
+def test_each_job_opens_and_closes_its_own_tab(monkeypatch):
+    orchestrator = _orchestrator(monkeypatch)
+    manager = orchestrator.manager
+
+    async def run():
+        job_a = (await orchestrator.create_job("Java", url="https://www.zhipin.com/web/boss/recommend?job=a"))["job"]
+        job_b = (await orchestrator.create_job("Python", url="https://www.zhipin.com/web/boss/recommend?job=b"))["job"]
+        await _settle()
+        pages = list(manager.context.pages)
+        removed = await orchestrator.remove_job(job_a["id"])
+        remaining_open = not pages[1].closed
+        await orchestrator.close_all()
+        return job_b, pages, removed, remaining_open
+
+    job_b, pages, removed, remaining_open = asyncio.run(run())
+    assert len(pages) == 2
+    assert [page.url for page in pages] == [
+        "https://www.zhipin.com/web/boss/recommend?job=a",
+        "https://www.zhipin.com/web/boss/recommend?job=b"
+    ]
+    # 每个标签页都注入了stealth脚本并应用了请求拦截策略
+    assert manager.stealth == pages
+    assert manager.request_policy.applied == pages
+
+    assert removed == {"success": True, "message": "任务已移除"}
+    assert pages[0].closed is True
+    assert remaining_open is True
+    assert list(orchestrator.jobs) == [job_b["id"]]
+
+
+def test_quota_finishes_job_and_counts_are_reported(monkeypatch):
+    orchestrator = _orchestrator(monkeypatch)
+    _Processor.greets_per_round = 3
+
+    async def run():
+        created = await orchestrator.create_job("Java", quota=3, pacing={"greetsPerMinute": 5})
+        job = orchestrator.jobs[created["job"]["id"]]
+        await asyncio.wait_for(job.task, 1)
+        return job
+
+    try:
+        job = asyncio.run(run())
+    finally:
+        _Processor.greets_per_round = 1
+
+    status = orchestrator.get_job_status(job.job_id)
+    assert status["status"] == "finished"
+    assert status["quota"] == 3
+    assert status["rounds"] == 1
+    assert status["processedCount"] == 2
+    assert status["greetedCount"] == 3
+    assert status["counters"] == {"processed": 2, "greeted": 3, "skipped": 0}
+    assert status["stoppedAt"] is not None
+    assert job.config["pacing"] == {"greetsPerMinute": 5}
+    assert job.processor.finished_checkpoints == 1
+    assert job.processor.pool_closed is True
+
+
+def test_stop_and_start_again(monkeypatch):
+    orchestrator = _orchestrator(monkeypatch)
+
+    async def run():
+        job_id = (await orchestrator.create_job("Java"))["job"]["id"]
+        await _settle()
+        job = orchestrator.jobs[job_id]
+
+        stopped = orchestrator.stop_job(job_id)
+        await asyncio.wait_for(job.task, 1)
+        after_stop = job.status
+        again = orchestrator.stop_job(job_id)
+
+        restarted = await orchestrator.start_job(job_id)
+        await _settle()
+        await orchestrator.close_all()
+        return job, stopped, after_stop, again, restarted
+
+    job, stopped, after_stop, again, restarted = asyncio.run(run())
+    assert stopped["message"] == "任务已停止"
+    assert after_stop == "stopped"
+    assert again["message"] == "任务未在运行"
+    assert restarted["success"] is True
+    # 重新启动时沿用同一个处理器，计数器继续累计
+    assert job.rounds == 2
+    assert job.processor.get_processed_count() == 4
+
+
+def test_unknown_job_ids(monkeypatch):
+    orchestrator = _orchestrator(monkeypatch)
+
+    async def run():
+        return (await orchestrator.start_job("missing"), orchestrator.stop_job("missing"),
+                await orchestrator.remove_job("missing"))
+
+    for result in asyncio.run(run()):
+        assert result == {"success": False, "message": "任务不存在"}
+    assert orchestrator.get_job_status("missing") is None
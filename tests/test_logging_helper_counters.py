@@ -0,0 +1,45 @@
+"""日志助手会话计数器测试"""
+
+from types import SimpleNamespace
+
+from automation.processors.logging_helper import LoggingHelper
+
+
+def test_counters_by_action_and_reason():
+    helper = LoggingHelper(SimpleNamespace())
+    helper._count_candidate("greet", "通过评估")
+    helper._count_candidate("skip", "期望职位不匹配")
+    helper.count_skipped(3, "期望职位不匹配")
+    helper.count_skipped(0, "忽略")
+
+    assert helper.get_greeted_count() == 1
+    assert helper.get_counters() == {
+        "processed": 5,
+        "greeted": 1,
+        "skipped": 4,
+        "reasons": {"通过评估": 1, "期望职位不匹配": 4}
+    }
+
+
+def test_reason_kinds_are_bounded():
+    helper = LoggingHelper(SimpleNamespace())
+    for i in range(LoggingHelper.MAX_REASON_KINDS + 10):
+        helper._count_candidate("skip", f"原因{i}")
+    helper._count_candidate("skip", "很长的原因" * 50)
+
+    reasons = helper.get_counters()["reasons"]
+    assert len(reasons) == LoggingHelper.MAX_REASON_KINDS + 1
+    assert reasons[LoggingHelper.OTHER_REASON] == 11
+
+
+def test_restore_counters_round_trip():
+    helper = LoggingHelper(SimpleNamespace())
+    helper._count_candidate("greet", "通过评估")
+    snapshot = helper.get_counters()
+
+    restored = LoggingHelper(SimpleNamespace())
+    restored.restore_counters(snapshot)
+
+    assert restored.get_counters() == snapshot
+    restored.reset_counters()
+    assert restored.get_counters()["processed"] == 0
@@ -0,0 +1,94 @@
+"""节奏调度器测试"""
+
+import asyncio
+import time
+
+from automation.processors.pacing_scheduler import PacingScheduler
+
+
+def test_budgets_are_unlimited_by_default():
+    pacing = PacingScheduler()
+    pacing.configure({})
+
+    async def run():
+        return [await pacing.acquire("greet") for _ in range(3)]
+
+    assert asyncio.run(run()) == [0.0, 0.0, 0.0]
+    assert pacing.get_stats()["actions"] == {"greet": 3}
+
+
+def test_configured_budget_spaces_actions():
+    pacing = PacingScheduler()
+    pacing.configure({"pacing": {"scrollIntervalSeconds": 0.1, "budgetJitter": 0}})
+
+    async def run():
+        await pacing.acquire("scroll")
+        start = time.monotonic()
+        waited = await pacing.acquire("scroll")
+        return waited, time.monotonic() - start
+
+    waited, elapsed = asyncio.run(run())
+    assert 0.05 < waited <= 0.1
+    assert elapsed >= 0.05
+    assert "budget:scroll" in pacing.get_stats()["byKind"]
+
+
+def test_per_minute_budget_interval():
+    pacing = PacingScheduler()
+    pacing.configure({"pacing": {"greetsPerMinute": 1200, "budgetJitter": 0}})
+
+    async def run():
+        await pacing.acquire("greet")
+        return await pacing.acquire("greet")
+
+    # 1200次/分钟 => 两次之间至少0.05秒
+    assert 0.0 < asyncio.run(run()) <= 0.05
+
+
+def test_concurrent_callers_take_separate_slots():
+    pacing = PacingScheduler()
+    pacing.configure({"pacing": {"scrollIntervalSeconds": 0.1, "budgetJitter": 0}})
+
+    async def run():
+        await pacing.acquire("scroll")
+        start = time.monotonic()
+        waits = await asyncio.gather(pacing.acquire("scroll"), pacing.acquire("scroll"))
+        return waits, time.monotonic() - start
+
+    waits, elapsed = asyncio.run(run())
+    # 两个并发调用者不能一起通过：第二个要在第一个之后再等一个间隔
+    assert 0.05 < waits[0] <= 0.1
+    assert 0.0 < waits[1] <= 0.1
+    assert elapsed >= 0.15
+    assert pacing.get_stats()["actions"] == {"scroll": 3}
+
+def test_invalid_values_fall_back_to_defaults():
+    pacing = PacingScheduler()
+    pacing.configure({"pacing": {"greetsPerMinute": "abc", "delays": {"hover": ["x"]}}})
+
+    assert pacing.budgets["greetsPerMinute"] == PacingScheduler.DEFAULT_BUDGETS["greetsPerMinute"]
+    assert pacing.delays["hover"] == PacingScheduler.DEFAULT_DELAYS["hover"]
+
+
+def test_sample_respects_range_and_scale():
+    pacing = PacingScheduler()
+    pacing.configure({"pacing": {"delays": {"card_gap": [0.4, 0.2]}, "delayScale": 0.5, "jitter": "normal"}})
+
+    samples = [pacing.sample("card_gap") for _ in range(200)]
+    assert all(0.1 <= value <= 0.2 for value in samples)
+    assert pacing.sample("unknown_kind") == 0.0
+
+
+def test_stop_event_ends_sleep_early():
+    async def run():
+        stop_event = asyncio.Event()
+        pacing = PacingScheduler(lambda: stop_event)
+        asyncio.get_running_loop().call_later(0.05, stop_event.set)
+        start = time.monotonic()
+        completed = await pacing.sleep(5, "retry")
+        return completed, time.monotonic() - start, pacing.get_stats()
+
+    completed, elapsed, stats = asyncio.run(run())
+    assert completed is False
+    assert elapsed < 1
+    assert stats["byKind"]["retry"]["count"] == 1
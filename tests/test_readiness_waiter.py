@@ -0,0 +1,58 @@
+"""就绪等待和延迟直方图测试"""
+
+import asyncio
+
+from automation.processors.readiness_waiter import LatencyHistogram, ReadinessWaiter
+
+
+def test_histogram_buckets_and_percentiles():
+    histogram = LatencyHistogram("detail_ready")
+    for ms in (40, 90, 90, 450, 9000):
+        histogram.record(ms / 1000.0)
+    histogram.record(2.5, timed_out=True)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 6
+    assert snapshot["timeouts"] == 1
+    assert snapshot["buckets"]["<=50ms"] == 1
+    assert snapshot["buckets"]["<=100ms"] == 2
+    assert snapshot["buckets"][">8000ms"] == 1
+    assert snapshot["p50Ms"] == 100.0
+    assert snapshot["maxMs"] == 9000.0
+    assert LatencyHistogram("empty").percentile(50) == 0.0
+
+
+class _Target:
+    def __init__(self, error=None):
+        self.error = error
+        self.selectors = None
+
+    async def wait_for_selector(self, selector, state, timeout):
+        self.selectors = selector
+        if self.error:
+            raise self.error
+
+    async def wait_for_function(self, script, arg, timeout, polling):
+        if self.error:
+            raise self.error
+
+
+def test_wait_for_container_records_result():
+    waiter = ReadinessWaiter()
+    target = _Target()
+
+    assert asyncio.run(waiter.wait_for_container(target)) is True
+    assert ".resume-detail-wrap" in target.selectors
+    assert asyncio.run(waiter.wait_for_container(_Target(TimeoutError("timeout")), timeout=0.1)) is False
+
+    stats = waiter.get_stats()
+    assert stats["detail_container"]["count"] == 2
+    assert stats["detail_container"]["timeouts"] == 1
+
+
+def test_detached_frame_counts_as_closed():
+    waiter = ReadinessWaiter()
+
+    assert asyncio.run(waiter.wait_for_detail_closed(_Target(Exception("Frame was detached")))) is True
+    assert asyncio.run(waiter.wait_for_detail_closed(_Target(TimeoutError("timeout")))) is False
+    assert waiter.get_stats()["detail_close"]["timeouts"] == 1
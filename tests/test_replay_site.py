@@ -0,0 +1,25 @@
+"""回放模拟站点测试"""
+
+import urllib.request
+
+from automation.benchmarks.replay_harness import MockRecommendSite
+
+
+def test_list_exhausted_after_reload_following_last_batch():
+    site = MockRecommendSite(batches=2, latency_ms=0)
+    port = site.start()
+    try:
+        def get(path):
+            return urllib.request.urlopen(f"http://127.0.0.1:{port}{path}").read()
+
+        get("/web/boss/recommend")
+        assert not site.list_exhausted()
+
+        get("/mock/cards?batch=1")
+        assert not site.list_exhausted()
+
+        # 最后一批加载后页面被刷新，说明处理流程已到列表末尾
+        get("/web/boss/recommend")
+        assert site.list_exhausted()
+    finally:
+        site.stop()
@@ -0,0 +1,112 @@
+"""请求拦截策略测试"""
+
+import asyncio
+from types import SimpleNamespace
+
+from automation.browser_control.request_policy import RequestPolicy
+
+RECOMMEND_URL = "https://www.zhipin.com/web/boss/recommend"
+DETAIL_URL = "https://www.zhipin.com/web/boss/geek/detail/abc"
+
+
+class _PageDetector:
+    def get_current_page_type(self, url):
+        if "recommend" in url:
+            return "recommend"
+        if "detail" in url:
+            return "detail"
+        return "unknown"
+
+
+def _request(url, resource_type, frame_url=RECOMMEND_URL):
+    return SimpleNamespace(url=url, resource_type=resource_type, frame=SimpleNamespace(url=frame_url))
+
+
+def _policy(config=None):
+    policy = RequestPolicy(_PageDetector())
+    return policy, policy._compile_rules(config)
+
+
+def test_recommend_page_rules():
+    policy, rules = _policy()
+
+    assert policy._action_for(rules, _request("https://img.bosszhipin.com/a.jpg", "image")) == "stub"
+    assert policy._action_for(rules, _request("https://static.zhipin.com/f.woff2", "font")) == "block"
+    assert policy._action_for(rules, _request("https://hm.baidu.com/hm.js", "script")) == "block"
+    assert policy._action_for(rules, _request("https://www.zhipin.com/wapi/list.json", "xhr")) is None
+    assert policy._action_for(rules, _request(RECOMMEND_URL, "document")) is None
+
+
+def test_detail_page_keeps_images_except_avatars():
+    policy, rules = _policy()
+
+    assert policy._action_for(rules, _request("https://img.bosszhipin.com/resume.png", "image", DETAIL_URL)) is None
+    assert policy._action_for(rules, _request("https://img.bosszhipin.com/avatar/1.png", "image", DETAIL_URL)) == "stub"
+    assert policy._action_for(rules, _request("https://static.zhipin.com/f.woff2", "font", DETAIL_URL)) is None
+
+
+def test_first_party_log_and_monitor_paths_are_not_blocked():
+    policy, rules = _policy()
+
+    assert policy._action_for(rules, _request("https://www.zhipin.com/wapi/zpCommon/log/action.json", "xhr")) is None
+    assert policy._action_for(rules, _request("https://logapi.zhipin.com/logs/batch", "fetch")) is None
+    assert policy._action_for(rules, _request("https://www.zhipin.com/wapi/sentry/report", "xhr")) is None
+    # 第三方域名出现在查询参数中时也不拦截
+    assert policy._action_for(rules, _request("https://www.zhipin.com/jump?to=https://hm.baidu.com/", "xhr")) is None
+    assert policy._action_for(rules, _request("https://o1.ingest.sentry.io/api/1/envelope/", "fetch")) == "block"
+
+
+def test_unknown_frame_only_blocks_analytics():
+    policy, rules = _policy()
+    frame = "https://example.com/"
+
+    assert policy._action_for(rules, _request("https://example.com/a.jpg", "image", frame)) is None
+    assert policy._action_for(rules, _request("https://www.google-analytics.com/collect", "xhr", frame)) == "block"
+
+
+def test_config_overrides_rules():
+    policy, rules = _policy({"requestPolicy": {"rules": {"recommend": {"stubTypes": [], "blockHosts": [], "blockPatterns": ["*ads*"]}}}})
+
+    assert policy._action_for(rules, _request("https://img.bosszhipin.com/a.jpg", "image")) is None
+    assert policy._action_for(rules, _request("https://x.com/ads/1.js", "script")) == "block"
+    assert policy._action_for(rules, _request("https://hm.baidu.com/hm.js", "script")) is None
+
+
+def test_is_enabled_defaults_to_false():
+    assert not RequestPolicy.is_enabled(None)
+    assert not RequestPolicy.is_enabled({"requestPolicy": {}})
+    assert not RequestPolicy.is_enabled({"requestPolicy": {"enabled": False}})
+    assert RequestPolicy.is_enabled({"requestPolicy": {"enabled": True}})
+
+
+class _Route:
+    def __init__(self):
+        self.calls = []
+
+    async def continue_(self):
+        self.calls.append("continue")
+
+    async def fulfill(self, **kwargs):
+        self.calls.append(("fulfill", kwargs["content_type"]))
+
+    async def abort(self, reason):
+        self.calls.append(("abort", reason))
+
+
+def test_handler_counts_and_estimates_savings():
+    policy, rules = _policy()
+    handler = policy._make_handler(rules)
+    route = _Route()
+
+    async def run():
+        await handler(route, _request("https://img.bosszhipin.com/a.jpg", "image"))
+        await handler(route, _request("https://static.zhipin.com/f.woff2", "font"))
+        await handler(route, _request("https://www.zhipin.com/wapi/list.json", "xhr"))
+
+    asyncio.run(run())
+
+    assert route.calls == [("fulfill", "image/gif"), ("abort", "blockedbyclient"), "continue"]
+    stats = policy.get_stats()
+    assert stats["stubbed"] == {"image": 1}
+    assert stats["blocked"] == {"font": 1}
+    assert stats["estimatedBytesSaved"] == RequestPolicy.DEFAULT_SIZES["image"] + RequestPolicy.DEFAULT_SIZES["font"]
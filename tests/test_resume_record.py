@@ -0,0 +1,50 @@
+"""简历记录测试"""
+
+from automation.processors.resume_record import ResumeRecord
+
+
+def test_behaves_like_dict():
+    record = ResumeRecord({"name": "张三", "fullText": "很长的简历文本"}, position="后端")
+
+    assert record["name"] == "张三"
+    assert record.get("fullText") == "很长的简历文本"
+    assert record.get("missing", "默认") == "默认"
+    assert set(record) == {"name", "position", "fullText"}
+    assert len(record) == 3
+    assert record == {"name": "张三", "position": "后端", "fullText": "很长的简历文本"}
+
+    del record["position"]
+    assert "position" not in record
+
+
+def test_copy_on_write():
+    original = ResumeRecord({"name": "张三", "skills": ["Java"], "fullText": "文本"})
+    copy = original.copy()
+
+    copy["name"] = "李四"
+    copy["fullText"] = "新文本"
+
+    assert original["name"] == "张三"
+    assert original["fullText"] == "文本"
+    assert copy["name"] == "李四"
+
+
+def test_wrap_and_copy_of():
+    record = ResumeRecord({"name": "张三"})
+    assert ResumeRecord.wrap(record) is record
+    assert ResumeRecord.wrap(None) == {}
+
+    copy = ResumeRecord.copy_of({"name": "张三"})
+    copy["name"] = "李四"
+    assert isinstance(copy, ResumeRecord)
+
+
+def test_to_dict_returns_independent_lists():
+    record = ResumeRecord({"skills": ["Java"], "html_content": "<div></div>"})
+
+    data = record.to_dict()
+    data["skills"].append("Go")
+
+    assert record["skills"] == ["Java"]
+    assert "html_content" not in record.to_dict(include_large_text=False)
+    assert type(data) is dict
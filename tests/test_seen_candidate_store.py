@@ -0,0 +1,148 @@
+"""已处理候选人存储测试"""
+
+import asyncio
+import uuid
+
+from automation.processors.seen_candidate_store import BloomFilter, SeenCandidateStore
+
+
+def _job():
+    return f"job-{uuid.uuid4().hex[:8]}"
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"key-{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+    bloom.clear()
+    assert "key-1" not in bloom
+
+
+def test_records_persist_across_sessions():
+    job = _job()
+    store = SeenCandidateStore()
+    store.open(job)
+    store.add("geek-1")
+    store.add("fp:abc", simhash=123)
+    store.flush()
+
+    reopened = SeenCandidateStore()
+    assert reopened.open(job) == 2
+    assert "geek-1" in reopened
+    assert "geek-2" not in reopened
+    assert reopened.find_similar(123, exclude="other") == ("fp:abc", 0)
+
+    # 不同岗位范围互不影响
+    other = SeenCandidateStore()
+    assert other.open(_job()) == 0
+    assert "geek-1" not in other
+
+
+def test_add_is_visible_before_flush():
+    store = SeenCandidateStore()
+    store.open(_job())
+    store.add("geek-1")
+
+    assert "geek-1" in store
+    store.flush()
+    assert store.get_stats()["pendingWrites"] == 0
+    assert store.get_stats()["dbWrites"] >= 1
+
+
+def test_async_lookups_confirm_bloom_hits_in_database():
+    job = _job()
+    writer = SeenCandidateStore()
+    writer.open(job)
+    for i in range(5):
+        writer.add(f"geek-{i}")
+    writer.flush()
+
+    store = SeenCandidateStore()
+    store.open(job)
+
+    async def run():
+        found = await store.contains("geek-3")
+        missing = await store.contains("geek-99")
+        queried = await store.prefetch(["geek-0", "geek-1", "geek-1", None])
+        return found, missing, queried
+
+    found, missing, queried = asyncio.run(run())
+    assert found is True
+    assert missing is False
+    assert queried == 2
+    lookups = store.db_lookups
+    # 预取后的判断只读内存
+    assert "geek-0" in store and "geek-1" in store
+    assert store.db_lookups == lookups
+
+
+def test_clear_removes_job_records():
+    job = _job()
+    store = SeenCandidateStore()
+    store.open(job)
+    store.add("geek-1")
+    store.flush()
+
+    assert store.clear() == 1
+    assert "geek-1" not in store
+    store.flush()
+    assert SeenCandidateStore().open(job) == 0
+
+
+def test_job_key_for_uses_job_id_or_position_rules():
+    assert SeenCandidateStore.job_key_for({"jobId": "123"}) == "123"
+    assert SeenCandidateStore.job_key_for({}) == SeenCandidateStore.DEFAULT_JOB_KEY
+
+    config = {"rules": [{"type": "岗位", "keywords": ["后端"], "enabled": True}]}
+    key = SeenCandidateStore.job_key_for(config)
+    assert key == SeenCandidateStore.job_key_for(dict(config))
+    assert key != SeenCandidateStore.job_key_for({"rules": [{"type": "岗位", "keywords": ["前端"], "enabled": True}]})
+
+
+def test_open_async_loads_off_loop_and_sync_lookup_is_rejected_in_loop():
+    job = _job()
+    writer = SeenCandidateStore()
+    writer.open(job)
+    writer.add("geek-1")
+    writer.flush()
+
+    store = SeenCandidateStore()
+
+    async def run():
+        count = await store.open_async(job)
+        # 布隆过滤器命中但未确认的键不能在事件循环中同步查询
+        try:
+            "geek-1" in store
+            raised = False
+        except RuntimeError:
+            raised = True
+        before = store.peek("geek-1")
+        await store.prefetch(["geek-1"])
+        return count, raised, before, store.peek("geek-1"), "geek-1" in store
+
+    count, raised, before, after, sync_hit = asyncio.run(run())
+    assert count == 1
+    assert raised is True
+    assert before is None
+    assert after is True
+    assert sync_hit is True
+    assert store.peek("never-seen") is False
+
+
+def test_unopened_store_cannot_load_inside_event_loop():
+    store = SeenCandidateStore()
+
+    async def run():
+        try:
+            store.add("geek-1")
+        except RuntimeError:
+            return True
+        return False
+
+    assert asyncio.run(run()) is True
@@ -0,0 +1,88 @@
+"""API服务启动预热测试"""
+
+import asyncio
+
+from automation.api.warmup import StartupWarmup
+
+
+class _Automation:
+    """模拟工作进程客户端"""
+
+    def __init__(self, ready=True):
+        self.alive = False
+        self.ready = False
+        self.will_be_ready = ready
+        self.restarts = 0
+        self.last_error = None
+
+    def start(self):
+        self.alive = True
+        self.ready = self.will_be_ready
+
+    async def wait_ready(self, timeout):
+        return self.ready
+
+    def get_info(self):
+        return {"alive": self.alive, "ready": self.ready, "restarts": self.restarts, "lastError": self.last_error}
+
+
+async def _warm(automation):
+    warmup = StartupWarmup(automation, import_seconds=0.1)
+
+    async def init_database():
+        return True
+
+    warmup._init_database = init_database
+    warmup.start()
+    await asyncio.gather(warmup._database_task, warmup._worker_task)
+    return warmup
+
+
+def test_ready_after_components_start():
+    warmup = asyncio.run(_warm(_Automation()))
+
+    status = warmup.get_status()
+    assert status["ready"] is True
+    assert status["components"]["database"]["ready"] is True
+    assert status["components"]["worker"]["ready"] is True
+    assert status["components"]["worker"]["seconds"] is not None
+    assert status["importSeconds"] == 0.1
+
+
+def test_worker_crash_and_restart_are_reflected():
+    automation = _Automation()
+    warmup = asyncio.run(_warm(automation))
+
+    automation.alive = False
+    automation.last_error = "进程退出"
+    status = warmup.get_status()
+    assert status["ready"] is False
+    assert not warmup.is_ready
+    assert status["components"]["worker"]["error"] == "进程退出"
+
+    automation.alive = True
+    automation.restarts = 1
+    status = warmup.get_status()
+    assert status["ready"] is True
+    assert status["components"]["worker"]["error"] is None
+    assert status["components"]["worker"]["restarts"] == 1
+
+
+def test_worker_timeout_reports_error():
+    warmup = asyncio.run(_warm(_Automation(ready=False)))
+
+    status = warmup.get_status()
+    assert status["ready"] is False
+    assert status["components"]["worker"]["error"] == "工作进程初始化超时"
+
+
+def test_wait_database_without_start():
+    warmup = StartupWarmup(_Automation())
+
+    async def init_database():
+        return True
+
+    warmup._init_database = init_database
+
+    assert asyncio.run(warmup.wait_database()) is True
+    assert warmup.get_status()["components"]["worker"]["ready"] is False
@@ -0,0 +1,54 @@
+"""自动化工作进程客户端测试"""
+
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from automation.api import server
+from automation.worker.worker_client import AutomationWorkerClient, WorkerCommandError, WorkerUnavailableError
+
+
+def test_status_resets_when_worker_exits():
+    async def run():
+        client = AutomationWorkerClient()
+        client._dispatch({"type": "status", "data": {"running": True, "pageType": "recommend", "processedCount": 7, "candidates": [{"name": "a"}]}})
+        pending = asyncio.get_running_loop().create_future()
+        client._pending["req"] = pending
+        assert client.status["running"] is True
+
+        client._on_exit("工作进程已退出")
+
+        assert client.status == {"running": False, "pageType": "unknown", "processedCount": 0, "candidates": []}
+        assert isinstance(pending.exception(), WorkerUnavailableError)
+        assert client._pending == {}
+    asyncio.run(run())
+
+
+def test_failed_command_raises_command_error():
+    async def run():
+        client = AutomationWorkerClient()
+        future = asyncio.get_running_loop().create_future()
+        client._pending["req"] = future
+        client._dispatch({"type": "result", "id": "req", "ok": False, "error": "浏览器未连接"})
+        assert isinstance(future.exception(), WorkerCommandError)
+    asyncio.run(run())
+
+
+def test_api_returns_error_shape_when_worker_fails(monkeypatch):
+    async def unavailable(command, timeout=None, **args):
+        raise WorkerUnavailableError("自动化工作进程不可用，请稍后重试")
+
+    async def failed(command, timeout=None, **args):
+        raise WorkerCommandError("浏览器未连接")
+
+    client = TestClient(server.app)
+
+    monkeypatch.setattr(server.automation, "call", unavailable)
+    response = client.post("/api/automation/start")
+    assert response.status_code == 503
+    assert response.json() == {"success": False, "message": "自动化工作进程不可用，请稍后重试"}
+
+    monkeypatch.setattr(server.automation, "call", failed)
+    response = client.get("/api/jobs")
+    assert response.status_code == 500
+    assert response.json() == {"success": False, "message": "浏览器未连接"}
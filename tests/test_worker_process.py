@@ -0,0 +1,112 @@
+"""自动化工作进程命令分发测试"""
+
+import asyncio
+import queue
+from types import SimpleNamespace
+
+from automation.worker.worker_process import AutomationWorker
+
+
+class _Jobs:
+    def get_status(self):
+        return []
+
+    def stop_all(self):
+        pass
+
+    def create_job(self, **kwargs):
+        return {"id": "job-1", **kwargs}
+
+    get_job_status = start_job = stop_job = remove_job = create_job
+
+
+class _Manager:
+    def __init__(self):
+        self.is_running = False
+        self.current_page_type = "recommend"
+        self.processed_count = 3
+        self.selectors = {"card": ".card"}
+        self.browser = None
+        self.supervisor = SimpleNamespace(get_stats=lambda: {"heartbeats": 0})
+        self.request_policy = SimpleNamespace(get_stats=lambda: {})
+        self.jobs = _Jobs()
+        self.stopped = 0
+
+    def get_greeted_candidates(self, limit):
+        return [{"name": "a"}, {"name": "b"}]
+
+    async def detect_browser(self):
+        return {"found": True}
+
+    async def launch_browser(self, port=9222):
+        raise RuntimeError(f"端口 {port} 不可用")
+
+    def stop_automation(self):
+        self.stopped += 1
+
+    async def close_browser(self):
+        pass
+
+
+def _worker():
+    events = queue.Queue()
+    worker = AutomationWorker(queue.Queue(), events, manager=_Manager())
+    return worker, events
+
+
+def _drain(events):
+    items = []
+    while not events.empty():
+        items.append(events.get_nowait())
+    return items
+
+
+def _run(worker, message):
+    async def run():
+        worker._stopped = asyncio.Event()
+        await worker._handle(message)
+    asyncio.run(run())
+
+
+def test_sync_command_result_and_status_push():
+    worker, events = _worker()
+
+    _run(worker, {"id": "1", "command": "get_selectors"})
+
+    result, status = _drain(events)
+    assert result == {"type": "result", "id": "1", "ok": True, "result": {"card": ".card"}}
+    assert status["type"] == "status"
+    assert status["data"]["processedCount"] == 3
+    assert status["data"]["candidates"] == [{"name": "b"}, {"name": "a"}]
+
+
+def test_async_command_with_args():
+    worker, events = _worker()
+
+    _run(worker, {"id": "2", "command": "create_job", "args": {"name": "后端"}})
+
+    assert _drain(events)[0]["result"] == {"id": "job-1", "name": "后端"}
+
+
+def test_command_errors_are_returned():
+    worker, events = _worker()
+
+    _run(worker, {"id": "3", "command": "launch_browser", "args": {"port": 9333}})
+    _run(worker, {"id": "4", "command": "no_such_command"})
+
+    results = [event for event in _drain(events) if event["type"] == "result"]
+    assert results[0] == {"type": "result", "id": "3", "ok": False, "error": "端口 9333 不可用"}
+    assert results[1]["ok"] is False and "no_such_command" in results[1]["error"]
+
+
+def test_shutdown_stops_worker():
+    worker, events = _worker()
+
+    async def run():
+        worker._stopped = asyncio.Event()
+        await worker._handle({"id": "5", "command": "shutdown"})
+        return worker._stopped.is_set()
+
+    assert asyncio.run(run()) is True
+    assert worker.manager.stopped == 1
+    assert _drain(events)[0]["result"]["success"] is True